@@ -0,0 +1,132 @@
+"""Benchmark ``ContextBuilder.build_context`` over growing history sizes.
+
+Run with::
+
+    uv run python benchmarks/context_build.py [--repeat N]
+
+Each case builds context for a tool-heavy history under a budget tight enough
+to force the sliding window, summary fitting and protected-message truncation.
+"no memo" disables the token cache, "cold" uses a fresh builder per build and
+"warm" reuses one builder across builds the way ``Application`` does.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from collections.abc import Callable
+
+from nahida_bot.agent.context import ContextBudget, ContextBuilder, ContextMessage
+from nahida_bot.core.logging import configure_logging
+
+HISTORY_SIZES = (50, 100, 200, 500)
+
+
+def _history(size: int) -> list[ContextMessage]:
+    messages: list[ContextMessage] = []
+    for index in range(size):
+        if index % 5 == 3:
+            messages.append(
+                ContextMessage(
+                    role="assistant",
+                    source="history",
+                    content="checking",
+                    metadata={
+                        "tool_calls": [
+                            {
+                                "id": f"call_{index}",
+                                "name": "web_fetch",
+                                "arguments": {"url": f"https://example.com/{index}"},
+                            }
+                        ]
+                    },
+                )
+            )
+            messages.append(
+                ContextMessage(
+                    role="tool",
+                    source="tool_result:web_fetch",
+                    content=f"page {index} " + "lorem ipsum dolor " * 40,
+                    metadata={"tool_call_id": f"call_{index}"},
+                )
+            )
+            continue
+        role = "user" if index % 2 == 0 else "assistant"
+        messages.append(
+            ContextMessage(
+                role=role,
+                source="history",
+                content=f"message {index}: " + "some conversational text " * 12,
+                metadata={"message_id": str(index), "platform": "telegram"},
+            )
+        )
+    return messages
+
+
+def _protected() -> list[ContextMessage]:
+    return [
+        ContextMessage(role="user", source="user_input", content="summarize the pages"),
+        ContextMessage(
+            role="assistant",
+            source="provider_response",
+            content="fetching",
+            metadata={
+                "tool_calls": [{"id": "live", "name": "web_fetch", "arguments": {}}]
+            },
+        ),
+        ContextMessage(
+            role="tool",
+            source="tool_result:web_fetch",
+            content="large result " * 3000,
+            metadata={"tool_call_id": "live"},
+        ),
+    ]
+
+
+BUDGET = ContextBudget(max_tokens=6000, reserved_tokens=500)
+
+
+def _time_builds(
+    make_builder: Callable[[], ContextBuilder], size: int, repeat: int
+) -> float:
+    samples: list[float] = []
+    for _ in range(repeat):
+        # Rebuild messages every run: history is reloaded from SQLite per turn.
+        history = _history(size)
+        protected = _protected()
+        builder = make_builder()
+        started = time.perf_counter()
+        builder.build_context(
+            system_prompt="You are a helpful assistant.",
+            history_messages=history,
+            protected_messages=protected,
+        )
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ContextBuilder build benchmark")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    configure_logging(debug=False, log_level="ERROR")
+
+    print(f"{'history':>8} {'no memo ms':>11} {'cold ms':>9} {'warm ms':>9}")
+    for size in HISTORY_SIZES:
+        no_memo = _time_builds(
+            lambda: ContextBuilder(budget=BUDGET, token_cache_size=0),
+            size,
+            args.repeat,
+        )
+        cold = _time_builds(lambda: ContextBuilder(budget=BUDGET), size, args.repeat)
+        shared = ContextBuilder(budget=BUDGET)
+        _time_builds(lambda builder=shared: builder, size, 1)
+        warm = _time_builds(lambda builder=shared: builder, size, args.repeat)
+        print(
+            f"{size:>8} {no_memo * 1000:>11.2f} {cold * 1000:>9.2f} {warm * 1000:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
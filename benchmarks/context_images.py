@@ -0,0 +1,99 @@
+"""Benchmark ``ContextBuilder.build_context`` for turns carrying large images.
+
+Run with::
+
+    uv run python benchmarks/context_images.py [--repeat N] [--image-mb MB]
+
+Each case builds context for a 40-message history followed by an active user
+turn with 1-4 base64 images of roughly ``--image-mb`` megabytes each. Images
+are charged by pixel size, so build time should stay flat as images grow and
+the history should survive the budget.
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import os
+import statistics
+import time
+
+from nahida_bot.agent.context import (
+    ContextBudget,
+    ContextBuilder,
+    ContextMessage,
+    ContextPart,
+)
+from nahida_bot.core.logging import configure_logging
+
+IMAGE_COUNTS = (1, 2, 3, 4)
+BUDGET = ContextBudget(max_tokens=16000, reserved_tokens=1000)
+
+
+def _history() -> list[ContextMessage]:
+    return [
+        ContextMessage(
+            role="user" if index % 2 == 0 else "assistant",
+            source="history",
+            content=f"message {index}: " + "some conversational text " * 10,
+        )
+        for index in range(40)
+    ]
+
+
+def _image_turn(count: int, payload: str) -> ContextMessage:
+    return ContextMessage(
+        role="user",
+        source="user_input",
+        content="compare these screenshots",
+        parts=[
+            ContextPart(type="text", text="compare these screenshots"),
+            *(
+                ContextPart(
+                    type="image_base64",
+                    # Distinct payloads so nothing is shared between images.
+                    data=f"{index}{payload}",
+                    mime_type="image/png",
+                    media_id=f"img_{index}",
+                    width=2560,
+                    height=1440,
+                )
+                for index in range(count)
+            ),
+        ],
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ContextBuilder image benchmark")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--image-mb", type=float, default=5.0)
+    args = parser.parse_args()
+    configure_logging(debug=False, log_level="ERROR")
+
+    raw_bytes = int(args.image_mb * 1024 * 1024 * 3 / 4)
+    payload = base64.b64encode(os.urandom(raw_bytes)).decode("ascii")
+    builder = ContextBuilder(budget=BUDGET)
+    print(f"{'images':>7} {'build ms':>9} {'kept history':>13} {'est. tokens':>12}")
+    for count in IMAGE_COUNTS:
+        samples: list[float] = []
+        result: list[ContextMessage] = []
+        for _ in range(args.repeat):
+            history = _history()
+            active = _image_turn(count, payload)
+            started = time.perf_counter()
+            result = builder.build_context(
+                system_prompt="You are a helpful assistant.",
+                history_messages=history,
+                protected_messages=[active],
+            )
+            samples.append(time.perf_counter() - started)
+        kept = sum(1 for message in result if message.source == "history")
+        print(
+            f"{count:>7} {statistics.median(samples) * 1000:>9.2f} "
+            f"{kept:>13} {builder._estimate_tokens(result):>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
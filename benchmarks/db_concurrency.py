@@ -0,0 +1,142 @@
+"""Benchmark memory-store throughput with many concurrent sessions.
+
+Run with::
+
+    uv run python benchmarks/db_concurrency.py [--sessions N] [--turns N]
+
+Each simulated session repeats what one agent turn does against SQLite: load
+recent history, run an FTS search, and append the user and assistant turns.
+All sessions run concurrently on one ``DatabaseEngine``. The case with zero
+readers is the previous single-connection engine, where every read queues
+behind every write on one aiosqlite worker thread. ``--write-batch-ms 0``
+commits every turn separately instead of group-committing concurrent writes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from nahida_bot.agent.memory.models import ConversationTurn
+from nahida_bot.agent.memory.sqlite import SQLiteMemoryStore
+from nahida_bot.core.logging import configure_logging
+from nahida_bot.db.engine import DatabaseEngine
+
+POOL_SIZES = (0, 1, 2, 4, 8)
+SEED_TURNS = 400
+WORDS = [
+    "memory",
+    "retrieval",
+    "sqlite",
+    "session",
+    "agent",
+    "provider",
+    "context",
+    "budget",
+    "image",
+    "schedule",
+    "dreaming",
+    "embedding",
+    "vector",
+    "keyword",
+    "summary",
+]
+
+
+def _text(index: int) -> str:
+    return " ".join(WORDS[(index + offset) % len(WORDS)] for offset in range(12))
+
+
+async def _seed(path: Path, sessions: int) -> None:
+    engine = DatabaseEngine(path, read_pool_size=0)
+    await engine.initialize()
+    store = SQLiteMemoryStore(engine)
+    for session in range(sessions):
+        session_id = f"bench-{session}"
+        await store.ensure_session(session_id)
+        for index in range(SEED_TURNS):
+            role = "user" if index % 2 == 0 else "assistant"
+            await store.append_turn(
+                session_id, ConversationTurn(role=role, content=_text(index))
+            )
+    await engine.close()
+
+
+async def _run_case(
+    path: Path, *, pool_size: int, sessions: int, turns: int, write_batch_ms: float
+) -> tuple[float, list[float]]:
+    engine = DatabaseEngine(path, read_pool_size=pool_size)
+    await engine.initialize()
+    store = SQLiteMemoryStore(engine, write_batch_max_delay=write_batch_ms / 1000)
+    read_latencies: list[float] = []
+
+    async def session_loop(session: int) -> None:
+        session_id = f"bench-{session}"
+        for turn in range(turns):
+            started = time.perf_counter()
+            await store.get_recent(session_id, limit=50)
+            await store.search(session_id, WORDS[turn % len(WORDS)], limit=10)
+            read_latencies.append(time.perf_counter() - started)
+            for role in ("user", "assistant"):
+                await store.append_turn(
+                    session_id, ConversationTurn(role=role, content=_text(turn))
+                )
+
+    started = time.perf_counter()
+    await asyncio.gather(*(session_loop(session) for session in range(sessions)))
+    elapsed = time.perf_counter() - started
+    await engine.close()
+    return elapsed, read_latencies
+
+
+def _percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="DatabaseEngine concurrency")
+    parser.add_argument("--sessions", type=int, default=64)
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--write-batch-ms", type=float, default=5.0)
+    args = parser.parse_args()
+    configure_logging(debug=False, log_level="ERROR")
+
+    print(
+        f"cpus: {os.cpu_count()}  sessions: {args.sessions}  turns: {args.turns}  "
+        f"write batch: {args.write_batch_ms} ms"
+    )
+    print(
+        f"{'readers':>7} {'wall s':>8} {'turns/s':>9} "
+        f"{'read p50 ms':>12} {'read p95 ms':>12}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        seed = Path(tmp) / "seed.sqlite3"
+        asyncio.run(_seed(seed, args.sessions))
+        for pool_size in POOL_SIZES:
+            path = Path(tmp) / f"case-{pool_size}.sqlite3"
+            path.write_bytes(seed.read_bytes())
+            elapsed, reads = asyncio.run(
+                _run_case(
+                    path,
+                    pool_size=pool_size,
+                    write_batch_ms=args.write_batch_ms,
+                    sessions=args.sessions,
+                    turns=args.turns,
+                )
+            )
+            total_turns = args.sessions * args.turns
+            print(
+                f"{pool_size:>7} {elapsed:>8.2f} {total_turns / elapsed:>9.1f} "
+                f"{statistics.median(reads) * 1000:>12.2f} "
+                f"{_percentile(reads, 0.95) * 1000:>12.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
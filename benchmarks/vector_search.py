@@ -0,0 +1,144 @@
+"""Benchmark durable-memory vector search backends.
+
+Run with::
+
+    uv run python benchmarks/vector_search.py [--repeat N] [--baseline-max N]
+
+Each case indexes random embeddings and runs top-10 queries. "json scan" is
+the previous built-in path: ``json.loads`` every stored vector and score it
+with :func:`cosine_similarity`, then sort. "numpy" and "array" are
+:class:`InMemoryVectorIndex` with and without NumPy. The JSON scan and the
+pure-Python index get slow quickly, so they only run up to the given sizes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from array import array
+
+from nahida_bot.agent.memory.vector import (
+    InMemoryVectorIndex,
+    VectorRecord,
+    _numpy,
+    cosine_similarity,
+)
+from nahida_bot.core.logging import configure_logging
+
+SIZES = (1_000, 10_000, 100_000)
+DIMENSIONS = (768, 1536)
+TOP_K = 10
+CHUNK = 5_000
+
+
+def _random_rows(count: int, dims: int, seed: int) -> list[array]:
+    np = _numpy()
+    if np is not None:
+        matrix = np.random.default_rng(seed).standard_normal(
+            (count, dims), dtype=np.float32
+        )
+        return [array("f", row.tobytes()) for row in matrix]
+    rng = random.Random(seed)
+    return [array("f", [rng.gauss(0, 1) for _ in range(dims)]) for _ in range(count)]
+
+
+def _build_index(
+    size: int, dims: int, *, use_numpy: bool
+) -> tuple[InMemoryVectorIndex, float]:
+    index = InMemoryVectorIndex(use_numpy=use_numpy)
+    started = time.perf_counter()
+    for offset in range(0, size, CHUNK):
+        rows = _random_rows(min(CHUNK, size - offset), dims, seed=offset)
+        asyncio.run(
+            index.upsert(
+                [
+                    VectorRecord(f"e{offset + i}", f"item{offset + i}", row)
+                    for i, row in enumerate(rows)
+                ]
+            )
+        )
+    return index, time.perf_counter() - started
+
+
+def _time_index(index: InMemoryVectorIndex, query: list[float], repeat: int) -> float:
+    async def run() -> float:
+        samples: list[float] = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            await index.search(query, limit=TOP_K)
+            samples.append(time.perf_counter() - started)
+        return statistics.median(samples)
+
+    return asyncio.run(run())
+
+
+def _time_json_scan(size: int, dims: int, query: list[float], repeat: int) -> float:
+    stored: list[str] = []
+    for offset in range(0, size, CHUNK):
+        rows = _random_rows(min(CHUNK, size - offset), dims, seed=offset)
+        stored.extend(json.dumps(row.tolist()) for row in rows)
+    samples: list[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        sorted(
+            (
+                (index, cosine_similarity(query, json.loads(raw)))
+                for index, raw in enumerate(stored)
+            ),
+            key=lambda item: item[1],
+            reverse=True,
+        )[:TOP_K]
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def _fmt(seconds: float | None) -> str:
+    return f"{seconds * 1000:.2f}" if seconds is not None else "-"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Memory vector search benchmark")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline-max", type=int, default=10_000)
+    parser.add_argument("--array-max", type=int, default=10_000)
+    args = parser.parse_args()
+    configure_logging(debug=False, log_level="ERROR")
+
+    has_numpy = _numpy() is not None
+    print(
+        f"{'items':>8} {'dims':>5} {'json scan ms':>13} {'array ms':>9} "
+        f"{'numpy ms':>9} {'numpy build s':>14} {'matrix MB':>10}"
+    )
+    for dims in DIMENSIONS:
+        query = list(_random_rows(1, dims, seed=10**9)[0])
+        for size in SIZES:
+            baseline = (
+                _time_json_scan(size, dims, query, args.repeat)
+                if size <= args.baseline_max
+                else None
+            )
+            pure = None
+            if size <= args.array_max:
+                index, _ = _build_index(size, dims, use_numpy=False)
+                pure = _time_index(index, query, args.repeat)
+                del index
+            vectorized = build = None
+            matrix_mb = 0.0
+            if has_numpy:
+                index, build = _build_index(size, dims, use_numpy=True)
+                vectorized = _time_index(index, query, args.repeat)
+                matrix_mb = index.nbytes / (1024 * 1024)
+                del index
+            print(
+                f"{size:>8} {dims:>5} {_fmt(baseline):>13} {_fmt(pure):>9} "
+                f"{_fmt(vectorized):>9} "
+                f"{build if build is not None else 0:>14.2f} {matrix_mb:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -19,6 +19,7 @@ from nahida_bot.agent.metrics import (
     ContextPruneRecord,
     MetricsCollector,
     ProviderCallRecord,
+    ToolBatchRecord,
     ToolCallRecord,
     Trace,
 )
@@ -32,6 +33,7 @@ from nahida_bot.agent.providers import (
     ProviderError,
     ProviderRateLimitError,
     ProviderResponse,
+    ProviderStreamDelta,
     ProviderTimeoutError,
     ProviderTransportError,
     ReasoningPolicy,
@@ -77,12 +79,14 @@ __all__ = [
     "ProviderError",
     "ProviderRateLimitError",
     "ProviderResponse",
+    "ProviderStreamDelta",
     "ProviderTimeoutError",
     "ProviderTransportError",
     "ReasoningPolicy",
     "RoutedModel",
     "SQLiteMemoryStore",
     "TokenUsage",
+    "ToolBatchRecord",
     "ToolCall",
     "ToolCallRecord",
     "ToolDefinition",
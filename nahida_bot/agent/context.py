@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
+import os
+import weakref
+from collections import OrderedDict
 from dataclasses import dataclass, field, replace
 from enum import Enum
 from pathlib import Path
@@ -15,8 +19,14 @@ from nahida_bot.agent.memory.markdown import (
     MAX_CONTEXT_MEMORY_CHARS,
     build_memory_context,
     load_workspace_markdown_memory,
+    workspace_memory_candidates,
+)
+from nahida_bot.agent.tokenization import (
+    DEFAULT_IMAGE_TOKEN_MODEL,
+    Tokenizer,
+    estimate_image_tokens,
+    resolve_tokenizer,
 )
-from nahida_bot.agent.tokenization import Tokenizer, resolve_tokenizer
 from nahida_bot.core.logging import log_trace
 
 logger = structlog.get_logger(__name__)
@@ -37,11 +47,18 @@ class ReasoningPolicy(Enum):
 
 
 if TYPE_CHECKING:
-    from nahida_bot.agent.providers.base import ChatProvider
+    from collections.abc import Callable
+
+    from nahida_bot.agent.providers.base import ChatProvider, ModelCapabilities
     from nahida_bot.core.config import ContextConfig
 
 MessageRole = Literal["system", "user", "assistant", "tool"]
 
+IMAGE_PART_TYPES = frozenset({"image_url", "image_base64"})
+
+DEFAULT_TOKEN_CACHE_SIZE = 4096
+DEFAULT_WORKSPACE_CACHE_SIZE = 64
+
 
 @dataclass(slots=True, frozen=True)
 class ContextPart:
@@ -57,9 +74,11 @@ class ContextPart:
     mime_type: str = ""
     media_id: str = ""
     cache_control: str = ""  # "ephemeral" | ""
+    width: int = 0  # image pixel size when known, used for budget costing
+    height: int = 0
 
 
-@dataclass(slots=True, frozen=True)
+@dataclass(slots=True, frozen=True, weakref_slot=True)
 class ContextMessage:
     """Single message unit used to build provider request context."""
 
@@ -138,14 +157,29 @@ class ContextBuilder:
         provider: ChatProvider | None = None,
         tokenizer: Tokenizer | None = None,
         fallback_tokenizer: Tokenizer | None = None,
+        token_cache_size: int = DEFAULT_TOKEN_CACHE_SIZE,
+        image_token_model: str | None = None,
     ) -> None:
-        """Create context builder with optional provider/tokenizer strategy."""
+        """Create context builder with optional provider/tokenizer strategy.
+
+        ``token_cache_size`` bounds the per-message token count memo. Set it
+        to ``0`` to disable caching. ``image_token_model`` selects the image
+        cost formula and defaults to the provider's ``image_token_model``.
+        """
         self.budget = budget or ContextBudget()
         self.tokenizer = resolve_tokenizer(
             provider_tokenizer=provider.tokenizer if provider is not None else None,
             tokenizer=tokenizer,
             fallback_tokenizer=fallback_tokenizer,
         )
+        self.image_token_model = image_token_model or getattr(
+            provider, "image_token_model", DEFAULT_IMAGE_TOKEN_MODEL
+        )
+        self._active_image_token_model = self.image_token_model
+        self._token_cache = _MessageTokenCache(max(0, token_cache_size))
+        self._workspace_cache: OrderedDict[
+            Path, tuple[tuple[object, ...], tuple[ContextMessage, ...]]
+        ] = OrderedDict()
 
     def load_workspace_instructions(self, workspace_root: Path) -> list[ContextMessage]:
         """Load instruction files in strict priority order."""
@@ -204,6 +238,67 @@ class ContextBuilder:
             },
         )
 
+    def _workspace_prefix(self, workspace_root: Path) -> tuple[ContextMessage, ...]:
+        """Return cached workspace instructions, skills and memory messages.
+
+        Entries are revalidated on every call against the mtime and size of
+        each source file, which costs a few ``stat`` calls instead of reading
+        and parsing every file. Returning the same message objects lets the
+        token memo answer their counts by identity.
+        """
+        fingerprint = self._workspace_fingerprint(workspace_root)
+        cached = self._workspace_cache.get(workspace_root)
+        if cached is not None and cached[0] == fingerprint:
+            self._workspace_cache.move_to_end(workspace_root)
+            return cached[1]
+
+        messages: list[ContextMessage] = [
+            *self.load_workspace_instructions(workspace_root),
+            *self.load_workspace_skills(workspace_root),
+        ]
+        memory_message = self.load_workspace_memory(workspace_root)
+        if memory_message is not None:
+            messages.append(memory_message)
+        prefix = tuple(messages)
+        for message in prefix:
+            self._message_text_tokens(message)
+
+        self._workspace_cache[workspace_root] = (fingerprint, prefix)
+        self._workspace_cache.move_to_end(workspace_root)
+        while len(self._workspace_cache) > DEFAULT_WORKSPACE_CACHE_SIZE:
+            self._workspace_cache.popitem(last=False)
+        logger.debug(
+            "context_builder.workspace_prefix_loaded",
+            workspace_root=str(workspace_root),
+            message_count=len(prefix),
+            reason="stale" if cached is not None else "miss",
+        )
+        return prefix
+
+    def _workspace_fingerprint(self, workspace_root: Path) -> tuple[object, ...]:
+        """Stat every file that feeds the workspace prefix."""
+        items: list[object] = [
+            _stat_signature(workspace_root / filename)
+            for filename in self.instruction_filenames
+        ]
+        for directory in self.skill_directories:
+            root = workspace_root / directory
+            items.append(_stat_signature(root))
+            try:
+                entries = sorted(
+                    entry.name for entry in os.scandir(root) if entry.is_dir()
+                )
+            except OSError:
+                continue
+            items.extend(
+                (name, _stat_signature(root / name / "SKILL.md")) for name in entries
+            )
+        items.extend(
+            (relative_path, _stat_signature(workspace_root / relative_path))
+            for relative_path in workspace_memory_candidates()
+        )
+        return tuple(items)
+
     def build_context(
         self,
         *,
@@ -212,6 +307,7 @@ class ContextBuilder:
         history_messages: list[ContextMessage] | None = None,
         tool_messages: list[ContextMessage] | None = None,
         protected_messages: list[ContextMessage] | None = None,
+        capabilities: ModelCapabilities | None = None,
     ) -> list[ContextMessage]:
         """Build ordered context and apply budget policy.
 
@@ -221,7 +317,15 @@ class ContextBuilder:
         3. History messages
         4. Tool messages
         5. Protected messages, usually the active user turn and live tool transcript
+
+        ``capabilities`` of the target model may override the image cost
+        formula via ``image_token_model``.
         """
+        self._active_image_token_model = (
+            capabilities.image_token_model
+            if capabilities is not None and capabilities.image_token_model
+            else self.image_token_model
+        )
         prefix_messages: list[ContextMessage] = [
             ContextMessage(
                 role="system",
@@ -231,11 +335,7 @@ class ContextBuilder:
         ]
 
         if workspace_root is not None:
-            prefix_messages.extend(self.load_workspace_instructions(workspace_root))
-            prefix_messages.extend(self.load_workspace_skills(workspace_root))
-            memory_message = self.load_workspace_memory(workspace_root)
-            if memory_message is not None:
-                prefix_messages.append(memory_message)
+            prefix_messages.extend(self._workspace_prefix(workspace_root))
 
         optional_messages = [*(history_messages or []), *(tool_messages or [])]
         protected = list(protected_messages or [])
@@ -684,8 +784,14 @@ class ContextBuilder:
         truncation_marker: str = "",
         allow_empty: bool = False,
     ) -> ContextMessage | None:
-        """Trim a message content to fit a remaining token budget."""
-        overhead_tokens = self._estimate_tokens([replace(message, content="")])
+        """Trim a message content to fit a remaining token budget.
+
+        The fixed per-message overhead is subtracted once and the content
+        prefix is sized against the remainder, so probes only tokenize the
+        candidate content. Tokenizers that are not additive across the
+        content boundary fall back to probing the full serialized message.
+        """
+        overhead_tokens = self._message_overhead_tokens(message)
         if remaining_budget_tokens < overhead_tokens:
             return None
         if not allow_empty and remaining_budget_tokens <= overhead_tokens + 4:
@@ -695,28 +801,90 @@ class ContextBuilder:
         if not content:
             return message
 
-        low = 0
-        high = len(content)
-        best: str | None = None
-
-        while low <= high:
-            mid = (low + high) // 2
-            candidate_content = content[:mid]
-            if truncation_marker and mid < len(content):
-                candidate_content += truncation_marker
-            candidate = replace(message, content=candidate_content)
-            size = self._estimate_tokens([candidate])
-            if size <= remaining_budget_tokens:
-                best = candidate_content
-                low = mid + 1
-            else:
-                high = mid - 1
+        best = self._longest_content_prefix(
+            content,
+            lambda candidate: self.tokenizer.count_tokens(candidate),
+            remaining_budget_tokens - overhead_tokens,
+            truncation_marker=truncation_marker,
+        )
+        if best is not None:
+            truncated = replace(message, content=best)
+            if self._estimate_tokens([truncated]) > remaining_budget_tokens:
+                best = self._longest_content_prefix(
+                    content,
+                    lambda candidate: self._estimate_tokens(
+                        [replace(message, content=candidate)]
+                    ),
+                    remaining_budget_tokens,
+                    truncation_marker=truncation_marker,
+                )
 
         if best is None or (best == "" and not allow_empty):
             return None
 
         return replace(message, content=best)
 
+    @staticmethod
+    def _longest_content_prefix(
+        content: str,
+        measure: Callable[[str], int],
+        budget_tokens: int,
+        *,
+        truncation_marker: str,
+    ) -> str | None:
+        """Find the longest content prefix whose measure fits the budget.
+
+        The first probe is placed proportionally to the full content's token
+        count, then the search gallops outward to bracket the boundary and
+        bisects inside it. Assumes ``measure`` is monotonic in prefix length.
+        """
+        length = len(content)
+
+        def candidate(size: int) -> str:
+            if truncation_marker and size < length:
+                return content[:size] + truncation_marker
+            return content[:size]
+
+        def fits(size: int) -> bool:
+            return measure(candidate(size)) <= budget_tokens
+
+        full_tokens = measure(content)
+        if full_tokens <= budget_tokens:
+            return content
+
+        guess = length * max(budget_tokens, 0) // full_tokens if full_tokens else 0
+        guess = min(max(guess, 0), length - 1)
+        step = max(16, length // 256)
+        if fits(guess):
+            low, high = guess, length
+            probe = guess + step
+            while probe < high and fits(probe):
+                low = probe
+                step *= 2
+                probe = low + step
+            high = min(probe, high)
+        else:
+            low, high = -1, guess
+            probe = guess - step
+            while probe > 0 and not fits(probe):
+                high = probe
+                step *= 2
+                probe = high - step
+            if probe <= 0:
+                if not fits(0):
+                    return None
+                probe = 0
+            low = probe
+
+        # Invariant: fits(low) and not fits(high).
+        while high - low > 1:
+            mid = (low + high) // 2
+            if fits(mid):
+                low = mid
+            else:
+                high = mid
+        return candidate(low)
+
     def _fit_summary_with_window(
         self,
         *,
@@ -728,23 +896,30 @@ class ContextBuilder:
         """Try to include summary by dropping oldest retained dynamic messages."""
         suffix = list(suffix_messages or [])
         candidate_groups = self._tool_transcript_groups(windowed_dynamic)
+        fixed_tokens = self._estimate_tokens(
+            [*prefix_messages, summary_message, *suffix]
+        )
+        group_tokens = [self._estimate_tokens(group) for group in candidate_groups]
+        dynamic_tokens = sum(group_tokens)
+        start = 0
         while True:
-            candidate_dynamic = [
-                message for group in candidate_groups for message in group
-            ]
-            candidate = [
-                *prefix_messages,
-                summary_message,
-                *candidate_dynamic,
-                *suffix,
-            ]
-            if self._estimate_tokens(candidate) <= self.budget.usable_tokens:
-                return candidate
-            if not candidate_groups:
+            if fixed_tokens + dynamic_tokens <= self.budget.usable_tokens:
+                return [
+                    *prefix_messages,
+                    summary_message,
+                    *(
+                        message
+                        for group in candidate_groups[start:]
+                        for message in group
+                    ),
+                    *suffix,
+                ]
+            if start >= len(candidate_groups):
                 return None
-            if self._is_tool_transcript_group(candidate_groups[0]):
+            if self._is_tool_transcript_group(candidate_groups[start]):
                 return None
-            candidate_groups = candidate_groups[1:]
+            dynamic_tokens -= group_tokens[start]
+            start += 1
 
     def _is_tool_transcript_group(self, group: list[ContextMessage]) -> bool:
         return any(message.role == "tool" for message in group) or any(
@@ -754,29 +929,74 @@ class ContextBuilder:
     def _estimate_tokens(self, messages: list[ContextMessage]) -> int:
         """Estimate context size using configured tokenizer strategy.
 
-        TODO: Metadata JSON is re-serialized on every call. The binary-search
-        truncation path calls this repeatedly for the same messages. Cache the
-        serialized form on ContextMessage or compute metadata overhead once.
+        Per-message counts are memoized, first by message identity and then by
+        a digest of the serialized form, so repeated window and summary probes
+        over the same history only tokenize each message once.
         """
-        total = 0
-        for message in messages:
-            metadata_serialized = (
-                json.dumps(message.metadata, sort_keys=True)
-                if message.metadata is not None
-                else ""
+        return sum(self._message_tokens(message) for message in messages)
+
+    def _message_tokens(self, message: ContextMessage) -> int:
+        return self._message_text_tokens(message) + self._image_tokens(message)
+
+    def _message_text_tokens(self, message: ContextMessage) -> int:
+        cached = self._token_cache.get_by_identity(message)
+        if cached is not None:
+            return cached
+
+        serialized = self._serialize_for_budget(message, message.content)
+        if not self._token_cache.max_entries:
+            return self.tokenizer.count_tokens(serialized)
+        digest = hashlib.blake2b(
+            serialized.encode("utf-8", "surrogatepass"), digest_size=16
+        ).digest()
+        tokens = self._token_cache.get_by_digest(digest)
+        if tokens is None:
+            tokens = self.tokenizer.count_tokens(serialized)
+        self._token_cache.put(message, digest, tokens)
+        return tokens
+
+    def _image_tokens(self, message: ContextMessage) -> int:
+        """Charge image parts by pixel size instead of tokenizing their payload."""
+        if not message.parts:
+            return 0
+        return sum(
+            estimate_image_tokens(
+                part.width, part.height, model=self._active_image_token_model
             )
-            parts_serialized = self._serialize_parts_for_budget(message)
-            reasoning_serialized = self._serialize_reasoning_for_budget(message)
-            serialized = (
-                f"role:{message.role}\n"
-                f"source:{message.source}\n"
-                f"content:{message.content}\n"
-                f"{reasoning_serialized}"
-                f"parts:{parts_serialized}\n"
-                f"metadata:{metadata_serialized}"
+            for part in message.parts
+            if part.type in IMAGE_PART_TYPES
+        )
+
+    def _message_overhead_tokens(self, message: ContextMessage) -> int:
+        """Tokens a message costs with empty content (role, metadata, parts)."""
+        cached = self._token_cache.get_overhead(message)
+        if cached is None:
+            cached = self.tokenizer.count_tokens(
+                self._serialize_for_budget(message, "")
             )
-            total += self.tokenizer.count_tokens(serialized)
-        return total
+            self._token_cache.put_overhead(message, cached)
+        return cached + self._image_tokens(message)
+
+    def _serialize_for_budget(self, message: ContextMessage, content: str) -> str:
+        metadata_serialized = (
+            json.dumps(message.metadata, sort_keys=True)
+            if message.metadata is not None
+            else ""
+        )
+        parts_serialized = self._serialize_parts_for_budget(message)
+        reasoning_serialized = self._serialize_reasoning_for_budget(message)
+        return (
+            f"role:{message.role}\n"
+            f"source:{message.source}\n"
+            f"content:{content}\n"
+            f"{reasoning_serialized}"
+            f"parts:{parts_serialized}\n"
+            f"metadata:{metadata_serialized}"
+        )
+
+    def token_cache_stats(self) -> dict[str, int]:
+        """Return hit/miss counters for the per-message token memo."""
+        return self._token_cache.stats()
 
     @staticmethod
     def _serialize_reasoning_for_budget(message: ContextMessage) -> str:
@@ -792,6 +1012,11 @@ class ContextBuilder:
         return "\n".join(parts) + "\n"
 
     def _serialize_parts_for_budget(self, message: ContextMessage) -> str:
+        """Serialize parts for text tokenization.
+
+        Raw image ``data`` is never included; image parts are charged
+        separately by :meth:`_image_tokens`.
+        """
         if not message.parts:
             return ""
         return json.dumps(
@@ -800,7 +1025,6 @@ class ContextBuilder:
                     "type": part.type,
                     "text": part.text,
                     "url": part.url,
-                    "data": part.data,
                     "mime_type": part.mime_type,
                     "media_id": part.media_id,
                 }
@@ -856,3 +1080,104 @@ class ContextBuilder:
         if not isinstance(parsed, dict):
             return {}, raw
         return {str(key): value for key, value in parsed.items()}, body.lstrip()
+
+
+class _MessageTokenCache:
+    """Bounded LRU memo of per-message token counts.
+
+    Messages are frozen, so the identity layer maps ``id(message)`` to its
+    counts. It holds only a weak reference to each message, which both
+    guards against id reuse and lets large messages (base64 image parts)
+    be freed; entries are dropped when their message is collected. The
+    digest layer survives across builds, where history messages are
+    rebuilt from storage as new objects with identical content.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._by_identity: OrderedDict[
+            int, tuple[weakref.ref[ContextMessage], int, int | None]
+        ] = OrderedDict()
+        self._by_digest: OrderedDict[bytes, int] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_by_identity(self, message: ContextMessage) -> int | None:
+        entry = self._lookup(message)
+        if entry is None:
+            return None
+        self._by_identity.move_to_end(id(message))
+        self.hits += 1
+        return entry[1]
+
+    def get_by_digest(self, digest: bytes) -> int | None:
+        tokens = self._by_digest.get(digest)
+        if tokens is None:
+            self.misses += 1
+            return None
+        self._by_digest.move_to_end(digest)
+        self.hits += 1
+        return tokens
+
+    def put(self, message: ContextMessage, digest: bytes, tokens: int) -> None:
+        if self.max_entries <= 0:
+            return
+        key = id(message)
+        entry = self._lookup(message)
+        ref = entry[0] if entry is not None else self._ref(message)
+        self._by_identity[key] = (ref, tokens, None)
+        self._by_identity.move_to_end(key)
+        self._by_digest[digest] = tokens
+        self._by_digest.move_to_end(digest)
+        self._evict()
+
+    def get_overhead(self, message: ContextMessage) -> int | None:
+        entry = self._lookup(message)
+        return entry[2] if entry is not None else None
+
+    def put_overhead(self, message: ContextMessage, overhead: int) -> None:
+        entry = self._lookup(message)
+        if entry is None:
+            return
+        self._by_identity[id(message)] = (entry[0], entry[1], overhead)
+
+    def _lookup(
+        self, message: ContextMessage
+    ) -> tuple[weakref.ref[ContextMessage], int, int | None] | None:
+        entry = self._by_identity.get(id(message))
+        if entry is None or entry[0]() is not message:
+            return None
+        return entry
+
+    def _ref(self, message: ContextMessage) -> weakref.ref[ContextMessage]:
+        key = id(message)
+        identity = self._by_identity
+
+        def _drop(ref: weakref.ref[ContextMessage]) -> None:
+            entry = identity.get(key)
+            if entry is not None and entry[0] is ref:
+                del identity[key]
+
+        return weakref.ref(message, _drop)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "identity_entries": len(self._by_identity),
+            "digest_entries": len(self._by_digest),
+        }
+
+    def _evict(self) -> None:
+        while len(self._by_identity) > self.max_entries:
+            self._by_identity.popitem(last=False)
+        while len(self._by_digest) > self.max_entries:
+            self._by_digest.popitem(last=False)
+
+
+def _stat_signature(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
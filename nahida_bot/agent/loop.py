@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import json
 import time
 from abc import ABC, abstractmethod
@@ -17,11 +18,20 @@ from nahida_bot.agent.context import ContextBuilder, ContextMessage, ContextPart
 from nahida_bot.agent.metrics import MetricsCollector, Trace
 from nahida_bot.agent.providers import (
     ChatProvider,
+    ModelCapabilities,
     ProviderError,
     ProviderResponse,
+    ProviderStreamDelta,
     ToolCall,
     ToolDefinition,
 )
+from nahida_bot.agent.providers.ratelimit import (
+    ProviderRateLimiter,
+    RateLimitPermit,
+    backoff_delay,
+    estimate_request_tokens,
+    provider_rate_limiter,
+)
 
 logger = structlog.get_logger(__name__)
 
@@ -84,9 +94,11 @@ class AgentLoopConfig:
     provider_timeout_seconds: float = 30.0
     retry_attempts: int = 2
     retry_backoff_seconds: float = 0.2
+    retry_backoff_max_seconds: float = 20.0
     tool_timeout_seconds: float = 135.0
     tool_retry_attempts: int = 1
     tool_retry_backoff_seconds: float = 0.1
+    max_parallel_tools: int = 4
     max_tool_log_chars: int = 400
     tool_use_system_prompt: str = (
         "Tool use policy: When a tool is needed, call it through the structured "
@@ -113,9 +125,25 @@ class AgentRunResult:
 
 @dataclass(slots=True, frozen=True)
 class LoopEvent:
-    """Streaming event emitted during agent loop execution."""
-
-    type: Literal["text", "tool_start", "tool_end", "done"]
+    """Streaming event emitted during agent loop execution.
+
+    ``text_delta`` / ``reasoning_delta`` / ``tool_call_delta`` events carry
+    incremental provider output while a step is still generating; the
+    complete step output follows in a regular ``text`` event. ``delta_reset``
+    tells consumers to discard deltas from a provider attempt that failed and
+    is being retried.
+    """
+
+    type: Literal[
+        "text",
+        "text_delta",
+        "reasoning_delta",
+        "tool_call_delta",
+        "delta_reset",
+        "tool_start",
+        "tool_end",
+        "done",
+    ]
     text: str | None = None
     reasoning: str | None = None
     tool_names: list[str] | None = None
@@ -159,6 +187,7 @@ class AgentLoop:
         context_builder: ContextBuilder | None = None,
         model: str | None = None,
         stop_event: asyncio.Event | None = None,
+        capabilities: ModelCapabilities | None = None,
     ) -> AgentRunResult:
         """Run the agent loop until terminal assistant response is produced.
 
@@ -166,6 +195,7 @@ class AgentLoop:
             provider: Override provider for this call only.
             context_builder: Override context builder for this call only.
             model: Override model name for this call only.
+            capabilities: Capabilities of the target model, used for budgeting.
         """
         async for event in self.run_stream(
             user_message=user_message,
@@ -178,6 +208,7 @@ class AgentLoop:
             context_builder=context_builder,
             model=model,
             stop_event=stop_event,
+            capabilities=capabilities,
         ):
             if event.type == "done":
                 return AgentRunResult(
@@ -203,6 +234,7 @@ class AgentLoop:
         context_builder: ContextBuilder | None = None,
         model: str | None = None,
         stop_event: asyncio.Event | None = None,
+        capabilities: ModelCapabilities | None = None,
     ) -> AsyncIterator[LoopEvent]:
         """Run the agent loop, yielding :class:`LoopEvent` as progress happens.
 
@@ -271,6 +303,7 @@ class AgentLoop:
                     workspace_root=workspace_root,
                     history_messages=history,
                     protected_messages=active_turn_messages,
+                    capabilities=capabilities,
                 )
                 logger.debug(
                     "agent_loop.context_built",
@@ -282,14 +315,21 @@ class AgentLoop:
                     model_override=model or "",
                 )
 
-                response = await self._call_provider_with_retry(
+                response: ProviderResponse | None = None
+                async for item in self._stream_provider_with_retry(
                     messages=prompt_messages,
                     tools=tools,
                     step=step,
                     trace=trace,
                     provider=active_provider,
                     model=model,
-                )
+                ):
+                    if isinstance(item, ProviderResponse):
+                        response = item
+                    else:
+                        yield item
+                if response is None:
+                    raise RuntimeError("Provider stream produced no response")
 
                 assistant_message = self._build_assistant_message(response)
                 if assistant_message is not None:
@@ -426,7 +466,7 @@ class AgentLoop:
             return system_prompt
         return f"{system_prompt.rstrip()}\n\n{self.config.tool_use_system_prompt}"
 
-    async def _call_provider_with_retry(
+    async def _stream_provider_with_retry(
         self,
         *,
         messages: list[ContextMessage],
@@ -435,12 +475,15 @@ class AgentLoop:
         trace: Trace | None = None,
         provider: ChatProvider | None = None,
         model: str | None = None,
-    ) -> ProviderResponse:
+    ) -> AsyncIterator[LoopEvent | ProviderResponse]:
+        """Call the provider, yielding delta events and finally the response."""
         active_provider = provider or self.provider
+        limiter = provider_rate_limiter(active_provider)
         attempts = 0
         while True:
             attempts += 1
             t0 = time.monotonic()
+            emitted_deltas = False
             try:
                 effective_model = model or getattr(active_provider, "model", "")
                 logger.debug(
@@ -458,12 +501,25 @@ class AgentLoop:
                     roles=[m.role for m in messages],
                     sources=[m.source for m in messages],
                 )
-                response = await active_provider.chat(
-                    messages=messages,
-                    tools=tools,
-                    timeout_seconds=self.config.provider_timeout_seconds,
-                    model=model,
-                )
+                response: ProviderResponse | None = None
+                async with self._provider_permit(limiter, messages) as permit:
+                    async for delta in active_provider.chat_stream(
+                        messages=messages,
+                        tools=tools,
+                        timeout_seconds=self.config.provider_timeout_seconds,
+                        model=model,
+                    ):
+                        if delta.type == "response":
+                            response = delta.response
+                            continue
+                        event = self._delta_event(delta)
+                        if event is not None:
+                            emitted_deltas = True
+                            yield event
+                    if response is None:
+                        raise RuntimeError("Provider stream ended without a response")
+                    if permit is not None and response.usage is not None:
+                        permit.record_usage(response.usage.total)
                 logger.debug(
                     "agent_loop.provider_call_done",
                     trace_id=trace.trace_id if trace else "",
@@ -484,7 +540,8 @@ class AgentLoop:
                     self.metrics.record_provider_call(
                         trace, step=step, latency_seconds=time.monotonic() - t0
                     )
-                return response
+                yield response
+                return
             except ProviderError as exc:
                 if trace is not None and self.metrics is not None:
                     self.metrics.record_provider_call(
@@ -494,7 +551,16 @@ class AgentLoop:
                         error_code=exc.code,
                         retryable=exc.retryable,
                     )
-                can_retry = exc.retryable and attempts <= self.config.retry_attempts
+                can_retry = (
+                    exc.retryable
+                    and attempts <= self.config.retry_attempts
+                    # A server asking for a longer pause than we are willing
+                    # to wait fails fast instead of holding the run open.
+                    and (
+                        exc.retry_after is None
+                        or exc.retry_after <= self.config.retry_backoff_max_seconds
+                    )
+                )
                 logger.warning(
                     "agent_loop.provider_call_failed",
                     trace_id=trace.trace_id if trace else "",
@@ -505,11 +571,43 @@ class AgentLoop:
                     attempt=attempts,
                     error_code=exc.code,
                     retryable=exc.retryable,
+                    retry_after=exc.retry_after,
                     will_retry=can_retry,
                 )
                 if not can_retry:
                     raise
-                await asyncio.sleep(self.config.retry_backoff_seconds)
+                if emitted_deltas:
+                    yield LoopEvent(type="delta_reset")
+                await asyncio.sleep(
+                    backoff_delay(
+                        attempts,
+                        base=self.config.retry_backoff_seconds,
+                        cap=self.config.retry_backoff_max_seconds,
+                        retry_after=exc.retry_after,
+                    )
+                )
+
+    @staticmethod
+    def _provider_permit(
+        limiter: ProviderRateLimiter | None, messages: list[ContextMessage]
+    ) -> contextlib.AbstractAsyncContextManager[RateLimitPermit | None]:
+        if limiter is None:
+            return contextlib.nullcontext()
+        return limiter.permit(estimated_tokens=estimate_request_tokens(messages))
+
+    @staticmethod
+    def _delta_event(delta: ProviderStreamDelta) -> LoopEvent | None:
+        if delta.type == "text" and delta.text:
+            return LoopEvent(type="text_delta", text=delta.text)
+        if delta.type == "reasoning" and delta.text:
+            return LoopEvent(type="reasoning_delta", reasoning=delta.text)
+        if delta.type == "tool_call":
+            return LoopEvent(
+                type="tool_call_delta",
+                text=delta.text or None,
+                tool_names=[delta.tool_name] if delta.tool_name else None,
+            )
+        return None
 
     def _log_terminal_without_tool_calls(
         self,
@@ -717,37 +815,101 @@ class AgentLoop:
         step: int = 0,
         trace: Trace | None = None,
     ) -> list[ContextMessage]:
-        messages: list[ContextMessage] = []
+        """Execute one step's tool calls, running independent calls concurrently.
+
+        Consecutive non-serial calls form a batch that runs with at most
+        ``max_parallel_tools`` in flight; a serial tool runs alone as a
+        barrier. Tool messages are returned in the provider's call order.
+        """
+        messages: list[ContextMessage | None] = [None] * len(response.tool_calls)
+        runnable: list[tuple[int, ToolCall]] = []
 
         definitions = self._index_tools(tools)
-        for tool_call in response.tool_calls:
+        for index, tool_call in enumerate(response.tool_calls):
             validation_error = self._validate_tool_call(
                 tool_call=tool_call,
                 definitions=definitions,
             )
             if validation_error is not None:
-                messages.append(
-                    self._build_tool_message(
-                        tool_call=tool_call,
-                        phase="prepare_failed",
-                        attempt=0,
-                        result=validation_error,
-                    )
+                messages[index] = self._build_tool_message(
+                    tool_call=tool_call,
+                    phase="prepare_failed",
+                    attempt=0,
+                    result=validation_error,
                 )
                 continue
+            runnable.append((index, tool_call))
 
-            result, attempt, phase = await self._execute_tool_with_lifecycle(
-                tool_call, step=step, trace=trace
-            )
-            messages.append(
-                self._build_tool_message(
-                    tool_call=tool_call,
-                    phase=phase,
-                    attempt=attempt,
-                    result=result,
+        semaphore = asyncio.Semaphore(max(1, self.config.max_parallel_tools))
+
+        async def _run(index: int, tool_call: ToolCall) -> float:
+            async with semaphore:
+                t0 = time.monotonic()
+                result, attempt, phase = await self._execute_tool_with_lifecycle(
+                    tool_call, step=step, trace=trace
                 )
+                elapsed = time.monotonic() - t0
+            messages[index] = self._build_tool_message(
+                tool_call=tool_call,
+                phase=phase,
+                attempt=attempt,
+                result=result,
+            )
+            return elapsed
+
+        for batch in self._tool_batches(runnable, definitions):
+            if len(batch) == 1:
+                await _run(*batch[0])
+                continue
+
+            t0 = time.monotonic()
+            async with asyncio.TaskGroup() as group:
+                tasks = [group.create_task(_run(*item)) for item in batch]
+            wall_seconds = time.monotonic() - t0
+            sequential_seconds = sum(task.result() for task in tasks)
+            logger.debug(
+                "agent_loop.tool_batch_done",
+                trace_id=trace.trace_id if trace else "",
+                step=step,
+                tool_count=len(batch),
+                max_parallel_tools=self.config.max_parallel_tools,
+                wall_seconds=round(wall_seconds, 3),
+                sequential_seconds=round(sequential_seconds, 3),
             )
-        return messages
+            if trace is not None and self.metrics is not None:
+                self.metrics.record_tool_batch(
+                    trace,
+                    step=step,
+                    tool_count=len(batch),
+                    wall_seconds=wall_seconds,
+                    sequential_seconds=sequential_seconds,
+                )
+
+        return [message for message in messages if message is not None]
+
+    def _tool_batches(
+        self,
+        runnable: list[tuple[int, ToolCall]],
+        definitions: dict[str, ToolDefinition],
+    ) -> list[list[tuple[int, ToolCall]]]:
+        """Split validated calls into order-preserving execution batches."""
+        if self.config.max_parallel_tools <= 1:
+            return [[item] for item in runnable]
+
+        batches: list[list[tuple[int, ToolCall]]] = []
+        current: list[tuple[int, ToolCall]] = []
+        for item in runnable:
+            definition = definitions.get(item[1].name)
+            if definition is not None and definition.serial:
+                if current:
+                    batches.append(current)
+                    current = []
+                batches.append([item])
+            else:
+                current.append(item)
+        if current:
+            batches.append(current)
+        return batches
 
     async def _execute_tool_with_lifecycle(
         self,
@@ -1,145 +1,367 @@
-"""On-disk media cache with TTL-based expiry."""
+"""On-disk media cache with TTL expiry and a byte budget."""
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import json
+import os
 import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
 
 import aiofiles
 import aiofiles.os
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_MEDIA_CACHE_MAX_BYTES = 512 * 1024 * 1024
+MANIFEST_NAME = "manifest.jsonl"
+_TMP_SUFFIX = ".tmp"
+_MIN_COMPACT_RECORDS = 1024
+
+
+@dataclass(slots=True)
+class _Entry:
+    name: str
+    size: int
+    cached_at: float
 
 
 class MediaCache:
     """Disk-backed cache for downloaded media artifacts.
 
-    Each entry is stored as a file named by the SHA-256 hex digest of its
-    cache key, with a companion ``.<hash>_meta.json`` storing the original
-    URL and cached timestamp for TTL tracking.
+    Each entry is a file named by the SHA-256 hex digest of its cache key,
+    stored under a two-character shard directory (``ab/abcdef….jpg``).
+    An in-memory index ordered by last access makes lookups O(1); it is
+    rebuilt on startup from ``manifest.jsonl``, an append-only journal of
+    puts and removals that is compacted once it grows well past the number
+    of live entries. Without a manifest (first run or an older cache
+    layout) the index is rebuilt from a single walk of the shard
+    directories.
+
+    TTLs use wall-clock timestamps so they survive restarts. When
+    ``max_bytes`` is positive, least recently used entries are evicted
+    after each write until the cache fits the budget. Files are written to
+    a temporary name and renamed into place, so concurrent fills of the
+    same key never expose a partial file.
+
+    A ``variant`` (for example a downscaled copy) is stored as its own
+    entry next to the original, as ``<hash>-<variant><suffix>`` in the same
+    shard directory.
     """
 
-    def __init__(self, cache_dir: str | Path, *, ttl_seconds: int = 3600) -> None:
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        *,
+        ttl_seconds: int = 3600,
+        max_bytes: int = DEFAULT_MEDIA_CACHE_MAX_BYTES,
+    ) -> None:
         self._dir = Path(cache_dir)
         self._ttl = ttl_seconds
+        self.max_bytes = max(0, max_bytes)
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._total_bytes = 0
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+        self._manifest_lock = asyncio.Lock()
+        self._manifest_records = 0
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    @property
+    def manifest_path(self) -> Path:
+        return self._dir / MANIFEST_NAME
 
     async def ensure_dir(self) -> None:
         """Create cache directory if it does not exist."""
         await aiofiles.os.makedirs(str(self._dir), exist_ok=True)
 
-    async def get(self, cache_key: str) -> str | None:
+    async def get(self, cache_key: str, *, variant: str = "") -> str | None:
         """Return cached file path if present and not expired, else ``None``."""
-        hashed = self._hash_key(cache_key)
-        entry = self._find_entry(hashed)
+        await self._ensure_loaded()
+        hashed = self._hash_key(cache_key, variant)
+        entry = self._entries.get(hashed)
         if entry is None:
+            self.misses += 1
             return None
-
-        meta = await self._read_meta(cache_key)
-        if meta is None:
-            await self._remove_entry(cache_key)
-            return None
-
-        cached_at = meta.get("cached_at", 0.0)
-        if time.monotonic() - cached_at >= self._ttl:
-            await self._remove_entry(cache_key)
+        if self._is_expired(entry, time.time()):
+            self.misses += 1
+            self.expired += 1
+            await self._remove(hashed)
             return None
+        self._entries.move_to_end(hashed)
+        self.hits += 1
+        return str(self._path_for(entry.name))
 
-        return str(entry)
-
-    async def put(self, cache_key: str, data: bytes, suffix: str = "") -> str:
+    async def put(
+        self, cache_key: str, data: bytes, suffix: str = "", *, variant: str = ""
+    ) -> str:
         """Write data to cache and return the file path."""
-        await self.ensure_dir()
-        entry = self._entry_path(cache_key, suffix=suffix)
-        async with aiofiles.open(str(entry), "wb") as f:
-            await f.write(data)
+        await self._ensure_loaded()
+        hashed = self._hash_key(cache_key, variant)
+        name = f"{hashed}{suffix}"
+        path = self._path_for(name)
+        await aiofiles.os.makedirs(str(path.parent), exist_ok=True)
+        tmp_path = path.with_name(f".{name}.{uuid.uuid4().hex}{_TMP_SUFFIX}")
+        try:
+            async with aiofiles.open(str(tmp_path), "wb") as f:
+                await f.write(data)
+            await aiofiles.os.replace(str(tmp_path), str(path))
+        except OSError:
+            await self._unlink(tmp_path)
+            raise
 
-        await self._write_meta(cache_key, {"cached_at": time.monotonic()})
-        return str(entry)
+        previous = self._entries.pop(hashed, None)
+        if previous is not None:
+            self._total_bytes -= previous.size
+            if previous.name != name:
+                await self._unlink(self._path_for(previous.name))
+        entry = _Entry(name=name, size=len(data), cached_at=time.time())
+        self._entries[hashed] = entry
+        self._total_bytes += entry.size
+        await self._append_manifest(
+            {
+                "op": "put",
+                "key": hashed,
+                "name": name,
+                "size": entry.size,
+                "at": entry.cached_at,
+            }
+        )
+        await self._evict_to_budget(keep=hashed)
+        return str(path)
 
     async def invalidate(self, cache_key: str) -> None:
-        """Remove a cached entry and its metadata."""
-        await self._remove_entry(cache_key)
+        """Remove a cached entry."""
+        await self._ensure_loaded()
+        await self._remove(self._hash_key(cache_key))
 
     async def cleanup_expired(self) -> int:
         """Remove all expired entries. Returns count of removed items."""
-        if not self._dir.exists():
-            return 0
+        await self._ensure_loaded()
+        now = time.time()
+        expired = [
+            hashed
+            for hashed, entry in self._entries.items()
+            if self._is_expired(entry, now)
+        ]
+        for hashed in expired:
+            await self._remove(hashed)
+        self.expired += len(expired)
+        return len(expired)
 
-        removed = 0
-        now = time.monotonic()
-        for meta_file in self._dir.glob("*_meta.json"):
-            try:
-                async with aiofiles.open(str(meta_file), "r", encoding="utf-8") as f:
-                    raw = await f.read()
-                meta = json.loads(raw)
-                cached_at = meta.get("cached_at", 0.0)
-                if now - cached_at >= self._ttl:
-                    stem = meta_file.stem.removesuffix("_meta")
-                    await self._remove_entry_by_stem(stem)
-                    removed += 1
-            except (json.JSONDecodeError, OSError, ValueError):
-                stem = meta_file.stem.removesuffix("_meta")
-                await self._remove_entry_by_stem(stem)
-                removed += 1
-                continue
-        for entry in self._dir.iterdir():
-            if entry.name.endswith("_meta.json"):
-                continue
-            stem = entry.stem if entry.suffix else entry.name
-            meta_file = self._dir / f"{stem}_meta.json"
-            if not meta_file.exists():
-                await self._remove_entry_by_stem(stem)
-                removed += 1
-        return removed
+    async def rebuild(self) -> int:
+        """Rebuild the index and manifest from the files on disk.
+
+        Files left behind by an older flat cache layout and interrupted
+        writes are deleted. Returns the number of entries indexed.
+        """
+        async with self._manifest_lock:
+            entries = await asyncio.to_thread(self._scan_disk)
+            self._replace_index(entries)
+            await self._write_manifest_snapshot()
+        self._loaded = True
+        logger.info(
+            "media_cache.rebuilt",
+            entries=len(self._entries),
+            bytes=self._total_bytes,
+        )
+        return len(self._entries)
+
+    async def close(self) -> None:
+        """Persist the current index, including LRU order, to the manifest."""
+        if not self._loaded:
+            return
+        async with self._manifest_lock:
+            await self._write_manifest_snapshot()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "expired": self.expired,
+            "evictions": self.evictions,
+        }
 
     # -- internal helpers ------------------------------------------------
 
-    def _hash_key(self, cache_key: str) -> str:
-        return hashlib.sha256(cache_key.encode()).hexdigest()
+    def _hash_key(self, cache_key: str, variant: str = "") -> str:
+        hashed = hashlib.sha256(cache_key.encode()).hexdigest()
+        return f"{hashed}-{variant}" if variant else hashed
+
+    def _path_for(self, name: str) -> Path:
+        return self._dir / name[:2] / name
+
+    def _is_expired(self, entry: _Entry, now: float) -> bool:
+        return now - entry.cached_at >= self._ttl
 
-    def _entry_path(self, cache_key: str, *, suffix: str = "") -> Path:
-        hashed = self._hash_key(cache_key)
-        return self._dir / f"{hashed}{suffix}"
+    async def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if self._loaded:
+                return
+            await self.ensure_dir()
+            entries = await asyncio.to_thread(self._read_manifest)
+            if entries is None:
+                await self.rebuild()
+                return
+            self._replace_index(entries)
+            self._loaded = True
 
-    def _find_entry(self, hashed: str) -> Path | None:
-        """Find a cache entry file by hash prefix, skipping meta files."""
-        if not self._dir.exists():
+    def _replace_index(self, entries: list[tuple[str, _Entry]]) -> None:
+        self._entries = OrderedDict(entries)
+        self._total_bytes = sum(entry.size for entry in self._entries.values())
+
+    def _read_manifest(self) -> list[tuple[str, _Entry]] | None:
+        """Replay the manifest journal; ``None`` when it is missing or corrupt."""
+        try:
+            lines = self.manifest_path.read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
             return None
-        for path in self._dir.iterdir():
-            name = path.name
-            if name.startswith(hashed) and not name.endswith("_meta.json"):
-                return path
-        return None
-
-    def _meta_path(self, cache_key: str) -> Path:
-        hashed = self._hash_key(cache_key)
-        return self._dir / f"{hashed}_meta.json"
-
-    async def _read_meta(self, cache_key: str) -> dict | None:
-        meta_path = self._meta_path(cache_key)
-        if not meta_path.exists():
+        except OSError as exc:
+            logger.warning("media_cache.manifest_unreadable", error=str(exc))
             return None
+        entries: OrderedDict[str, _Entry] = OrderedDict()
+        for index, line in enumerate(lines):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                hashed = record["key"]
+                if record["op"] == "put":
+                    entries.pop(hashed, None)
+                    entries[hashed] = _Entry(
+                        name=str(record["name"]),
+                        size=int(record["size"]),
+                        cached_at=float(record["at"]),
+                    )
+                elif record["op"] == "del":
+                    entries.pop(hashed, None)
+            except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                # A torn final line from a crash mid-append is expected;
+                # anything else means the index cannot be trusted.
+                if index == len(lines) - 1:
+                    continue
+                logger.warning("media_cache.manifest_corrupt")
+                return None
+        self._manifest_records = len(lines)
+        return list(entries.items())
+
+    def _scan_disk(self) -> list[tuple[str, _Entry]]:
+        found: list[tuple[float, str, _Entry]] = []
+        for child in self._dir.iterdir():
+            if child.name == MANIFEST_NAME:
+                continue
+            if not child.is_dir():
+                # Legacy flat layout: ``<hash><suffix>`` plus ``_meta.json``.
+                _unlink_quietly(child)
+                continue
+            if len(child.name) != 2:
+                continue
+            for path in child.iterdir():
+                name = path.name
+                if name.startswith(".") or not name.startswith(child.name):
+                    _unlink_quietly(path)
+                    continue
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                hashed = name.split(".", 1)[0]
+                found.append(
+                    (
+                        stat.st_mtime,
+                        hashed,
+                        _Entry(name=name, size=stat.st_size, cached_at=stat.st_mtime),
+                    )
+                )
+        found.sort(key=lambda item: item[0])
+        return [(hashed, entry) for _, hashed, entry in found]
+
+    async def _remove(self, hashed: str) -> None:
+        entry = self._entries.pop(hashed, None)
+        if entry is None:
+            return
+        self._total_bytes -= entry.size
+        await self._unlink(self._path_for(entry.name))
+        await self._append_manifest({"op": "del", "key": hashed})
+
+    async def _evict_to_budget(self, *, keep: str) -> None:
+        if self.max_bytes <= 0:
+            return
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            oldest = next(iter(self._entries))
+            if oldest == keep:
+                break
+            await self._remove(oldest)
+            self.evictions += 1
+
+    async def _append_manifest(self, record: dict[str, Any]) -> None:
+        async with self._manifest_lock:
+            line = json.dumps(record, separators=(",", ":")) + "\n"
+            async with aiofiles.open(
+                str(self.manifest_path), "a", encoding="utf-8"
+            ) as f:
+                await f.write(line)
+            self._manifest_records += 1
+            if self._manifest_records > max(
+                _MIN_COMPACT_RECORDS, 2 * len(self._entries)
+            ):
+                await self._write_manifest_snapshot()
+
+    async def _write_manifest_snapshot(self) -> None:
+        """Rewrite the manifest as one ``put`` per live entry, in LRU order."""
+        lines = [
+            json.dumps(
+                {
+                    "op": "put",
+                    "key": hashed,
+                    "name": entry.name,
+                    "size": entry.size,
+                    "at": entry.cached_at,
+                },
+                separators=(",", ":"),
+            )
+            for hashed, entry in self._entries.items()
+        ]
+        content = "".join(f"{line}\n" for line in lines)
+        await asyncio.to_thread(_atomic_write_text, self.manifest_path, content)
+        self._manifest_records = len(lines)
+
+    @staticmethod
+    async def _unlink(path: Path) -> None:
         try:
-            async with aiofiles.open(str(meta_path), "r", encoding="utf-8") as f:
-                raw = await f.read()
-            return json.loads(raw)
-        except (json.JSONDecodeError, OSError):
-            return None
+            await aiofiles.os.remove(str(path))
+        except OSError:
+            pass
 
-    async def _write_meta(self, cache_key: str, meta: dict) -> None:
-        meta_path = self._meta_path(cache_key)
-        async with aiofiles.open(str(meta_path), "w", encoding="utf-8") as f:
-            await f.write(json.dumps(meta))
 
-    async def _remove_entry(self, cache_key: str) -> None:
-        hashed = self._hash_key(cache_key)
-        await self._remove_entry_by_stem(hashed)
+def _atomic_write_text(path: Path, content: str) -> None:
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}{_TMP_SUFFIX}")
+    try:
+        tmp_path.write_text(content, encoding="utf-8")
+        os.replace(tmp_path, path)
+    except OSError:
+        _unlink_quietly(tmp_path)
+        raise
 
-    async def _remove_entry_by_stem(self, hashed_stem: str) -> None:
-        for path in self._dir.iterdir():
-            name = path.name
-            if name.startswith(hashed_stem):
-                try:
-                    await aiofiles.os.remove(str(path))
-                except OSError:
-                    pass
+
+def _unlink_quietly(path: Path) -> None:
+    try:
+        path.unlink()
+    except OSError:
+        pass
@@ -0,0 +1,74 @@
+"""In-memory LRU of base64-encoded media, shared across turns."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+
+DEFAULT_ENCODED_MEDIA_MEMO_BYTES = 64 * 1024 * 1024
+
+
+@dataclass(slots=True, frozen=True)
+class EncodedMedia:
+    """An image already read, sniffed and base64-encoded."""
+
+    base64_data: str
+    mime_type: str
+    file_size: int
+    width: int = 0
+    height: int = 0
+
+
+class EncodedMediaMemo:
+    """Byte-bounded LRU of :class:`EncodedMedia` keyed by media cache key.
+
+    History turns re-send the same images on every new message and every
+    agent step; the memo lets those lookups skip the disk read, dimension
+    sniffing and base64 encoding. ``max_bytes`` counts the encoded strings;
+    ``0`` disables the memo.
+    """
+
+    def __init__(self, *, max_bytes: int = DEFAULT_ENCODED_MEDIA_MEMO_BYTES) -> None:
+        self.max_bytes = max(0, max_bytes)
+        self._entries: OrderedDict[str, EncodedMedia] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> EncodedMedia | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, media: EncodedMedia) -> None:
+        size = len(media.base64_data)
+        if self.max_bytes <= 0 or size > self.max_bytes:
+            return
+        self.invalidate(key)
+        self._entries[key] = media
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted.base64_data)
+            self.evictions += 1
+
+    def invalidate(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry.base64_data)
+
+    def stats(self) -> dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
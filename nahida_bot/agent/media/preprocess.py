@@ -0,0 +1,217 @@
+"""Optional downscale and re-encode stage for images sent to providers."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import io
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Literal
+
+import structlog
+
+from nahida_bot.agent.tokenization import provider_image_size
+
+logger = structlog.get_logger(__name__)
+
+ImageFormat = Literal["jpeg", "webp"]
+
+_FORMAT_MIME: dict[str, str] = {"jpeg": "image/jpeg", "webp": "image/webp"}
+
+
+@dataclass(slots=True, frozen=True)
+class ImagePreprocessPolicy:
+    """How images are downsized and re-encoded before upload.
+
+    Images are scaled to what the target model actually uses (see
+    :func:`~nahida_bot.agent.tokenization.provider_image_size`), never past
+    ``max_edge`` pixels on the long side, and re-encoded as ``format`` at
+    ``quality``. Images already within bounds and under ``min_bytes`` are
+    sent unchanged. ``workers`` > 0 runs the work in a process pool of that
+    size instead of the default thread pool.
+    """
+
+    enabled: bool = False
+    max_edge: int = 2048
+    format: ImageFormat = "jpeg"
+    quality: int = 85
+    min_bytes: int = 256 * 1024
+    workers: int = 0
+
+
+@dataclass(slots=True, frozen=True)
+class PreprocessedImage:
+    """An image re-encoded by :class:`ImagePreprocessor`."""
+
+    data: bytes
+    mime_type: str
+    width: int
+    height: int
+
+
+@functools.cache
+def _pillow() -> Any | None:
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    return Image
+
+
+def target_image_size(
+    width: int, height: int, *, model: str, max_edge: int
+) -> tuple[int, int]:
+    """Return the useful size for an image sent to ``model``.
+
+    ``model`` is a capability ``image_token_model`` name; an empty name only
+    applies ``max_edge``.
+    """
+    if width <= 0 or height <= 0:
+        return width, height
+    scaled_w, scaled_h = float(width), float(height)
+    if model:
+        scaled_w, scaled_h = provider_image_size(width, height, model=model)
+    if max_edge > 0:
+        scale = min(1.0, max_edge / max(scaled_w, scaled_h))
+        scaled_w, scaled_h = scaled_w * scale, scaled_h * scale
+    return max(1, round(scaled_w)), max(1, round(scaled_h))
+
+
+class ImagePreprocessor:
+    """Downsize and re-encode images off the event loop.
+
+    Requires Pillow (an optional dependency); without it :attr:`available`
+    is false and :meth:`process` always returns ``None``.
+    """
+
+    def __init__(self, policy: ImagePreprocessPolicy) -> None:
+        self.policy = policy
+        self._executor: Executor | None = None
+        self.processed = 0
+        self.skipped = 0
+        self.failures = 0
+        self.saved_bytes = 0
+        if policy.enabled and not self.available:
+            logger.warning(
+                "media_preprocess.pillow_missing",
+                hint="install Pillow to enable image preprocessing",
+            )
+
+    @property
+    def available(self) -> bool:
+        return self.policy.enabled and _pillow() is not None
+
+    def variant_name(self, model: str) -> str:
+        """Stable, filename-safe name of the variant produced for ``model``."""
+        policy = self.policy
+        return f"{model or 'any'}-{policy.max_edge}-{policy.format}-q{policy.quality}"
+
+    def should_process(
+        self, width: int, height: int, file_size: int, *, model: str
+    ) -> bool:
+        """Cheap pre-check from header dimensions, before decoding anything."""
+        if not self.available:
+            return False
+        if file_size > self.policy.min_bytes:
+            return True
+        if width <= 0 or height <= 0:
+            return False
+        target = target_image_size(
+            width, height, model=model, max_edge=self.policy.max_edge
+        )
+        return target != (width, height)
+
+    async def process(self, data: bytes, *, model: str) -> PreprocessedImage | None:
+        """Return a smaller re-encoded image, or ``None`` to keep the original."""
+        if not self.available:
+            return None
+        policy = self.policy
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(
+                self._get_executor(),
+                _transcode,
+                data,
+                model,
+                policy.max_edge,
+                policy.format,
+                policy.quality,
+            )
+        except Exception as exc:  # noqa: BLE001
+            # Untrusted images can make Pillow (or a broken worker pool) raise
+            # almost anything; the original bytes are still usable.
+            self.failures += 1
+            logger.warning("media_preprocess.failed", error=str(exc))
+            return None
+        if result is None or len(result[0]) >= len(data):
+            self.skipped += 1
+            return None
+        encoded, width, height = result
+        self.processed += 1
+        self.saved_bytes += len(data) - len(encoded)
+        return PreprocessedImage(
+            data=encoded,
+            mime_type=_FORMAT_MIME[policy.format],
+            width=width,
+            height=height,
+        )
+
+    def close(self) -> None:
+        """Shut down the process pool, if one was started."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "processed": self.processed,
+            "skipped": self.skipped,
+            "failures": self.failures,
+            "saved_bytes": self.saved_bytes,
+        }
+
+    def _get_executor(self) -> Executor | None:
+        # ``None`` selects the event loop's default thread pool; Pillow
+        # releases the GIL while decoding, resizing and encoding.
+        if self.policy.workers > 0 and self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.policy.workers)
+        return self._executor
+
+
+def _transcode(
+    data: bytes, model: str, max_edge: int, image_format: str, quality: int
+) -> tuple[bytes, int, int] | None:
+    """Decode, downsize and re-encode ``data``; runs in a worker."""
+    image_module = _pillow()
+    if image_module is None:
+        return None
+    from PIL import ImageOps
+
+    with image_module.open(io.BytesIO(data)) as opened:
+        width, height = opened.size
+        target = target_image_size(width, height, model=model, max_edge=max_edge)
+        # EXIF orientations 5-8 swap width and height once applied.
+        rotated = opened.getexif().get(0x0112, 1) in (5, 6, 7, 8)
+        if opened.format == "JPEG":
+            # Let the JPEG decoder drop resolution while decoding.
+            opened.draft("RGB", target)
+        image = ImageOps.exif_transpose(opened)
+        if rotated:
+            target = (target[1], target[0])
+        if image.size != target:
+            image = image.resize(target, image_module.Resampling.LANCZOS)
+        if image_format == "jpeg" and image.mode != "RGB":
+            if "A" in image.getbands() or image.mode == "P":
+                rgba = image.convert("RGBA")
+                background = image_module.new("RGB", rgba.size, (255, 255, 255))
+                background.paste(rgba, mask=rgba.getchannel("A"))
+                image = background
+            else:
+                image = image.convert("RGB")
+        buffer = io.BytesIO()
+        if image_format == "webp":
+            image.save(buffer, format="WEBP", quality=quality, method=4)
+        else:
+            image.save(buffer, format="JPEG", quality=quality, optimize=True)
+    return buffer.getvalue(), image.size[0], image.size[1]
@@ -5,21 +5,40 @@ from __future__ import annotations
 import asyncio
 import base64
 import hashlib
+import importlib.util
 import ipaddress
 import socket
 import struct
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, replace
 from pathlib import Path
+from typing import TYPE_CHECKING
 from urllib.parse import urlparse
 
 import httpx
 import structlog
 
 from nahida_bot.agent.media.cache import MediaCache
+from nahida_bot.agent.media.memo import (
+    DEFAULT_ENCODED_MEDIA_MEMO_BYTES,
+    EncodedMedia,
+    EncodedMediaMemo,
+)
+from nahida_bot.agent.media.preprocess import ImagePreprocessor, target_image_size
 from nahida_bot.plugins.base import InboundAttachment
 
+if TYPE_CHECKING:
+    from nahida_bot.agent.metrics import MetricsCollector, Trace
+
 logger = structlog.get_logger(__name__)
 
+DEFAULT_MEDIA_RESOLVE_CONCURRENCY = 4
+_DOWNLOAD_TIMEOUT_SECONDS = 30.0
+_KEEPALIVE_EXPIRY_SECONDS = 30.0
+# Resolver-owned traces are rotated so they stay inside the collector's
+# rolling window instead of growing without bound.
+_MAX_RECORDS_PER_TRACE = 256
+
 
 @dataclass(slots=True, frozen=True)
 class ResolvedMedia:
@@ -55,6 +74,18 @@ class MediaResolver:
     2. Cached URL (cache hit)
     3. Remote URL (download + cache)
     4. Description only (alt_text fallback)
+
+    Resolutions run concurrently up to ``max_concurrency`` across all
+    callers. Requests for the same path or cache key while one is in flight
+    share its result instead of reading or downloading again. Without an
+    injected ``http_client`` the resolver keeps one pooled keep-alive client
+    (HTTP/2 when ``h2`` is installed) until :meth:`close`. Encoded results
+    are memoized in an :class:`EncodedMediaMemo`, so images re-sent with
+    every history turn are read and base64-encoded once.
+
+    With an :class:`ImagePreprocessor`, callers that pass ``image_model``
+    get a copy downsized for that model and re-encoded; the variant is
+    cached next to the original in :class:`MediaCache`.
     """
 
     def __init__(
@@ -63,45 +94,102 @@ class MediaResolver:
         policy: MediaPolicy,
         *,
         http_client: httpx.AsyncClient | None = None,
+        max_concurrency: int = DEFAULT_MEDIA_RESOLVE_CONCURRENCY,
+        metrics: MetricsCollector | None = None,
+        encoded_memo_bytes: int = DEFAULT_ENCODED_MEDIA_MEMO_BYTES,
+        preprocessor: ImagePreprocessor | None = None,
     ) -> None:
         self._cache = cache
         self._policy = policy
         self._client = http_client
+        self._owns_client = False
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self._inflight: dict[str, asyncio.Task[ResolvedMedia]] = {}
+        self._metrics = metrics
+        self._trace: Trace | None = None
+        self.coalesced = 0
+        self._memo = EncodedMediaMemo(max_bytes=encoded_memo_bytes)
+        self._preprocessor = preprocessor
+
+    async def close(self) -> None:
+        """Close the pooled HTTP client if the resolver created it."""
+        if self._preprocessor is not None:
+            self._preprocessor.close()
+        client, self._client = self._client, None
+        if client is not None and self._owns_client:
+            await client.aclose()
+        self._owns_client = False
+
+    async def resolve(
+        self,
+        attachment: InboundAttachment,
+        *,
+        trace: Trace | None = None,
+        image_model: str | None = None,
+    ) -> ResolvedMedia:
+        """Resolve a single attachment to a ResolvedMedia.
+
+        ``image_model`` (a capability ``image_token_model`` name, possibly
+        empty) requests the preprocessed variant for that model instead of
+        the original bytes.
+        """
+        if self._preprocessor is None or not self._preprocessor.available:
+            image_model = None
+        from_path = bool(attachment.path) and Path(attachment.path).exists()
+        if from_path:
+            flight_key = f"path:{attachment.path}"
+        elif attachment.url:
+            flight_key = f"url:{self.cache_key(attachment)}"
+        else:
+            return ResolvedMedia(
+                media_id=attachment.platform_id,
+                source="description_only",
+                description=attachment.alt_text,
+                mime_type=attachment.mime_type,
+            )
 
-    async def resolve(self, attachment: InboundAttachment) -> ResolvedMedia:
-        """Resolve a single attachment to a ResolvedMedia."""
-        media_id = attachment.platform_id
-
-        # 1. Local file path
-        if attachment.path and Path(attachment.path).exists():
-            return await self._resolve_from_path(attachment)
-
-        # 2/3. URL-based (cache or download)
-        if attachment.url:
-            return await self._resolve_from_url(attachment)
+        if image_model is not None:
+            flight_key = f"{flight_key}#{image_model}"
+        task = self._inflight.get(flight_key)
+        if task is not None:
+            self.coalesced += 1
+            shared = await asyncio.shield(task)
+            if shared.media_id == attachment.platform_id:
+                return shared
+            return replace(
+                shared,
+                media_id=attachment.platform_id,
+                description=attachment.alt_text or shared.description,
+            )
 
-        # 4. Description only
-        return ResolvedMedia(
-            media_id=media_id,
-            source="description_only",
-            description=attachment.alt_text,
-            mime_type=attachment.mime_type,
+        task = asyncio.create_task(
+            self._resolve_limited(attachment, from_path, trace, image_model)
         )
+        self._inflight[flight_key] = task
+        task.add_done_callback(lambda done: self._finish_flight(flight_key, done))
+        return await asyncio.shield(task)
 
     async def resolve_many(
         self, attachments: list[InboundAttachment]
     ) -> list[ResolvedMedia]:
-        """Resolve multiple attachments, filtering to images by kind."""
+        """Resolve multiple attachments concurrently, filtering to images."""
         images = [a for a in attachments if a.kind == "image"]
         if self._policy.max_images_per_turn > 0:
             images = images[: self._policy.max_images_per_turn]
+        images = [
+            att
+            for att in images
+            if not att.mime_type or att.mime_type in self._policy.supported_mime_types
+        ]
+        return list(await asyncio.gather(*(self.resolve(att) for att in images)))
 
-        results: list[ResolvedMedia] = []
-        for att in images:
-            if att.mime_type and att.mime_type not in self._policy.supported_mime_types:
-                continue
-            results.append(await self.resolve(att))
-        return results
+    def inflight_stats(self) -> dict[str, int]:
+        """Return in-flight and coalesced resolution counters."""
+        return {"inflight": len(self._inflight), "coalesced": self.coalesced}
+
+    def memo_stats(self) -> dict[str, float]:
+        """Return hit-rate counters for the encoded media memo."""
+        return self._memo.stats()
 
     def encode_base64(self, data: bytes) -> str:
         """Encode bytes to base64 string."""
@@ -114,9 +202,143 @@ class MediaResolver:
 
     # -- internal --------------------------------------------------------
 
-    async def _resolve_from_path(self, attachment: InboundAttachment) -> ResolvedMedia:
+    async def _resolve_limited(
+        self,
+        attachment: InboundAttachment,
+        from_path: bool,
+        trace: Trace | None,
+        image_model: str | None,
+    ) -> ResolvedMedia:
+        async with self._semaphore:
+            started = time.perf_counter()
+            if from_path:
+                result, source_key = await self._resolve_from_path(attachment)
+            else:
+                result = await self._resolve_from_url(attachment)
+                source_key = self.cache_key(attachment)
+            if image_model is not None and result.base64_data:
+                result = await self._preprocessed(result, source_key, image_model)
+            self._record_resolve(result, time.perf_counter() - started, trace)
+            return result
+
+    async def _preprocessed(
+        self, original: ResolvedMedia, source_key: str, image_model: str
+    ) -> ResolvedMedia:
+        """Swap ``original`` for its variant downsized for ``image_model``."""
+        preprocessor = self._preprocessor
+        assert preprocessor is not None
+        if not preprocessor.should_process(
+            original.width, original.height, original.file_size, model=image_model
+        ):
+            return original
+        variant = preprocessor.variant_name(image_model)
+        memo_key = f"variant:{source_key}:{variant}"
+        encoded = self._memo.get(memo_key)
+        if encoded is None:
+            cached = await self._cache.get(source_key, variant=variant)
+            try:
+                data = await self._read_file(Path(cached)) if cached else None
+            except OSError:
+                data = None
+            if data is not None:
+                encoded = self._encode(data, self._detect_mime(data))
+            else:
+                processed = await preprocessor.process(
+                    base64.b64decode(original.base64_data), model=image_model
+                )
+                if processed is None:
+                    # Not worth shrinking: remember the original for this model.
+                    encoded = EncodedMedia(
+                        base64_data=original.base64_data,
+                        mime_type=original.mime_type,
+                        file_size=original.file_size,
+                        width=original.width,
+                        height=original.height,
+                    )
+                else:
+                    await self._cache.put(
+                        source_key,
+                        processed.data,
+                        suffix=self._mime_to_suffix(processed.mime_type),
+                        variant=variant,
+                    )
+                    encoded = EncodedMedia(
+                        base64_data=self.encode_base64(processed.data),
+                        mime_type=processed.mime_type,
+                        file_size=len(processed.data),
+                        width=processed.width,
+                        height=processed.height,
+                    )
+            self._memo.put(memo_key, encoded)
+        # WebP headers are not sniffed; fall back to the computed size.
+        width, height = target_image_size(
+            original.width,
+            original.height,
+            model=image_model,
+            max_edge=preprocessor.policy.max_edge,
+        )
+        return replace(
+            original,
+            base64_data=encoded.base64_data,
+            mime_type=encoded.mime_type,
+            file_size=encoded.file_size,
+            width=encoded.width or width,
+            height=encoded.height or height,
+        )
+
+    def _finish_flight(
+        self, flight_key: str, task: asyncio.Task[ResolvedMedia]
+    ) -> None:
+        self._inflight.pop(flight_key, None)
+        if not task.cancelled():
+            # Retrieve the exception so a flight whose waiters were all
+            # cancelled does not log "exception was never retrieved".
+            task.exception()
+
+    def _record_resolve(
+        self, result: ResolvedMedia, latency_seconds: float, trace: Trace | None
+    ) -> None:
+        if self._metrics is None:
+            return
+        if trace is None:
+            if (
+                self._trace is None
+                or len(self._trace.media_resolves) >= _MAX_RECORDS_PER_TRACE
+            ):
+                self._trace = self._metrics.new_trace()
+            trace = self._trace
+        self._metrics.record_media_resolve(
+            trace,
+            media_id=result.media_id,
+            source=result.source,
+            latency_seconds=latency_seconds,
+            fallback_used=result.source == "description_only",
+        )
+
+    def _http_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=_DOWNLOAD_TIMEOUT_SECONDS,
+                limits=httpx.Limits(keepalive_expiry=_KEEPALIVE_EXPIRY_SECONDS),
+                http2=importlib.util.find_spec("h2") is not None,
+            )
+            self._owns_client = True
+        return self._client
+
+    async def _resolve_from_path(
+        self, attachment: InboundAttachment
+    ) -> tuple[ResolvedMedia, str]:
+        """Resolve a local file; also return its ``path:mtime:size`` key."""
         path = Path(attachment.path)
+        memo_key = ""
         try:
+            stat = path.stat()
+            memo_key = f"path:{path}:{stat.st_mtime_ns}:{stat.st_size}"
+            memoized = self._memoized(
+                memo_key, attachment, local_path=str(path), source="path"
+            )
+            if memoized is not None:
+                return memoized, memo_key
             data = await self._read_file(path)
         except OSError as exc:
             logger.warning(
@@ -129,43 +351,39 @@ class MediaResolver:
                 source="description_only",
                 description=attachment.alt_text,
                 mime_type=attachment.mime_type,
-            )
+            ), memo_key
 
         mime = attachment.mime_type or self._detect_mime(data)
-        size = len(data)
-        width, height = self._read_image_dimensions(data, mime)
-
         if not self._validate(data, mime):
             return ResolvedMedia(
                 media_id=attachment.platform_id,
                 source="description_only",
                 description=attachment.alt_text,
                 mime_type=mime,
-                file_size=size,
-            )
-
-        b64 = self.encode_base64(data)
-        return ResolvedMedia(
-            local_path=str(path),
-            base64_data=b64,
-            mime_type=mime,
-            file_size=size,
-            width=width or attachment.width,
-            height=height or attachment.height,
-            media_id=attachment.platform_id,
-            source="path",
-        )
+                file_size=len(data),
+            ), memo_key
+        return self._encode_and_memoize(
+            memo_key, data, mime, attachment, local_path=str(path), source="path"
+        ), memo_key
 
     async def _resolve_from_url(self, attachment: InboundAttachment) -> ResolvedMedia:
         cache_key = self.cache_key(attachment)
 
+        memo_key = f"url:{cache_key}"
+
         # Check cache first
         cached = await self._cache.get(cache_key)
-        if cached is not None:
+        if cached is None:
+            self._memo.invalidate(memo_key)
+        else:
+            memoized = self._memoized(
+                memo_key, attachment, local_path=cached, source="cache_hit"
+            )
+            if memoized is not None:
+                return memoized
             try:
                 data = await self._read_file(Path(cached))
                 mime = attachment.mime_type or self._detect_mime(data)
-                size = len(data)
                 if not self._validate(data, mime):
                     await self._cache.invalidate(cache_key)
                     return ResolvedMedia(
@@ -173,18 +391,14 @@ class MediaResolver:
                         source="description_only",
                         description=attachment.alt_text,
                         mime_type=mime,
-                        file_size=size,
+                        file_size=len(data),
                     )
-                width, height = self._read_image_dimensions(data, mime)
-                b64 = self.encode_base64(data)
-                return ResolvedMedia(
+                return self._encode_and_memoize(
+                    memo_key,
+                    data,
+                    mime,
+                    attachment,
                     local_path=cached,
-                    base64_data=b64,
-                    mime_type=mime,
-                    file_size=size,
-                    width=width or attachment.width,
-                    height=height or attachment.height,
-                    media_id=attachment.platform_id,
                     source="cache_hit",
                 )
             except OSError:
@@ -221,27 +435,75 @@ class MediaResolver:
         # Cache the download
         suffix = self._mime_to_suffix(mime)
         cached_path = await self._cache.put(cache_key, data, suffix=suffix)
+        return self._encode_and_memoize(
+            memo_key, data, mime, attachment, local_path=cached_path, source="url"
+        )
 
-        size = len(data)
-        width, height = self._read_image_dimensions(data, mime)
-        b64 = self.encode_base64(data)
+    def _memoized(
+        self,
+        memo_key: str,
+        attachment: InboundAttachment,
+        *,
+        local_path: str,
+        source: str,
+    ) -> ResolvedMedia | None:
+        encoded = self._memo.get(memo_key)
+        if encoded is None:
+            return None
+        mime = attachment.mime_type or encoded.mime_type
+        if not self._allowed(encoded.file_size, mime):
+            # Re-validate from disk under the current policy.
+            self._memo.invalidate(memo_key)
+            return None
+        return ResolvedMedia(
+            local_path=local_path,
+            base64_data=encoded.base64_data,
+            mime_type=mime,
+            file_size=encoded.file_size,
+            width=encoded.width or attachment.width,
+            height=encoded.height or attachment.height,
+            media_id=attachment.platform_id,
+            source=source,
+        )
 
+    def _encode_and_memoize(
+        self,
+        memo_key: str,
+        data: bytes,
+        mime: str,
+        attachment: InboundAttachment,
+        *,
+        local_path: str,
+        source: str,
+    ) -> ResolvedMedia:
+        encoded = self._encode(data, mime)
+        self._memo.put(memo_key, encoded)
         return ResolvedMedia(
-            local_path=cached_path,
-            base64_data=b64,
+            local_path=local_path,
+            base64_data=encoded.base64_data,
             mime_type=mime,
-            file_size=size,
-            width=width or attachment.width,
-            height=height or attachment.height,
+            file_size=encoded.file_size,
+            width=encoded.width or attachment.width,
+            height=encoded.height or attachment.height,
             media_id=attachment.platform_id,
-            source="url",
+            source=source,
+        )
+
+    def _encode(self, data: bytes, mime: str) -> EncodedMedia:
+        width, height = self._read_image_dimensions(data, mime)
+        return EncodedMedia(
+            base64_data=self.encode_base64(data),
+            mime_type=mime,
+            file_size=len(data),
+            width=width,
+            height=height,
         )
 
     def _validate(self, data: bytes, mime_type: str) -> bool:
-        if (
-            self._policy.max_image_bytes > 0
-            and len(data) > self._policy.max_image_bytes
-        ):
+        return self._allowed(len(data), mime_type)
+
+    def _allowed(self, size: int, mime_type: str) -> bool:
+        if self._policy.max_image_bytes > 0 and size > self._policy.max_image_bytes:
             return False
         if mime_type and mime_type not in self._policy.supported_mime_types:
             return False
@@ -293,18 +555,16 @@ class MediaResolver:
         self, url: str, *, allow_private_network: bool = False
     ) -> tuple[bytes, str]:
         await self._ensure_url_allowed(url, allow_private_network=allow_private_network)
-        client = self._client or httpx.AsyncClient(timeout=30.0)
-        try:
-            async with client.stream("GET", url, follow_redirects=False) as response:
-                response.raise_for_status()
-                data = await self._read_limited_response(response)
-                mime = response.headers.get("content-type", "").split(";")[0].strip()
-                if not mime:
-                    mime = self._detect_mime(data)
-                return data, mime
-        finally:
-            if self._client is None:
-                await client.aclose()
+        client = self._http_client()
+        async with client.stream(
+            "GET", url, follow_redirects=False, timeout=_DOWNLOAD_TIMEOUT_SECONDS
+        ) as response:
+            response.raise_for_status()
+            data = await self._read_limited_response(response)
+            mime = response.headers.get("content-type", "").split(";")[0].strip()
+            if not mime:
+                mime = self._detect_mime(data)
+            return data, mime
 
     async def _read_limited_response(self, response: httpx.Response) -> bytes:
         limit = self._policy.max_image_bytes
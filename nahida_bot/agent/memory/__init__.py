@@ -15,6 +15,17 @@ from nahida_bot.agent.memory.consolidation import (
     RuleBasedMemoryExtractor,
     parse_memory_dream,
 )
+from nahida_bot.agent.memory.consolidation_worker import (
+    ConsolidationJob,
+    ConsolidationWorker,
+)
+from nahida_bot.agent.memory.history_cache import SessionHistoryCache
+from nahida_bot.agent.memory.retention import (
+    MemoryRetention,
+    RetentionPolicy,
+    RetentionReport,
+)
+from nahida_bot.agent.memory.session_meta_cache import SessionMetaCache
 from nahida_bot.agent.memory.sqlite import SQLiteMemoryStore, extract_keywords
 from nahida_bot.agent.memory.store import MemoryStore
 from nahida_bot.agent.memory.embedding import (
@@ -23,7 +34,9 @@ from nahida_bot.agent.memory.embedding import (
     HashEmbeddingProvider,
     RoutedEmbeddingProvider,
 )
+from nahida_bot.agent.memory.embedding_refresh import EmbeddingRefresher
 from nahida_bot.agent.memory.vector import (
+    InMemoryVectorIndex,
     NoopVectorIndex,
     SQLiteVecIndex,
     VectorHit,
@@ -32,6 +45,8 @@ from nahida_bot.agent.memory.vector import (
 )
 
 __all__ = [
+    "ConsolidationJob",
+    "ConsolidationWorker",
     "ConversationTurn",
     "ExtractedMemory",
     "LlmMemoryDreamer",
@@ -41,15 +56,22 @@ __all__ = [
     "MemoryEmbedding",
     "MemoryItem",
     "MemoryRecord",
+    "MemoryRetention",
     "MemoryStore",
     "SQLiteMemoryStore",
     "EmbeddingProvider",
+    "EmbeddingRefresher",
     "EmbeddingResult",
     "HashEmbeddingProvider",
+    "InMemoryVectorIndex",
     "RoutedEmbeddingProvider",
     "NoopVectorIndex",
+    "RetentionPolicy",
+    "RetentionReport",
     "RuleBasedMemoryExtractor",
     "SQLiteVecIndex",
+    "SessionHistoryCache",
+    "SessionMetaCache",
     "VectorHit",
     "VectorIndex",
     "VectorRecord",
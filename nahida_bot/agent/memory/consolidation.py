@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import re
 import json
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from pathlib import Path
@@ -246,6 +247,10 @@ class LlmMemoryDreamer:
     ) -> MemoryDream:
         """Ask the LLM for structured add/archive memory changes."""
         from nahida_bot.agent.context import ContextMessage
+        from nahida_bot.agent.providers.ratelimit import (
+            estimate_request_tokens,
+            rate_limited_call,
+        )
 
         logger.debug(
             "memory_dreaming.llm_start",
@@ -261,21 +266,22 @@ class LlmMemoryDreamer:
             assistant_message=assistant_message,
             existing_items=existing_items[: self._max_existing],
         )
-        response = await self._provider.chat(
-            messages=[
-                ContextMessage(
-                    role="system",
-                    source="memory_dreaming_system",
-                    content=build_dream_system_prompt(self._app_name),
-                ),
-                ContextMessage(
-                    role="user",
-                    source="memory_dreaming_input",
-                    content=prompt,
-                ),
-            ],
-            tools=[],
-            model=self._model,
+        messages = [
+            ContextMessage(
+                role="system",
+                source="memory_dreaming_system",
+                content=build_dream_system_prompt(self._app_name),
+            ),
+            ContextMessage(
+                role="user",
+                source="memory_dreaming_input",
+                content=prompt,
+            ),
+        ]
+        response = await rate_limited_call(
+            self._provider,
+            lambda: self._provider.chat(messages=messages, tools=[], model=self._model),
+            estimated_tokens=estimate_request_tokens(messages),
         )
         dream = parse_memory_dream(str(response.content or ""))
         logger.debug(
@@ -395,6 +401,71 @@ class MemoryConsolidator:
             except Exception as exc:
                 logger.warning("memory_consolidation.dream_failed", error=str(exc))
 
+        return await self._apply_extracted(
+            extracted,
+            archives=archives,
+            existing_items=existing_items,
+            session_id=session_id,
+            workspace_id=workspace_id,
+            workspace_root=workspace_root,
+        )
+
+    async def consolidate_turns(
+        self,
+        *,
+        session_id: str,
+        turns: Sequence[tuple[str, str]],
+        workspace_id: str | None = None,
+        workspace_root: Path | None = None,
+    ) -> int:
+        """Rule-extract several completed ``(user, assistant)`` turns at once.
+
+        Equivalent to calling :meth:`consolidate_turn` per turn with
+        ``run_rules=True`` and no dream provider, but existing items are
+        loaded and the workspace projection is rewritten only once.
+        """
+        append_item = getattr(self._memory, "append_item", None)
+        if not callable(append_item) or not turns:
+            return 0
+        existing_items = await self._load_existing_items()
+        extracted = _dedupe_extractions(
+            [
+                memory
+                for user_message, assistant_message in turns
+                for memory in self._extractor.extract(
+                    session_id=session_id,
+                    user_message=user_message,
+                    assistant_message=assistant_message,
+                )
+            ]
+        )
+        if extracted:
+            logger.debug(
+                "memory_consolidation.rule_extracted",
+                session_id=session_id,
+                count=len(extracted),
+                turns=len(turns),
+            )
+        return await self._apply_extracted(
+            extracted,
+            archives=[],
+            existing_items=existing_items,
+            session_id=session_id,
+            workspace_id=workspace_id,
+            workspace_root=workspace_root,
+        )
+
+    async def _apply_extracted(
+        self,
+        extracted: list[ExtractedMemory],
+        *,
+        archives: list[DreamArchive],
+        existing_items: list[Any],
+        session_id: str,
+        workspace_id: str | None,
+        workspace_root: Path | None,
+    ) -> int:
+        append_item = cast(Any, self._memory).append_item
         applied = 0
         skipped_duplicates = 0
         skipped_unsafe = 0
@@ -415,7 +486,7 @@ class MemoryConsolidator:
                 "candidate_id": candidate_id,
                 "consolidated_at": datetime.now(UTC).isoformat(),
             }
-            await cast(Any, append_item)(
+            await append_item(
                 title=memory.title,
                 content=memory.content,
                 scope_type="global",
@@ -0,0 +1,206 @@
+"""Background queue that runs memory consolidation off the reply path."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_CONSOLIDATION_QUEUE_SIZE = 256
+DEFAULT_CONSOLIDATION_MAX_TURNS_PER_JOB = 16
+
+
+@dataclass(slots=True)
+class ConsolidationJob:
+    """Completed turns of one session waiting to be consolidated."""
+
+    session_id: str
+    workspace_id: str | None
+    workspace_root: Any
+    turns: list[tuple[str, str]] = field(default_factory=list)
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class ConsolidationWorker:
+    """Single background task draining a bounded FIFO of consolidation jobs.
+
+    :meth:`submit` appends a ``(user, assistant)`` turn to the session's
+    queued job when one is still waiting (coalescing), otherwise it enqueues a
+    new job. When ``max_pending_jobs`` jobs are already queued the caller
+    waits for the worker to free a slot; those waits are counted in
+    :meth:`stats` so overload is visible instead of silently dropping memory.
+    Jobs run one at a time in submission order, so a session's turns are
+    never consolidated out of order.
+    """
+
+    def __init__(
+        self,
+        process: Callable[[ConsolidationJob], Awaitable[None]],
+        *,
+        max_pending_jobs: int = DEFAULT_CONSOLIDATION_QUEUE_SIZE,
+        max_turns_per_job: int = DEFAULT_CONSOLIDATION_MAX_TURNS_PER_JOB,
+    ) -> None:
+        self._process = process
+        self.max_pending_jobs = max(1, max_pending_jobs)
+        self.max_turns_per_job = max(1, max_turns_per_job)
+        self._queue: deque[ConsolidationJob] = deque()
+        self._open_jobs: dict[str, ConsolidationJob] = {}
+        self._in_flight: ConsolidationJob | None = None
+        self._changed = asyncio.Condition()
+        self._task: asyncio.Task[None] | None = None
+        self._closed = False
+        self.submitted = 0
+        self.coalesced = 0
+        self.processed_jobs = 0
+        self.processed_turns = 0
+        self.failures = 0
+        self.backpressure_waits = 0
+        self.backpressure_wait_seconds = 0.0
+        self.max_queue_delay_seconds = 0.0
+
+    @property
+    def pending_jobs(self) -> int:
+        return len(self._queue)
+
+    async def submit(
+        self,
+        *,
+        session_id: str,
+        user_message: str,
+        assistant_message: str,
+        workspace_id: str | None,
+        workspace_root: Any,
+    ) -> None:
+        """Queue one completed turn for consolidation.
+
+        After :meth:`close` the turn is processed inline so late writers
+        during shutdown are not lost.
+        """
+        turn = (user_message, assistant_message)
+        self.submitted += 1
+        if self._closed:
+            await self._run_job(
+                ConsolidationJob(session_id, workspace_id, workspace_root, [turn])
+            )
+            return
+        async with self._changed:
+            job = self._open_jobs.get(session_id)
+            if (
+                job is not None
+                and job.workspace_id == workspace_id
+                and len(job.turns) < self.max_turns_per_job
+            ):
+                job.turns.append(turn)
+                self.coalesced += 1
+                return
+            if len(self._queue) >= self.max_pending_jobs:
+                self.backpressure_waits += 1
+                started = time.monotonic()
+                await self._changed.wait_for(
+                    lambda: len(self._queue) < self.max_pending_jobs
+                )
+                waited = time.monotonic() - started
+                self.backpressure_wait_seconds += waited
+                logger.warning(
+                    "memory.consolidation_backpressure",
+                    session_id=session_id,
+                    waited_ms=round(waited * 1000, 2),
+                    pending_jobs=len(self._queue),
+                )
+            job = ConsolidationJob(session_id, workspace_id, workspace_root, [turn])
+            self._queue.append(job)
+            self._open_jobs[session_id] = job
+            self._changed.notify_all()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(
+                self._run(), name="memory-consolidation-worker"
+            )
+
+    async def drain(self, timeout: float | None = None) -> bool:
+        """Wait until every queued job has finished; return false on timeout."""
+        if self._task is None or self._task.done():
+            return not self._queue
+        try:
+            async with asyncio.timeout(timeout):
+                async with self._changed:
+                    await self._changed.wait_for(
+                        lambda: not self._queue and self._in_flight is None
+                    )
+        except TimeoutError:
+            return False
+        return True
+
+    async def close(self, timeout: float | None = None) -> None:
+        """Drain the queue, then stop the worker task."""
+        self._closed = True
+        drained = await self.drain(timeout)
+        if not drained:
+            logger.warning(
+                "memory.consolidation_drain_timeout",
+                dropped_jobs=len(self._queue),
+                dropped_turns=sum(len(job.turns) for job in self._queue),
+            )
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        self._queue.clear()
+        self._open_jobs.clear()
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "pending_jobs": len(self._queue),
+            "pending_turns": sum(len(job.turns) for job in self._queue),
+            "in_flight": 1 if self._in_flight is not None else 0,
+            "submitted": self.submitted,
+            "coalesced": self.coalesced,
+            "processed_jobs": self.processed_jobs,
+            "processed_turns": self.processed_turns,
+            "failures": self.failures,
+            "backpressure_waits": self.backpressure_waits,
+            "backpressure_wait_ms": round(self.backpressure_wait_seconds * 1000, 2),
+            "max_queue_delay_ms": round(self.max_queue_delay_seconds * 1000, 2),
+        }
+
+    # -- internal helpers ------------------------------------------------
+
+    async def _run(self) -> None:
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: bool(self._queue))
+                job = self._queue.popleft()
+                if self._open_jobs.get(job.session_id) is job:
+                    del self._open_jobs[job.session_id]
+                self._in_flight = job
+                self._changed.notify_all()
+            self.max_queue_delay_seconds = max(
+                self.max_queue_delay_seconds, time.monotonic() - job.enqueued_at
+            )
+            try:
+                await self._run_job(job)
+            finally:
+                async with self._changed:
+                    self._in_flight = None
+                    self._changed.notify_all()
+
+    async def _run_job(self, job: ConsolidationJob) -> None:
+        try:
+            await self._process(job)
+        except Exception as exc:  # noqa: BLE001
+            # One bad job must not stop the queue behind it.
+            self.failures += 1
+            logger.warning(
+                "memory.consolidation_job_failed",
+                session_id=job.session_id,
+                turns=len(job.turns),
+                error=str(exc),
+            )
+        self.processed_jobs += 1
+        self.processed_turns += len(job.turns)
@@ -106,6 +106,8 @@ class RoutedEmbeddingProvider:
         self.batch_size = batch_size
 
     async def embed_texts(self, texts: list[str]) -> list[EmbeddingResult]:
+        from nahida_bot.agent.providers.ratelimit import rate_limited_call
+
         embed = getattr(self._provider, "embed_texts", None)
         if not callable(embed):
             raise RuntimeError(
@@ -114,7 +116,11 @@ class RoutedEmbeddingProvider:
         results: list[EmbeddingResult] = []
         for offset in range(0, len(texts), self.batch_size):
             batch = texts[offset : offset + self.batch_size]
-            raw_results = await cast(Any, embed)(batch, model=self.model)
+            raw_results = await rate_limited_call(
+                self._provider,
+                lambda batch=batch: cast(Any, embed)(batch, model=self.model),
+                estimated_tokens=sum(len(text) for text in batch) // 4,
+            )
             for result in raw_results:
                 embedding = list(getattr(result, "embedding", []) or [])
                 if self.dimensions <= 0 and embedding:
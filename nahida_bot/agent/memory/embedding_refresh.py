@@ -0,0 +1,132 @@
+"""Debounced background refresh of durable memory embeddings."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_REFRESH_DEBOUNCE_SECONDS = 5.0
+DEFAULT_REFRESH_MAX_DELAY_SECONDS = 60.0
+
+
+class EmbeddingRefresher:
+    """Coalesce embedding refresh requests into one background pass.
+
+    :meth:`request` is cheap and never blocks: it marks the memory as dirty
+    and makes sure a worker task is running. The worker waits until no new
+    request arrived for ``debounce_seconds`` (but never longer than
+    ``max_delay_seconds`` after the first pending request) and then awaits
+    ``refresh`` once for the whole burst. Requests that arrive while a pass
+    is running schedule exactly one follow-up pass.
+    """
+
+    def __init__(
+        self,
+        refresh: Callable[[], Awaitable[int]],
+        *,
+        debounce_seconds: float = DEFAULT_REFRESH_DEBOUNCE_SECONDS,
+        max_delay_seconds: float = DEFAULT_REFRESH_MAX_DELAY_SECONDS,
+    ) -> None:
+        self._refresh = refresh
+        self.debounce_seconds = max(0.0, debounce_seconds)
+        self.max_delay_seconds = max(self.debounce_seconds, max_delay_seconds)
+        self._task: asyncio.Task[None] | None = None
+        self._flush = asyncio.Event()
+        self._dirty_since: float | None = None
+        self._last_request = 0.0
+        self._pending_requests = 0
+        self._closed = False
+        self.requests = 0
+        self.passes = 0
+        self.embedded = 0
+        self.failures = 0
+
+    @property
+    def pending(self) -> bool:
+        return self._dirty_since is not None
+
+    def request(self) -> None:
+        """Schedule a refresh after the debounce window."""
+        if self._closed:
+            return
+        now = time.monotonic()
+        self.requests += 1
+        self._pending_requests += 1
+        self._last_request = now
+        if self._dirty_since is None:
+            self._dirty_since = now
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(
+                self._run(), name="memory-embedding-refresh"
+            )
+
+    async def flush(self) -> None:
+        """Run any pending refresh now and wait for the worker to go idle."""
+        task = self._task
+        if task is None or task.done():
+            return
+        self._flush.set()
+        await asyncio.shield(task)
+
+    async def close(self) -> None:
+        """Flush pending work and ignore further requests."""
+        self._closed = True
+        await self.flush()
+
+    def stats(self) -> dict[str, int | bool]:
+        return {
+            "requests": self.requests,
+            "passes": self.passes,
+            "embedded": self.embedded,
+            "failures": self.failures,
+            "pending": self.pending,
+        }
+
+    # -- internal helpers ------------------------------------------------
+
+    async def _run(self) -> None:
+        try:
+            while self._dirty_since is not None:
+                await self._wait_until_quiet()
+                self._dirty_since = None
+                coalesced, self._pending_requests = self._pending_requests, 0
+                await self._run_pass(coalesced)
+        finally:
+            self._flush.clear()
+
+    async def _wait_until_quiet(self) -> None:
+        while not self._flush.is_set() and self._dirty_since is not None:
+            deadline = min(
+                self._last_request + self.debounce_seconds,
+                self._dirty_since + self.max_delay_seconds,
+            )
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                await asyncio.wait_for(self._flush.wait(), timeout=remaining)
+            except TimeoutError:
+                pass
+
+    async def _run_pass(self, coalesced: int) -> None:
+        started = time.perf_counter()
+        self.passes += 1
+        try:
+            count = await self._refresh()
+        except Exception as exc:  # noqa: BLE001
+            # A failed pass must not kill the worker; the next request retries.
+            self.failures += 1
+            logger.warning("memory.embedding_refresh_failed", error=str(exc))
+            return
+        self.embedded += count
+        logger.debug(
+            "memory.embedding_refresh_done",
+            embedded=count,
+            coalesced_requests=coalesced,
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 2),
+        )
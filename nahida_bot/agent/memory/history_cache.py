@@ -0,0 +1,233 @@
+"""In-memory LRU of recent conversation turns for hot sessions."""
+
+from __future__ import annotations
+
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+from nahida_bot.agent.memory.models import MemoryRecord
+
+DEFAULT_HISTORY_CACHE_SESSIONS = 256
+DEFAULT_HISTORY_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+
+@dataclass(slots=True)
+class _SessionWindow:
+    """Chronological tail of one session plus values derived from its turns."""
+
+    records: list[MemoryRecord]
+    capacity: int
+    complete: bool
+    record_bytes: dict[int, int] = field(default_factory=dict)
+    derived: dict[int, tuple[Any, int]] = field(default_factory=dict)
+    nbytes: int = 0
+    touched_at: float = field(default_factory=time.monotonic)
+
+
+class SessionHistoryCache:
+    """Size-bounded LRU of the most recent turns per session.
+
+    A window holds up to ``capacity`` of the newest :class:`MemoryRecord` rows
+    for a session in chronological order. It is *complete* when the store
+    returned fewer rows than requested, i.e. it holds the whole session and
+    can answer any limit. Writers keep windows current with :meth:`append`;
+    anything that removes turns must call :meth:`invalidate`.
+
+    Callers can attach one derived value per turn (for example a rendered
+    history message) with :meth:`remember`; it is dropped together with the
+    turn. Footprint is tracked as an approximate byte count and the cache
+    evicts least recently used sessions to stay within both bounds.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_sessions: int = DEFAULT_HISTORY_CACHE_SESSIONS,
+        max_bytes: int = DEFAULT_HISTORY_CACHE_MAX_BYTES,
+    ) -> None:
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self._windows: OrderedDict[str, _SessionWindow] = OrderedDict()
+        self._nbytes = 0
+        self._version = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_sessions > 0 and self.max_bytes > 0
+
+    @property
+    def version(self) -> int:
+        """Counter bumped by every write; guards :meth:`put` against races."""
+        return self._version
+
+    def get(self, session_id: str, limit: int) -> list[MemoryRecord] | None:
+        """Return the newest ``limit`` turns, or ``None`` when not cached."""
+        window = self._windows.get(session_id)
+        if window is None or (not window.complete and window.capacity < limit):
+            self.misses += 1
+            return None
+        self._windows.move_to_end(session_id)
+        self.hits += 1
+        if limit <= 0:
+            return []
+        return window.records[-limit:]
+
+    def put(
+        self,
+        session_id: str,
+        records: list[MemoryRecord],
+        *,
+        limit: int,
+        version: int,
+    ) -> None:
+        """Cache a window loaded from the store with ``limit``.
+
+        ``version`` is the value of :attr:`version` read before the load; if a
+        write happened in between, the loaded rows may be stale and are
+        discarded.
+        """
+        if not self.enabled or version != self._version:
+            return
+        self._drop(session_id)
+        window = _SessionWindow(
+            records=[],
+            capacity=limit,
+            complete=len(records) < limit,
+        )
+        for record in records:
+            self._push(window, record)
+        if window.nbytes > self.max_bytes:
+            return
+        self._windows[session_id] = window
+        self._nbytes += window.nbytes
+        self._evict()
+
+    def append(self, session_id: str, record: MemoryRecord) -> None:
+        """Add a newly persisted turn to a cached window, if there is one."""
+        self._version += 1
+        window = self._windows.get(session_id)
+        if window is None:
+            return
+        before = window.nbytes
+        self._push(window, record)
+        while len(window.records) > window.capacity:
+            self._pop_oldest(window)
+            window.complete = False
+        self._nbytes += window.nbytes - before
+        self._evict()
+
+    def invalidate(self, session_id: str | None = None) -> None:
+        """Forget one session's window, or every window when ``None``."""
+        self._version += 1
+        if session_id is None:
+            self.invalidations += len(self._windows)
+            self._windows.clear()
+            self._nbytes = 0
+            return
+        if self._drop(session_id):
+            self.invalidations += 1
+
+    def lookup(self, session_id: str, turn_id: int) -> Any | None:
+        """Return the derived value remembered for a cached turn."""
+        window = self._windows.get(session_id)
+        if window is None:
+            return None
+        entry = window.derived.get(turn_id)
+        return entry[0] if entry is not None else None
+
+    def remember(self, session_id: str, turn_id: int, value: Any, nbytes: int) -> None:
+        """Attach a derived value of roughly ``nbytes`` to a cached turn."""
+        window = self._windows.get(session_id)
+        if window is None or turn_id not in window.record_bytes:
+            return
+        previous = window.derived.get(turn_id)
+        delta = nbytes - (previous[1] if previous is not None else 0)
+        window.derived[turn_id] = (value, nbytes)
+        window.nbytes += delta
+        self._nbytes += delta
+        self._evict()
+
+    def needs_touch(self, session_id: str, interval_seconds: float) -> bool:
+        """Return true (and reset the clock) when a cached session is due a touch."""
+        window = self._windows.get(session_id)
+        if window is None:
+            return True
+        now = time.monotonic()
+        if now - window.touched_at < interval_seconds:
+            return False
+        window.touched_at = now
+        return True
+
+    def stats(self) -> dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "sessions": len(self._windows),
+            "records": sum(len(w.records) for w in self._windows.values()),
+            "approx_bytes": self._nbytes,
+        }
+
+    # -- internal helpers ------------------------------------------------
+
+    @staticmethod
+    def _push(window: _SessionWindow, record: MemoryRecord) -> None:
+        nbytes = _record_nbytes(record)
+        window.records.append(record)
+        window.record_bytes[record.turn_id] = nbytes
+        window.nbytes += nbytes
+
+    @staticmethod
+    def _pop_oldest(window: _SessionWindow) -> None:
+        record = window.records.pop(0)
+        window.nbytes -= window.record_bytes.pop(record.turn_id, 0)
+        derived = window.derived.pop(record.turn_id, None)
+        if derived is not None:
+            window.nbytes -= derived[1]
+
+    def _drop(self, session_id: str) -> bool:
+        window = self._windows.pop(session_id, None)
+        if window is None:
+            return False
+        self._nbytes -= window.nbytes
+        return True
+
+    def _evict(self) -> None:
+        while self._windows and (
+            len(self._windows) > self.max_sessions or self._nbytes > self.max_bytes
+        ):
+            _, window = self._windows.popitem(last=False)
+            self._nbytes -= window.nbytes
+            self.evictions += 1
+
+
+def _record_nbytes(record: MemoryRecord) -> int:
+    turn = record.turn
+    return (
+        sys.getsizeof(record)
+        + sys.getsizeof(turn)
+        + sys.getsizeof(turn.content)
+        + sys.getsizeof(turn.source)
+        + approx_nbytes(turn.metadata)
+    )
+
+
+def approx_nbytes(value: object) -> int:
+    """Approximate the retained size of JSON-like data (dicts, lists, scalars)."""
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            approx_nbytes(key) + approx_nbytes(item) for key, item in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(approx_nbytes(item) for item in value)
+    return sys.getsizeof(value)
@@ -260,6 +260,15 @@ def has_memory_signal(content: str) -> bool:
     return False
 
 
+def workspace_memory_candidates(*, daily_days: int = DEFAULT_DAILY_DAYS) -> list[str]:
+    """Return relative memory file paths considered for context, in load order."""
+    return [
+        MEMORY_FILE,
+        MEMORY_SUMMARY_FILE,
+        *recent_daily_memory_paths(days=daily_days),
+    ]
+
+
 def load_workspace_markdown_memory(
     workspace_root: Path,
     *,
@@ -267,11 +276,7 @@ def load_workspace_markdown_memory(
     max_chars: int = MAX_CONTEXT_MEMORY_CHARS,
 ) -> list[MarkdownMemoryEntry]:
     """Load bounded markdown memory entries from a workspace."""
-    candidates = [
-        MEMORY_FILE,
-        MEMORY_SUMMARY_FILE,
-        *recent_daily_memory_paths(days=daily_days),
-    ]
+    candidates = workspace_memory_candidates(daily_days=daily_days)
     entries: list[MarkdownMemoryEntry] = []
     total = 0
     for relative_path in candidates:
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
-from typing import Any
+from typing import Any, cast
 
 
 @dataclass(slots=True, frozen=True)
@@ -25,7 +25,18 @@ class MemoryRecord:
     turn_id: int
     session_id: str
     turn: ConversationTurn
-    keywords: list[str] = field(default_factory=list)
+    _keywords: list[str] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def keywords(self) -> list[str]:
+        """Keywords of the turn content, extracted on first access."""
+        if self._keywords is None:
+            from nahida_bot.agent.memory.sqlite import extract_keywords
+
+            object.__setattr__(self, "_keywords", extract_keywords(self.turn.content))
+        return cast(list[str], self._keywords)
 
 
 @dataclass(slots=True, frozen=True)
@@ -92,3 +103,16 @@ class SessionSummary:
     last_active_at: str
     turn_count: int
     metadata: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(slots=True, frozen=True)
+class SessionActivity:
+    """Turn counters of a session, maintained as turns are written."""
+
+    session_id: str
+    workspace_id: str | None
+    turn_count: int
+    last_turn_id: int
+    last_turn_at: str
+    last_dream_turn_id: int
+    pending_dream_turns: int
@@ -0,0 +1,191 @@
+"""Periodic retention and compaction of stored conversation turns."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+
+import aiosqlite
+import structlog
+
+if TYPE_CHECKING:
+    from nahida_bot.agent.memory.sqlite import SQLiteMemoryStore
+    from nahida_bot.db.engine import DatabaseEngine
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_RETENTION_INTERVAL_SECONDS = 3600.0
+DEFAULT_RETENTION_INITIAL_DELAY_SECONDS = 600.0
+
+
+@dataclass(slots=True, frozen=True)
+class RetentionPolicy:
+    """How long conversation turns are kept.
+
+    Ages are in days and ``0`` keeps turns forever. ``source_max_age_days``
+    overrides the dialogue age for turns stored with a given ``source``;
+    observed group messages always follow ``observed_max_age_days``.
+    ``max_turns_per_session`` caps every session to its newest turns.
+    """
+
+    observed_max_age_days: float = 1.0
+    dialogue_max_age_days: float = 90.0
+    source_max_age_days: Mapping[str, float] = field(default_factory=dict)
+    max_turns_per_session: int = 0
+    chunk_size: int = 500
+    vacuum_pages_per_step: int = 256
+
+
+@dataclass(slots=True)
+class RetentionReport:
+    """Outcome of one retention pass."""
+
+    deleted_observed: int = 0
+    deleted_dialogue: int = 0
+    deleted_by_source: dict[str, int] = field(default_factory=dict)
+    trimmed: int = 0
+    reclaimed_bytes: int = 0
+    freelist_bytes: int = 0
+    elapsed_ms: float = 0.0
+
+    @property
+    def deleted(self) -> int:
+        return (
+            self.deleted_observed
+            + self.deleted_dialogue
+            + sum(self.deleted_by_source.values())
+            + self.trimmed
+        )
+
+
+class MemoryRetention:
+    """Background task that applies a :class:`RetentionPolicy` periodically.
+
+    Each pass deletes expired turns (and their search index rows) in small
+    chunks, trims sessions above the turn cap, then compacts the database
+    with ``PRAGMA incremental_vacuum`` and ``PRAGMA optimize``. Deletes go
+    through the memory store so cached history is invalidated.
+    """
+
+    def __init__(
+        self,
+        store: SQLiteMemoryStore,
+        engine: DatabaseEngine,
+        policy: RetentionPolicy | None = None,
+        *,
+        interval_seconds: float = DEFAULT_RETENTION_INTERVAL_SECONDS,
+        initial_delay_seconds: float = DEFAULT_RETENTION_INITIAL_DELAY_SECONDS,
+    ) -> None:
+        self._store = store
+        self._engine = engine
+        self.policy = policy or RetentionPolicy()
+        self.interval_seconds = max(1.0, interval_seconds)
+        self.initial_delay_seconds = max(0.0, initial_delay_seconds)
+        self._task: asyncio.Task[None] | None = None
+        self._lock = asyncio.Lock()
+        self.runs = 0
+        self.failures = 0
+        self.deleted_turns = 0
+        self.reclaimed_bytes = 0
+        self.last_report: RetentionReport | None = None
+
+    def start(self) -> None:
+        """Start the periodic retention task."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="memory-retention")
+
+    async def close(self) -> None:
+        """Stop the periodic task; a pass in progress is cancelled between chunks."""
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def run_once(self, *, now: datetime | None = None) -> RetentionReport:
+        """Apply the policy once and compact the database."""
+        async with self._lock:
+            started = time.perf_counter()
+            report = await self._apply(now or datetime.now(UTC))
+            compaction = await self._engine.compact(
+                pages_per_step=self.policy.vacuum_pages_per_step
+            )
+            report.reclaimed_bytes = compaction["reclaimed_bytes"]
+            report.freelist_bytes = (
+                compaction["freelist_pages"] * compaction["page_size"]
+            )
+            report.elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+            self.runs += 1
+            self.deleted_turns += report.deleted
+            self.reclaimed_bytes += report.reclaimed_bytes
+            self.last_report = report
+        logger.info(
+            "memory.retention_completed",
+            deleted_observed=report.deleted_observed,
+            deleted_dialogue=report.deleted_dialogue,
+            deleted_by_source=report.deleted_by_source,
+            trimmed=report.trimmed,
+            reclaimed_bytes=report.reclaimed_bytes,
+            freelist_bytes=report.freelist_bytes,
+            elapsed_ms=report.elapsed_ms,
+        )
+        return report
+
+    def stats(self) -> dict[str, float]:
+        last = self.last_report
+        return {
+            "runs": self.runs,
+            "failures": self.failures,
+            "deleted_turns": self.deleted_turns,
+            "reclaimed_bytes": self.reclaimed_bytes,
+            "last_deleted": last.deleted if last else 0,
+            "last_freelist_bytes": last.freelist_bytes if last else 0,
+            "last_elapsed_ms": last.elapsed_ms if last else 0.0,
+        }
+
+    # -- internal helpers ------------------------------------------------
+
+    async def _run(self) -> None:
+        await asyncio.sleep(self.initial_delay_seconds)
+        while True:
+            try:
+                await self.run_once()
+            except (aiosqlite.Error, OSError) as exc:
+                self.failures += 1
+                logger.warning("memory.retention_failed", error=str(exc))
+            await asyncio.sleep(self.interval_seconds)
+
+    async def _apply(self, now: datetime) -> RetentionReport:
+        policy = self.policy
+        chunk_size = policy.chunk_size
+        report = RetentionReport()
+        if policy.observed_max_age_days > 0:
+            report.deleted_observed = await self._store.evict_before(
+                now - timedelta(days=policy.observed_max_age_days),
+                observed_only=True,
+                chunk_size=chunk_size,
+            )
+        for source, max_age_days in policy.source_max_age_days.items():
+            if max_age_days <= 0:
+                continue
+            report.deleted_by_source[source] = await self._store.evict_before(
+                now - timedelta(days=max_age_days),
+                source=source,
+                observed_only=False,
+                chunk_size=chunk_size,
+            )
+        if policy.dialogue_max_age_days > 0:
+            report.deleted_dialogue = await self._store.evict_before(
+                now - timedelta(days=policy.dialogue_max_age_days),
+                exclude_sources=tuple(policy.source_max_age_days),
+                observed_only=False,
+                chunk_size=chunk_size,
+            )
+        if policy.max_turns_per_session > 0:
+            report.trimmed = await self._store.trim_sessions(
+                policy.max_turns_per_session, chunk_size=chunk_size
+            )
+        return report
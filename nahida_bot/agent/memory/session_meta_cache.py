@@ -0,0 +1,164 @@
+"""Write-through LRU of parsed session metadata."""
+
+from __future__ import annotations
+
+import copy
+import itertools
+from collections import OrderedDict
+from typing import Any, NoReturn
+
+DEFAULT_SESSION_META_CACHE_SIZE = 1024
+
+
+def _read_only(*_args: object, **_kwargs: object) -> NoReturn:
+    raise TypeError("session metadata snapshots are read-only; copy with dict()")
+
+
+class FrozenDict(dict[str, Any]):
+    """``dict`` that rejects mutation, shared between readers of a snapshot.
+
+    It still passes ``isinstance(value, dict)`` and serializes with
+    :mod:`json`; ``dict(snapshot)`` or :func:`copy.deepcopy` give a mutable
+    copy.
+    """
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self) -> dict[str, Any]:
+        return dict(self)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> dict[str, Any]:
+        return {key: copy.deepcopy(value, memo) for key, value in self.items()}
+
+
+class FrozenList(list[Any]):
+    """``list`` counterpart of :class:`FrozenDict`."""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __copy__(self) -> list[Any]:
+        return list(self)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> list[Any]:
+        return [copy.deepcopy(value, memo) for value in self]
+
+
+def freeze_metadata(value: Any) -> Any:
+    """Return a read-only deep copy of JSON-like ``value``."""
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze_metadata(item)) for key, item in value.items())
+    if isinstance(value, list | tuple):
+        return FrozenList(freeze_metadata(item) for item in value)
+    return value
+
+
+class SessionMetaCache:
+    """Size-bounded LRU of session metadata snapshots.
+
+    Entries are :class:`FrozenDict` snapshots, so a caller can keep the
+    value for a whole turn and never observe a later update half-applied:
+    writers replace the entry with a new snapshot instead of mutating it.
+    A ``max_sessions`` of ``0`` disables caching.
+
+    Filling the cache after a miss races with writers: a snapshot read
+    before an update commits must not replace the one the update stored.
+    Readers take :meth:`generation` before the database read and store the
+    result with :meth:`fill`, which drops it if a :meth:`put` or
+    :meth:`invalidate` happened in between.
+    """
+
+    def __init__(self, *, max_sessions: int = DEFAULT_SESSION_META_CACHE_SIZE) -> None:
+        self.max_sessions = max(0, max_sessions)
+        self._entries: OrderedDict[str, FrozenDict] = OrderedDict()
+        # Session -> sequence number of its last write; bounded like the
+        # entries. Evicting a counter raises ``_cleared_at`` to its value, so
+        # an untracked session still reads a token at least as new as its
+        # last write and a fill that raced that write gives up.
+        self._sequence = itertools.count(1)
+        self._generations: OrderedDict[str, int] = OrderedDict()
+        self._cleared_at = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.stale_fills = 0
+
+    def get(self, session_id: str) -> FrozenDict | None:
+        entry = self._entries.get(session_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(session_id)
+        self.hits += 1
+        return entry
+
+    def generation(self, session_id: str) -> int:
+        """Return a token that changes whenever ``session_id`` is written."""
+        return max(self._cleared_at, self._generations.get(session_id, 0))
+
+    def put(self, session_id: str, metadata: dict[str, Any]) -> FrozenDict:
+        """Store a snapshot of ``metadata`` written through by an update."""
+        self._bump(session_id)
+        return self._store(session_id, metadata)
+
+    def fill(
+        self, session_id: str, metadata: dict[str, Any], generation: int
+    ) -> FrozenDict:
+        """Cache ``metadata`` read after a miss unless a write raced the read.
+
+        ``generation`` is the :meth:`generation` taken before the read. If it
+        changed, the newer cached snapshot (if any) is returned instead.
+        """
+        if generation != self.generation(session_id):
+            self.stale_fills += 1
+            current = self._entries.get(session_id)
+            return current if current is not None else freeze_metadata(metadata)
+        return self._store(session_id, metadata)
+
+    def invalidate(self, session_id: str | None = None) -> None:
+        """Drop one session's entry, or every entry."""
+        if session_id is None:
+            self._entries.clear()
+            self._generations.clear()
+            self._cleared_at = next(self._sequence)
+        else:
+            self._bump(session_id)
+            self._entries.pop(session_id, None)
+
+    def stats(self) -> dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "sessions": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "stale_fills": self.stale_fills,
+        }
+
+    def _store(self, session_id: str, metadata: dict[str, Any]) -> FrozenDict:
+        snapshot = (
+            metadata if isinstance(metadata, FrozenDict) else freeze_metadata(metadata)
+        )
+        if self.max_sessions <= 0:
+            return snapshot
+        self._entries[session_id] = snapshot
+        self._entries.move_to_end(session_id)
+        while len(self._entries) > self.max_sessions:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return snapshot
+
+    def _bump(self, session_id: str) -> None:
+        if self.max_sessions <= 0:
+            return
+        self._generations[session_id] = next(self._sequence)
+        self._generations.move_to_end(session_id)
+        while len(self._generations) > self.max_sessions:
+            _, evicted = self._generations.popitem(last=False)
+            self._cleared_at = max(self._cleared_at, evicted)
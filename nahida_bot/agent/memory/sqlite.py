@@ -2,13 +2,18 @@
 
 from __future__ import annotations
 
+import json
 import re
 import warnings
+from array import array
+from collections.abc import Sequence
 from dataclasses import replace
 from datetime import UTC, datetime
 from typing import Any
 from uuid import uuid4
 
+import structlog
+
 # FIXME: jieba 0.42.1 emits SyntaxWarning on Python 3.12+ due to invalid escapes.
 # Keep this suppression until we upgrade/patch jieba in a dedicated follow-up.
 # TODO: jieba's dictionary loading costs ~0.5-1s at import time. Even if the
@@ -25,18 +30,29 @@ from nahida_bot.agent.memory.models import (
     MemoryEmbedding,
     MemoryItem,
     MemoryRecord,
+    SessionActivity,
     SessionSummary,
 )
 from nahida_bot.agent.memory.embedding import EmbeddingProvider, memory_text_hash
-from nahida_bot.agent.memory.store import MemoryStore
+from nahida_bot.agent.memory.session_meta_cache import (
+    DEFAULT_SESSION_META_CACHE_SIZE,
+    SessionMetaCache,
+)
+from nahida_bot.agent.memory.store import MemoryStore, TurnListener
 from nahida_bot.agent.memory.vector import (
+    InMemoryVectorIndex,
     VectorIndex,
     VectorRecord,
-    cosine_similarity,
     reciprocal_rank_fusion,
 )
 from nahida_bot.db.engine import DatabaseEngine
 from nahida_bot.db.repositories.sqlite_memory_repo import SQLiteMemoryRepository
+from nahida_bot.db.write_batcher import (
+    DEFAULT_WRITE_BATCH_MAX_DELAY_SECONDS,
+    DEFAULT_WRITE_BATCH_MAX_SIZE,
+)
+
+logger = structlog.get_logger(__name__)
 
 _MIN_KEYWORD_LENGTH = 2
 _CJK_RANGE = re.compile(r"[\u4e00-\u9fff\u3400-\u4dbf\uac00-\ud7af]")
@@ -92,9 +108,7 @@ def build_fts_query(query: str) -> str:
     return " OR ".join(quoted)
 
 
-def _row_to_record(
-    row: dict[str, Any], *, keywords: list[str] | None = None
-) -> MemoryRecord:
+def _row_to_record(row: dict[str, Any]) -> MemoryRecord:
     """Convert a repository row dict into a MemoryRecord."""
     created_at_raw = row.get("created_at", "")
     if isinstance(created_at_raw, str) and created_at_raw:
@@ -116,7 +130,6 @@ def _row_to_record(
             metadata=metadata,
             created_at=created_at,
         ),
-        keywords=list(keywords) if keywords else [],
     )
 
 
@@ -165,7 +178,7 @@ def _row_to_embedding(row: dict[str, Any]) -> MemoryEmbedding:
         else datetime.now(UTC)
     )
     raw_embedding = row.get("embedding")
-    embedding = raw_embedding if isinstance(raw_embedding, list) else []
+    embedding = raw_embedding if isinstance(raw_embedding, list | array) else []
     return MemoryEmbedding(
         embedding_id=str(row.get("embedding_id", "")),
         item_id=str(row.get("item_id", "")),
@@ -212,7 +225,11 @@ def _row_to_candidate(row: dict[str, Any]) -> MemoryCandidate:
 
 def _item_embedding_text(item: MemoryItem) -> str:
     """Build the text payload embedded for a durable memory item."""
-    parts = [item.title.strip(), item.content.strip()]
+    return _embedding_text(item.title, item.content)
+
+
+def _embedding_text(title: str, content: str) -> str:
+    parts = [title.strip(), content.strip()]
     return "\n".join(part for part in parts if part)
 
 
@@ -231,8 +248,58 @@ def _embedding_id_for(
 class SQLiteMemoryStore(MemoryStore):
     """SQLite-backed memory store using the memory repository."""
 
-    def __init__(self, engine: DatabaseEngine) -> None:
-        self._repo = SQLiteMemoryRepository(engine)
+    def __init__(
+        self,
+        engine: DatabaseEngine,
+        *,
+        write_batch_max_delay: float = DEFAULT_WRITE_BATCH_MAX_DELAY_SECONDS,
+        write_batch_max_size: int = DEFAULT_WRITE_BATCH_MAX_SIZE,
+        session_meta_cache_size: int = DEFAULT_SESSION_META_CACHE_SIZE,
+    ) -> None:
+        self._repo = SQLiteMemoryRepository(
+            engine,
+            write_batch_max_delay=write_batch_max_delay,
+            write_batch_max_size=write_batch_max_size,
+            fts_tokenizer=tokenize_for_fts,
+        )
+        self._turn_listeners: list[TurnListener] = []
+        self._session_meta_cache = SessionMetaCache(
+            max_sessions=session_meta_cache_size
+        )
+        # Built-in vector search: one lazily loaded in-process index per
+        # embedding space (provider, model, dimensions).
+        # Keyed by (provider_id, model, dimensions, scope_type, scope_id) so a
+        # top-k search never has to compete with vectors from other scopes.
+        self._local_vector_indexes: dict[
+            tuple[str, str, int, str, str], InMemoryVectorIndex
+        ] = {}
+        # Vectors of archived items already removed from the table; an
+        # external index only sees them on the next :meth:`embed_items`.
+        self._pending_vector_deletes: set[str] = set()
+
+    def write_batch_stats(self) -> dict[str, float]:
+        """Return group-commit counters for turn and session writes."""
+        return self._repo.write_batch_stats()
+
+    async def close(self) -> None:
+        """Commit queued writes; call before the database engine is closed."""
+        await self._repo.close()
+
+    def add_turn_listener(self, listener: TurnListener) -> None:
+        """Register a callback notified after turns are appended or removed."""
+        if listener not in self._turn_listeners:
+            self._turn_listeners.append(listener)
+
+    def remove_turn_listener(self, listener: TurnListener) -> None:
+        """Unregister a callback added with :meth:`add_turn_listener`."""
+        if listener in self._turn_listeners:
+            self._turn_listeners.remove(listener)
+
+    def _notify_turns(
+        self, session_id: str | None, record: MemoryRecord | None
+    ) -> None:
+        for listener in list(self._turn_listeners):
+            listener(session_id, record)
 
     async def ensure_session(
         self, session_id: str, workspace_id: str | None = None
@@ -241,59 +308,120 @@ class SQLiteMemoryStore(MemoryStore):
         await self._repo.ensure_session(session_id, workspace_id)
 
     async def append_turn(self, session_id: str, turn: ConversationTurn) -> int:
-        """Store a conversation turn with auto-extracted keywords."""
-        keywords = extract_keywords(turn.content)
-        return await self._repo.append_turn(
+        """Store a conversation turn and index it for full-text search."""
+        turn_id = await self._repo.append_turn(
             session_id,
             role=turn.role,
             content=turn.content,
             source=turn.source,
             metadata=turn.metadata,
-            keywords=keywords,
         )
+        if self._turn_listeners:
+            # Round-trip metadata so listeners see what get_recent would return
+            # and cannot alias the caller's dict.
+            metadata = (
+                json.loads(json.dumps(turn.metadata, ensure_ascii=False))
+                if turn.metadata
+                else None
+            )
+            self._notify_turns(
+                session_id,
+                MemoryRecord(
+                    turn_id=turn_id,
+                    session_id=session_id,
+                    turn=replace(turn, metadata=metadata),
+                ),
+            )
+        return turn_id
 
     async def search(
         self, session_id: str, query: str, *, limit: int = 10
     ) -> list[MemoryRecord]:
-        """Search by query keywords with multi-keyword OR aggregation.
+        """Search turns by BM25 rank over the FTS5 turn index.
 
-        Falls back to time-ordered retrieval when no keyword matches.
+        Falls back to time-ordered retrieval when nothing matches.
         """
-        query_keywords = extract_keywords(query)
-        if query_keywords:
-            rows = await self._repo.search_by_keywords(
-                session_id, query_keywords, limit=limit
-            )
+        fts_query = build_fts_query(query)
+        if fts_query:
+            rows = await self._repo.search_turns(session_id, fts_query, limit=limit)
             if rows:
-                turn_ids = [row["id"] for row in rows]
-                kw_map = await self._repo.get_keywords_for_turns(turn_ids)
-                return [
-                    _row_to_record(row, keywords=kw_map.get(row["id"], []))
-                    for row in rows
-                ]
+                return [_row_to_record(row) for row in rows]
 
         # Fallback: return recent turns when no keyword match.
         rows = await self._repo.get_recent_turns(session_id, limit=limit)
-        turn_ids = [row["id"] for row in rows]
-        kw_map = await self._repo.get_keywords_for_turns(turn_ids)
-        return [_row_to_record(row, keywords=kw_map.get(row["id"], [])) for row in rows]
+        return [_row_to_record(row) for row in rows]
 
     async def get_recent(
         self, session_id: str, *, limit: int = 50
     ) -> list[MemoryRecord]:
-        """Retrieve recent turns in chronological order with keywords."""
+        """Retrieve recent turns in chronological order."""
         rows = await self._repo.get_recent_turns(session_id, limit=limit)
-        turn_ids = [row["id"] for row in rows]
-        kw_map = await self._repo.get_keywords_for_turns(turn_ids)
-        return [_row_to_record(row, keywords=kw_map.get(row["id"], [])) for row in rows]
+        return [_row_to_record(row) for row in rows]
+
+    async def backfill_turn_index(self, *, chunk_size: int = 500) -> int:
+        """Index turns stored before the FTS turn index existed.
 
-    async def evict_before(self, cutoff: datetime) -> int:
-        """Delete turns older than cutoff datetime."""
-        return await self._repo.delete_turns_before(cutoff)
+        Runs chunk by chunk (newest turns first) until nothing is left and
+        returns the number of turns processed.
+        """
+        total = 0
+        while processed := await self._repo.backfill_turn_index(chunk_size=chunk_size):
+            total += processed
+            logger.debug("memory.turn_index_backfill_progress", processed=total)
+        if total:
+            logger.info("memory.turn_index_backfill_completed", processed=total)
+        return total
+
+    async def rebuild_turn_index(self, *, chunk_size: int = 500) -> int:
+        """Re-index every turn, e.g. after the tokenizer or its dictionary changed."""
+        await self._repo.rebuild_turn_index()
+        return await self.backfill_turn_index(chunk_size=chunk_size)
+
+    async def evict_before(
+        self,
+        cutoff: datetime,
+        *,
+        source: str | None = None,
+        exclude_sources: Sequence[str] = (),
+        observed_only: bool | None = None,
+        chunk_size: int = 500,
+    ) -> int:
+        """Delete turns older than cutoff datetime.
+
+        The filters select turns by source or by whether they were only
+        observed in a group chat; see
+        :meth:`SQLiteMemoryRepository.delete_turns_before`.
+        """
+        deleted = await self._repo.delete_turns_before(
+            cutoff,
+            source=source,
+            exclude_sources=exclude_sources,
+            observed_only=observed_only,
+            chunk_size=chunk_size,
+        )
+        if deleted:
+            self._notify_turns(None, None)
+        return deleted
+
+    async def trim_sessions(self, max_turns: int, *, chunk_size: int = 500) -> int:
+        """Keep only the newest ``max_turns`` turns of every session."""
+        deleted = 0
+        for session_id, _count in await self._repo.list_sessions_over_turn_limit(
+            max_turns
+        ):
+            trimmed = await self._repo.trim_session_turns(
+                session_id, max_turns, chunk_size=chunk_size
+            )
+            if trimmed:
+                self._notify_turns(session_id, None)
+            deleted += trimmed
+        return deleted
 
     async def clear_session(self, session_id: str) -> int:
-        """Delete all turns and keywords for a session."""
-        return await self._repo.clear_session_turns(session_id)
+        """Delete all turns for a session."""
+        deleted = await self._repo.clear_session_turns(session_id)
+        self._notify_turns(session_id, None)
+        return deleted
 
     async def list_sessions(self, *, limit: int = 50) -> list[SessionSummary]:
         """List sessions with turn counts."""
@@ -310,15 +438,60 @@ class SQLiteMemoryStore(MemoryStore):
             for r in rows
         ]
 
+    async def list_sessions_for_dreaming(
+        self, *, min_new_turns: int = 2, limit: int = 20
+    ) -> list[SessionActivity]:
+        """List recently active sessions with at least ``min_new_turns`` new turns.
+
+        Served from the per-session stats table, so the cost does not grow
+        with the number of stored turns.
+        """
+        rows = await self._repo.list_sessions_for_dreaming(
+            min_new_turns=min_new_turns, limit=limit
+        )
+        return [
+            SessionActivity(
+                session_id=r["session_id"],
+                workspace_id=r.get("workspace_id"),
+                turn_count=int(r["turn_count"]),
+                last_turn_id=int(r["last_turn_id"]),
+                last_turn_at=r.get("last_turn_at", ""),
+                last_dream_turn_id=int(r["last_dream_turn_id"]),
+                pending_dream_turns=int(r["pending_dream_turns"]),
+            )
+            for r in rows
+        ]
+
+    async def mark_session_dreamed(self, session_id: str, turn_id: int) -> None:
+        """Record that turns up to ``turn_id`` have been dreamed over."""
+        await self._repo.mark_session_dreamed(session_id, turn_id)
+
     async def get_session_meta(self, session_id: str) -> dict[str, Any]:
-        """Get session metadata."""
-        return await self._repo.get_session_metadata(session_id)
+        """Get a read-only snapshot of session metadata.
+
+        Snapshots are cached and shared; copy with ``dict()`` before
+        modifying one.
+        """
+        cached = self._session_meta_cache.get(session_id)
+        if cached is not None:
+            return cached
+        generation = self._session_meta_cache.generation(session_id)
+        metadata = await self._repo.get_session_metadata(session_id)
+        return self._session_meta_cache.fill(session_id, metadata, generation)
 
     async def update_session_meta(
         self, session_id: str, updates: dict[str, Any]
     ) -> None:
-        """Merge updates into session metadata."""
-        await self._repo.update_session_metadata(session_id, updates)
+        """Merge updates into session metadata and refresh the cached snapshot."""
+        merged = await self._repo.update_session_metadata(session_id, updates)
+        if merged is None:
+            self._session_meta_cache.invalidate(session_id)
+        else:
+            self._session_meta_cache.put(session_id, merged)
+
+    def session_meta_cache_stats(self) -> dict[str, float]:
+        """Return hit-rate counters for the session metadata cache."""
+        return self._session_meta_cache.stats()
 
     async def persist_active_session(self, chat_key: str, session_id: str) -> None:
         """Persist the active session override for a chat key."""
@@ -392,7 +565,15 @@ class SQLiteMemoryStore(MemoryStore):
 
     async def archive_item(self, item_id: str) -> bool:
         """Archive a durable memory item."""
-        return await self._repo.archive_memory_item(item_id)
+        archived = await self._repo.archive_memory_item(item_id)
+        if archived:
+            embedding_ids = await self._repo.list_memory_embedding_ids_for_item(item_id)
+            if embedding_ids:
+                await self._repo.delete_memory_embeddings_for_item(item_id)
+                self._pending_vector_deletes.update(embedding_ids)
+            for index in self._local_vector_indexes.values():
+                await index.delete_items([item_id])
+        return archived
 
     async def append_candidate(
         self,
@@ -462,26 +643,113 @@ class SQLiteMemoryStore(MemoryStore):
             model=model,
             content_hash=content_hash,
         )
-        await self._repo.upsert_memory_embedding(
-            embedding_id=embedding_id,
-            item_id=item_id,
-            provider_id=provider_id,
-            model=model,
-            dimensions=len(embedding),
-            content_hash=content_hash,
-            embedding=embedding,
+        await self._upsert_embeddings(
+            [
+                {
+                    "embedding_id": embedding_id,
+                    "item_id": item_id,
+                    "provider_id": provider_id,
+                    "model": model,
+                    "dimensions": len(embedding),
+                    "content_hash": content_hash,
+                    "embedding": embedding,
+                }
+            ],
+            vector_index=vector_index,
         )
+        return embedding_id
+
+    async def _upsert_embeddings(
+        self,
+        rows: list[dict[str, Any]],
+        *,
+        vector_index: VectorIndex | None,
+    ) -> None:
+        """Write embedding rows in one transaction, then mirror them to indexes."""
+        await self._repo.upsert_memory_embeddings(rows)
+        records = [
+            VectorRecord(
+                embedding_id=row["embedding_id"],
+                item_id=row["item_id"],
+                embedding=row["embedding"],
+            )
+            for row in rows
+        ]
+        if vector_index is not None and records:
+            await vector_index.upsert(records)
+        if not self._local_vector_indexes or not records:
+            return
+        scope_by_id = {
+            str(item["item_id"]): (str(item["scope_type"]), str(item["scope_id"]))
+            for item in await self._repo.get_memory_items_by_ids(
+                list({row["item_id"] for row in rows})
+            )
+        }
+        by_space: dict[tuple[str, str, int, str, str], list[VectorRecord]] = {}
+        for row, record in zip(rows, records, strict=True):
+            scope = scope_by_id.get(row["item_id"])
+            if scope is None:
+                continue
+            key = (row["provider_id"], row["model"], row["dimensions"], *scope)
+            by_space.setdefault(key, []).append(record)
+        for key, space_records in by_space.items():
+            local_index = self._local_vector_indexes.get(key)
+            if local_index is not None:
+                await local_index.upsert(space_records)
+
+    async def _delete_embeddings(
+        self,
+        embedding_ids: list[str],
+        *,
+        vector_index: VectorIndex | None,
+    ) -> None:
+        """Remove embeddings from the table, local indexes and ``vector_index``."""
+        if not embedding_ids:
+            return
+        await self._repo.delete_memory_embeddings(embedding_ids)
         if vector_index is not None:
-            await vector_index.upsert(
-                [
+            await vector_index.delete(embedding_ids)
+        for index in self._local_vector_indexes.values():
+            await index.delete(embedding_ids)
+
+    def _local_vector_index(
+        self,
+        provider_id: str,
+        model: str,
+        dimensions: int,
+        *,
+        scope_type: str,
+        scope_id: str,
+    ) -> InMemoryVectorIndex:
+        """Return the in-process index for an embedding space and scope.
+
+        The index is loaded on first search.
+        """
+        key = (provider_id, model, dimensions, scope_type, scope_id)
+        index = self._local_vector_indexes.get(key)
+        if index is None:
+
+            async def load() -> list[VectorRecord]:
+                rows = await self._repo.list_memory_embedding_vectors(
+                    provider_id=provider_id,
+                    model=model,
+                    dimensions=dimensions,
+                    scope_type=scope_type,
+                    scope_id=scope_id,
+                )
+                return [
                     VectorRecord(
-                        embedding_id=embedding_id,
-                        item_id=item_id,
-                        embedding=embedding,
+                        embedding_id=str(row["embedding_id"]),
+                        item_id=str(row["item_id"]),
+                        embedding=row["embedding"],
                     )
+                    for row in rows
+                    if len(row["embedding"]) == dimensions
                 ]
-            )
-        return embedding_id
+
+            index = InMemoryVectorIndex(loader=load)
+            self._local_vector_indexes[key] = index
+        return index
 
     async def embed_items(
         self,
@@ -492,29 +760,83 @@ class SQLiteMemoryStore(MemoryStore):
         limit: int = 100,
         vector_index: VectorIndex | None = None,
     ) -> int:
-        """Embed recent active memory items for a scope."""
-        items = await self.search_items(
-            "",
+        """Embed active memory items whose content changed since the last run.
+
+        Stored ``content_hash`` values for ``provider``'s model are diffed
+        against the current item text, so only new or edited items (at most
+        ``limit`` per call, most important first) reach the provider. Vectors
+        of superseded content and of archived items are deleted from the
+        table, the in-process indexes and ``vector_index``. Returns the number
+        of items embedded; callers may loop while it equals ``limit``.
+        """
+        await self._prune_inactive_embeddings(vector_index)
+        rows = await self._repo.list_memory_embedding_state(
             scope_type=scope_type,
             scope_id=scope_id,
-            limit=limit,
+            provider_id=provider.provider_id,
+            model=provider.model,
         )
-        texts = [_item_embedding_text(item) for item in items]
-        results = await provider.embed_texts(texts)
-        count = 0
-        for item, text, result in zip(items, texts, results, strict=False):
+        stored: dict[str, dict[str, str]] = {}
+        texts_by_id: dict[str, str] = {}
+        for row in rows:
+            item_id = str(row["item_id"])
+            texts_by_id.setdefault(
+                item_id,
+                _embedding_text(str(row["title"] or ""), str(row["content"] or "")),
+            )
+            hashes = stored.setdefault(item_id, {})
+            if row["embedding_id"] is not None:
+                hashes[str(row["content_hash"])] = str(row["embedding_id"])
+
+        pending: list[tuple[str, str, str]] = []
+        for item_id, text in texts_by_id.items():
+            if len(pending) >= limit:
+                break
+            content_hash = memory_text_hash(text)
+            if content_hash not in stored[item_id]:
+                pending.append((item_id, text, content_hash))
+        if not pending:
+            return 0
+
+        results = await provider.embed_texts([text for _, text, _ in pending])
+        upserts: list[dict[str, Any]] = []
+        superseded: list[str] = []
+        for (item_id, _text, content_hash), result in zip(
+            pending, results, strict=False
+        ):
             if not result.embedding:
                 continue
-            await self.upsert_item_embedding(
-                item.item_id,
-                result.embedding,
-                provider_id=result.provider_id,
-                model=result.model,
-                content_hash=memory_text_hash(text),
-                vector_index=vector_index,
+            upserts.append(
+                {
+                    "embedding_id": _embedding_id_for(
+                        item_id=item_id,
+                        provider_id=result.provider_id,
+                        model=result.model,
+                        content_hash=content_hash,
+                    ),
+                    "item_id": item_id,
+                    "provider_id": result.provider_id,
+                    "model": result.model,
+                    "dimensions": len(result.embedding),
+                    "content_hash": content_hash,
+                    "embedding": result.embedding,
+                }
             )
-            count += 1
-        return count
+            superseded.extend(stored[item_id].values())
+        await self._upsert_embeddings(upserts, vector_index=vector_index)
+        await self._delete_embeddings(superseded, vector_index=vector_index)
+        return len(upserts)
+
+    async def _prune_inactive_embeddings(
+        self, vector_index: VectorIndex | None
+    ) -> None:
+        """Drop vectors of archived items that an earlier call left behind."""
+        pending = sorted(self._pending_vector_deletes)
+        self._pending_vector_deletes.clear()
+        if vector_index is not None and pending:
+            await vector_index.delete(pending)
+        stale = await self._repo.list_inactive_memory_embedding_ids()
+        await self._delete_embeddings(stale, vector_index=vector_index)
 
     async def search_items_vector(
         self,
@@ -526,60 +848,42 @@ class SQLiteMemoryStore(MemoryStore):
         limit: int = 10,
         vector_index: VectorIndex | None = None,
     ) -> list[MemoryItem]:
-        """Search memory items by cosine similarity over persisted embeddings."""
+        """Search memory items by cosine similarity over persisted embeddings.
+
+        Without an explicit ``vector_index`` the store's in-process index for
+        the query's embedding space and the requested scope is used. An
+        explicit ``vector_index`` may span scopes, so its hits are filtered
+        after the lookup.
+        """
         embedded = await provider.embed_texts([query])
         if not embedded or not embedded[0].embedding:
             return []
         query_embedding = embedded[0].embedding
 
-        if vector_index is not None:
-            hits = await vector_index.search(
-                query_embedding, limit=max(limit * 3, limit)
-            )
-            if not hits:
-                return []
-            score_by_id = {hit.item_id: hit.score for hit in hits}
-            rows = await self._repo.get_memory_items_by_ids(
-                [hit.item_id for hit in hits]
-            )
-            items = [
-                replace(
-                    _row_to_item(row),
-                    score=score_by_id.get(str(row["item_id"]), 0.0),
-                )
-                for row in rows
-                if row.get("scope_type") == scope_type
-                and row.get("scope_id") == scope_id
-            ]
-            return items[:limit]
-
-        rows = await self._repo.list_memory_embeddings(
-            provider_id=embedded[0].provider_id,
-            model=embedded[0].model,
-            dimensions=len(query_embedding),
+        index: VectorIndex = vector_index or self._local_vector_index(
+            embedded[0].provider_id,
+            embedded[0].model,
+            len(query_embedding),
             scope_type=scope_type,
             scope_id=scope_id,
         )
-        embeddings = [_row_to_embedding(row) for row in rows]
-        ranked = sorted(
-            (
-                (
-                    embedding.item_id,
-                    cosine_similarity(query_embedding, embedding.embedding),
-                )
-                for embedding in embeddings
-            ),
-            key=lambda item: item[1],
-            reverse=True,
-        )[:limit]
-        rows_by_rank = await self._repo.get_memory_items_by_ids(
-            [item_id for item_id, _score in ranked]
-        )
-        score_by_id = {item_id: score for item_id, score in ranked}
-        return [
-            replace(_row_to_item(row), score=score_by_id.get(str(row["item_id"]), 0.0))
-            for row in rows_by_rank
+        hits = await index.search(query_embedding, limit=max(limit * 3, limit))
+        if not hits:
+            return []
+        score_by_id: dict[str, float] = {}
+        for hit in hits:
+            # An item may have several vectors (older content hashes).
+            score_by_id.setdefault(hit.item_id, hit.score)
+        rows = await self._repo.get_memory_items_by_ids(list(score_by_id))
+        items = [
+            replace(
+                _row_to_item(row),
+                score=score_by_id.get(str(row["item_id"]), 0.0),
+            )
+            for row in rows
+            if row.get("scope_type") == scope_type and row.get("scope_id") == scope_id
         ]
+        return items[:limit]
 
     async def search_items_hybrid(
         self,
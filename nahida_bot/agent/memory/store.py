@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections.abc import Callable
 from datetime import datetime
 
 from typing import Any
@@ -13,6 +14,14 @@ from nahida_bot.agent.memory.models import (
     SessionSummary,
 )
 
+TurnListener = Callable[[str | None, MemoryRecord | None], None]
+"""Callback for turn writes.
+
+Called with ``(session_id, record)`` after a turn is appended,
+``(session_id, None)`` after a session's turns are removed and
+``(None, None)`` after turns are removed across sessions.
+"""
+
 
 class MemoryStore(ABC):
     """Abstract base class for memory persistence backends."""
@@ -50,7 +59,7 @@ class MemoryStore(ABC):
 
     @abstractmethod
     async def clear_session(self, session_id: str) -> int:
-        """Delete all turns and keywords for a session. Returns deleted turn count."""
+        """Delete all turns for a session. Returns deleted turn count."""
         raise NotImplementedError
 
     @abstractmethod
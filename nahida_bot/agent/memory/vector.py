@@ -2,10 +2,15 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import heapq
 import json
 import math
+from array import array
+from collections.abc import Awaitable, Callable, Sequence
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any, Protocol, cast
+from typing import TYPE_CHECKING, Any, Protocol
 
 if TYPE_CHECKING:
     from nahida_bot.db.engine import DatabaseEngine
@@ -17,7 +22,7 @@ class VectorRecord:
 
     embedding_id: str
     item_id: str
-    embedding: list[float]
+    embedding: Sequence[float]
 
 
 @dataclass(slots=True, frozen=True)
@@ -90,12 +95,15 @@ class SQLiteVecIndex:
         except ImportError as exc:
             raise RuntimeError("sqlite-vec is not installed") from exc
 
-        await self._engine.db.enable_load_extension(True)
-        try:
-            raw_conn = cast(Any, self._engine.db)._conn
-            await cast(Any, self._engine.db)._execute(sqlite_vec.load, raw_conn)
-        finally:
-            await self._engine.db.enable_load_extension(False)
+        async def load_extension(conn: Any) -> None:
+            await conn.enable_load_extension(True)
+            try:
+                await conn._execute(sqlite_vec.load, conn._conn)
+            finally:
+                await conn.enable_load_extension(False)
+
+        # vec0 queries may run on any pooled reader connection.
+        await self._engine.configure_connections(load_extension)
 
         async with self._engine.write_lock:
             await self._engine.execute(
@@ -195,6 +203,217 @@ class SQLiteVecIndex:
         return serialize_float32(embedding)
 
 
+class InMemoryVectorIndex:
+    """Process-local cosine index over one contiguous float32 matrix.
+
+    Rows are L2-normalized on insert, so a search is a single matrix-vector
+    product followed by a top-k selection. With NumPy installed the matrix is
+    an ``ndarray`` and selection uses ``argpartition``; without it rows live in
+    a flat ``array('f')`` scored with :func:`math.sumprod` and ``heapq``.
+
+    When a ``loader`` is given, the index fills itself from it on first use
+    and is kept current afterwards through :meth:`upsert` and :meth:`delete`.
+    All vectors in one index must share a dimensionality.
+    """
+
+    def __init__(
+        self,
+        *,
+        loader: Callable[[], Awaitable[list[VectorRecord]]] | None = None,
+        use_numpy: bool | None = None,
+    ) -> None:
+        self._loader = loader
+        self._loaded = loader is None
+        self._load_lock = asyncio.Lock()
+        self._np = _numpy() if use_numpy is not False else None
+        if use_numpy and self._np is None:
+            raise RuntimeError("numpy is not installed")
+        self._dimensions = 0
+        self._size = 0
+        self._embedding_ids: list[str] = []
+        self._item_ids: list[str] = []
+        self._row_by_id: dict[str, int] = {}
+        self._matrix: Any = None
+        self._rows = array("f")
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def dimensions(self) -> int:
+        return self._dimensions
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the vector matrix, including spare capacity."""
+        if self._matrix is not None:
+            return int(self._matrix.nbytes)
+        return self._rows.itemsize * len(self._rows)
+
+    async def upsert(self, records: list[VectorRecord]) -> None:
+        await self._ensure_loaded()
+        self._upsert(records)
+
+    async def delete(self, ids: list[str]) -> None:
+        await self._ensure_loaded()
+        for embedding_id in ids:
+            self._remove_row(embedding_id)
+
+    async def delete_items(self, item_ids: list[str]) -> None:
+        """Delete every vector belonging to the given memory items."""
+        await self._ensure_loaded()
+        wanted = set(item_ids)
+        doomed = [
+            self._embedding_ids[row]
+            for row in range(self._size)
+            if self._item_ids[row] in wanted
+        ]
+        for embedding_id in doomed:
+            self._remove_row(embedding_id)
+
+    async def search(
+        self, query_embedding: list[float], *, limit: int
+    ) -> list[VectorHit]:
+        await self._ensure_loaded()
+        if limit <= 0 or self._size == 0 or len(query_embedding) != self._dimensions:
+            return []
+        k = min(limit, self._size)
+        if self._np is not None:
+            ranked = self._search_numpy(query_embedding, k)
+        else:
+            ranked = self._search_python(query_embedding, k)
+        return [
+            VectorHit(item_id=self._item_ids[row], score=score) for row, score in ranked
+        ]
+
+    # -- internal helpers ------------------------------------------------
+
+    async def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if self._loaded or self._loader is None:
+                return
+            self._upsert(await self._loader())
+            self._loaded = True
+
+    def _upsert(self, records: list[VectorRecord]) -> None:
+        for record in records:
+            if not record.embedding:
+                continue
+            if self._dimensions == 0:
+                self._dimensions = len(record.embedding)
+            elif len(record.embedding) != self._dimensions:
+                raise ValueError(
+                    f"vector has {len(record.embedding)} dimensions, "
+                    f"index expects {self._dimensions}"
+                )
+            row = self._row_by_id.get(record.embedding_id)
+            if row is None:
+                row = self._append_row(record.embedding_id, record.item_id)
+            else:
+                self._item_ids[row] = record.item_id
+            self._write_row(row, record.embedding)
+
+    def _append_row(self, embedding_id: str, item_id: str) -> int:
+        row = self._size
+        dims = self._dimensions
+        if self._np is not None:
+            np = self._np
+            if self._matrix is None:
+                self._matrix = np.zeros((16, dims), dtype=np.float32)
+            elif row >= self._matrix.shape[0]:
+                grown = np.zeros((self._matrix.shape[0] * 2, dims), dtype=np.float32)
+                grown[:row] = self._matrix[:row]
+                self._matrix = grown
+        else:
+            self._rows.frombytes(bytes(self._rows.itemsize * dims))
+        self._embedding_ids.append(embedding_id)
+        self._item_ids.append(item_id)
+        self._row_by_id[embedding_id] = row
+        self._size += 1
+        return row
+
+    def _write_row(self, row: int, embedding: Sequence[float]) -> None:
+        dims = self._dimensions
+        if self._np is not None:
+            np = self._np
+            vector = np.asarray(embedding, dtype=np.float32)
+            norm = float(np.linalg.norm(vector))
+            self._matrix[row] = vector / norm if norm > 0 else 0.0
+            return
+        norm = math.sqrt(math.sumprod(embedding, embedding))
+        scale = 1.0 / norm if norm > 0 else 0.0
+        self._rows[row * dims : (row + 1) * dims] = array(
+            "f", [value * scale for value in embedding]
+        )
+
+    def _remove_row(self, embedding_id: str) -> None:
+        """Delete a row by moving the last row into its slot."""
+        row = self._row_by_id.pop(embedding_id, None)
+        if row is None:
+            return
+        last = self._size - 1
+        dims = self._dimensions
+        if row != last:
+            moved_id = self._embedding_ids[last]
+            self._embedding_ids[row] = moved_id
+            self._item_ids[row] = self._item_ids[last]
+            self._row_by_id[moved_id] = row
+            if self._np is not None:
+                self._matrix[row] = self._matrix[last]
+            else:
+                self._rows[row * dims : (row + 1) * dims] = self._rows[
+                    last * dims : (last + 1) * dims
+                ]
+        self._embedding_ids.pop()
+        self._item_ids.pop()
+        if self._np is None:
+            del self._rows[last * dims :]
+        self._size = last
+
+    def _search_numpy(
+        self, query_embedding: list[float], k: int
+    ) -> list[tuple[int, float]]:
+        np = self._np
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(query))
+        if norm == 0:
+            return []
+        scores = self._matrix[: self._size] @ (query / norm)
+        if k < self._size:
+            top = np.argpartition(scores, self._size - k)[self._size - k :]
+        else:
+            top = np.arange(self._size)
+        order = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(row), float(scores[row])) for row in order]
+
+    def _search_python(
+        self, query_embedding: list[float], k: int
+    ) -> list[tuple[int, float]]:
+        norm = math.sqrt(math.sumprod(query_embedding, query_embedding))
+        if norm == 0:
+            return []
+        query = [value / norm for value in query_embedding]
+        dims = self._dimensions
+        rows = self._rows
+        scores = [
+            math.sumprod(rows[start : start + dims], query)
+            for start in range(0, self._size * dims, dims)
+        ]
+        top = heapq.nlargest(k, range(self._size), key=scores.__getitem__)
+        return [(row, scores[row]) for row in top]
+
+
+@functools.cache
+def _numpy() -> Any | None:
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
 def cosine_similarity(left: list[float], right: list[float]) -> float:
     """Return cosine similarity for two vectors."""
     if not left or not right or len(left) != len(right):
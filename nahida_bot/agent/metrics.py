@@ -43,6 +43,22 @@ class ToolCallRecord:
     retryable: bool = False
 
 
+@dataclass(slots=True, frozen=True)
+class ToolBatchRecord:
+    """Snapshot of one concurrently executed batch of tool calls."""
+
+    trace_id: str
+    step: int
+    tool_count: int
+    wall_seconds: float
+    sequential_seconds: float
+
+    @property
+    def saved_seconds(self) -> float:
+        """Wall time saved compared with running the batch sequentially."""
+        return max(0.0, self.sequential_seconds - self.wall_seconds)
+
+
 @dataclass(slots=True, frozen=True)
 class ContextPruneRecord:
     """Snapshot of a context window pruning event."""
@@ -100,6 +116,7 @@ class Trace:
 
     provider_calls: list[ProviderCallRecord] = field(default_factory=list)
     tool_calls: list[ToolCallRecord] = field(default_factory=list)
+    tool_batches: list[ToolBatchRecord] = field(default_factory=list)
     context_prunes: list[ContextPruneRecord] = field(default_factory=list)
     media_resolves: list[MediaResolveRecord] = field(default_factory=list)
     image_fallbacks: list[ImageFallbackRecord] = field(default_factory=list)
@@ -179,6 +196,25 @@ class MetricsCollector:
             )
         )
 
+    def record_tool_batch(
+        self,
+        trace: Trace,
+        *,
+        step: int,
+        tool_count: int,
+        wall_seconds: float,
+        sequential_seconds: float,
+    ) -> None:
+        trace.tool_batches.append(
+            ToolBatchRecord(
+                trace_id=trace.trace_id,
+                step=step,
+                tool_count=tool_count,
+                wall_seconds=wall_seconds,
+                sequential_seconds=sequential_seconds,
+            )
+        )
+
     def record_context_prune(
         self,
         trace: Trace,
@@ -276,6 +312,25 @@ class MetricsCollector:
         succeeded = sum(1 for t in self._traces for rec in t.tool_calls if rec.success)
         return succeeded / total
 
+    def tool_parallelism_stats(self) -> dict[str, float]:
+        """Return aggregate wall time saved by parallel tool batches."""
+        batches = [rec for trace in self._traces for rec in trace.tool_batches]
+        if not batches:
+            return {
+                "batches": 0.0,
+                "tool_calls": 0.0,
+                "wall_seconds": 0.0,
+                "sequential_seconds": 0.0,
+                "saved_seconds": 0.0,
+            }
+        return {
+            "batches": float(len(batches)),
+            "tool_calls": float(sum(rec.tool_count for rec in batches)),
+            "wall_seconds": sum(rec.wall_seconds for rec in batches),
+            "sequential_seconds": sum(rec.sequential_seconds for rec in batches),
+            "saved_seconds": sum(rec.saved_seconds for rec in batches),
+        }
+
     def provider_error_rate(self) -> float:
         """Return fraction of provider calls that errored (0.0 – 1.0)."""
         total = sum(len(t.provider_calls) for t in self._traces)
@@ -4,6 +4,7 @@ from nahida_bot.agent.providers.base import (
     ChatProvider,
     ModelCapabilities,
     ProviderResponse,
+    ProviderStreamDelta,
     TokenUsage,
     ToolCall,
     ToolDefinition,
@@ -33,6 +34,8 @@ from nahida_bot.agent.providers.registry import (
     register_runtime_provider,
     unregister_runtime_provider,
 )
+from nahida_bot.agent.providers.failover import FailoverPolicy, FailoverProvider
+from nahida_bot.agent.providers.ratelimit import ProviderRateLimiter
 from nahida_bot.agent.providers.router import ModelRouter, RoutedModel
 
 # Import provider subclasses to trigger @register_provider decorators.
@@ -47,6 +50,8 @@ import nahida_bot.agent.providers.openai_responses as _openai_responses  # noqa:
 __all__ = [
     "AnthropicProvider",
     "ChatProvider",
+    "FailoverPolicy",
+    "FailoverProvider",
     "ModelCapabilities",
     "ModelRouter",
     "OpenAICompatibleProvider",
@@ -56,7 +61,9 @@ __all__ = [
     "ProviderDescriptor",
     "ProviderError",
     "ProviderRateLimitError",
+    "ProviderRateLimiter",
     "ProviderResponse",
+    "ProviderStreamDelta",
     "RoutedModel",
     "ProviderTimeoutError",
     "ProviderTransportError",
@@ -9,6 +9,7 @@ inherit from ``OpenAICompatibleProvider``.
 from __future__ import annotations
 
 import json
+from collections.abc import AsyncIterator
 from dataclasses import dataclass, field
 
 import httpx
@@ -18,6 +19,7 @@ from nahida_bot.agent.context import ContextMessage, ContextPart
 from nahida_bot.agent.providers.base import (
     ChatProvider,
     ProviderResponse,
+    ProviderStreamDelta,
     TokenUsage,
     ToolCall,
     ToolDefinition,
@@ -29,6 +31,7 @@ from nahida_bot.agent.providers.errors import (
     ProviderTimeoutError,
     ProviderTransportError,
 )
+from nahida_bot.agent.providers.ratelimit import parse_retry_after
 from nahida_bot.agent.providers.registry import register_provider
 from nahida_bot.agent.tokenization import Tokenizer
 
@@ -60,27 +63,33 @@ class AnthropicProvider(ChatProvider):
     model: str
     name: str = "anthropic"
     api_family: str = "anthropic-messages"
+    image_token_model: str = "anthropic_pixels"
     max_tokens: int = 4096
     stream_responses: bool = False
     tokenizer_impl: Tokenizer | None = None
     _client: httpx.AsyncClient | None = field(default=None, init=False, repr=False)
+    _owns_client: bool = field(default=True, init=False, repr=False)
 
     @property
     def tokenizer(self) -> Tokenizer | None:
         return self.tokenizer_impl
 
+    def bind_http_client(self, client: httpx.AsyncClient) -> None:
+        """Send requests through a shared client owned by the caller."""
+        self._client = client
+        self._owns_client = False
+
     def _ensure_client(self) -> httpx.AsyncClient:
-        # TODO: Same lifecycle issue as OpenAICompatibleProvider — see its
-        # _ensure_client TODO for details.
         if self._client is None or self._client.is_closed:
             self._client = httpx.AsyncClient()
+            self._owns_client = True
         return self._client
 
     async def close(self) -> None:
-        """Close the underlying HTTP client."""
-        if self._client is not None and not self._client.is_closed:
-            await self._client.aclose()
-            self._client = None
+        """Close the underlying HTTP client if this provider owns it."""
+        client, self._client = self._client, None
+        if client is not None and self._owns_client and not client.is_closed:
+            await client.aclose()
 
     # ------------------------------------------------------------------
     # format_tools: Anthropic uses ``input_schema`` instead of ``parameters``
@@ -283,6 +292,24 @@ class AnthropicProvider(ChatProvider):
         model: str | None = None,
     ) -> ProviderResponse:
         """Call the Anthropic Messages API."""
+        return await self._collect_stream_response(
+            self.chat_stream(
+                messages=messages,
+                tools=tools,
+                timeout_seconds=timeout_seconds,
+                model=model,
+            )
+        )
+
+    async def chat_stream(
+        self,
+        *,
+        messages: list[ContextMessage],
+        tools: list[ToolDefinition] | None = None,
+        timeout_seconds: float | None = None,
+        model: str | None = None,
+    ) -> AsyncIterator[ProviderStreamDelta]:
+        """Call the Messages API, yielding content-block deltas when streaming."""
         system_prompt, serialized_messages = self._serialize_messages_anthropic(
             messages
         )
@@ -325,13 +352,16 @@ class AnthropicProvider(ChatProvider):
             )
             client = self._ensure_client()
             if self.stream_responses:
-                body = await self._stream_messages(
+                body: dict[str, object] = {}
+                async for delta in self._stream_messages(
                     client=client,
                     endpoint=endpoint,
                     payload=payload,
                     headers=headers,
                     timeout=timeout,
-                )
+                    body=body,
+                ):
+                    yield delta
                 status_code = 200
             else:
                 response = await client.post(
@@ -360,19 +390,23 @@ class AnthropicProvider(ChatProvider):
             stream=self.stream_responses,
         )
 
-        return self._parse_response(body)
+        yield ProviderStreamDelta(type="response", response=self._parse_response(body))
 
     def _raise_for_status(self, response: httpx.Response) -> None:
+        self._observe_rate_limit_headers(response.headers)
         if response.status_code in (401, 403):
             raise ProviderAuthError(
                 f"Provider auth rejected request with status {response.status_code}"
             )
         if response.status_code == 429:
-            raise ProviderRateLimitError()
+            raise ProviderRateLimitError(
+                retry_after=parse_retry_after(response.headers)
+            )
         if response.status_code >= 500:
             body_hint = response.text[:200] if response.text else ""
             raise ProviderTransportError(
-                f"Provider server error: status {response.status_code} — {body_hint}"
+                f"Provider server error: status {response.status_code} — {body_hint}",
+                retry_after=parse_retry_after(response.headers),
             )
         if response.status_code >= 400:
             body_hint = response.text[:300] if response.text else ""
@@ -381,6 +415,7 @@ class AnthropicProvider(ChatProvider):
             )
 
     async def _raise_for_stream_status(self, response: httpx.Response) -> None:
+        self._observe_rate_limit_headers(response.headers)
         if response.status_code < 400:
             return
         raw = await response.aread()
@@ -390,10 +425,13 @@ class AnthropicProvider(ChatProvider):
                 f"Provider auth rejected request with status {response.status_code} — {body_hint[:200]}"
             )
         if response.status_code == 429:
-            raise ProviderRateLimitError()
+            raise ProviderRateLimitError(
+                retry_after=parse_retry_after(response.headers)
+            )
         if response.status_code >= 500:
             raise ProviderTransportError(
-                f"Provider server error: status {response.status_code} — {body_hint[:200]}"
+                f"Provider server error: status {response.status_code} — {body_hint[:200]}",
+                retry_after=parse_retry_after(response.headers),
             )
         raise ProviderBadResponseError(
             f"Provider rejected request: status {response.status_code} — {body_hint[:300]}"
@@ -407,21 +445,20 @@ class AnthropicProvider(ChatProvider):
         payload: dict[str, object],
         headers: dict[str, str],
         timeout: float,
-    ) -> dict[str, object]:
+        body: dict[str, object],
+    ) -> AsyncIterator[ProviderStreamDelta]:
+        """Yield SSE deltas, then fill *body* with the assembled message."""
         async with client.stream(
             "POST", endpoint, json=payload, headers=headers, timeout=timeout
         ) as response:
             await self._raise_for_stream_status(response)
-            return await self._parse_stream_response(response)
+            async for delta in self._parse_stream_response(response, body):
+                yield delta
 
     async def _parse_stream_response(
-        self, response: httpx.Response
-    ) -> dict[str, object]:
-        message: dict[str, object] = {
-            "type": "message",
-            "role": "assistant",
-            "content": [],
-        }
+        self, response: httpx.Response, message: dict[str, object]
+    ) -> AsyncIterator[ProviderStreamDelta]:
+        message.update({"type": "message", "role": "assistant", "content": []})
         content_by_index: dict[int, dict[str, object]] = {}
         tool_input_json: dict[int, str] = {}
         usage: dict[str, object] = {}
@@ -460,16 +497,26 @@ class AnthropicProvider(ChatProvider):
                 block = event.get("content_block")
                 if index is not None and isinstance(block, dict):
                     content_by_index[index] = dict(block)
+                    if block.get("type") == "tool_use":
+                        yield ProviderStreamDelta(
+                            type="tool_call",
+                            tool_call_index=index,
+                            tool_call_id=str(block.get("id", "")),
+                            tool_name=str(block.get("name", "")),
+                        )
             elif event_type == "content_block_delta":
                 index = self._stream_event_index(event)
                 delta = event.get("delta")
                 if index is not None and isinstance(delta, dict):
-                    self._apply_content_block_delta(
+                    block = content_by_index.setdefault(index, {})
+                    stream_delta = self._apply_content_block_delta(
                         index=index,
-                        block=content_by_index.setdefault(index, {}),
+                        block=block,
                         delta=delta,
                         tool_input_json=tool_input_json,
                     )
+                    if stream_delta is not None:
+                        yield stream_delta
             elif event_type == "message_delta":
                 delta = event.get("delta")
                 if isinstance(delta, dict):
@@ -501,7 +548,6 @@ class AnthropicProvider(ChatProvider):
             message["stop_reason"] = "end_turn"
         if usage:
             message["usage"] = usage
-        return message
 
     def _stream_event_index(self, event: dict[str, object]) -> int | None:
         index = event.get("index")
@@ -514,18 +560,21 @@ class AnthropicProvider(ChatProvider):
         block: dict[str, object],
         delta: dict[str, object],
         tool_input_json: dict[int, str],
-    ) -> None:
+    ) -> ProviderStreamDelta | None:
+        """Merge one ``content_block_delta`` into *block* and describe it."""
         delta_type = delta.get("type")
         if delta_type == "text_delta":
             text = delta.get("text")
             if isinstance(text, str):
                 block["type"] = block.get("type") or "text"
                 block["text"] = str(block.get("text", "")) + text
+                return ProviderStreamDelta(type="text", text=text)
         elif delta_type == "thinking_delta":
             thinking = delta.get("thinking")
             if isinstance(thinking, str):
                 block["type"] = block.get("type") or "thinking"
                 block["thinking"] = str(block.get("thinking", "")) + thinking
+                return ProviderStreamDelta(type="reasoning", text=thinking)
         elif delta_type == "signature_delta":
             signature = delta.get("signature")
             if isinstance(signature, str):
@@ -535,6 +584,14 @@ class AnthropicProvider(ChatProvider):
             if isinstance(partial, str):
                 block["type"] = block.get("type") or "tool_use"
                 tool_input_json[index] = tool_input_json.get(index, "") + partial
+                return ProviderStreamDelta(
+                    type="tool_call",
+                    text=partial,
+                    tool_call_index=index,
+                    tool_call_id=str(block.get("id", "")),
+                    tool_name=str(block.get("name", "")),
+                )
+        return None
 
     # ------------------------------------------------------------------
     # Response parsing — content block iteration
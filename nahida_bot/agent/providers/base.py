@@ -3,13 +3,16 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Mapping
 from dataclasses import dataclass, field
 from typing import Literal
 
 from nahida_bot.agent.context import ContextMessage, ContextPart
-from nahida_bot.agent.tokenization import Tokenizer
+from nahida_bot.agent.providers.ratelimit import ProviderRateLimiter
+from nahida_bot.agent.tokenization import DEFAULT_IMAGE_TOKEN_MODEL, Tokenizer
 
 ToolType = Literal["function"]
+StreamDeltaType = Literal["text", "reasoning", "tool_call", "response"]
 
 
 @dataclass(slots=True, frozen=True)
@@ -34,6 +37,8 @@ class ModelCapabilities:
         "image/png",
         "image/webp",
     )
+    # Image cost formula for context budgeting; "" uses the provider default.
+    image_token_model: str = ""
 
     # Built-in tool capabilities (Responses API)
     image_generation: bool = False
@@ -44,12 +49,17 @@ class ModelCapabilities:
 
 @dataclass(slots=True, frozen=True)
 class ToolDefinition:
-    """Tool metadata exposed to model providers."""
+    """Tool metadata exposed to model providers.
+
+    ``serial`` is agent-side metadata and is never sent to providers: serial
+    tools run alone, never concurrently with other calls from the same step.
+    """
 
     name: str
     description: str
     parameters: dict[str, object]
     type: ToolType = "function"
+    serial: bool = False
 
 
 @dataclass(slots=True, frozen=True)
@@ -101,11 +111,32 @@ class ProviderResponse:
     extra: dict[str, object] = field(default_factory=dict)
 
 
+@dataclass(slots=True, frozen=True)
+class ProviderStreamDelta:
+    """One incremental chunk emitted by ``ChatProvider.chat_stream``.
+
+    ``text`` / ``reasoning`` deltas carry newly generated characters only.
+    ``tool_call`` deltas report tool-call assembly progress (name and the
+    partial JSON argument fragment). The stream always ends with exactly one
+    ``response`` delta carrying the fully parsed ``ProviderResponse``.
+    """
+
+    type: StreamDeltaType
+    text: str = ""
+    tool_call_index: int | None = None
+    tool_call_id: str = ""
+    tool_name: str = ""
+    response: ProviderResponse | None = None
+
+
 class ChatProvider(ABC):
     """Common provider interface consumed by agent loop."""
 
     name: str
     api_family: str = "openai-completions"
+    image_token_model: str = DEFAULT_IMAGE_TOKEN_MODEL
+    # Shared limiter of the provider slot; bound by ``ProviderManager``.
+    rate_limiter: ProviderRateLimiter | None = None
 
     @property
     @abstractmethod
@@ -129,6 +160,46 @@ class ChatProvider(ABC):
         """
         raise NotImplementedError
 
+    async def chat_stream(
+        self,
+        *,
+        messages: list[ContextMessage],
+        tools: list[ToolDefinition] | None = None,
+        timeout_seconds: float | None = None,
+        model: str | None = None,
+    ) -> AsyncIterator[ProviderStreamDelta]:
+        """Run a chat round, yielding incremental deltas as they arrive.
+
+        The default implementation does not stream: it awaits ``chat`` and
+        yields a single ``response`` delta. Providers with a native streaming
+        transport override this.
+        """
+        response = await self.chat(
+            messages=messages,
+            tools=tools,
+            timeout_seconds=timeout_seconds,
+            model=model,
+        )
+        yield ProviderStreamDelta(type="response", response=response)
+
+    def _observe_rate_limit_headers(self, headers: Mapping[str, str]) -> None:
+        """Feed rate-limit response headers to the slot's shared limiter."""
+        if self.rate_limiter is not None:
+            self.rate_limiter.update_from_headers(headers)
+
+    @staticmethod
+    async def _collect_stream_response(
+        stream: AsyncIterator[ProviderStreamDelta],
+    ) -> ProviderResponse:
+        """Drain a ``chat_stream`` iterator and return its final response."""
+        final: ProviderResponse | None = None
+        async for delta in stream:
+            if delta.type == "response":
+                final = delta.response
+        if final is None:
+            raise RuntimeError("Provider stream ended without a final response")
+        return final
+
     def format_tools(self, tools: list[ToolDefinition]) -> list[object]:
         """Convert ToolDefinition list to provider-native tool format.
 
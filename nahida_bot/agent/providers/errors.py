@@ -12,6 +12,8 @@ class ProviderError(Exception):
     code: str
     message: str
     retryable: bool = False
+    # Server-requested delay before retrying (``Retry-After``), in seconds.
+    retry_after: float | None = None
 
     def __str__(self) -> str:
         return f"{self.code}: {self.message}"
@@ -27,8 +29,18 @@ class ProviderTimeoutError(ProviderError):
 class ProviderRateLimitError(ProviderError):
     """Raised when provider rejects request due to throttling."""
 
-    def __init__(self, message: str = "Provider rate limit reached") -> None:
-        super().__init__(code="provider_rate_limited", message=message, retryable=True)
+    def __init__(
+        self,
+        message: str = "Provider rate limit reached",
+        *,
+        retry_after: float | None = None,
+    ) -> None:
+        super().__init__(
+            code="provider_rate_limited",
+            message=message,
+            retryable=True,
+            retry_after=retry_after,
+        )
 
 
 class ProviderAuthError(ProviderError):
@@ -48,7 +60,15 @@ class ProviderBadResponseError(ProviderError):
 class ProviderTransportError(ProviderError):
     """Raised for upstream transport-level errors."""
 
-    def __init__(self, message: str = "Provider transport request failed") -> None:
+    def __init__(
+        self,
+        message: str = "Provider transport request failed",
+        *,
+        retry_after: float | None = None,
+    ) -> None:
         super().__init__(
-            code="provider_transport_error", message=message, retryable=True
+            code="provider_transport_error",
+            message=message,
+            retryable=True,
+            retry_after=retry_after,
         )
@@ -0,0 +1,410 @@
+"""Provider failover chains, circuit breaking, and hedged requests."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Sequence
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+import structlog
+
+from nahida_bot.agent.context import ContextMessage
+from nahida_bot.agent.providers.base import (
+    ChatProvider,
+    ProviderResponse,
+    ProviderStreamDelta,
+    ToolDefinition,
+)
+from nahida_bot.agent.providers.errors import ProviderError, ProviderTimeoutError
+from nahida_bot.agent.providers.ratelimit import (
+    estimate_request_tokens,
+    provider_rate_limiter,
+)
+from nahida_bot.agent.tokenization import Tokenizer
+
+if TYPE_CHECKING:
+    from nahida_bot.agent.providers.router import RoutedModel
+
+logger = structlog.get_logger(__name__)
+
+_LATENCY_SAMPLE_SIZE = 256
+
+
+@dataclass(slots=True, frozen=True)
+class FailoverPolicy:
+    """When to fail over, open a slot's circuit, and hedge.
+
+    ``first_byte_timeout_seconds`` is the latency deadline: a chain entry
+    that has produced nothing by then is abandoned for the next one
+    (``0`` disables it). With ``hedge`` on, the next entry is started
+    alongside instead, after the slot's ``hedge_quantile`` first-byte
+    latency (once ``hedge_min_samples`` calls have been observed; before
+    that the deadline is used), and whichever answers first wins.
+    """
+
+    failure_threshold: int = 3
+    circuit_open_seconds: float = 30.0
+    first_byte_timeout_seconds: float = 0.0
+    hedge: bool = False
+    hedge_quantile: float = 0.95
+    hedge_min_samples: int = 20
+    hedge_min_delay_seconds: float = 0.5
+
+
+@dataclass(slots=True)
+class SlotHealth:
+    """Failure streak, circuit state, and first-byte latencies of one slot."""
+
+    consecutive_failures: int = 0
+    open_until: float = 0.0
+    successes: int = 0
+    failures: int = 0
+    circuit_opens: int = 0
+    first_byte: deque[float] = field(
+        default_factory=lambda: deque(maxlen=_LATENCY_SAMPLE_SIZE)
+    )
+
+    def is_open(self, now: float) -> bool:
+        return now < self.open_until
+
+    def first_byte_quantile(self, quantile: float) -> float | None:
+        if not self.first_byte:
+            return None
+        ordered = sorted(self.first_byte)
+        return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
+
+
+class ProviderHealth:
+    """Shared health registry of provider slots, keyed by slot id."""
+
+    def __init__(self, policy: FailoverPolicy | None = None) -> None:
+        self.policy = policy or FailoverPolicy()
+        self._slots: dict[str, SlotHealth] = {}
+        self.failovers = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def get(self, slot_id: str) -> SlotHealth:
+        health = self._slots.get(slot_id)
+        if health is None:
+            health = self._slots[slot_id] = SlotHealth()
+        return health
+
+    def is_open(self, slot_id: str) -> bool:
+        health = self._slots.get(slot_id)
+        return health is not None and health.is_open(time.monotonic())
+
+    def record_first_byte(self, slot_id: str, seconds: float) -> None:
+        self.get(slot_id).first_byte.append(seconds)
+
+    def record_success(self, slot_id: str) -> None:
+        health = self.get(slot_id)
+        health.successes += 1
+        if health.consecutive_failures >= self.policy.failure_threshold:
+            logger.info("provider_failover.circuit_closed", slot=slot_id)
+        health.consecutive_failures = 0
+        health.open_until = 0.0
+
+    def record_failure(self, slot_id: str, error: BaseException) -> None:
+        health = self.get(slot_id)
+        health.failures += 1
+        health.consecutive_failures += 1
+        if health.consecutive_failures < self.policy.failure_threshold:
+            return
+        # Still failing after the open period (half-open probe) re-opens it.
+        health.open_until = time.monotonic() + self.policy.circuit_open_seconds
+        health.circuit_opens += 1
+        logger.warning(
+            "provider_failover.circuit_opened",
+            slot=slot_id,
+            consecutive_failures=health.consecutive_failures,
+            open_seconds=self.policy.circuit_open_seconds,
+            error=str(error),
+        )
+
+    def hedge_delay(self, slot_id: str) -> float | None:
+        """Seconds without a first byte after which to hedge, if known."""
+        policy = self.policy
+        health = self._slots.get(slot_id)
+        if health is not None and len(health.first_byte) >= policy.hedge_min_samples:
+            quantile = health.first_byte_quantile(policy.hedge_quantile)
+            if quantile is not None:
+                return max(policy.hedge_min_delay_seconds, quantile)
+        return policy.first_byte_timeout_seconds or None
+
+    def stats(self) -> dict[str, Any]:
+        now = time.monotonic()
+        slots: dict[str, dict[str, Any]] = {}
+        for slot_id, health in self._slots.items():
+            p95 = health.first_byte_quantile(0.95)
+            slots[slot_id] = {
+                "successes": health.successes,
+                "failures": health.failures,
+                "consecutive_failures": health.consecutive_failures,
+                "circuit_open": health.is_open(now),
+                "circuit_opens": health.circuit_opens,
+                "first_byte_p95_ms": round(p95 * 1000, 2) if p95 is not None else None,
+            }
+        return {
+            "failovers": self.failovers,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "slots": slots,
+        }
+
+
+@dataclass(slots=True, eq=False)
+class _Attempt:
+    candidate: RoutedModel
+    # Set once the slot's rate-limit permit is held: waiting out the slot's
+    # own cooldown is not a first-byte stall.
+    started: float | None = None
+    hedged: bool = False
+    task: asyncio.Task[None] | None = None
+
+    def elapsed(self) -> float:
+        """Seconds since the request was sent, ``0`` while still queued."""
+        return 0.0 if self.started is None else time.monotonic() - self.started
+
+
+class FailoverProvider(ChatProvider):
+    """Serve a chat round from an ordered chain of ``(slot, model)`` entries.
+
+    The first entry whose circuit is closed is tried first. A retryable
+    :class:`ProviderError`, or no first byte within the latency deadline,
+    moves on to the next entry; a non-retryable error is raised as is.
+    Once an entry has produced output the stream is committed to it, so a
+    later failure propagates to the agent loop's own retry. Each entry is
+    called under its own slot's rate limiter.
+    """
+
+    def __init__(self, chain: Sequence[RoutedModel], health: ProviderHealth) -> None:
+        if not chain:
+            raise ValueError("failover chain must not be empty")
+        self._chain = list(chain)
+        self._health = health
+        primary = self._chain[0].slot.provider
+        self.name = getattr(primary, "name", "")
+        self.api_family = primary.api_family
+        self.image_token_model = primary.image_token_model
+
+    @property
+    def chain(self) -> list[RoutedModel]:
+        return list(self._chain)
+
+    @property
+    def model(self) -> str:
+        return str(getattr(self._chain[0].slot.provider, "model", ""))
+
+    @property
+    def tokenizer(self) -> Tokenizer | None:
+        return self._chain[0].slot.provider.tokenizer
+
+    async def chat(
+        self,
+        *,
+        messages: list[ContextMessage],
+        tools: list[ToolDefinition] | None = None,
+        timeout_seconds: float | None = None,
+        model: str | None = None,
+    ) -> ProviderResponse:
+        return await self._collect_stream_response(
+            self.chat_stream(
+                messages=messages,
+                tools=tools,
+                timeout_seconds=timeout_seconds,
+                model=model,
+            )
+        )
+
+    async def chat_stream(
+        self,
+        *,
+        messages: list[ContextMessage],
+        tools: list[ToolDefinition] | None = None,
+        timeout_seconds: float | None = None,
+        model: str | None = None,
+    ) -> AsyncIterator[ProviderStreamDelta]:
+        """Stream from the first chain entry that answers.
+
+        ``model`` only overrides the primary entry; fallbacks use the model
+        their chain entry resolved to.
+        """
+        policy = self._health.policy
+        pending = deque(self._candidates())
+        queue: asyncio.Queue[tuple[_Attempt, str, Any]] = asyncio.Queue()
+        launched: list[_Attempt] = []
+        racing: list[_Attempt] = []
+        last_error: BaseException | None = None
+
+        def launch(*, hedged: bool = False) -> None:
+            candidate = pending.popleft()
+            attempt = _Attempt(candidate=candidate, hedged=hedged)
+            attempt.task = asyncio.create_task(
+                self._pump(
+                    attempt,
+                    queue,
+                    messages=messages,
+                    tools=tools,
+                    timeout_seconds=timeout_seconds,
+                    model=(
+                        model
+                        if model and candidate is self._chain[0]
+                        else candidate.model
+                    ),
+                )
+            )
+            launched.append(attempt)
+            racing.append(attempt)
+
+        try:
+            winner: _Attempt | None = None
+            kind, payload = "", None
+            while winner is None:
+                if not racing:
+                    if not pending:
+                        assert last_error is not None
+                        raise last_error
+                    if launched:
+                        self._health.failovers += 1
+                        logger.warning(
+                            "provider_failover.failover",
+                            from_slot=launched[-1].candidate.slot.id,
+                            to_slot=pending[0].slot.id,
+                            error=str(last_error),
+                        )
+                    launch()
+                try:
+                    attempt, kind, payload = await asyncio.wait_for(
+                        queue.get(), self._launch_timeout(racing, bool(pending))
+                    )
+                except TimeoutError:
+                    stalled = racing[-1]
+                    if policy.hedge:
+                        self._health.hedges += 1
+                        logger.info(
+                            "provider_failover.hedged",
+                            slot=stalled.candidate.slot.id,
+                            hedge_slot=pending[0].slot.id,
+                            waited_ms=round(stalled.elapsed() * 1000, 2),
+                        )
+                        launch(hedged=True)
+                        continue
+                    racing.remove(stalled)
+                    assert stalled.task is not None
+                    stalled.task.cancel()
+                    last_error = ProviderTimeoutError(
+                        "Provider produced no output within "
+                        f"{policy.first_byte_timeout_seconds}s"
+                    )
+                    self._health.record_failure(stalled.candidate.slot.id, last_error)
+                    continue
+                if attempt not in racing or kind == "started":
+                    # Abandoned attempts' output is dropped; a permit grant
+                    # only re-arms the deadline.
+                    continue
+                if kind == "error":
+                    racing.remove(attempt)
+                    self._health.record_failure(attempt.candidate.slot.id, payload)
+                    last_error = payload
+                    if racing:
+                        continue
+                    if isinstance(payload, ProviderError) and payload.retryable:
+                        continue
+                    raise payload
+                winner = attempt
+
+            for other in racing:
+                if other is not winner and other.task is not None:
+                    other.task.cancel()
+            slot_id = winner.candidate.slot.id
+            self._health.record_first_byte(slot_id, winner.elapsed())
+            if winner.hedged:
+                self._health.hedge_wins += 1
+            while kind != "end":
+                if kind == "error":
+                    self._health.record_failure(slot_id, payload)
+                    raise payload
+                yield payload
+                attempt, kind, payload = await queue.get()
+                while attempt is not winner:
+                    attempt, kind, payload = await queue.get()
+            self._health.record_success(slot_id)
+        finally:
+            tasks = [a.task for a in launched if a.task is not None]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    # -- internal helpers ------------------------------------------------
+
+    def _candidates(self) -> list[RoutedModel]:
+        closed = [c for c in self._chain if not self._health.is_open(c.slot.id)]
+        if closed:
+            return closed
+        # Every circuit is open: trying the chain beats failing outright.
+        logger.warning(
+            "provider_failover.all_circuits_open",
+            slots=[c.slot.id for c in self._chain],
+        )
+        return list(self._chain)
+
+    def _launch_timeout(self, racing: list[_Attempt], has_next: bool) -> float | None:
+        """Seconds until the next chain entry should start, or ``None``."""
+        if not has_next or not racing:
+            return None
+        policy = self._health.policy
+        newest = racing[-1]
+        if newest.started is None:
+            return None  # Still queued behind the slot's rate limiter.
+        if policy.hedge:
+            if len(racing) > 1:
+                return None  # At most one hedge per round.
+            delay = self._health.hedge_delay(newest.candidate.slot.id)
+        else:
+            delay = policy.first_byte_timeout_seconds or None
+        if delay is None:
+            return None
+        return max(0.0, delay - newest.elapsed())
+
+    @staticmethod
+    async def _pump(
+        attempt: _Attempt,
+        queue: asyncio.Queue[tuple[_Attempt, str, Any]],
+        *,
+        messages: list[ContextMessage],
+        tools: list[ToolDefinition] | None,
+        timeout_seconds: float | None,
+        model: str | None,
+    ) -> None:
+        provider = attempt.candidate.slot.provider
+        limiter = provider_rate_limiter(provider)
+        permit_cm = (
+            limiter.permit(estimated_tokens=estimate_request_tokens(messages))
+            if limiter is not None
+            else contextlib.nullcontext()
+        )
+        try:
+            async with permit_cm as permit:
+                attempt.started = time.monotonic()
+                queue.put_nowait((attempt, "started", None))
+                async for delta in provider.chat_stream(
+                    messages=messages,
+                    tools=tools,
+                    timeout_seconds=timeout_seconds,
+                    model=model,
+                ):
+                    if (
+                        permit is not None
+                        and delta.response is not None
+                        and delta.response.usage is not None
+                    ):
+                        permit.record_usage(delta.response.usage.total)
+                    queue.put_nowait((attempt, "delta", delta))
+            queue.put_nowait((attempt, "end", None))
+        except Exception as exc:  # noqa: BLE001
+            queue.put_nowait((attempt, "error", exc))
@@ -3,9 +3,11 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from typing import Any
 
 from nahida_bot.agent.context import ContextBuilder
 from nahida_bot.agent.providers.base import ChatProvider, ModelCapabilities
+from nahida_bot.agent.providers.ratelimit import ProviderRateLimiter
 
 
 @dataclass(slots=True)
@@ -19,6 +21,7 @@ class ProviderSlot:
     available_models: list[str] = field(default_factory=list)
     capabilities_by_model: dict[str, ModelCapabilities] = field(default_factory=dict)
     tags_by_model: dict[str, list[str]] = field(default_factory=dict)
+    rate_limiter: ProviderRateLimiter | None = None
 
     def supports_model(self, model: str) -> bool:
         """Return whether this provider slot can serve ``model``."""
@@ -39,6 +42,10 @@ class ProviderManager:
 
     def __init__(self, slots: list[ProviderSlot], default_id: str = "") -> None:
         self._slots: dict[str, ProviderSlot] = {s.id: s for s in slots}
+        for slot in slots:
+            if slot.rate_limiter is not None:
+                # Every caller holding the provider shares the slot's limiter.
+                slot.provider.rate_limiter = slot.rate_limiter
         if default_id:
             self._default_id = default_id
         elif slots:
@@ -106,3 +113,11 @@ class ProviderManager:
     def slot_ids(self) -> list[str]:
         """Return all registered provider slot ids."""
         return list(self._slots.keys())
+
+    def rate_limit_stats(self) -> dict[str, dict[str, Any]]:
+        """Return rate limiter stats keyed by provider slot id."""
+        return {
+            slot_id: slot.rate_limiter.stats()
+            for slot_id, slot in self._slots.items()
+            if slot.rate_limiter is not None
+        }
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+from collections.abc import AsyncIterator
 from dataclasses import dataclass, field
 
 import httpx
@@ -13,6 +14,7 @@ from nahida_bot.agent.memory.embedding import EmbeddingResult
 from nahida_bot.agent.providers.base import (
     ChatProvider,
     ProviderResponse,
+    ProviderStreamDelta,
     TokenUsage,
     ToolCall,
     ToolDefinition,
@@ -24,6 +26,7 @@ from nahida_bot.agent.providers.errors import (
     ProviderTimeoutError,
     ProviderTransportError,
 )
+from nahida_bot.agent.providers.ratelimit import parse_retry_after
 from nahida_bot.agent.providers.reasoning import ReasoningMixin
 from nahida_bot.agent.providers.registry import register_provider
 from nahida_bot.agent.tokenization import Tokenizer
@@ -50,29 +53,34 @@ class OpenAICompatibleProvider(ReasoningMixin, ChatProvider):
     merge_system_messages: bool = False
     stream_responses: bool = False
     _client: httpx.AsyncClient | None = field(default=None, init=False, repr=False)
+    _owns_client: bool = field(default=True, init=False, repr=False)
 
     @property
     def tokenizer(self) -> Tokenizer | None:
         """Expose provider tokenizer to context budgeting."""
         return self.tokenizer_impl
 
+    def bind_http_client(self, client: httpx.AsyncClient) -> None:
+        """Send requests through a shared client owned by the caller."""
+        self._client = client
+        self._owns_client = False
+
     def _ensure_client(self) -> httpx.AsyncClient:
-        """Return the shared HTTP client, creating it if needed.
+        """Return the HTTP client, creating a private one if none is bound.
 
-        TODO: The httpx.AsyncClient is never closed automatically — ``close()``
-        must be called manually. Tie provider lifecycle to Application shutdown
-        or implement ``__aenter__``/``__aexit__`` on ChatProvider so the AgentLoop
-        can guarantee cleanup.
+        The application binds a pooled client from its transport registry;
+        a provider used standalone owns its client until :meth:`close`.
         """
         if self._client is None or self._client.is_closed:
             self._client = httpx.AsyncClient()
+            self._owns_client = True
         return self._client
 
     async def close(self) -> None:
-        """Close the underlying HTTP client."""
-        if self._client is not None and not self._client.is_closed:
-            await self._client.aclose()
-            self._client = None
+        """Close the underlying HTTP client if this provider owns it."""
+        client, self._client = self._client, None
+        if client is not None and self._owns_client and not client.is_closed:
+            await client.aclose()
 
     def _extra_payload(self) -> dict[str, object]:
         """Hook for subclasses to inject provider-specific parameters."""
@@ -164,6 +172,24 @@ class OpenAICompatibleProvider(ReasoningMixin, ChatProvider):
         model: str | None = None,
     ) -> ProviderResponse:
         """Call OpenAI-compatible chat completion API."""
+        return await self._collect_stream_response(
+            self.chat_stream(
+                messages=messages,
+                tools=tools,
+                timeout_seconds=timeout_seconds,
+                model=model,
+            )
+        )
+
+    async def chat_stream(
+        self,
+        *,
+        messages: list[ContextMessage],
+        tools: list[ToolDefinition] | None = None,
+        timeout_seconds: float | None = None,
+        model: str | None = None,
+    ) -> AsyncIterator[ProviderStreamDelta]:
+        """Call the chat completion API, yielding SSE deltas when streaming."""
         prepared = (
             ChatProvider._coalesce_system_messages(messages)
             if self.merge_system_messages
@@ -215,13 +241,16 @@ class OpenAICompatibleProvider(ReasoningMixin, ChatProvider):
             )
             client = self._ensure_client()
             if self.stream_responses:
-                body = await self._stream_chat_completions(
+                body: dict[str, object] = {}
+                async for delta in self._stream_chat_completions(
                     client=client,
                     endpoint=endpoint,
                     payload=payload,
                     headers=headers,
                     timeout=timeout,
-                )
+                    body=body,
+                ):
+                    yield delta
                 status_code = 200
             else:
                 response = await client.post(
@@ -250,6 +279,14 @@ class OpenAICompatibleProvider(ReasoningMixin, ChatProvider):
             stream=self.stream_responses,
         )
 
+        yield ProviderStreamDelta(
+            type="response",
+            response=self._parse_chat_response(body, str(payload["model"])),
+        )
+
+    def _parse_chat_response(
+        self, body: dict[str, object], model: str
+    ) -> ProviderResponse:
         choice = self._extract_first_choice(body)
         message = choice.get("message")
         if not isinstance(message, dict):
@@ -293,7 +330,7 @@ class OpenAICompatibleProvider(ReasoningMixin, ChatProvider):
             logger.warning(
                 "provider.openai_compatible.tool_finish_without_parsed_calls",
                 provider_name=self.name,
-                model=model or self.model,
+                model=model,
                 message_keys=sorted(message.keys()),
                 has_tool_calls_payload=isinstance(tool_calls_payload, list),
                 raw_tool_call_count=raw_tool_call_count,
@@ -303,7 +340,7 @@ class OpenAICompatibleProvider(ReasoningMixin, ChatProvider):
             logger.debug(
                 "provider.openai_compatible.parsed_response",
                 provider_name=self.name,
-                model=model or self.model,
+                model=model,
                 finish_reason=finish_reason or "",
                 content_chars=len(normalized_content or ""),
                 reasoning_chars=len(reasoning_content or ""),
@@ -324,17 +361,21 @@ class OpenAICompatibleProvider(ReasoningMixin, ChatProvider):
         )
 
     def _raise_for_status(self, response: httpx.Response) -> None:
+        self._observe_rate_limit_headers(response.headers)
         if response.status_code in (401, 403):
             body_hint = response.text[:200] if response.text else ""
             raise ProviderAuthError(
                 f"Provider auth rejected request with status {response.status_code} — {body_hint}"
             )
         if response.status_code == 429:
-            raise ProviderRateLimitError()
+            raise ProviderRateLimitError(
+                retry_after=parse_retry_after(response.headers)
+            )
         if response.status_code >= 500:
             body_hint = response.text[:200] if response.text else ""
             raise ProviderTransportError(
-                f"Provider server error: status {response.status_code} — {body_hint}"
+                f"Provider server error: status {response.status_code} — {body_hint}",
+                retry_after=parse_retry_after(response.headers),
             )
         if response.status_code >= 400:
             body_hint = response.text[:300] if response.text else ""
@@ -343,6 +384,7 @@ class OpenAICompatibleProvider(ReasoningMixin, ChatProvider):
             )
 
     async def _raise_for_stream_status(self, response: httpx.Response) -> None:
+        self._observe_rate_limit_headers(response.headers)
         if response.status_code < 400:
             return
         raw = await response.aread()
@@ -352,10 +394,13 @@ class OpenAICompatibleProvider(ReasoningMixin, ChatProvider):
                 f"Provider auth rejected request with status {response.status_code} — {body_hint[:200]}"
             )
         if response.status_code == 429:
-            raise ProviderRateLimitError()
+            raise ProviderRateLimitError(
+                retry_after=parse_retry_after(response.headers)
+            )
         if response.status_code >= 500:
             raise ProviderTransportError(
-                f"Provider server error: status {response.status_code} — {body_hint[:200]}"
+                f"Provider server error: status {response.status_code} — {body_hint[:200]}",
+                retry_after=parse_retry_after(response.headers),
             )
         raise ProviderBadResponseError(
             f"Provider rejected request: status {response.status_code} — {body_hint[:300]}"
@@ -369,16 +414,19 @@ class OpenAICompatibleProvider(ReasoningMixin, ChatProvider):
         payload: dict[str, object],
         headers: dict[str, str],
         timeout: float,
-    ) -> dict[str, object]:
+        body: dict[str, object],
+    ) -> AsyncIterator[ProviderStreamDelta]:
+        """Yield SSE deltas, then fill *body* with the assembled completion."""
         async with client.stream(
             "POST", endpoint, json=payload, headers=headers, timeout=timeout
         ) as response:
             await self._raise_for_stream_status(response)
-            return await self._parse_stream_response(response)
+            async for delta in self._parse_stream_response(response, body):
+                yield delta
 
     async def _parse_stream_response(
-        self, response: httpx.Response
-    ) -> dict[str, object]:
+        self, response: httpx.Response, body: dict[str, object]
+    ) -> AsyncIterator[ProviderStreamDelta]:
         content_parts: list[str] = []
         reasoning_parts: list[str] = []
         refusal_parts: list[str] = []
@@ -422,16 +470,23 @@ class OpenAICompatibleProvider(ReasoningMixin, ChatProvider):
             content = delta.get("content")
             if isinstance(content, str):
                 content_parts.append(content)
+                if content:
+                    yield ProviderStreamDelta(type="text", text=content)
 
             reasoning = delta.get(self.reasoning_key)
             if isinstance(reasoning, str):
                 reasoning_parts.append(reasoning)
+                if reasoning:
+                    yield ProviderStreamDelta(type="reasoning", text=reasoning)
 
             refusal = delta.get("refusal")
             if isinstance(refusal, str):
                 refusal_parts.append(refusal)
 
-            self._collect_stream_tool_calls(delta.get("tool_calls"), tool_call_parts)
+            for tool_delta in self._collect_stream_tool_calls(
+                delta.get("tool_calls"), tool_call_parts
+            ):
+                yield tool_delta
 
         message: dict[str, object] = {
             "role": "assistant",
@@ -446,25 +501,23 @@ class OpenAICompatibleProvider(ReasoningMixin, ChatProvider):
         if tool_calls:
             message["tool_calls"] = tool_calls
 
-        body: dict[str, object] = {
-            "choices": [
-                {
-                    "message": message,
-                    "finish_reason": finish_reason,
-                }
-            ]
-        }
+        body["choices"] = [
+            {
+                "message": message,
+                "finish_reason": finish_reason,
+            }
+        ]
         if usage is not None:
             body["usage"] = usage
-        return body
 
     def _collect_stream_tool_calls(
         self,
         payload: object,
         tool_call_parts: dict[int, dict[str, object]],
-    ) -> None:
+    ) -> list[ProviderStreamDelta]:
+        deltas: list[ProviderStreamDelta] = []
         if not isinstance(payload, list):
-            return
+            return deltas
         for item in payload:
             if not isinstance(item, dict):
                 continue
@@ -486,6 +539,16 @@ class OpenAICompatibleProvider(ReasoningMixin, ChatProvider):
             arguments = function.get("arguments")
             if isinstance(arguments, str):
                 current["arguments"] = str(current.get("arguments", "")) + arguments
+            deltas.append(
+                ProviderStreamDelta(
+                    type="tool_call",
+                    text=arguments if isinstance(arguments, str) else "",
+                    tool_call_index=index,
+                    tool_call_id=str(current.get("id", "")),
+                    tool_name=str(current.get("name", "")),
+                )
+            )
+        return deltas
 
     def _build_stream_tool_calls(
         self, tool_call_parts: dict[int, dict[str, object]]
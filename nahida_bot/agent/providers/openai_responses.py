@@ -17,6 +17,7 @@ from ``OpenAICompatibleProvider``.
 from __future__ import annotations
 
 import json
+from collections.abc import AsyncIterator
 from dataclasses import dataclass, field
 
 import httpx
@@ -27,6 +28,7 @@ from nahida_bot.agent.memory.embedding import EmbeddingResult
 from nahida_bot.agent.providers.base import (
     ChatProvider,
     ProviderResponse,
+    ProviderStreamDelta,
     TokenUsage,
     ToolCall,
     ToolDefinition,
@@ -38,6 +40,7 @@ from nahida_bot.agent.providers.errors import (
     ProviderTimeoutError,
     ProviderTransportError,
 )
+from nahida_bot.agent.providers.ratelimit import parse_retry_after
 from nahida_bot.agent.providers.registry import register_provider
 from nahida_bot.agent.tokenization import Tokenizer
 from nahida_bot.core.runtime_settings import current_runtime_settings
@@ -75,20 +78,27 @@ class OpenAIResponsesProvider(ChatProvider):
     built_in_tools: list[object] | None = None
     tokenizer_impl: Tokenizer | None = None
     _client: httpx.AsyncClient | None = field(default=None, init=False, repr=False)
+    _owns_client: bool = field(default=True, init=False, repr=False)
 
     @property
     def tokenizer(self) -> Tokenizer | None:
         return self.tokenizer_impl
 
+    def bind_http_client(self, client: httpx.AsyncClient) -> None:
+        """Send requests through a shared client owned by the caller."""
+        self._client = client
+        self._owns_client = False
+
     def _ensure_client(self) -> httpx.AsyncClient:
         if self._client is None or self._client.is_closed:
             self._client = httpx.AsyncClient()
+            self._owns_client = True
         return self._client
 
     async def close(self) -> None:
-        if self._client is not None and not self._client.is_closed:
-            await self._client.aclose()
-            self._client = None
+        client, self._client = self._client, None
+        if client is not None and self._owns_client and not client.is_closed:
+            await client.aclose()
 
     async def embed_texts(
         self,
@@ -414,6 +424,24 @@ class OpenAIResponsesProvider(ChatProvider):
         timeout_seconds: float | None = None,
         model: str | None = None,
     ) -> ProviderResponse:
+        return await self._collect_stream_response(
+            self.chat_stream(
+                messages=messages,
+                tools=tools,
+                timeout_seconds=timeout_seconds,
+                model=model,
+            )
+        )
+
+    async def chat_stream(
+        self,
+        *,
+        messages: list[ContextMessage],
+        tools: list[ToolDefinition] | None = None,
+        timeout_seconds: float | None = None,
+        model: str | None = None,
+    ) -> AsyncIterator[ProviderStreamDelta]:
+        """Call the Responses API, yielding output deltas when streaming."""
         prepared = ChatProvider._coalesce_system_messages(messages)
         previous_response_id, input_messages = self._input_messages_for_request(
             prepared
@@ -476,13 +504,16 @@ class OpenAIResponsesProvider(ChatProvider):
             )
             client = self._ensure_client()
             if self.stream_responses:
-                body = await self._stream_responses(
+                body: dict[str, object] = {}
+                async for delta in self._stream_responses(
                     client=client,
                     endpoint=endpoint,
                     payload=payload,
                     headers=headers,
                     timeout=timeout,
-                )
+                    body=body,
+                ):
+                    yield delta
                 status_code = 200
             else:
                 response = await client.post(
@@ -511,20 +542,24 @@ class OpenAIResponsesProvider(ChatProvider):
             stream=self.stream_responses,
         )
 
-        return self._parse_response(body)
+        yield ProviderStreamDelta(type="response", response=self._parse_response(body))
 
     def _raise_for_status(self, response: httpx.Response) -> None:
+        self._observe_rate_limit_headers(response.headers)
         if response.status_code in (401, 403):
             body_hint = response.text[:200] if response.text else ""
             raise ProviderAuthError(
                 f"Provider auth rejected request with status {response.status_code} — {body_hint}"
             )
         if response.status_code == 429:
-            raise ProviderRateLimitError()
+            raise ProviderRateLimitError(
+                retry_after=parse_retry_after(response.headers)
+            )
         if response.status_code >= 500:
             body_hint = response.text[:200] if response.text else ""
             raise ProviderTransportError(
-                f"Provider server error: status {response.status_code} — {body_hint}"
+                f"Provider server error: status {response.status_code} — {body_hint}",
+                retry_after=parse_retry_after(response.headers),
             )
         if response.status_code >= 400:
             body_hint = response.text[:300] if response.text else ""
@@ -533,6 +568,7 @@ class OpenAIResponsesProvider(ChatProvider):
             )
 
     async def _raise_for_stream_status(self, response: httpx.Response) -> None:
+        self._observe_rate_limit_headers(response.headers)
         if response.status_code < 400:
             return
         raw = await response.aread()
@@ -542,10 +578,13 @@ class OpenAIResponsesProvider(ChatProvider):
                 f"Provider auth rejected request with status {response.status_code} — {body_hint[:200]}"
             )
         if response.status_code == 429:
-            raise ProviderRateLimitError()
+            raise ProviderRateLimitError(
+                retry_after=parse_retry_after(response.headers)
+            )
         if response.status_code >= 500:
             raise ProviderTransportError(
-                f"Provider server error: status {response.status_code} — {body_hint[:200]}"
+                f"Provider server error: status {response.status_code} — {body_hint[:200]}",
+                retry_after=parse_retry_after(response.headers),
             )
         raise ProviderBadResponseError(
             f"Provider rejected request: status {response.status_code} — {body_hint[:300]}"
@@ -559,20 +598,24 @@ class OpenAIResponsesProvider(ChatProvider):
         payload: dict[str, object],
         headers: dict[str, str],
         timeout: float,
-    ) -> dict[str, object]:
+        body: dict[str, object],
+    ) -> AsyncIterator[ProviderStreamDelta]:
+        """Yield SSE deltas, then fill *body* with the completed response."""
         async with client.stream(
             "POST", endpoint, json=payload, headers=headers, timeout=timeout
         ) as response:
             await self._raise_for_stream_status(response)
-            return await self._parse_stream_response(response)
+            async for delta in self._parse_stream_response(response, body):
+                yield delta
 
     async def _parse_stream_response(
-        self, response: httpx.Response
-    ) -> dict[str, object]:
+        self, response: httpx.Response, body: dict[str, object]
+    ) -> AsyncIterator[ProviderStreamDelta]:
         text_parts: list[str] = []
         done_text: str | None = None
         final_body: dict[str, object] | None = None
         output_items: list[object] = []
+        function_calls: dict[int, dict[str, object]] = {}
 
         async for raw_line in response.aiter_lines():
             line = raw_line.strip()
@@ -593,6 +636,42 @@ class OpenAIResponsesProvider(ChatProvider):
                 delta = event.get("delta")
                 if isinstance(delta, str):
                     text_parts.append(delta)
+                    if delta:
+                        yield ProviderStreamDelta(type="text", text=delta)
+            elif event_type in (
+                "response.reasoning_summary_text.delta",
+                "response.reasoning_text.delta",
+            ):
+                delta = event.get("delta")
+                if isinstance(delta, str) and delta:
+                    yield ProviderStreamDelta(type="reasoning", text=delta)
+            elif event_type == "response.output_item.added":
+                item = event.get("item")
+                output_index = event.get("output_index")
+                if (
+                    isinstance(item, dict)
+                    and item.get("type") == "function_call"
+                    and isinstance(output_index, int)
+                ):
+                    function_calls[output_index] = item
+                    yield ProviderStreamDelta(
+                        type="tool_call",
+                        tool_call_index=output_index,
+                        tool_call_id=str(item.get("call_id", "")),
+                        tool_name=str(item.get("name", "")),
+                    )
+            elif event_type == "response.function_call_arguments.delta":
+                delta = event.get("delta")
+                output_index = event.get("output_index")
+                if isinstance(delta, str) and isinstance(output_index, int):
+                    item = function_calls.get(output_index, {})
+                    yield ProviderStreamDelta(
+                        type="tool_call",
+                        text=delta,
+                        tool_call_index=output_index,
+                        tool_call_id=str(item.get("call_id", "")),
+                        tool_name=str(item.get("name", "")),
+                    )
             elif event_type == "response.output_text.done":
                 text_done = event.get("text")
                 if isinstance(text_done, str):
@@ -619,7 +698,7 @@ class OpenAIResponsesProvider(ChatProvider):
             final_body = dict(final_body)
             final_body["output"] = output_items
 
-        return final_body
+        body.update(final_body)
 
     # ------------------------------------------------------------------
     # Response parsing — flat output array
@@ -0,0 +1,445 @@
+"""Per-provider-slot rate limiting, shared by every caller of a provider."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import email.utils
+import math
+import random
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Mapping
+from datetime import UTC, datetime
+from typing import Any
+
+import structlog
+
+from nahida_bot.agent.context import ContextMessage
+from nahida_bot.agent.providers.errors import (
+    ProviderError,
+    ProviderRateLimitError,
+    ProviderTransportError,
+)
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_PROVIDER_MAX_CONCURRENCY = 16
+DEFAULT_BACKOFF_BASE_SECONDS = 0.5
+DEFAULT_BACKOFF_MAX_SECONDS = 20.0
+# Multiplicative decreases closer together than this count as one event.
+_DECREASE_COOLDOWN_SECONDS = 1.0
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> float | None:
+    """Return the server-requested delay in seconds, if any.
+
+    Understands ``retry-after-ms`` and ``Retry-After`` as delta-seconds or
+    an HTTP date.
+    """
+    raw_ms = _header(headers, "retry-after-ms")
+    if raw_ms:
+        try:
+            return max(0.0, float(raw_ms) / 1000)
+        except ValueError:
+            pass
+    raw = _header(headers, "retry-after")
+    if not raw:
+        return None
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(raw)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=UTC)
+    return max(0.0, (when - datetime.now(UTC)).total_seconds())
+
+
+def backoff_delay(
+    attempt: int,
+    *,
+    base: float = DEFAULT_BACKOFF_BASE_SECONDS,
+    cap: float = DEFAULT_BACKOFF_MAX_SECONDS,
+    retry_after: float | None = None,
+) -> float:
+    """Full-jitter exponential backoff for retry ``attempt`` (1-based).
+
+    A server ``retry_after`` is a floor: the jitter is added on top so
+    callers released together do not retry in lockstep.
+    """
+    ceiling = min(cap, base * (2 ** max(0, attempt - 1))) if base > 0 else 0.0
+    delay = random.uniform(0, ceiling) if ceiling > 0 else 0.0
+    if retry_after is not None:
+        delay = retry_after + delay * 0.1
+    return delay
+
+
+def estimate_request_tokens(messages: list[ContextMessage]) -> int:
+    """Cheap prompt-size estimate used to reserve tokens-per-minute budget."""
+    chars = 0
+    for message in messages:
+        chars += len(message.content or "")
+        for part in message.parts:
+            chars += len(part.text or "")
+    return math.ceil(chars / 4)
+
+
+class TokenBucket:
+    """Per-minute budget that may go briefly into debt.
+
+    :meth:`reserve` always debits and returns how long the caller must wait
+    for the debt to be refilled, so concurrent callers queue in reservation
+    order instead of racing on each refill.
+    """
+
+    def __init__(self, per_minute: float) -> None:
+        self.capacity = max(0.0, float(per_minute))
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        return self.capacity > 0
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / 60.0
+
+    def available(self) -> float:
+        self._refill(time.monotonic())
+        return self.level
+
+    def reserve(self, amount: float) -> float:
+        if not self.enabled or amount <= 0:
+            return 0.0
+        self._refill(time.monotonic())
+        self.level -= min(amount, self.capacity)
+        return 0.0 if self.level >= 0 else -self.level / self.rate
+
+    def adjust(self, delta: float) -> None:
+        """Credit (positive) or debit (negative) budget after the fact."""
+        if not self.enabled:
+            return
+        self._refill(time.monotonic())
+        self.level = min(self.capacity, self.level + delta)
+
+    def sync(self, *, limit: float | None, remaining: float | None) -> None:
+        """Adopt the server's view of the budget from rate-limit headers."""
+        self._refill(time.monotonic())
+        if limit is not None and limit > 0:
+            if not self.enabled:
+                # First limit learned from headers: start from a full bucket.
+                self.level = limit
+            self.capacity = limit
+            self.level = min(self.level, limit)
+        if remaining is not None and self.enabled:
+            self.level = min(self.level, remaining)
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        if elapsed > 0 and self.enabled:
+            self.level = min(self.capacity, self.level + elapsed * self.rate)
+
+
+class RateLimitPermit:
+    """One admitted provider call; reports its outcome back to the limiter."""
+
+    def __init__(self, limiter: ProviderRateLimiter, estimated_tokens: int) -> None:
+        self._limiter = limiter
+        self._estimated_tokens = estimated_tokens
+        self._usage_recorded = False
+
+    def record_usage(self, total_tokens: int) -> None:
+        """Reconcile the token reservation with the provider's reported usage."""
+        if self._usage_recorded or total_tokens <= 0:
+            return
+        self._usage_recorded = True
+        self._limiter.tokens.adjust(self._estimated_tokens - total_tokens)
+
+
+class ProviderRateLimiter:
+    """Client-side throttle for one provider slot.
+
+    Three mechanisms run together:
+
+    * Token buckets for requests and tokens per minute, seeded from config
+      and corrected from ``x-ratelimit-*`` / ``anthropic-ratelimit-*``
+      response headers (a limit of ``0`` learns it from headers only).
+    * AIMD concurrency: the in-flight limit grows by about one per
+      ``limit`` successful calls and halves on a 429 or server error,
+      never going below ``min_concurrency``. ``max_concurrency`` of ``0``
+      disables the concurrency limit.
+    * A shared cooldown: a 429 pauses every caller of the slot until the
+      server's ``Retry-After`` (or a jittered backoff) has passed, instead
+      of each session retrying on its own schedule.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        max_concurrency: int = DEFAULT_PROVIDER_MAX_CONCURRENCY,
+        min_concurrency: int = 1,
+        backoff_base_seconds: float = DEFAULT_BACKOFF_BASE_SECONDS,
+        backoff_max_seconds: float = DEFAULT_BACKOFF_MAX_SECONDS,
+    ) -> None:
+        self.name = name
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_concurrency = max(0, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency or 1))
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self._limit = float(self.max_concurrency)
+        self._inflight = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._blocked_until = 0.0
+        self._last_decrease = 0.0
+        self._rate_limit_streak = 0
+        self.calls = 0
+        self.throttled = 0
+        self.throttle_wait_seconds = 0.0
+        self.rate_limited = 0
+        self.server_errors = 0
+        self.decreases = 0
+
+    @property
+    def concurrency_limit(self) -> int:
+        return int(self._limit) if self.max_concurrency else 0
+
+    @contextlib.asynccontextmanager
+    async def permit(
+        self, *, estimated_tokens: int = 0
+    ) -> AsyncIterator[RateLimitPermit]:
+        """Wait for budget, hold a concurrency slot, and record the outcome.
+
+        A :class:`ProviderError` raised inside the block feeds the AIMD
+        controller and the shared cooldown before propagating.
+        """
+        started = time.monotonic()
+        delayed = await self._wait_for_budget(estimated_tokens)
+        delayed = await self._acquire_slot() or delayed
+        waited = time.monotonic() - started
+        self.calls += 1
+        if delayed:
+            self.throttled += 1
+            self.throttle_wait_seconds += waited
+            logger.debug(
+                "provider_rate_limit.throttled",
+                provider=self.name,
+                wait_ms=round(waited * 1000, 2),
+                inflight=self._inflight,
+                concurrency_limit=self.concurrency_limit,
+            )
+        permit = RateLimitPermit(self, estimated_tokens)
+        try:
+            yield permit
+        except ProviderError as exc:
+            self._on_error(exc)
+            raise
+        else:
+            self._on_success()
+        finally:
+            self._release_slot()
+
+    def backoff_delay(self, attempt: int, error: ProviderError | None = None) -> float:
+        """Delay before retrying ``attempt`` after ``error``."""
+        retry_after = error.retry_after if error is not None else None
+        return backoff_delay(
+            attempt,
+            base=self.backoff_base_seconds,
+            cap=self.backoff_max_seconds,
+            retry_after=retry_after,
+        )
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Correct the buckets from a response's rate-limit headers."""
+        for bucket, kind in ((self.requests, "requests"), (self.tokens, "tokens")):
+            limit = _header_number(
+                headers,
+                f"x-ratelimit-limit-{kind}",
+                f"anthropic-ratelimit-{kind}-limit",
+            )
+            remaining = _header_number(
+                headers,
+                f"x-ratelimit-remaining-{kind}",
+                f"anthropic-ratelimit-{kind}-remaining",
+            )
+            if limit is not None or remaining is not None:
+                bucket.sync(limit=limit, remaining=remaining)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "inflight": self._inflight,
+            "waiting": len(self._waiters),
+            "concurrency_limit": self.concurrency_limit,
+            "throttled": self.throttled,
+            "throttle_wait_seconds": round(self.throttle_wait_seconds, 3),
+            "rate_limited": self.rate_limited,
+            "server_errors": self.server_errors,
+            "concurrency_decreases": self.decreases,
+            "requests_available": (
+                round(self.requests.available(), 2) if self.requests.enabled else None
+            ),
+            "tokens_available": (
+                round(self.tokens.available(), 2) if self.tokens.enabled else None
+            ),
+            "cooldown_seconds": round(
+                max(0.0, self._blocked_until - time.monotonic()), 3
+            ),
+        }
+
+    # -- internal helpers ------------------------------------------------
+
+    async def _wait_for_budget(self, estimated_tokens: int) -> bool:
+        """Sleep out any cooldown and bucket debt; return whether it waited."""
+        cooldown = self._blocked_until - time.monotonic()
+        if cooldown > 0:
+            await asyncio.sleep(cooldown)
+        wait = max(
+            self.requests.reserve(1),
+            self.tokens.reserve(estimated_tokens),
+        )
+        if wait <= 0:
+            return cooldown > 0
+        try:
+            await asyncio.sleep(wait)
+        except asyncio.CancelledError:
+            self.requests.adjust(1)
+            self.tokens.adjust(estimated_tokens)
+            raise
+        return True
+
+    async def _acquire_slot(self) -> bool:
+        """Take a concurrency slot; return whether the caller had to queue."""
+        if not self.max_concurrency:
+            self._inflight += 1
+            return False
+        if self._inflight < self.concurrency_limit and not self._waiters:
+            self._inflight += 1
+            return False
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Handed a slot in the same tick the caller was cancelled.
+                self._release_slot()
+            else:
+                self._waiters.remove(future)
+            raise
+        return True
+
+    def _release_slot(self) -> None:
+        self._inflight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        limit = self.concurrency_limit if self.max_concurrency else math.inf
+        while self._waiters and self._inflight < limit:
+            future = self._waiters.popleft()
+            if not future.done():
+                self._inflight += 1
+                future.set_result(None)
+
+    def _on_success(self) -> None:
+        self._rate_limit_streak = 0
+        if self.max_concurrency and self._limit < self.max_concurrency:
+            self._limit = min(self.max_concurrency, self._limit + 1 / self._limit)
+            self._wake()
+
+    def _on_error(self, exc: ProviderError) -> None:
+        now = time.monotonic()
+        if isinstance(exc, ProviderRateLimitError):
+            self.rate_limited += 1
+            self._rate_limit_streak += 1
+            pause = (
+                exc.retry_after
+                if exc.retry_after is not None
+                else backoff_delay(
+                    self._rate_limit_streak,
+                    base=self.backoff_base_seconds,
+                    cap=self.backoff_max_seconds,
+                )
+            )
+            self._blocked_until = max(self._blocked_until, now + pause)
+            logger.warning(
+                "provider_rate_limit.cooldown",
+                provider=self.name,
+                seconds=round(pause, 3),
+                retry_after=exc.retry_after,
+            )
+        elif isinstance(exc, ProviderTransportError):
+            self.server_errors += 1
+            if exc.retry_after is not None:
+                self._blocked_until = max(self._blocked_until, now + exc.retry_after)
+        else:
+            return
+        if (
+            self.max_concurrency
+            and now - self._last_decrease >= _DECREASE_COOLDOWN_SECONDS
+        ):
+            self._last_decrease = now
+            previous = self.concurrency_limit
+            self._limit = max(float(self.min_concurrency), self._limit / 2)
+            self.decreases += 1
+            logger.info(
+                "provider_rate_limit.concurrency_decreased",
+                provider=self.name,
+                previous=previous,
+                limit=self.concurrency_limit,
+                error_code=exc.code,
+            )
+
+
+def provider_rate_limiter(provider: object) -> ProviderRateLimiter | None:
+    """Return the limiter bound to ``provider`` by :class:`ProviderManager`."""
+    limiter = getattr(provider, "rate_limiter", None)
+    return limiter if isinstance(limiter, ProviderRateLimiter) else None
+
+
+async def rate_limited_call[T](
+    provider: object,
+    call: Callable[[], Awaitable[T]],
+    *,
+    estimated_tokens: int = 0,
+) -> T:
+    """Run one provider request under ``provider``'s limiter, if it has one."""
+    limiter = provider_rate_limiter(provider)
+    if limiter is None:
+        return await call()
+    async with limiter.permit(estimated_tokens=estimated_tokens) as permit:
+        result = await call()
+        usage = getattr(result, "usage", None)
+        if usage is not None:
+            permit.record_usage(int(getattr(usage, "total", 0) or 0))
+        return result
+
+
+def _header(headers: Mapping[str, str], name: str) -> str:
+    value = headers.get(name)
+    if value is None:
+        # Plain dicts are case-sensitive; httpx.Headers is not.
+        value = headers.get(name.title())
+    return str(value).strip() if value is not None else ""
+
+
+def _header_number(headers: Mapping[str, str], *names: str) -> float | None:
+    for name in names:
+        raw = _header(headers, name)
+        if not raw:
+            continue
+        try:
+            return float(raw)
+        except ValueError:
+            continue
+    return None
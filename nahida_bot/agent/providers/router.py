@@ -2,12 +2,20 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping, Sequence
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Literal
+from typing import TYPE_CHECKING, Any, Literal
 
 import structlog
 
+from nahida_bot.agent.providers.failover import (
+    FailoverPolicy,
+    FailoverProvider,
+    ProviderHealth,
+)
+
 if TYPE_CHECKING:
+    from nahida_bot.agent.providers.base import ChatProvider, ModelCapabilities
     from nahida_bot.agent.providers.manager import ProviderManager, ProviderSlot
 
 logger = structlog.get_logger(__name__)
@@ -37,13 +45,28 @@ class ModelRouter:
 
     Task-level routing is intentionally code-level, not user-configured:
     explicit spec → task default spec → task fallback policy.
+
+    ``fallback_chains`` maps a primary — ``provider_id/model``,
+    ``provider_id`` or a bare model name — to the ordered specs to fail
+    over to. :meth:`provider_for` wraps a primary that has a chain in a
+    :class:`FailoverProvider`; all of them share one health registry, so
+    a slot's circuit opens for every session at once.
     """
 
     def __init__(
         self,
         provider_manager: ProviderManager,
+        *,
+        fallback_chains: Mapping[str, Sequence[str]] | None = None,
+        failover_policy: FailoverPolicy | None = None,
     ) -> None:
         self._pm = provider_manager
+        self._fallback_chains = {
+            key.strip(): list(specs)
+            for key, specs in (fallback_chains or {}).items()
+            if key.strip()
+        }
+        self._health = ProviderHealth(failover_policy)
 
     # ── Public API ─────────────────────────────────────────
 
@@ -125,8 +148,82 @@ class ModelRouter:
 
         return self._apply_fallback(task, fallback)
 
+    def resolve_chain(
+        self, slot: ProviderSlot, model: str | None = None
+    ) -> list[RoutedModel]:
+        """Return the failover chain for ``slot``/``model``, primary first.
+
+        Entries resolving to a slot/model pair already in the chain are
+        dropped; unresolvable specs are logged and skipped. So are entries
+        lacking image input or tool calling the primary has: the request is
+        built for the primary's capabilities, and a fallback that cannot
+        accept it would only fail with a non-retryable error.
+        """
+        effective = model or slot.default_model
+        chain = [RoutedModel(slot=slot, model=model, reason="primary")]
+        specs = self._fallback_specs(slot.id, effective)
+        if not specs:
+            return chain
+        required = slot.resolve_capabilities(model)
+        seen = {(slot.id, effective)}
+        for spec in specs:
+            routed = self.resolve(spec)
+            if routed is None:
+                logger.warning(
+                    "model_router.fallback_missed",
+                    primary=f"{slot.id}/{effective}",
+                    spec=spec,
+                )
+                continue
+            key = (routed.slot.id, routed.model or routed.slot.default_model)
+            if key in seen:
+                continue
+            seen.add(key)
+            missing = _missing_capabilities(
+                required, routed.slot.resolve_capabilities(routed.model)
+            )
+            if missing:
+                logger.warning(
+                    "model_router.fallback_incompatible",
+                    primary=f"{slot.id}/{effective}",
+                    spec=spec,
+                    missing=missing,
+                )
+                continue
+            chain.append(
+                RoutedModel(
+                    slot=routed.slot, model=routed.model, reason=f"fallback:{spec}"
+                )
+            )
+        return chain
+
+    def provider_for(
+        self, slot: ProviderSlot, model: str | None = None
+    ) -> ChatProvider:
+        """Return the provider to call for ``slot``/``model``.
+
+        That is the slot's own provider unless a fallback chain is
+        configured for it, in which case a :class:`FailoverProvider` is
+        returned.
+        """
+        chain = self.resolve_chain(slot, model)
+        if len(chain) == 1:
+            return slot.provider
+        return FailoverProvider(chain, self._health)
+
+    def failover_stats(self) -> dict[str, Any]:
+        """Failover, hedging and circuit-breaker counters per slot."""
+        return self._health.stats()
+
     # ── Internals ──────────────────────────────────────────
 
+    def _fallback_specs(self, slot_id: str, model: str) -> list[str]:
+        for key in (f"{slot_id}/{model}", slot_id, model):
+            specs = self._fallback_chains.get(key)
+            if specs:
+                return specs
+        return []
+
     def _resolve_by_tag(self, tag: str) -> RoutedModel | None:
         """Find first model matching *tag* across all provider slots.
 
@@ -174,3 +271,14 @@ class ModelRouter:
             )
             return None
         return None
+
+
+def _missing_capabilities(
+    required: ModelCapabilities, candidate: ModelCapabilities
+) -> list[str]:
+    """Request-shaping capabilities of ``required`` that ``candidate`` lacks."""
+    return [
+        name
+        for name in ("image_input", "tool_calling")
+        if getattr(required, name) and not getattr(candidate, name)
+    ]
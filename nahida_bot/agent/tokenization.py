@@ -5,7 +5,14 @@ from __future__ import annotations
 import math
 import re
 from dataclasses import dataclass
-from typing import Protocol, runtime_checkable
+from typing import Literal, Protocol, runtime_checkable
+
+ImageTokenModel = Literal["openai_tiles", "anthropic_pixels"]
+
+DEFAULT_IMAGE_TOKEN_MODEL: ImageTokenModel = "openai_tiles"
+
+# Assumed dimensions when neither the channel nor the resolver reported a size.
+UNKNOWN_IMAGE_SIZE = (1024, 1024)
 
 
 @runtime_checkable
@@ -87,3 +94,50 @@ def resolve_tokenizer(
         return fallback_tokenizer
 
     return CompositeTokenizer(HeuristicTokenizer(), CharacterEstimateTokenizer())
+
+
+def estimate_image_tokens(width: int, height: int, *, model: str = "") -> int:
+    """Estimate the prompt tokens a provider charges for one image.
+
+    ``openai_tiles`` follows the high-detail tile formula: fit within
+    2048x2048, scale the short side down to 768, then charge 85 base tokens
+    plus 170 per 512px tile. ``anthropic_pixels`` scales to a 1568px long
+    edge and ~1.15 megapixels, then charges ``width * height / 750``. Unknown
+    model names use the OpenAI formula. Missing dimensions fall back to
+    :data:`UNKNOWN_IMAGE_SIZE`.
+    """
+    if width <= 0 or height <= 0:
+        width, height = UNKNOWN_IMAGE_SIZE
+    if model == "anthropic_pixels":
+        return _anthropic_pixel_tokens(width, height)
+    return _openai_tile_tokens(width, height)
+
+
+def provider_image_size(
+    width: int, height: int, *, model: str = ""
+) -> tuple[float, float]:
+    """Return the size a provider scales an image to before charging for it.
+
+    Uses the same formulas as :func:`estimate_image_tokens`; pixels beyond
+    this size cost upload bandwidth but add nothing the model can see.
+    """
+    if model == "anthropic_pixels":
+        scale = min(
+            1.0, 1568 / max(width, height), math.sqrt(1_150_000 / (width * height))
+        )
+        return width * scale, height * scale
+    scale = min(1.0, 2048 / max(width, height))
+    scaled_w, scaled_h = width * scale, height * scale
+    scale = min(1.0, 768 / min(scaled_w, scaled_h))
+    return scaled_w * scale, scaled_h * scale
+
+
+def _openai_tile_tokens(width: int, height: int) -> int:
+    scaled_w, scaled_h = provider_image_size(width, height, model="openai_tiles")
+    tiles = math.ceil(scaled_w / 512) * math.ceil(scaled_h / 512)
+    return 85 + 170 * tiles
+
+
+def _anthropic_pixel_tokens(width: int, height: int) -> int:
+    scaled_w, scaled_h = provider_image_size(width, height, model="anthropic_pixels")
+    return max(1, math.ceil(scaled_w * scaled_h / 750))
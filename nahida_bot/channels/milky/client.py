@@ -225,7 +225,12 @@ class MilkyClient:
         url = self._api_url(api_name)
 
         try:
-            response = await client.post(url, json=payload, headers=self._headers())
+            response = await client.post(
+                url,
+                json=payload,
+                headers=self._headers(),
+                timeout=httpx.Timeout(self._config.connect_timeout),
+            )
         except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as exc:
             raise MilkyNetworkError(
                 f"Milky API {api_name} network failure: {exc}",
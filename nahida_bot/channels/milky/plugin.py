@@ -77,7 +77,15 @@ class MilkyPlugin(Plugin):
         """Create client, verify connection, and register channel."""
         config = self.config
         if self._client is None:
-            self._client = MilkyClient(config)
+            transports = getattr(self.api, "http_transports", None)
+            self._client = MilkyClient(
+                config,
+                http_client=(
+                    transports.client_for(config.api_base_url)
+                    if transports is not None
+                    else None
+                ),
+            )
         login_info = await self._client.get_login_info()
         self._self_id = _pick_int(login_info, "uin", "user_id", "self_id", "qq")
         self._inbound_converter = MilkyMessageConverter(
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import asyncio
 import os
+from collections import OrderedDict
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
@@ -31,6 +32,9 @@ if TYPE_CHECKING:
 
 logger = structlog.get_logger(__name__)
 
+# Streamed replies whose continuation messages are remembered for editing.
+_MAX_TRACKED_EDITS = 256
+
 
 class TelegramPlugin(Plugin):
     """Telegram Bot channel using aiogram v3 long polling.
@@ -47,6 +51,10 @@ class TelegramPlugin(Plugin):
         self._polling_task: asyncio.Task | None = None  # type: ignore[type-arg]
         self._converter = TelegramMessageConverter(bot_username=None)
         self._update_offset = 0
+        # (chat, first message id) -> [(message id, last text)] per chunk
+        self._edited_chunks: OrderedDict[tuple[str, str], list[tuple[str, str]]] = (
+            OrderedDict()
+        )
 
     @property
     def channel_id(self) -> str:
@@ -206,6 +214,57 @@ class TelegramPlugin(Plugin):
 
         return last_msg_id
 
+    async def edit_message(
+        self, target: str, message_id: str, message: OutboundMessage
+    ) -> str:
+        """Replace the text of a previously sent message via ``editMessageText``.
+
+        Used by the router to render streaming replies progressively. Text
+        that no longer fits in one Telegram message is continued in new
+        messages; their ids are remembered so later edits of the same reply
+        update them instead of posting the overflow again. Unchanged chunks
+        are not re-sent. The id of the last message is returned.
+        """
+        assert self._bot is not None
+        html_text = convert_markdown_to_telegram_html(message.text)
+        chunks = split_html_message(html_text)
+        if not chunks:
+            return message_id
+
+        key = (target, message_id)
+        sent_chunks = self._edited_chunks.pop(key, None) or [(message_id, "")]
+        for i, chunk in enumerate(chunks):
+            if i < len(sent_chunks):
+                chunk_id, previous = sent_chunks[i]
+                if chunk != previous:
+                    await self._edit_chunk(target, chunk_id, chunk)
+                    sent_chunks[i] = (chunk_id, chunk)
+                continue
+            sent = await self._send_with_retry(
+                self._bot.send_message, {"chat_id": int(target), "text": chunk}
+            )
+            sent_chunks.append((str(sent.message_id), chunk))
+
+        self._edited_chunks[key] = sent_chunks
+        while len(self._edited_chunks) > _MAX_TRACKED_EDITS:
+            self._edited_chunks.popitem(last=False)
+        return sent_chunks[len(chunks) - 1][0]
+
+    async def _edit_chunk(self, target: str, message_id: str, text: str) -> None:
+        assert self._bot is not None
+        try:
+            await self._send_with_retry(
+                self._bot.edit_message_text,
+                {
+                    "chat_id": int(target),
+                    "message_id": int(message_id),
+                    "text": text,
+                },
+            )
+        except Exception as exc:
+            if "message is not modified" not in str(exc):
+                raise
+
     async def get_user_info(self, user_id: str) -> dict[str, Any]:
         """Fetch Telegram user profile."""
         if self._bot is None:
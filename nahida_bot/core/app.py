@@ -22,6 +22,7 @@ from nahida_bot.core.events import (
     EventContext,
 )
 from nahida_bot.core.exceptions import ApplicationError, StartupError
+from nahida_bot.core.http_transport import HttpTransportRegistry
 from nahida_bot.core.logging import configure_logging
 from nahida_bot.core.router import MessageRouter, RouterConfig
 from nahida_bot.plugins.commands import CommandMatcher
@@ -77,7 +78,20 @@ class Application:
         self._model_router: ModelRouter | None = None
         self._memory_embedding_provider: Any | None = None
         self._memory_vector_index: Any | None = None
+        self._memory_retention: Any | None = None
+        self._media_cache: Any | None = None
+        self._media_resolver: Any | None = None
+        self._turn_index_backfill: asyncio.Task[None] | None = None
         self._providers_to_close: list[object] = []  # ChatProvider instances
+        http = self.settings.http
+        self.http_transports = HttpTransportRegistry(
+            max_connections_per_host=http.max_connections_per_host,
+            max_keepalive_connections=http.max_keepalive_connections,
+            keepalive_expiry_seconds=http.keepalive_expiry_seconds,
+            connect_timeout_seconds=http.connect_timeout_seconds,
+            http2=http.http2,
+            host_limits=http.host_limits,
+        )
         self.session_runner: SessionRunner | None = None
         self.scheduler_service: SchedulerService | None = None
         self.orchestration_service: AgentOrchestrator | None = None
@@ -174,17 +188,40 @@ class Application:
         from nahida_bot.agent.context import ContextBuilder
         from nahida_bot.agent.context import build_context_budget
         from nahida_bot.agent.loop import AgentLoop, AgentLoopConfig
+        from nahida_bot.agent.memory.retention import MemoryRetention, RetentionPolicy
         from nahida_bot.agent.memory.sqlite import SQLiteMemoryStore
-        from nahida_bot.agent.providers import create_provider
+        from nahida_bot.agent.providers import ProviderRateLimiter, create_provider
         from nahida_bot.agent.providers.manager import ProviderManager, ProviderSlot
         from nahida_bot.db.engine import DatabaseEngine
 
         # Database + Memory
         db_path = self.settings.db_path
-        engine = DatabaseEngine(db_path)
+        engine = DatabaseEngine(db_path, read_pool_size=self.settings.db_read_pool_size)
         await engine.initialize()
         self._db_engine = engine
-        self.memory_store = SQLiteMemoryStore(engine)
+        memory_cfg = self.settings.memory
+        self.memory_store = SQLiteMemoryStore(
+            engine,
+            write_batch_max_delay=memory_cfg.write_batch_max_delay_ms / 1000,
+            write_batch_max_size=memory_cfg.write_batch_max_size,
+            session_meta_cache_size=memory_cfg.session_meta_cache_size,
+        )
+        retention_cfg = memory_cfg.retention
+        if retention_cfg.enabled:
+            self._memory_retention = MemoryRetention(
+                self.memory_store,
+                engine,
+                RetentionPolicy(
+                    observed_max_age_days=retention_cfg.observed_max_age_days,
+                    dialogue_max_age_days=retention_cfg.dialogue_max_age_days,
+                    source_max_age_days=dict(retention_cfg.source_max_age_days),
+                    max_turns_per_session=retention_cfg.max_turns_per_session,
+                    chunk_size=retention_cfg.chunk_size,
+                    vacuum_pages_per_step=retention_cfg.vacuum_pages_per_step,
+                ),
+                interval_seconds=retention_cfg.interval_seconds,
+                initial_delay_seconds=retention_cfg.initial_delay_seconds,
+            )
         logger.info("application.memory_initialized", db_path=db_path)
 
         # Build providers from config
@@ -228,6 +265,9 @@ class Application:
                 if value is not None:
                     provider_kwargs[extra_field] = value
             provider = create_provider(cfg.type, **provider_kwargs)
+            bind_http_client = getattr(provider, "bind_http_client", None)
+            if cfg.base_url and callable(bind_http_client):
+                bind_http_client(self.http_transports.client_for(cfg.base_url))
             cb = ContextBuilder(
                 budget=build_context_budget(self.settings.context),
                 provider=provider,
@@ -241,6 +281,14 @@ class Application:
                     available_models=available_models,
                     capabilities_by_model=capabilities_by_model,
                     tags_by_model=tags_by_model,
+                    rate_limiter=ProviderRateLimiter(
+                        pid,
+                        requests_per_minute=cfg.requests_per_minute,
+                        tokens_per_minute=cfg.tokens_per_minute,
+                        max_concurrency=cfg.max_concurrency,
+                        backoff_base_seconds=self.settings.agent.retry_backoff_seconds,
+                        backoff_max_seconds=self.settings.agent.retry_backoff_max_seconds,
+                    ),
                 )
             )
             self._providers_to_close.append(provider)
@@ -255,9 +303,23 @@ class Application:
             default_id = self.settings.default_provider or ""
             self._provider_manager = ProviderManager(slots, default_id=default_id)
 
+            from nahida_bot.agent.providers.failover import FailoverPolicy
             from nahida_bot.agent.providers.router import ModelRouter
 
-            self._model_router = ModelRouter(self._provider_manager)
+            failover = self.settings.agent.failover
+            self._model_router = ModelRouter(
+                self._provider_manager,
+                fallback_chains=failover.chains,
+                failover_policy=FailoverPolicy(
+                    failure_threshold=failover.failure_threshold,
+                    circuit_open_seconds=failover.circuit_open_seconds,
+                    first_byte_timeout_seconds=failover.first_byte_timeout_seconds,
+                    hedge=failover.hedge,
+                    hedge_quantile=failover.hedge_quantile,
+                    hedge_min_samples=failover.hedge_min_samples,
+                    hedge_min_delay_seconds=failover.hedge_min_delay_seconds,
+                ),
+            )
             await self._init_memory_embedding()
 
             # Create a single AgentLoop with the default provider as fallback
@@ -270,9 +332,11 @@ class Application:
                     provider_timeout_seconds=self.settings.agent.provider_timeout_seconds,
                     retry_attempts=self.settings.agent.retry_attempts,
                     retry_backoff_seconds=self.settings.agent.retry_backoff_seconds,
+                    retry_backoff_max_seconds=self.settings.agent.retry_backoff_max_seconds,
                     tool_timeout_seconds=self.settings.agent.tool_timeout_seconds,
                     tool_retry_attempts=self.settings.agent.tool_retry_attempts,
                     tool_retry_backoff_seconds=self.settings.agent.tool_retry_backoff_seconds,
+                    max_parallel_tools=self.settings.agent.max_parallel_tools,
                     max_tool_log_chars=self.settings.agent.max_tool_log_chars,
                     tool_use_system_prompt=self.settings.agent.tool_use_system_prompt,
                     provider_error_template=self.settings.agent.provider_error_template,
@@ -400,7 +464,12 @@ class Application:
         from pathlib import Path
 
         from nahida_bot.agent.media.cache import MediaCache
+        from nahida_bot.agent.media.preprocess import (
+            ImagePreprocessor,
+            ImagePreprocessPolicy,
+        )
         from nahida_bot.agent.media.resolver import MediaPolicy, MediaResolver
+        from nahida_bot.core.run_scheduler import AgentRunScheduler
         from nahida_bot.core.session_runner import SessionRunner
         from nahida_bot.scheduler.repository import CronRepository
         from nahida_bot.scheduler.service import SchedulerService
@@ -418,8 +487,11 @@ class Application:
         multimodal = self.settings.multimodal
         cache_dir = str(Path(self.settings.db_path).parent / "media_cache")
         media_cache = MediaCache(
-            cache_dir, ttl_seconds=multimodal.media_cache_ttl_seconds
+            cache_dir,
+            ttl_seconds=multimodal.media_cache_ttl_seconds,
+            max_bytes=multimodal.media_cache_max_bytes,
         )
+        self._media_cache = media_cache
         media_policy = MediaPolicy(
             max_image_bytes=multimodal.max_image_bytes,
             supported_mime_types=("image/jpeg", "image/png", "image/webp"),
@@ -427,7 +499,44 @@ class Application:
             cache_ttl_seconds=multimodal.media_cache_ttl_seconds,
             cache_dir=cache_dir,
         )
-        media_resolver = MediaResolver(cache=media_cache, policy=media_policy)
+        media_resolver = MediaResolver(
+            cache=media_cache,
+            policy=media_policy,
+            http_client=self.http_transports.client("media"),
+            max_concurrency=multimodal.media_resolve_concurrency,
+            encoded_memo_bytes=multimodal.encoded_media_memo_bytes,
+            preprocessor=ImagePreprocessor(
+                ImagePreprocessPolicy(
+                    enabled=multimodal.image_preprocess,
+                    max_edge=multimodal.image_preprocess_max_edge,
+                    format=multimodal.image_preprocess_format,
+                    quality=multimodal.image_preprocess_quality,
+                    min_bytes=multimodal.image_preprocess_min_bytes,
+                    workers=multimodal.image_preprocess_workers,
+                )
+            )
+            if multimodal.image_preprocess
+            else None,
+            metrics=self.agent_loop.metrics if self.agent_loop is not None else None,
+        )
+        self._media_resolver = media_resolver
+
+        scheduling = self.settings.agent.run_scheduler
+        run_scheduler = (
+            AgentRunScheduler(
+                max_concurrent=scheduling.max_concurrent_runs,
+                max_per_provider=scheduling.max_runs_per_provider,
+                provider_limits=scheduling.provider_limits,
+                weights={
+                    "private": scheduling.private_weight,
+                    "group": scheduling.group_weight,
+                    "subagent": scheduling.subagent_weight,
+                    "cron": scheduling.cron_weight,
+                },
+            )
+            if scheduling.enabled
+            else None
+        )
 
         self.session_runner = SessionRunner(
             agent_loop=self.agent_loop,
@@ -456,6 +565,27 @@ class Application:
             group_context_max_chars=self.settings.router.group_context.max_chars,
             media_resolver=media_resolver,
             channel_registry=self.channel_registry,
+            history_cache_sessions=self.settings.router.history_cache_sessions,
+            history_cache_max_bytes=self.settings.router.history_cache_max_bytes,
+            memory_embedding_refresh_debounce_seconds=(
+                self.settings.memory.embedding.refresh_debounce_seconds
+            ),
+            memory_embedding_refresh_max_delay_seconds=(
+                self.settings.memory.embedding.refresh_max_delay_seconds
+            ),
+            memory_embedding_refresh_max_items=(
+                self.settings.memory.embedding.refresh_max_items
+            ),
+            memory_consolidation_queue_size=(
+                self.settings.memory.consolidation.queue_size
+            ),
+            memory_consolidation_max_turns_per_job=(
+                self.settings.memory.consolidation.max_turns_per_job
+            ),
+            memory_consolidation_drain_timeout=(
+                self.settings.memory.consolidation.drain_timeout_seconds
+            ),
+            run_scheduler=run_scheduler,
         )
 
         from nahida_bot.agent.orchestration import (
@@ -644,6 +774,11 @@ class Application:
                 await self.plugin_manager.load_all(phase="post-agent")
                 await self.plugin_manager.enable_all(phase="post-agent")
 
+            if self.settings.http.prewarm:
+                await self.http_transports.prewarm(
+                    timeout_seconds=self.settings.http.prewarm_timeout_seconds
+                )
+
             # Create and start the message router
             assert self.plugin_manager is not None
             self.message_router = MessageRouter(
@@ -663,6 +798,16 @@ class Application:
                     show_reasoning=self.settings.router.show_reasoning,
                     reasoning_max_chars=self.settings.router.reasoning_max_chars,
                     group_context_enabled=self.settings.router.group_context.enabled,
+                    stream_edits=self.settings.router.stream_edits,
+                    stream_edit_interval_seconds=(
+                        self.settings.router.stream_edit_interval_seconds
+                    ),
+                    pending_coalesce=self.settings.router.pending_coalesce,
+                    pending_max_messages=self.settings.router.pending_max_messages,
+                    pending_overflow=self.settings.router.pending_overflow,
+                    burst_debounce_seconds=(
+                        self.settings.router.burst_debounce_seconds
+                    ),
                 ),
             )
             await self.message_router.start()
@@ -679,6 +824,15 @@ class Application:
                 )
                 await self.scheduler_service.start()
 
+            if self._memory_retention is not None:
+                self._memory_retention.start()
+            backfill = getattr(self.memory_store, "backfill_turn_index", None)
+            if callable(backfill):
+                self._turn_index_backfill = asyncio.create_task(
+                    self._backfill_turn_index(backfill),
+                    name="memory-turn-index-backfill",
+                )
+
             result = await self.event_bus.publish(
                 AppStarted(
                     payload=AppLifecyclePayload(
@@ -737,6 +891,10 @@ class Application:
                 if self.message_router is not None:
                     await self.message_router.stop()
 
+                # Flush debounced background memory work
+                if self.session_runner is not None:
+                    await self.session_runner.close()
+
                 # Shut down plugins before event bus
                 if self.plugin_manager is not None:
                     await self.plugin_manager.shutdown_all()
@@ -755,11 +913,27 @@ class Application:
                 await self.event_bus.shutdown(timeout=1.0)
 
             # Always clean up resources, even if startup didn't fully complete.
+            if self._turn_index_backfill is not None:
+                self._turn_index_backfill.cancel()
+                await asyncio.gather(self._turn_index_backfill, return_exceptions=True)
+                self._turn_index_backfill = None
+            if self._memory_retention is not None:
+                await self._memory_retention.close()
+            if self._media_resolver is not None:
+                await self._media_resolver.close()
+            if self._media_cache is not None:
+                await self._media_cache.close()
             for provider in self._providers_to_close:
                 close_fn = getattr(provider, "close", None)
                 if close_fn is not None:
                     await close_fn()
             self._providers_to_close.clear()
+            # Pooled connections go last: everything above may still use them.
+            await self.http_transports.aclose()
+            # Queued group-commit writes must land before the engine closes.
+            close_store = getattr(self.memory_store, "close", None)
+            if close_store is not None:
+                await close_store()
             if self._db_engine is not None:
                 await self._db_engine.close()
                 self._db_engine = None
@@ -777,6 +951,13 @@ class Application:
             )
             raise ApplicationError(f"Failed to stop application: {e}") from e
 
+    async def _backfill_turn_index(self, backfill: Any) -> None:
+        """Index turns stored before the FTS turn index existed."""
+        try:
+            await backfill()
+        except Exception:
+            logger.exception("application.turn_index_backfill_failed")
+
     def request_shutdown(self) -> None:
         """Request application shutdown from external callers."""
         if self._shutdown_event is not None:
@@ -33,6 +33,9 @@ class ProviderEntryConfig(BaseModel):
     api_key: str = ""
     base_url: str = ""
     models: list[ProviderModelEntry] = Field(default_factory=list)
+    requests_per_minute: int = Field(default=0, ge=0)
+    tokens_per_minute: int = Field(default=0, ge=0)
+    max_concurrency: int = Field(default=16, ge=0)
 
 
 class MultimodalConfig(BaseModel):
@@ -47,6 +50,45 @@ class MultimodalConfig(BaseModel):
     max_images_per_turn: int = Field(default=4, ge=0)
     max_image_bytes: int = Field(default=10485760, ge=0)  # 10 MB
     media_cache_ttl_seconds: int = Field(default=3600, ge=0)
+    media_cache_max_bytes: int = Field(default=512 * 1024 * 1024, ge=0)  # 512 MB
+    media_resolve_concurrency: int = Field(default=4, ge=1)
+    encoded_media_memo_bytes: int = Field(default=64 * 1024 * 1024, ge=0)  # 64 MB
+    image_preprocess: bool = False
+    image_preprocess_format: Literal["jpeg", "webp"] = "jpeg"
+    image_preprocess_quality: int = Field(default=85, ge=1, le=100)
+    image_preprocess_max_edge: int = Field(default=2048, ge=0)
+    image_preprocess_min_bytes: int = Field(default=256 * 1024, ge=0)  # 256 KB
+    image_preprocess_workers: int = Field(default=0, ge=0)
+
+
+class RunSchedulerConfig(BaseModel):
+    """Agent run admission control and fair-queueing configuration."""
+
+    model_config = ConfigDict(frozen=True, extra="allow")
+
+    enabled: bool = True
+    max_concurrent_runs: int = Field(default=16, ge=0)
+    max_runs_per_provider: int = Field(default=8, ge=0)
+    provider_limits: dict[str, int] = {}
+    private_weight: int = Field(default=4, ge=1)
+    group_weight: int = Field(default=2, ge=1)
+    subagent_weight: int = Field(default=2, ge=1)
+    cron_weight: int = Field(default=1, ge=1)
+
+
+class FailoverConfig(BaseModel):
+    """Provider failover chain, circuit breaker and hedging configuration."""
+
+    model_config = ConfigDict(frozen=True, extra="allow")
+
+    chains: dict[str, list[str]] = {}
+    failure_threshold: int = Field(default=3, ge=1)
+    circuit_open_seconds: float = Field(default=30.0, ge=0)
+    first_byte_timeout_seconds: float = Field(default=0.0, ge=0)
+    hedge: bool = False
+    hedge_quantile: float = Field(default=0.95, gt=0, le=1)
+    hedge_min_samples: int = Field(default=20, ge=1)
+    hedge_min_delay_seconds: float = Field(default=0.5, ge=0)
 
 
 class AgentConfig(BaseModel):
@@ -58,10 +100,14 @@ class AgentConfig(BaseModel):
     provider_timeout_seconds: float = Field(default=30.0, ge=0)
     retry_attempts: int = Field(default=2, ge=0)
     retry_backoff_seconds: float = Field(default=0.2, ge=0)
+    retry_backoff_max_seconds: float = Field(default=20.0, ge=0)
     tool_timeout_seconds: float = Field(default=135.0, ge=0)
     tool_retry_attempts: int = Field(default=1, ge=0)
     tool_retry_backoff_seconds: float = Field(default=0.1, ge=0)
+    max_parallel_tools: int = Field(default=4, ge=1)
     max_tool_log_chars: int = Field(default=400, ge=0)
+    run_scheduler: RunSchedulerConfig = RunSchedulerConfig()
+    failover: FailoverConfig = FailoverConfig()
     tool_use_system_prompt: str = (
         "Tool use policy: When a tool is needed, call it through the structured "
         "tool/function calling interface. Do not merely say that you will call a "
@@ -136,6 +182,9 @@ class MemoryEmbeddingConfig(BaseModel):
     dimensions: int = Field(default=0, ge=0)
     batch_size: int = Field(default=16, ge=1)
     embed_after_consolidation: bool = True
+    refresh_debounce_seconds: float = Field(default=5.0, ge=0)
+    refresh_max_delay_seconds: float = Field(default=60.0, ge=0)
+    refresh_max_items: int = Field(default=100, ge=1)
 
 
 class MemoryConsolidationConfig(BaseModel):
@@ -144,6 +193,29 @@ class MemoryConsolidationConfig(BaseModel):
     model_config = ConfigDict(frozen=True, extra="allow")
 
     rule_based_enabled: bool = True
+    queue_size: int = Field(default=256, ge=1)
+    max_turns_per_job: int = Field(default=16, ge=1)
+    drain_timeout_seconds: float = Field(default=10.0, ge=0)
+
+
+class MemoryRetentionConfig(BaseModel):
+    """Conversation turn retention and database compaction configuration.
+
+    Opt-in: retention permanently deletes stored turns, so it never runs
+    unless explicitly enabled.
+    """
+
+    model_config = ConfigDict(frozen=True, extra="allow")
+
+    enabled: bool = False
+    interval_seconds: float = Field(default=3600.0, ge=60)
+    initial_delay_seconds: float = Field(default=600.0, ge=0)
+    observed_max_age_days: float = Field(default=1.0, ge=0)
+    dialogue_max_age_days: float = Field(default=90.0, ge=0)
+    source_max_age_days: dict[str, float] = Field(default_factory=dict)
+    max_turns_per_session: int = Field(default=0, ge=0)
+    chunk_size: int = Field(default=500, ge=1, le=500)
+    vacuum_pages_per_step: int = Field(default=256, ge=1)
 
 
 class MemoryConfig(BaseModel):
@@ -152,9 +224,13 @@ class MemoryConfig(BaseModel):
     model_config = ConfigDict(frozen=True, extra="allow")
 
     enabled: bool = True
+    write_batch_max_delay_ms: float = Field(default=5.0, ge=0)
+    write_batch_max_size: int = Field(default=64, ge=1)
+    session_meta_cache_size: int = Field(default=1024, ge=0)
     retrieval: MemoryRetrievalConfig = MemoryRetrievalConfig()
     embedding: MemoryEmbeddingConfig = MemoryEmbeddingConfig()
     consolidation: MemoryConsolidationConfig = MemoryConsolidationConfig()
+    retention: MemoryRetentionConfig = MemoryRetentionConfig()
 
 
 class GroupContextConfig(BaseModel):
@@ -175,15 +251,38 @@ class RouterConfigModel(BaseModel):
 
     system_prompt: str = "You are a helpful assistant."
     max_history_turns: int = Field(default=50, ge=1)
+    history_cache_sessions: int = Field(default=256, ge=0)
+    history_cache_max_bytes: int = Field(default=32 * 1024 * 1024, ge=0)
     agent_enabled: bool = True
     command_timeout_seconds: float = Field(default=30.0, ge=0)
     command_timeout_message: str = "Command timed out. Please try again later."
     reply_to_inbound: bool = True
     show_reasoning: bool = False
     reasoning_max_chars: int = Field(default=2000, ge=0)
+    stream_edits: bool = True
+    stream_edit_interval_seconds: float = Field(default=1.0, ge=0)
+    pending_coalesce: bool = True
+    pending_max_messages: int = Field(default=20, ge=1)
+    pending_overflow: Literal["drop_oldest", "drop_newest"] = "drop_oldest"
+    burst_debounce_seconds: float = Field(default=0.0, ge=0)
     group_context: GroupContextConfig = GroupContextConfig()
 
 
+class HttpConfig(BaseModel):
+    """Shared HTTP connection pool configuration."""
+
+    model_config = ConfigDict(frozen=True, extra="allow")
+
+    max_connections_per_host: int = Field(default=20, ge=1)
+    max_keepalive_connections: int = Field(default=10, ge=0)
+    keepalive_expiry_seconds: float = Field(default=30.0, ge=0)
+    connect_timeout_seconds: float = Field(default=10.0, gt=0)
+    http2: bool = True
+    host_limits: dict[str, int] = {}
+    prewarm: bool = False
+    prewarm_timeout_seconds: float = Field(default=5.0, gt=0)
+
+
 class Settings(BaseModel):
     """Main application settings."""
 
@@ -204,6 +303,7 @@ class Settings(BaseModel):
 
     # Database
     db_path: str = "./data/nahida.db"
+    db_read_pool_size: int = Field(default=4, ge=0)
 
     # Workspace
     workspace_base_dir: str = "./data/workspace"
@@ -222,6 +322,9 @@ class Settings(BaseModel):
     # Multimodal context
     multimodal: MultimodalConfig = MultimodalConfig()
 
+    # Shared HTTP connection pools
+    http: HttpConfig = HttpConfig()
+
     # Internal subsystem configs
     agent: AgentConfig = AgentConfig()
     context: ContextConfig = ContextConfig()
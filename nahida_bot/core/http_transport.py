@@ -0,0 +1,291 @@
+"""Shared, application-owned HTTP connection pools."""
+
+from __future__ import annotations
+
+import asyncio
+import http.cookiejar
+import importlib.util
+import time
+from collections import deque
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_MAX_CONNECTIONS_PER_HOST = 20
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 10
+DEFAULT_KEEPALIVE_EXPIRY_SECONDS = 30.0
+DEFAULT_CONNECT_TIMEOUT_SECONDS = 10.0
+DEFAULT_TIMEOUT_SECONDS = 30.0
+_WAIT_SAMPLE_SIZE = 512
+
+
+def origin_of(url: str) -> str:
+    """Return ``scheme://host[:port]`` for ``url``, or ``""`` if it has none."""
+    parts = urlsplit(url.strip())
+    if not parts.scheme or not parts.netloc:
+        return ""
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def _reject_all_cookies() -> http.cookiejar.CookieJar:
+    """Return a cookie jar whose policy refuses to store any cookie."""
+    return http.cookiejar.CookieJar(
+        policy=http.cookiejar.DefaultCookiePolicy(allowed_domains=[])
+    )
+
+
+@dataclass(slots=True)
+class _PoolStats:
+    """Request counters of one pooled client, fed by httpcore trace events."""
+
+    requests: int = 0
+    new_connections: int = 0
+    connect_failures: int = 0
+    waits: deque[float] = field(default_factory=lambda: deque(maxlen=_WAIT_SAMPLE_SIZE))
+    max_wait_seconds: float = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        self.waits.append(seconds)
+        self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+
+
+class _RequestTrace:
+    """``trace`` extension for one request; chains any caller-supplied one."""
+
+    __slots__ = ("_previous", "_started", "_stats", "_waited")
+
+    def __init__(self, stats: _PoolStats, previous: Any = None) -> None:
+        self._stats = stats
+        self._started = time.monotonic()
+        self._previous = previous
+        self._waited = False
+
+    async def __call__(self, event: str, info: dict[str, Any]) -> None:
+        if not self._waited and (
+            event == "connection.connect_tcp.started"
+            or event.endswith(".send_request_headers.started")
+        ):
+            # Time until the request got a connection, new or reused.
+            self._waited = True
+            self._stats.record_wait(time.monotonic() - self._started)
+        if event == "connection.connect_tcp.complete":
+            self._stats.new_connections += 1
+        elif event == "connection.connect_tcp.failed":
+            self._stats.connect_failures += 1
+        if self._previous is not None:
+            await self._previous(event, info)
+
+
+@dataclass(slots=True, eq=False)
+class _PooledClient:
+    key: str
+    client: httpx.AsyncClient
+    stats: _PoolStats
+    origin: str = ""
+
+
+class HttpTransportRegistry:
+    """Keyed ``httpx.AsyncClient`` pools shared across the application.
+
+    Clients are created lazily, one per key, and reused by every caller
+    asking for that key. :meth:`client_for` keys by origin, so providers,
+    channels and tools talking to the same host share one keep-alive pool
+    whose size is ``max_connections_per_host`` (or its ``host_limits``
+    entry). HTTP/2 is negotiated when enabled and the optional ``h2``
+    package is installed.
+
+    The registry owns the clients: callers must not close them.
+    :meth:`aclose` closes them all, once, at application shutdown.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry_seconds: float = DEFAULT_KEEPALIVE_EXPIRY_SECONDS,
+        connect_timeout_seconds: float = DEFAULT_CONNECT_TIMEOUT_SECONDS,
+        timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS,
+        http2: bool = True,
+        host_limits: Mapping[str, int] | None = None,
+    ) -> None:
+        self.max_connections_per_host = max(1, max_connections_per_host)
+        self.max_keepalive_connections = max(0, max_keepalive_connections)
+        self.keepalive_expiry_seconds = keepalive_expiry_seconds
+        self.connect_timeout_seconds = connect_timeout_seconds
+        self.timeout_seconds = timeout_seconds
+        self.http2 = http2 and importlib.util.find_spec("h2") is not None
+        self.host_limits = {
+            key.strip().lower(): max(1, value)
+            for key, value in (host_limits or {}).items()
+        }
+        self._clients: dict[str, _PooledClient] = {}
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def client(
+        self,
+        key: str,
+        *,
+        origin: str = "",
+        follow_redirects: bool = False,
+        max_redirects: int = 20,
+        accept_cookies: bool = True,
+    ) -> httpx.AsyncClient:
+        """Return the pooled client for ``key``, creating it on first use.
+
+        Options only apply when the client is created; later calls with the
+        same key get the existing client. Pass ``accept_cookies=False`` for
+        clients shared between users, so a ``Set-Cookie`` from one request is
+        never sent on another.
+        """
+        if self._closed:
+            raise RuntimeError("HttpTransportRegistry has been closed")
+        pooled = self._clients.get(key)
+        if pooled is not None and not pooled.client.is_closed:
+            return pooled.client
+        stats = _PoolStats()
+        max_connections = self._limit_for(key, origin)
+
+        async def on_request(request: httpx.Request) -> None:
+            stats.requests += 1
+            request.extensions["trace"] = _RequestTrace(
+                stats, request.extensions.get("trace")
+            )
+
+        client = httpx.AsyncClient(
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=min(
+                    self.max_keepalive_connections, max_connections
+                ),
+                keepalive_expiry=self.keepalive_expiry_seconds,
+            ),
+            timeout=httpx.Timeout(
+                self.timeout_seconds, connect=self.connect_timeout_seconds
+            ),
+            follow_redirects=follow_redirects,
+            max_redirects=max_redirects,
+            cookies=None if accept_cookies else _reject_all_cookies(),
+            event_hooks={"request": [on_request]},
+        )
+        self._clients[key] = _PooledClient(
+            key=key, client=client, stats=stats, origin=origin
+        )
+        logger.debug(
+            "http_transport.client_created",
+            key=key,
+            max_connections=max_connections,
+            http2=self.http2,
+        )
+        return client
+
+    def client_for(self, url: str) -> httpx.AsyncClient:
+        """Return the client shared by everything talking to ``url``'s origin."""
+        origin = origin_of(url)
+        if not origin:
+            raise ValueError(f"URL has no origin: {url!r}")
+        return self.client(origin, origin=origin)
+
+    async def prewarm(self, *, timeout_seconds: float = 5.0) -> None:
+        """Open one connection per known origin ahead of the first request.
+
+        Sends a ``HEAD`` to each origin so the TCP and TLS handshakes are
+        done before traffic arrives; any HTTP status counts as warm.
+        Failures are logged and ignored.
+        """
+        targets = [p for p in self._clients.values() if p.origin]
+        if not targets:
+            return
+        results = await asyncio.gather(
+            *(
+                pooled.client.head(pooled.origin, timeout=timeout_seconds)
+                for pooled in targets
+            ),
+            return_exceptions=True,
+        )
+        for pooled, result in zip(targets, results, strict=True):
+            if isinstance(result, BaseException):
+                logger.info(
+                    "http_transport.prewarm_failed",
+                    origin=pooled.origin,
+                    error=str(result) or type(result).__name__,
+                )
+        logger.info(
+            "http_transport.prewarmed",
+            origins=len(targets),
+            failed=sum(isinstance(r, BaseException) for r in results),
+        )
+
+    async def aclose(self) -> None:
+        """Close every pooled client; safe to call more than once."""
+        if self._closed:
+            return
+        self._closed = True
+        pooled = list(self._clients.values())
+        self._clients.clear()
+        results = await asyncio.gather(
+            *(p.client.aclose() for p in pooled), return_exceptions=True
+        )
+        for item, result in zip(pooled, results, strict=True):
+            if isinstance(result, BaseException):
+                logger.warning(
+                    "http_transport.close_failed", key=item.key, error=str(result)
+                )
+        logger.debug("http_transport.closed", clients=len(pooled))
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Pool statistics keyed by client key."""
+        return {key: self._client_stats(p) for key, p in self._clients.items()}
+
+    # -- internal helpers ------------------------------------------------
+
+    def _limit_for(self, key: str, origin: str) -> int:
+        for candidate in (key.lower(), origin, urlsplit(origin).hostname or ""):
+            if candidate and candidate in self.host_limits:
+                return self.host_limits[candidate]
+        return self.max_connections_per_host
+
+    @staticmethod
+    def _client_stats(pooled: _PooledClient) -> dict[str, Any]:
+        stats = pooled.stats
+        # httpx does not expose its pool publicly; read it defensively.
+        pool = getattr(getattr(pooled.client, "_transport", None), "_pool", None)
+        connections = list(getattr(pool, "connections", []) or [])
+        idle = sum(1 for conn in connections if _call(conn, "is_idle"))
+        reused = max(0, stats.requests - stats.new_connections)
+        waits = sorted(stats.waits)
+        return {
+            "requests": stats.requests,
+            "connections": len(connections),
+            "connections_in_use": len(connections) - idle,
+            "connections_idle": idle,
+            "new_connections": stats.new_connections,
+            "connect_failures": stats.connect_failures,
+            "reuse_ratio": round(reused / stats.requests, 3) if stats.requests else 0.0,
+            "wait_p50_ms": _percentile_ms(waits, 0.5),
+            "wait_p95_ms": _percentile_ms(waits, 0.95),
+            "wait_max_ms": round(stats.max_wait_seconds * 1000, 2),
+        }
+
+
+def _call(obj: object, name: str) -> bool:
+    method = getattr(obj, name, None)
+    return bool(method()) if callable(method) else False
+
+
+def _percentile_ms(ordered: list[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(fraction * len(ordered)))
+    return round(ordered[index] * 1000, 2)
@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 import asyncio
+import time
+from collections.abc import Sequence
 from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Literal
 from uuid import uuid4
 
 import structlog
@@ -40,6 +42,8 @@ if TYPE_CHECKING:
 
 logger = structlog.get_logger(__name__)
 
+PendingOverflowPolicy = Literal["drop_oldest", "drop_newest"]
+
 
 @dataclass(slots=True)
 class RouterConfig:
@@ -54,6 +58,12 @@ class RouterConfig:
     show_reasoning: bool = False
     reasoning_max_chars: int = 2000
     group_context_enabled: bool = True
+    stream_edits: bool = True
+    stream_edit_interval_seconds: float = 1.0
+    pending_coalesce: bool = True
+    pending_max_messages: int = 20
+    pending_overflow: PendingOverflowPolicy = "drop_oldest"
+    burst_debounce_seconds: float = 0.0
 
 
 @dataclass(slots=True, frozen=True)
@@ -64,6 +74,23 @@ class ReasoningDisplayConfig:
     max_chars: int
 
 
+@dataclass(slots=True)
+class _StreamingReply:
+    """Progressive preview message assembled from ``text_delta`` events."""
+
+    buffer: str = ""
+    message_id: str = ""
+    last_flush: float = 0.0
+    flushed_text: str = ""
+    disabled: bool = False
+
+    def reset(self) -> None:
+        self.buffer = ""
+        self.message_id = ""
+        self.last_flush = 0.0
+        self.flushed_text = ""
+
+
 class MessageRouter:
     """Bridges MessageReceived events to command handlers and the AgentLoop.
 
@@ -95,6 +122,8 @@ class MessageRouter:
         self._active_sessions: dict[str, str] = {}
         # Per-session queues for messages arriving while agent is busy
         self._pending: dict[str, list[tuple[InboundMessage, str, str | None]]] = {}
+        self._pending_dropped = 0
+        self._pending_coalesced = 0
         self._stopping = False
 
     @property
@@ -222,6 +251,8 @@ class MessageRouter:
         old = self._active_sessions.get(key, key)
         self._active_sessions[key] = session_id
         self._persist_override(key, session_id)
+        if self._runner is not None and old != session_id:
+            self._runner.invalidate_history(old)
         logger.debug(
             "router.set_active_session",
             key=key,
@@ -292,13 +323,24 @@ class MessageRouter:
         inbound: InboundMessage,
         session_id: str,
         workspace_id: str | None,
+        *,
+        coalesced: Sequence[tuple[InboundMessage, str, str | None]] = (),
     ) -> None:
-        """Command matching + agent execution (called within session context)."""
+        """Command matching + agent execution (called within session context).
+
+        ``coalesced`` are queued messages that precede ``inbound`` and are
+        folded into its run; they are persisted by the run itself, while the
+        session is marked busy, so new arrivals keep queueing behind them.
+        """
         # Step 1: Command matching
         match = self._matcher.match(inbound.text, prefix=inbound.command_prefix)
         if match.matched:
             entry = self._commands.get(match.name)
             if entry is not None:
+                if coalesced and self._runner is not None:
+                    await self._coalesce_burst(
+                        self._runner, [*coalesced, (inbound, session_id, workspace_id)]
+                    )
                 logger.debug(
                     "router.command_matched",
                     command=match.name,
@@ -342,20 +384,20 @@ class MessageRouter:
 
         tracker = runner.run_tracker
         if tracker.is_active(session_id):
-            self._pending.setdefault(session_id, []).append(
-                (inbound, session_id, workspace_id)
-            )
-            logger.debug(
-                "router.message_queued",
-                session_id=session_id,
-                queue_depth=len(self._pending.get(session_id, [])),
-            )
+            for item in coalesced:
+                self._enqueue_pending(*item)
+            self._enqueue_pending(inbound, session_id, workspace_id)
             return
 
         stop_event = asyncio.Event()
         task = asyncio.create_task(
             self._run_agent_in_background(
-                runner, inbound, session_id, workspace_id, stop_event
+                runner,
+                inbound,
+                session_id,
+                workspace_id,
+                stop_event,
+                coalesced=coalesced,
             )
         )
         tracker.start(session_id, task, stop_event)
@@ -366,6 +408,81 @@ class MessageRouter:
             chat_id=inbound.chat_id,
         )
 
+    def _enqueue_pending(
+        self,
+        inbound: InboundMessage,
+        session_id: str,
+        workspace_id: str | None,
+    ) -> None:
+        """Queue a message for a busy session, applying the overflow policy."""
+        queue = self._pending.setdefault(session_id, [])
+        if len(queue) >= max(1, self._config.pending_max_messages):
+            self._pending_dropped += 1
+            if self._config.pending_overflow == "drop_newest":
+                logger.warning(
+                    "router.pending_overflow",
+                    session_id=session_id,
+                    policy="drop_newest",
+                    queue_depth=len(queue),
+                )
+                return
+            queue.pop(0)
+            logger.warning(
+                "router.pending_overflow",
+                session_id=session_id,
+                policy="drop_oldest",
+                queue_depth=len(queue),
+            )
+        queue.append((inbound, session_id, workspace_id))
+        logger.debug(
+            "router.message_queued",
+            session_id=session_id,
+            queue_depth=len(queue),
+        )
+
+    async def _coalesce_burst(
+        self,
+        runner: SessionRunner,
+        batch: list[tuple[InboundMessage, str, str | None]],
+    ) -> tuple[InboundMessage, str, str | None]:
+        """Fold queued messages into one turn and return the one to answer.
+
+        Every message but the last is persisted as its own user turn, with
+        its own message context and attachments, so the next run sees the
+        whole burst in history and answers it once.
+        """
+        *earlier, last = batch
+        for inbound, session_id, workspace_id in earlier:
+            try:
+                await runner.persist_coalesced_message(
+                    inbound=inbound,
+                    session_id=session_id,
+                    workspace_id=workspace_id,
+                )
+            except Exception:
+                logger.warning(
+                    "router.pending_persist_failed",
+                    session_id=session_id,
+                    exc_info=True,
+                )
+        if earlier:
+            self._pending_coalesced += len(earlier)
+            logger.debug(
+                "router.pending_coalesced",
+                session_id=last[1],
+                message_count=len(batch),
+            )
+        return last
+
+    def pending_stats(self) -> dict[str, int]:
+        """Queue sizes and counters for messages held while sessions are busy."""
+        return {
+            "sessions": len(self._pending),
+            "queued": sum(len(queue) for queue in self._pending.values()),
+            "dropped": self._pending_dropped,
+            "coalesced": self._pending_coalesced,
+        }
+
     async def _run_agent_in_background(
         self,
         runner: SessionRunner,
@@ -373,12 +490,34 @@ class MessageRouter:
         session_id: str,
         workspace_id: str | None,
         stop_event: asyncio.Event,
+        *,
+        coalesced: Sequence[tuple[InboundMessage, str, str | None]] = (),
     ) -> None:
         """Run agent loop in background, streaming responses as they arrive."""
         tracker = runner.run_tracker
         last_sent = ""
-        reasoning_display = await self._load_reasoning_display_config(session_id)
         try:
+            # The session is already marked busy, so messages arriving while
+            # the burst is persisted (or during the debounce window) queue up
+            # instead of starting a run that would interleave with it.
+            batch = [*coalesced, (inbound, session_id, workspace_id)]
+            if (
+                self._config.burst_debounce_seconds > 0
+                and self._config.pending_coalesce
+            ):
+                await asyncio.sleep(self._config.burst_debounce_seconds)
+                batch.extend(self._pending.pop(session_id, []))
+            if len(batch) > 1:
+                inbound, session_id, workspace_id = await self._coalesce_burst(
+                    runner, batch
+                )
+            reasoning_display = await self._load_reasoning_display_config(session_id)
+            # Reasoning is rendered ahead of the answer, so progressive
+            # previews are only used when it is hidden.
+            preview = _StreamingReply(
+                disabled=reasoning_display.show
+                or not self._supports_stream_edits(inbound)
+            )
             async for event in runner.run_stream(
                 user_message=inbound.text,
                 session_id=session_id,
@@ -389,12 +528,23 @@ class MessageRouter:
                 source_tag="user_input",
                 stop_event=stop_event,
             ):
-                if event.type == "text":
+                if event.type == "text_delta":
+                    if not preview.disabled and event.text:
+                        preview.buffer += event.text
+                        await self._flush_preview(inbound, session_id, preview)
+                elif event.type == "delta_reset":
+                    preview.buffer = ""
+                elif event.type == "text":
                     reasoning = self._prepare_reasoning(
                         event.reasoning,
                         reasoning_display,
                     )
-                    if event.text and event.text != last_sent:
+                    if event.text and preview.message_id:
+                        await self._finalize_preview(
+                            inbound, session_id, preview, event.text
+                        )
+                        last_sent = event.text
+                    elif event.text and event.text != last_sent:
                         await self._send_response(
                             inbound, session_id, event.text, reasoning=reasoning
                         )
@@ -403,6 +553,7 @@ class MessageRouter:
                         await self._send_response(
                             inbound, session_id, "", reasoning=reasoning
                         )
+                    preview.reset()
                 elif event.type == "done":
                     if event.error == "cancelled":
                         await self._send_response(
@@ -437,11 +588,98 @@ class MessageRouter:
             else:
                 await self._drain_pending(session_id)
 
+    def _supports_stream_edits(self, inbound: InboundMessage) -> bool:
+        """Return whether deltas can be coalesced into message edits."""
+        if not self._config.stream_edits:
+            return False
+        channel = self._channels.get(inbound.platform)
+        return callable(getattr(channel, "edit_message", None))
+
+    async def _flush_preview(
+        self,
+        inbound: InboundMessage,
+        session_id: str,
+        preview: _StreamingReply,
+    ) -> None:
+        """Send or edit the preview message, rate-limited per reply."""
+        now = time.monotonic()
+        if now - preview.last_flush < self._config.stream_edit_interval_seconds:
+            return
+        text = preview.buffer
+        if not text.strip() or text == preview.flushed_text:
+            return
+        preview.last_flush = now
+        try:
+            if not preview.message_id:
+                preview.message_id = await self._send_outbound(
+                    inbound,
+                    session_id,
+                    OutboundMessage(
+                        text=text, reply_to=self._default_reply_to(inbound)
+                    ),
+                )
+            else:
+                await self._edit_outbound(inbound, preview.message_id, text)
+            preview.flushed_text = text
+        except Exception:
+            # Partial Markdown or platform limits can reject an edit; the
+            # final step text is still delivered by _finalize_preview.
+            logger.debug(
+                "router.stream_preview_failed",
+                session_id=session_id,
+                platform=inbound.platform,
+                exc_info=True,
+            )
+            preview.disabled = True
+
+    async def _finalize_preview(
+        self,
+        inbound: InboundMessage,
+        session_id: str,
+        preview: _StreamingReply,
+        text: str,
+    ) -> None:
+        """Replace the preview with the complete step text."""
+        if text == preview.flushed_text:
+            return
+        try:
+            await self._edit_outbound(inbound, preview.message_id, text)
+        except Exception:
+            logger.warning(
+                "router.stream_finalize_failed",
+                session_id=session_id,
+                platform=inbound.platform,
+                exc_info=True,
+            )
+            await self._send_response(inbound, session_id, text)
+
+    async def _edit_outbound(
+        self, inbound: InboundMessage, message_id: str, text: str
+    ) -> None:
+        channel = self._channels.get(inbound.platform)
+        edit = getattr(channel, "edit_message", None)
+        if edit is None:
+            raise RuntimeError(f"Channel {inbound.platform} cannot edit messages")
+        await edit(inbound.chat_id, message_id, OutboundMessage(text=text))
+
     async def _drain_pending(self, session_id: str) -> None:
-        """Process the next queued message for a session, if any."""
+        """Process queued messages for a session, if any.
+
+        With ``pending_coalesce`` the whole queue becomes one follow-up turn;
+        otherwise messages are answered one run at a time.
+        """
         queue = self._pending.get(session_id)
         if not queue:
             return
+        if self._config.pending_coalesce and self._runner is not None:
+            del self._pending[session_id]
+            *earlier, (next_inbound, next_sid, next_wid) = queue
+            # Dispatch before persisting: the run marks the session busy
+            # first, then folds the earlier messages in.
+            await self._dispatch_message(
+                next_inbound, next_sid, next_wid, coalesced=earlier
+            )
+            return
         next_inbound, next_sid, next_wid = queue.pop(0)
         if not queue:
             del self._pending[session_id]
@@ -523,10 +761,13 @@ class MessageRouter:
 
     async def _send_outbound(
         self, inbound: InboundMessage, session_id: str, outbound: OutboundMessage
-    ) -> None:
-        """Send an outbound message through the originating channel."""
+    ) -> str:
+        """Send an outbound message through the originating channel.
+
+        Returns the platform message id, or ``""`` when nothing was sent.
+        """
         if not outbound.text and not outbound.attachments:
-            return
+            return ""
 
         channel = self._channels.get(inbound.platform)
         if channel is None:
@@ -534,7 +775,7 @@ class MessageRouter:
                 "message_router.no_channel",
                 platform=inbound.platform,
             )
-            return
+            return ""
 
         # Publish MessageSending event for observation/audit hooks.
         await self._event_bus.publish(
@@ -561,6 +802,7 @@ class MessageRouter:
             chat_id=inbound.chat_id,
             msg_id=msg_id,
         )
+        return msg_id
 
     async def _execute_command(
         self,
@@ -0,0 +1,317 @@
+"""Admission control and fair queueing for agent runs."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import time
+from collections import OrderedDict, deque
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+RunPriority = Literal["private", "group", "subagent", "cron"]
+
+RUN_PRIORITIES: tuple[RunPriority, ...] = ("private", "group", "subagent", "cron")
+DEFAULT_RUN_WEIGHTS: dict[RunPriority, int] = {
+    "private": 4,
+    "group": 2,
+    "subagent": 2,
+    "cron": 1,
+}
+DEFAULT_MAX_CONCURRENT_RUNS = 16
+DEFAULT_MAX_RUNS_PER_PROVIDER = 8
+_WAIT_SAMPLE_SIZE = 512
+
+_current_lease: contextvars.ContextVar[RunLease | None] = contextvars.ContextVar(
+    "current_run_lease", default=None
+)
+
+
+def run_priority_for(source_tag: str, chat_type: str = "") -> RunPriority:
+    """Map a run's ``source_tag`` and chat type to its scheduling class."""
+    if source_tag == "cron_trigger":
+        return "cron"
+    if source_tag == "subagent_task":
+        return "subagent"
+    return "group" if chat_type == "group" else "private"
+
+
+@dataclass(slots=True, frozen=True)
+class RunRequest:
+    """What the scheduler needs to know to admit one agent run.
+
+    ``flow`` identifies the fair-queue the run waits in, normally
+    ``(platform, chat_id)``; runs of one flow are admitted in FIFO order.
+    ``provider_id`` is the provider slot the run will call.
+    """
+
+    flow: tuple[str, str]
+    priority: RunPriority = "private"
+    provider_id: str = ""
+    session_id: str = ""
+
+
+@dataclass(slots=True, eq=False)
+class RunLease:
+    """An admitted run; :meth:`release` frees its concurrency slot."""
+
+    request: RunRequest
+    wait_seconds: float = 0.0
+    nested: bool = False
+    _scheduler: AgentRunScheduler | None = field(default=None, repr=False)
+    _token: contextvars.Token[RunLease | None] | None = field(default=None, repr=False)
+
+    @property
+    def active(self) -> bool:
+        return self._scheduler is not None
+
+    def release(self) -> None:
+        """Return the slot; safe to call more than once."""
+        token, self._token = self._token, None
+        if token is not None:
+            try:
+                _current_lease.reset(token)
+            except ValueError:
+                # Released from a different context than it was acquired in.
+                pass
+        scheduler, self._scheduler = self._scheduler, None
+        if scheduler is not None:
+            scheduler._release(self)
+
+
+@dataclass(slots=True, eq=False)
+class _Waiter:
+    request: RunRequest
+    future: asyncio.Future[RunLease]
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class AgentRunScheduler:
+    """Bound concurrent agent runs and admit waiting runs fairly.
+
+    At most ``max_concurrent`` runs hold a lease at once, and at most
+    ``max_per_provider`` (or the ``provider_limits`` entry for that slot)
+    per provider slot; ``0`` disables a cap. Waiting runs are grouped by
+    priority class and, inside a class, by flow (one platform chat).
+    Classes share free slots by smooth weighted round-robin using
+    ``weights``; flows inside a class take turns, so one busy group cannot
+    starve the others. A run whose provider slot is full is skipped rather
+    than blocking runs bound for other providers.
+
+    Runs started while the current context already holds a lease (a
+    subagent spawned by a running agent's tool call) are admitted
+    immediately, since queueing them behind their own parent could
+    deadlock; they still count toward the caps, so other runs wait until
+    the combined load drops.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT_RUNS,
+        max_per_provider: int = DEFAULT_MAX_RUNS_PER_PROVIDER,
+        provider_limits: Mapping[str, int] | None = None,
+        weights: Mapping[str, int] | None = None,
+    ) -> None:
+        self.max_concurrent = max(0, max_concurrent)
+        self.max_per_provider = max(0, max_per_provider)
+        self.provider_limits = {
+            key: max(0, value) for key, value in (provider_limits or {}).items()
+        }
+        merged = {**DEFAULT_RUN_WEIGHTS, **(weights or {})}
+        self.weights: dict[RunPriority, int] = {
+            priority: max(1, int(merged[priority])) for priority in RUN_PRIORITIES
+        }
+        self._queues: dict[
+            RunPriority, OrderedDict[tuple[str, str], deque[_Waiter]]
+        ] = {priority: OrderedDict() for priority in RUN_PRIORITIES}
+        self._credits: dict[RunPriority, int] = dict.fromkeys(RUN_PRIORITIES, 0)
+        self._running = 0
+        self._running_by_provider: dict[str, int] = {}
+        self._waits: deque[float] = deque(maxlen=_WAIT_SAMPLE_SIZE)
+        self.admitted = 0
+        self.queued = 0
+        self.nested = 0
+        self.cancelled = 0
+        self.max_wait_seconds = 0.0
+
+    async def acquire(self, request: RunRequest) -> RunLease:
+        """Wait until ``request`` may run and return its lease.
+
+        The lease is also bound to the calling context so nested runs can
+        detect it; release it from the same task that acquired it.
+        """
+        parent = _current_lease.get()
+        if parent is not None and parent.active:
+            self.nested += 1
+            self._occupy(request.provider_id)
+            return RunLease(request=request, nested=True, _scheduler=self)
+
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(request=request, future=loop.create_future())
+        self._queues[request.priority].setdefault(request.flow, deque()).append(waiter)
+        self._dispatch()
+        if not waiter.future.done():
+            self.queued += 1
+            logger.debug(
+                "run_scheduler.queued",
+                session_id=request.session_id,
+                priority=request.priority,
+                provider_id=request.provider_id,
+                running=self._running,
+                queue_depth=self.queue_depth,
+            )
+        try:
+            lease = await waiter.future
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Admitted in the same tick the caller was cancelled.
+                waiter.future.result().release()
+            else:
+                self._discard(waiter)
+            raise
+        lease._token = _current_lease.set(lease)
+        return lease
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(
+            len(waiters)
+            for flows in self._queues.values()
+            for waiters in flows.values()
+        )
+
+    def stats(self) -> dict[str, Any]:
+        waits = sorted(self._waits)
+        return {
+            "running": self._running,
+            "max_concurrent": self.max_concurrent,
+            "running_by_provider": dict(self._running_by_provider),
+            "queue_depth": self.queue_depth,
+            "queue_depth_by_priority": {
+                priority: sum(len(waiters) for waiters in flows.values())
+                for priority, flows in self._queues.items()
+            },
+            "queued_flows": sum(len(flows) for flows in self._queues.values()),
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "nested": self.nested,
+            "cancelled": self.cancelled,
+            "wait_p50_ms": _percentile_ms(waits, 0.5),
+            "wait_p95_ms": _percentile_ms(waits, 0.95),
+            "wait_max_ms": round(self.max_wait_seconds * 1000, 2),
+        }
+
+    # -- internal helpers ------------------------------------------------
+
+    def _provider_limit(self, provider_id: str) -> int:
+        return self.provider_limits.get(provider_id, self.max_per_provider)
+
+    def _has_capacity(self, provider_id: str) -> bool:
+        limit = self._provider_limit(provider_id)
+        return limit <= 0 or self._running_by_provider.get(provider_id, 0) < limit
+
+    def _dispatch(self) -> None:
+        """Admit waiting runs while global capacity remains."""
+        while self.max_concurrent <= 0 or self._running < self.max_concurrent:
+            eligible = [
+                priority
+                for priority in RUN_PRIORITIES
+                if self._next_flow(priority) is not None
+            ]
+            if not eligible:
+                return
+            priority = self._pick_priority(eligible)
+            flow = self._next_flow(priority)
+            assert flow is not None
+            self._admit(priority, flow)
+
+    def _pick_priority(self, eligible: list[RunPriority]) -> RunPriority:
+        # Smooth weighted round-robin: interleaves classes in proportion to
+        # their weights instead of draining the heaviest class first.
+        total = 0
+        for priority in eligible:
+            self._credits[priority] += self.weights[priority]
+            total += self.weights[priority]
+        chosen = max(eligible, key=lambda priority: self._credits[priority])
+        self._credits[chosen] -= total
+        return chosen
+
+    def _next_flow(self, priority: RunPriority) -> tuple[str, str] | None:
+        for flow, waiters in self._queues[priority].items():
+            if self._has_capacity(waiters[0].request.provider_id):
+                return flow
+        return None
+
+    def _admit(self, priority: RunPriority, flow: tuple[str, str]) -> None:
+        flows = self._queues[priority]
+        waiters = flows.pop(flow)
+        waiter = waiters.popleft()
+        if waiters:
+            # Back of the rotation: other flows of this class go first.
+            flows[flow] = waiters
+        request = waiter.request
+        wait = time.monotonic() - waiter.enqueued_at
+        self._occupy(request.provider_id)
+        self.admitted += 1
+        self._waits.append(wait)
+        self.max_wait_seconds = max(self.max_wait_seconds, wait)
+        waiter.future.set_result(
+            RunLease(request=request, wait_seconds=wait, _scheduler=self)
+        )
+        if wait >= 0.001:
+            logger.debug(
+                "run_scheduler.admitted",
+                session_id=request.session_id,
+                priority=priority,
+                provider_id=request.provider_id,
+                wait_ms=round(wait * 1000, 2),
+                queue_depth=self.queue_depth,
+            )
+
+    def _discard(self, waiter: _Waiter) -> None:
+        flows = self._queues[waiter.request.priority]
+        waiters = flows.get(waiter.request.flow)
+        if waiters is None:
+            return
+        try:
+            waiters.remove(waiter)
+        except ValueError:
+            return
+        if not waiters:
+            del flows[waiter.request.flow]
+        # A discarded head may have been the only thing blocking its flow.
+        self._dispatch()
+
+    def _occupy(self, provider_id: str) -> None:
+        self._running += 1
+        self._running_by_provider[provider_id] = (
+            self._running_by_provider.get(provider_id, 0) + 1
+        )
+
+    def _release(self, lease: RunLease) -> None:
+        provider_id = lease.request.provider_id
+        self._running -= 1
+        remaining = self._running_by_provider.get(provider_id, 0) - 1
+        if remaining > 0:
+            self._running_by_provider[provider_id] = remaining
+        else:
+            self._running_by_provider.pop(provider_id, None)
+        self._dispatch()
+
+
+def _percentile_ms(ordered: list[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(fraction * len(ordered)))
+    return round(ordered[index] * 1000, 2)
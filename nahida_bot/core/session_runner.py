@@ -6,16 +6,37 @@ import asyncio
 import time
 from dataclasses import dataclass, field, replace
 from datetime import UTC, datetime, timedelta
-from typing import TYPE_CHECKING, AbstractSet, Any, cast
+from typing import TYPE_CHECKING, AbstractSet, Any, TypeVar, cast
 
 import structlog
 
 from nahida_bot.agent.context import ContextMessage, ContextPart
 from nahida_bot.agent.loop import AgentRunResult
 from nahida_bot.agent.memory.consolidation import MemoryConsolidator
+from nahida_bot.agent.memory.consolidation_worker import (
+    DEFAULT_CONSOLIDATION_MAX_TURNS_PER_JOB,
+    DEFAULT_CONSOLIDATION_QUEUE_SIZE,
+    ConsolidationJob,
+    ConsolidationWorker,
+)
+from nahida_bot.agent.memory.embedding_refresh import (
+    DEFAULT_REFRESH_DEBOUNCE_SECONDS,
+    DEFAULT_REFRESH_MAX_DELAY_SECONDS,
+    EmbeddingRefresher,
+)
+from nahida_bot.agent.memory.history_cache import (
+    DEFAULT_HISTORY_CACHE_MAX_BYTES,
+    DEFAULT_HISTORY_CACHE_SESSIONS,
+    SessionHistoryCache,
+    approx_nbytes,
+)
 from nahida_bot.agent.memory.sqlite import build_fts_query
 from nahida_bot.agent.memory.models import ConversationTurn, MemoryRecord
 from nahida_bot.agent.providers import ToolDefinition
+from nahida_bot.agent.providers.ratelimit import (
+    estimate_request_tokens,
+    rate_limited_call,
+)
 from nahida_bot.core.config import MediaContextPolicy
 from nahida_bot.core.context import current_attachments, current_session
 from nahida_bot.core.logging import log_trace
@@ -27,6 +48,7 @@ from nahida_bot.core.message_context import (
     message_context_to_metadata,
     render_message_with_context,
 )
+from nahida_bot.core.run_scheduler import RunRequest, run_priority_for
 from nahida_bot.core.runtime_settings import (
     REASONING_EFFORTS,
     ReasoningRuntimeSettings,
@@ -36,7 +58,8 @@ from nahida_bot.core.runtime_settings import (
 )
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncIterator
+    from collections.abc import AsyncIterator, Awaitable
+    from contextvars import Token
 
     from nahida_bot.agent.loop import AgentLoop, LoopEvent
     from nahida_bot.agent.media.resolver import MediaResolver
@@ -48,6 +71,7 @@ if TYPE_CHECKING:
     from nahida_bot.agent.providers.router import ModelRouter
     from nahida_bot.core.channel_registry import ChannelRegistry
     from nahida_bot.core.config import MemoryRetrievalConfig, MultimodalConfig
+    from nahida_bot.core.run_scheduler import AgentRunScheduler, RunLease
     from nahida_bot.plugins.base import (
         InboundAttachment,
         InboundMessage,
@@ -64,6 +88,11 @@ _FALLBACK_VISION_PROMPT = (
 )
 _GROUP_CONTEXT_HISTORY_OVERFETCH_FACTOR = 4
 _GROUP_CONTEXT_HISTORY_OVERFETCH_MIN = 50
+# Cached sessions skip ``ensure_session`` on history hits; refresh the
+# session's last_active_at at most this often instead.
+_HISTORY_CACHE_TOUCH_INTERVAL_SECONDS = 60.0
+
+_T = TypeVar("_T")
 
 
 @dataclass(slots=True)
@@ -76,6 +105,32 @@ class ActiveRun:
     started_at: float = field(default_factory=time.monotonic)
 
 
+@dataclass(slots=True)
+class _PreflightSpans:
+    """Per-stage wall-clock timings for one run's context pre-flight."""
+
+    started_at: float = field(default_factory=time.perf_counter)
+    stages: dict[str, float] = field(default_factory=dict)
+
+    async def timed(self, stage: str, awaitable: Awaitable[_T]) -> _T:
+        started = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self.stages[stage] = round((time.perf_counter() - started) * 1000, 2)
+
+    def elapsed_ms(self) -> float:
+        return round((time.perf_counter() - self.started_at) * 1000, 2)
+
+
+def _first_leaf_exception(group: BaseExceptionGroup) -> BaseException:
+    """Return the first concrete error so callers see the original type."""
+    exc: BaseException = group
+    while isinstance(exc, BaseExceptionGroup):
+        exc = exc.exceptions[0]
+    return exc
+
+
 class ActiveRunTracker:
     """Per-session active agent run tracking with cancellation support."""
 
@@ -137,6 +192,21 @@ class SessionRunner:
         group_context_max_chars: int = 4000,
         media_resolver: MediaResolver | None = None,
         channel_registry: ChannelRegistry | None = None,
+        history_cache_sessions: int = DEFAULT_HISTORY_CACHE_SESSIONS,
+        history_cache_max_bytes: int = DEFAULT_HISTORY_CACHE_MAX_BYTES,
+        memory_embedding_refresh_debounce_seconds: float = (
+            DEFAULT_REFRESH_DEBOUNCE_SECONDS
+        ),
+        memory_embedding_refresh_max_delay_seconds: float = (
+            DEFAULT_REFRESH_MAX_DELAY_SECONDS
+        ),
+        memory_embedding_refresh_max_items: int = 100,
+        memory_consolidation_queue_size: int = DEFAULT_CONSOLIDATION_QUEUE_SIZE,
+        memory_consolidation_max_turns_per_job: int = (
+            DEFAULT_CONSOLIDATION_MAX_TURNS_PER_JOB
+        ),
+        memory_consolidation_drain_timeout: float = 10.0,
+        run_scheduler: AgentRunScheduler | None = None,
     ) -> None:
         self._agent = agent_loop
         self._memory = memory_store
@@ -162,6 +232,27 @@ class SessionRunner:
         self._media_resolver = media_resolver
         self._channel_registry = channel_registry
         self._run_tracker = ActiveRunTracker()
+        self._run_scheduler = run_scheduler
+        self._history_cache = SessionHistoryCache(
+            max_sessions=history_cache_sessions,
+            max_bytes=history_cache_max_bytes,
+        )
+        self._history_cache_attached = False
+        self._attach_history_cache(memory_store)
+        self._memory_embedding_refresh_max_items = max(
+            1, memory_embedding_refresh_max_items
+        )
+        self._embedding_refresher = EmbeddingRefresher(
+            self._refresh_memory_embeddings_now,
+            debounce_seconds=memory_embedding_refresh_debounce_seconds,
+            max_delay_seconds=memory_embedding_refresh_max_delay_seconds,
+        )
+        self._consolidation_worker = ConsolidationWorker(
+            self._run_consolidation_job,
+            max_pending_jobs=memory_consolidation_queue_size,
+            max_turns_per_job=memory_consolidation_max_turns_per_job,
+        )
+        self._memory_consolidation_drain_timeout = memory_consolidation_drain_timeout
 
     @property
     def has_agent(self) -> bool:
@@ -181,10 +272,59 @@ class SessionRunner:
 
     @memory.setter
     def memory(self, value: MemoryStore | None) -> None:
+        self._detach_history_cache(self._memory)
         self._memory = value
         self._memory_consolidator = (
             MemoryConsolidator(value) if value is not None else None
         )
+        self._attach_history_cache(value)
+
+    def _attach_history_cache(self, store: MemoryStore | None) -> None:
+        """Keep the hot history cache coherent with every writer of ``store``.
+
+        Stores without turn listeners cannot report foreign writes, so history
+        is always loaded from them directly.
+        """
+        self._history_cache.invalidate()
+        add_listener = getattr(store, "add_turn_listener", None)
+        self._history_cache_attached = (
+            callable(add_listener) and self._history_cache.enabled
+        )
+        if self._history_cache_attached:
+            cast(Any, add_listener)(self._on_turns_changed)
+
+    def _detach_history_cache(self, store: MemoryStore | None) -> None:
+        remove_listener = getattr(store, "remove_turn_listener", None)
+        if self._history_cache_attached and callable(remove_listener):
+            cast(Any, remove_listener)(self._on_turns_changed)
+        self._history_cache_attached = False
+
+    def _on_turns_changed(
+        self, session_id: str | None, record: MemoryRecord | None
+    ) -> None:
+        if session_id is not None and record is not None:
+            self._history_cache.append(session_id, record)
+        else:
+            self._history_cache.invalidate(session_id)
+
+    def invalidate_history(self, session_id: str | None = None) -> None:
+        """Drop cached history for one session, or for all sessions."""
+        self._history_cache.invalidate(session_id)
+
+    def history_cache_stats(self) -> dict[str, float]:
+        """Return hit-rate and footprint counters for the hot history cache."""
+        return self._history_cache.stats()
+
+    def embedding_refresh_stats(self) -> dict[str, int | bool]:
+        """Return request/pass counters for the debounced embedding refresh."""
+        return self._embedding_refresher.stats()
+
+    async def close(self) -> None:
+        """Finish background memory work before shutdown."""
+        await self._consolidation_worker.close(
+            timeout=self._memory_consolidation_drain_timeout
+        )
+        await self._embedding_refresher.close()
 
     @property
     def provider_manager(self) -> ProviderManager | None:
@@ -276,6 +416,10 @@ class SessionRunner:
     def run_tracker(self) -> ActiveRunTracker:
         return self._run_tracker
 
+    @property
+    def run_scheduler(self) -> AgentRunScheduler | None:
+        return self._run_scheduler
+
     async def run(
         self,
         *,
@@ -354,18 +498,35 @@ class SessionRunner:
 
         attachments_for_turn = tuple(attachments or [])
         attachments_token = current_attachments.set(attachments_for_turn)
-        runtime_settings = await self._load_runtime_settings(session_id)
-        runtime_settings = self._apply_runtime_overrides(
-            runtime_settings,
-            reasoning_effort=reasoning_effort,
-        )
-        runtime_token = current_runtime_settings.set(runtime_settings)
+        runtime_token: Token[RuntimeSettings] | None = None
+        lease: RunLease | None = None
         done_data: dict[str, Any] = {}
         try:
-            provider_slot, selected_model = await self._resolve_provider(
-                session_id,
-                provider_id=provider_id,
-                model=model,
+            # Provider resolution runs first: session metadata is cached, and
+            # admission is per provider slot. Nothing heavier (database reads,
+            # embeddings, media downloads) starts before the run is admitted.
+            spans = _PreflightSpans()
+            visible_user_message = render_message_with_context(
+                user_message,
+                message_context,
+                role="user",
+            )
+            session_meta = await spans.timed(
+                "session_meta", self._load_session_meta(session_id)
+            )
+            runtime_settings = self._apply_runtime_overrides(
+                runtime_settings_from_meta(session_meta),
+                reasoning_effort=reasoning_effort,
+            )
+            runtime_token = current_runtime_settings.set(runtime_settings)
+            provider_slot, selected_model = await spans.timed(
+                "resolve_provider",
+                self._resolve_provider(
+                    session_id,
+                    provider_id=provider_id,
+                    model=model,
+                    session_meta=session_meta,
+                ),
             )
             effective_model = (
                 selected_model or provider_slot.default_model
@@ -398,30 +559,91 @@ class SessionRunner:
                     else ""
                 ),
             )
+            if self._run_scheduler is not None:
+                lease = await spans.timed(
+                    "admission",
+                    self._run_scheduler.acquire(
+                        self._run_request(
+                            session_id,
+                            provider_id=(
+                                provider_slot.id if provider_slot is not None else ""
+                            ),
+                            source_tag=source_tag,
+                            message_context=message_context,
+                        )
+                    ),
+                )
 
-            recent_records = await self._load_recent_records(
-                session_id,
-                workspace_id=workspace_id,
-                include_observed_surplus=bool(
-                    message_context is not None and message_context.chat_type == "group"
-                ),
-            )
-            history = await self._build_history_context(
-                session_id,
-                recent_records,
-                capabilities=capabilities,
-            )
-            observed_context = await self._load_observed_group_context(
-                session_id,
-                records=recent_records,
-                current_message_context=message_context,
-                current_message_content=user_message,
-            )
+            # Pre-flight: independent lookups run concurrently. Durable-memory
+            # retrieval (possibly an embedding request), the recent-records
+            # query and the user parts start immediately; history media waits
+            # for the recent records.
+            try:
+                async with asyncio.TaskGroup() as preflight:
+                    memory_task = preflight.create_task(
+                        spans.timed(
+                            "relevant_memory", self._load_relevant_memory(user_message)
+                        )
+                    )
+                    records_task = preflight.create_task(
+                        spans.timed(
+                            "recent_records",
+                            self._load_recent_records(
+                                session_id,
+                                workspace_id=workspace_id,
+                                include_observed_surplus=bool(
+                                    message_context is not None
+                                    and message_context.chat_type == "group"
+                                ),
+                            ),
+                        )
+                    )
+                    user_parts_task = preflight.create_task(
+                        spans.timed(
+                            "user_parts",
+                            self._build_user_parts(
+                                visible_user_message,
+                                list(attachments_for_turn),
+                                capabilities=capabilities,
+                            ),
+                        )
+                    )
+                    recent_records = await records_task
+                    history_task = preflight.create_task(
+                        spans.timed(
+                            "history",
+                            self._build_history_context(
+                                session_id,
+                                recent_records,
+                                capabilities=capabilities,
+                            ),
+                        )
+                    )
+                    observed_context = await spans.timed(
+                        "observed_group_context",
+                        self._load_observed_group_context(
+                            session_id,
+                            records=recent_records,
+                            current_message_context=message_context,
+                            current_message_content=user_message,
+                        ),
+                    )
+            except BaseExceptionGroup as group:
+                raise _first_leaf_exception(group) from group
+
+            history = history_task.result()
             if observed_context is not None:
                 history.append(observed_context)
-            relevant_memory = await self._load_relevant_memory(user_message)
+            relevant_memory = memory_task.result()
             if relevant_memory:
                 history = [relevant_memory, *history]
+            user_parts = user_parts_task.result()
+            logger.debug(
+                "session_runner.preflight_done",
+                session_id=session_id,
+                wall_ms=spans.elapsed_ms(),
+                stage_ms=dict(spans.stages),
+            )
             tools = self._collect_tools(
                 tool_filter,
                 tool_allowlist=tool_allowlist,
@@ -442,16 +664,6 @@ class SessionRunner:
                     capabilities.tool_calling if capabilities is not None else None
                 ),
             )
-            visible_user_message = render_message_with_context(
-                user_message,
-                message_context,
-                role="user",
-            )
-            user_parts = await self._build_user_parts(
-                visible_user_message,
-                list(attachments_for_turn),
-                capabilities=capabilities,
-            )
             logger.debug(
                 "session_runner.context_inputs_ready",
                 session_id=session_id,
@@ -481,8 +693,13 @@ class SessionRunner:
             if tools:
                 run_kwargs["tools"] = tools
             if provider_slot is not None:
-                run_kwargs["provider"] = provider_slot.provider
+                run_kwargs["provider"] = (
+                    self._model_router.provider_for(provider_slot, selected_model)
+                    if self._model_router is not None
+                    else provider_slot.provider
+                )
                 run_kwargs["context_builder"] = provider_slot.context_builder
+                run_kwargs["capabilities"] = capabilities
             if selected_model is not None:
                 run_kwargs["model"] = selected_model
 
@@ -533,25 +750,56 @@ class SessionRunner:
                 workspace_root=workspace_root,
             )
         finally:
-            current_runtime_settings.reset(runtime_token)
+            if lease is not None:
+                lease.release()
+            if runtime_token is not None:
+                current_runtime_settings.reset(runtime_token)
             current_attachments.reset(attachments_token)
 
     # ── Public helpers (used by image_understand tool) ─────────
 
     async def _load_runtime_settings(self, session_id: str) -> RuntimeSettings:
         """Load per-session runtime settings from memory metadata."""
+        return runtime_settings_from_meta(await self._load_session_meta(session_id))
+
+    @staticmethod
+    def _run_request(
+        session_id: str,
+        *,
+        provider_id: str,
+        source_tag: str,
+        message_context: MessageContext | None,
+    ) -> RunRequest:
+        """Describe this run for the scheduler; chats are the fairness unit."""
+        session = current_session.get()
+        flow = (
+            (session.platform, session.chat_id)
+            if session is not None
+            else ("", session_id)
+        )
+        return RunRequest(
+            flow=flow,
+            priority=run_priority_for(
+                source_tag,
+                message_context.chat_type if message_context is not None else "",
+            ),
+            provider_id=provider_id,
+            session_id=session_id,
+        )
+
+    async def _load_session_meta(self, session_id: str) -> dict[str, Any] | None:
+        """Load session metadata once per run; ``None`` when unavailable."""
         if self._memory is None:
-            return runtime_settings_from_meta(None)
+            return None
         try:
-            meta = await self._memory.get_session_meta(session_id)
-            return runtime_settings_from_meta(meta)
+            return await self._memory.get_session_meta(session_id)
         except Exception:
             logger.warning(
                 "session_runner.runtime_settings_load_failed",
                 session_id=session_id,
                 exc_info=True,
             )
-            return runtime_settings_from_meta(None)
+            return None
 
     @staticmethod
     def _apply_runtime_overrides(
@@ -611,7 +859,10 @@ class SessionRunner:
             return f"Error: no image found for media_id '{media_id}'"
 
         # Resolve the image
-        resolved = await self._resolve_attachment(attachment)
+        resolved = await self._resolve_attachment(
+            attachment,
+            image_model=slot.resolve_capabilities(fallback_model).image_token_model,
+        )
 
         # Build vision request
         prompt = question if question else _FALLBACK_VISION_PROMPT
@@ -651,9 +902,10 @@ class SessionRunner:
             chat_kwargs["model"] = fallback_model
 
         try:
-            response = await slot.provider.chat(
-                messages=[vision_msg],
-                **chat_kwargs,
+            response = await rate_limited_call(
+                slot.provider,
+                lambda: slot.provider.chat(messages=[vision_msg], **chat_kwargs),
+                estimated_tokens=estimate_request_tokens([vision_msg]),
             )
             return response.content or "Error: empty response from vision provider"
         except Exception as exc:
@@ -667,7 +919,13 @@ class SessionRunner:
         *,
         provider_id: str | None = None,
         model: str | None = None,
+        session_meta: dict[str, Any] | None = None,
     ) -> tuple[Any, str | None]:
+        """Pick the provider slot and model override for a run.
+
+        ``session_meta`` may carry metadata the caller already loaded; when
+        omitted it is read from the memory store.
+        """
         if self._providers is None:
             logger.debug(
                 "session_runner.provider_resolved",
@@ -749,7 +1007,11 @@ class SessionRunner:
                 requested_model=direct_model,
             )
         if self._memory is not None:
-            meta = await self._memory.get_session_meta(session_id)
+            meta = (
+                session_meta
+                if session_meta is not None
+                else await self._memory.get_session_meta(session_id)
+            )
             logger.debug(
                 "session_runner.session_meta_loaded",
                 session_id=session_id,
@@ -878,15 +1140,38 @@ class SessionRunner:
                 reason="no_memory_store",
             )
             return []
-        await self._memory.ensure_session(session_id, workspace_id=workspace_id)
         history_query_limit = self._history_query_limit(
             include_observed_surplus=include_observed_surplus,
         )
-        records = await self._memory.get_recent(session_id, limit=history_query_limit)
+        cached = (
+            self._history_cache.get(session_id, history_query_limit)
+            if self._history_cache_attached
+            else None
+        )
+        if cached is not None:
+            records = cached
+            if self._history_cache.needs_touch(
+                session_id, _HISTORY_CACHE_TOUCH_INTERVAL_SECONDS
+            ):
+                await self._memory.ensure_session(session_id, workspace_id=workspace_id)
+        else:
+            await self._memory.ensure_session(session_id, workspace_id=workspace_id)
+            version = self._history_cache.version
+            records = await self._memory.get_recent(
+                session_id, limit=history_query_limit
+            )
+            if self._history_cache_attached:
+                self._history_cache.put(
+                    session_id,
+                    records,
+                    limit=history_query_limit,
+                    version=version,
+                )
         logger.debug(
             "session_runner.history_loaded",
             session_id=session_id,
             workspace_id=workspace_id or "",
+            cache_hit=cached is not None,
             record_count=len(records),
             max_history_turns=self._max_history_turns,
             history_query_limit=history_query_limit,
@@ -920,57 +1205,55 @@ class SessionRunner:
         *,
         capabilities: ModelCapabilities | None = None,
     ) -> list[ContextMessage]:
-        messages: list[ContextMessage] = []
+        kept: list[tuple[ContextMessage, dict[str, Any] | None]] = []
         for r in records:
             metadata = r.turn.metadata
             if isinstance(metadata, dict) and metadata.get("observed_only") is True:
                 continue
-            parts = (
-                await self._reconstruct_parts_for_history(metadata)
-                if r.turn.role == "user"
-                else []
-            )
-            turn_context = message_context_from_metadata(metadata)
-            visible_content = render_message_with_context(
-                r.turn.content,
-                turn_context,
-                role=r.turn.role,
-            )
-            if r.turn.role == "user" and parts:
-                parts = self._prepend_text_part(visible_content, parts)
-            reasoning = None
-            reasoning_signature = None
-            has_redacted = False
-            if r.turn.role == "assistant" and isinstance(metadata, dict):
-                reasoning = metadata.get("reasoning")
-                reasoning_signature = metadata.get("reasoning_signature")
-                has_redacted = metadata.get("has_redacted_thinking", False)
-
-            messages.append(
-                ContextMessage(
-                    role=r.turn.role,  # type: ignore[arg-type]
-                    content=visible_content,
-                    source=r.turn.source,
-                    metadata=metadata,
-                    parts=parts,
-                    reasoning=reasoning,
-                    reasoning_signature=reasoning_signature,
-                    has_redacted_thinking=has_redacted,
-                )
-            )
+            kept.append((self._history_message(session_id, r), metadata))
 
-        if len(messages) > self._max_history_turns:
-            messages = messages[-self._max_history_turns :]
+        if len(kept) > self._max_history_turns:
+            kept = kept[-self._max_history_turns :]
 
-        # Apply media context policy to history
-        if self._multimodal_config is not None and any(
-            m.parts for m in messages if m.role == "user"
-        ):
-            messages = self._apply_media_context_policy(
-                messages,
+        # The media context policy is decided before any image is resolved,
+        # so images it would degrade are never read or encoded.
+        native: set[int] | None = None
+        if self._multimodal_config is not None:
+            native = self._native_image_message_indices(
+                [message for message, _ in kept],
                 policy=self._multimodal_config.media_context_policy,
                 capabilities=capabilities,
             )
+
+        image_model = capabilities.image_token_model if capabilities else ""
+
+        async def with_parts(
+            index: int, message: ContextMessage, metadata: dict[str, Any] | None
+        ) -> ContextMessage:
+            if message.role != "user":
+                return message
+            # Image parts depend on the media cache and are rebuilt per
+            # turn; the rendered text message itself is reused.
+            parts = await self._reconstruct_parts_for_history(
+                metadata,
+                native=native is None or index in native,
+                image_model=image_model,
+            )
+            if not parts:
+                return message
+            return replace(
+                message, parts=self._prepend_text_part(message.content, parts)
+            )
+
+        messages = list(
+            await asyncio.gather(
+                *(
+                    with_parts(index, message, metadata)
+                    for index, (message, metadata) in enumerate(kept)
+                )
+            )
+        )
+        if native is not None and any(m.parts for m in messages if m.role == "user"):
             logger.debug(
                 "session_runner.history_media_policy_applied",
                 session_id=session_id,
@@ -988,6 +1271,46 @@ class SessionRunner:
 
         return messages
 
+    def _history_message(self, session_id: str, record: MemoryRecord) -> ContextMessage:
+        """Render a stored turn as a part-less history message, memoized per turn."""
+        if self._history_cache_attached:
+            cached = self._history_cache.lookup(session_id, record.turn_id)
+            if isinstance(cached, ContextMessage):
+                return cached
+        metadata = record.turn.metadata
+        visible_content = render_message_with_context(
+            record.turn.content,
+            message_context_from_metadata(metadata),
+            role=record.turn.role,
+        )
+        reasoning = None
+        reasoning_signature = None
+        has_redacted = False
+        if record.turn.role == "assistant" and isinstance(metadata, dict):
+            reasoning = metadata.get("reasoning")
+            reasoning_signature = metadata.get("reasoning_signature")
+            has_redacted = metadata.get("has_redacted_thinking", False)
+        message = ContextMessage(
+            role=record.turn.role,  # type: ignore[arg-type]
+            content=visible_content,
+            source=record.turn.source,
+            metadata=metadata,
+            reasoning=reasoning,
+            reasoning_signature=reasoning_signature,
+            has_redacted_thinking=has_redacted,
+        )
+        if not self._history_cache_attached:
+            return message
+        self._history_cache.remember(
+            session_id,
+            record.turn_id,
+            message,
+            approx_nbytes(visible_content)
+            + approx_nbytes(reasoning)
+            + approx_nbytes(reasoning_signature),
+        )
+        return message
+
     def _history_query_limit(self, *, include_observed_surplus: bool = False) -> int:
         """Return how many raw turns to fetch before filtering observed-only rows."""
         if not include_observed_surplus or self._group_context_max_messages <= 0:
@@ -1229,6 +1552,8 @@ class SessionRunner:
                         url=att["url"],
                         media_id=att.get("platform_id", ""),
                         mime_type=att.get("mime_type", ""),
+                        width=_safe_int(att.get("width")),
+                        height=_safe_int(att.get("height")),
                     )
                 )
             elif att.get("path"):
@@ -1238,6 +1563,8 @@ class SessionRunner:
                         url=att["path"],
                         media_id=att.get("platform_id", ""),
                         mime_type=att.get("mime_type", ""),
+                        width=_safe_int(att.get("width")),
+                        height=_safe_int(att.get("height")),
                     )
                 )
             elif att.get("alt_text"):
@@ -1253,8 +1580,15 @@ class SessionRunner:
     async def _reconstruct_parts_for_history(
         self,
         metadata: dict[str, Any] | None,
+        *,
+        native: bool = True,
+        image_model: str | None = None,
     ) -> list[ContextPart]:
-        """Rebuild provider-safe image parts from persisted attachment metadata."""
+        """Rebuild provider-safe image parts from persisted attachment metadata.
+
+        With ``native=False`` images become placeholder descriptions without
+        being resolved, matching what the media context policy degrades them to.
+        """
         attachments = self._attachments_from_metadata(metadata)
         parts: list[ContextPart] = []
         for attachment in attachments:
@@ -1269,7 +1603,7 @@ class SessionRunner:
                 )
                 continue
 
-            if not attachment.path and not attachment.url:
+            if not native or (not attachment.path and not attachment.url):
                 parts.append(
                     ContextPart(
                         type="image_description",
@@ -1280,7 +1614,9 @@ class SessionRunner:
                 )
                 continue
 
-            resolved = await self._resolve_attachment(attachment)
+            resolved = await self._resolve_attachment(
+                attachment, image_model=image_model
+            )
             if resolved.base64_data:
                 parts.append(
                     ContextPart(
@@ -1288,6 +1624,8 @@ class SessionRunner:
                         data=resolved.base64_data,
                         media_id=resolved.media_id,
                         mime_type=resolved.mime_type,
+                        width=resolved.width,
+                        height=resolved.height,
                     )
                 )
             elif resolved.description:
@@ -1348,88 +1686,53 @@ class SessionRunner:
         return attachments
 
     @staticmethod
-    def _apply_media_context_policy(
+    def _native_image_message_indices(
         messages: list[ContextMessage],
         *,
         policy: MediaContextPolicy,
         capabilities: ModelCapabilities | None,
-    ) -> list[ContextMessage]:
-        """Apply media context policy to degrade historical image parts."""
+    ) -> set[int] | None:
+        """Return indices of messages whose images stay native.
+
+        ``None`` means the policy keeps every image native.
+        """
         if capabilities is not None and not capabilities.image_input:
             policy = "description_only"
+        user_indices = [i for i, m in enumerate(messages) if m.role == "user"]
 
         if policy == "cache_aware":
-            # Keep native images for the most recent user turns, degrade older
-            user_indices = [i for i, m in enumerate(messages) if m.role == "user"]
-            if not user_indices:
-                return messages
             # Keep the last 2 user turns' images native, degrade the rest
+            if not user_indices:
+                return set()
             recent_threshold = (
                 user_indices[-2] if len(user_indices) >= 2 else user_indices[-1]
             )
-
-            result: list[ContextMessage] = []
-            for i, msg in enumerate(messages):
-                if msg.role == "user" and msg.parts and i < recent_threshold:
-                    result.append(
-                        ContextMessage(
-                            role=msg.role,
-                            content=msg.content,
-                            source=msg.source,
-                            metadata=msg.metadata,
-                            parts=SessionRunner._degrade_image_parts(msg.parts),
-                            reasoning=msg.reasoning,
-                            reasoning_signature=msg.reasoning_signature,
-                            has_redacted_thinking=msg.has_redacted_thinking,
-                        )
-                    )
-                else:
-                    result.append(msg)
-            return result
-
+            return {i for i in user_indices if i >= recent_threshold}
         if policy == "description_only":
-            return [
-                (
-                    ContextMessage(
-                        role=m.role,
-                        content=m.content,
-                        source=m.source,
-                        metadata=m.metadata,
-                        parts=SessionRunner._degrade_image_parts(m.parts),
-                        reasoning=m.reasoning,
-                        reasoning_signature=m.reasoning_signature,
-                        has_redacted_thinking=m.has_redacted_thinking,
-                    )
-                    if m.role == "user" and m.parts
-                    else m
-                )
-                for m in messages
-            ]
-
+            return set()
         if policy == "native_recent":
-            user_indices = [i for i, m in enumerate(messages) if m.role == "user"]
-            last_user = user_indices[-1] if user_indices else -1
-
-            result: list[ContextMessage] = []
-            for i, msg in enumerate(messages):
-                if msg.role == "user" and msg.parts and i != last_user:
-                    result.append(
-                        ContextMessage(
-                            role=msg.role,
-                            content=msg.content,
-                            source=msg.source,
-                            metadata=msg.metadata,
-                            parts=SessionRunner._degrade_image_parts(msg.parts),
-                            reasoning=msg.reasoning,
-                            reasoning_signature=msg.reasoning_signature,
-                            has_redacted_thinking=msg.has_redacted_thinking,
-                        )
-                    )
-                else:
-                    result.append(msg)
-            return result
+            return set(user_indices[-1:])
+        return None
 
-        return messages
+    @staticmethod
+    def _apply_media_context_policy(
+        messages: list[ContextMessage],
+        *,
+        policy: MediaContextPolicy,
+        capabilities: ModelCapabilities | None,
+    ) -> list[ContextMessage]:
+        """Apply media context policy to degrade historical image parts."""
+        native = SessionRunner._native_image_message_indices(
+            messages, policy=policy, capabilities=capabilities
+        )
+        if native is None:
+            return messages
+        return [
+            replace(msg, parts=SessionRunner._degrade_image_parts(msg.parts))
+            if msg.role == "user" and msg.parts and i not in native
+            else msg
+            for i, msg in enumerate(messages)
+        ]
 
     @staticmethod
     def _context_protocol_summary(
@@ -1506,6 +1809,7 @@ class SessionRunner:
                     name=entry.name,
                     description=entry.description,
                     parameters=entry.parameters,
+                    serial=entry.serial,
                 )
                 for entry in self._tools.all()
                 if entry.name not in denied and (not allowed or entry.name in allowed)
@@ -1581,6 +1885,7 @@ class SessionRunner:
                 max_count=max_count,
                 max_bytes=max_bytes,
                 supported=supported,
+                image_model=capabilities.image_token_model if capabilities else "",
             )
 
         # Non-vision model: apply fallback mode
@@ -1613,6 +1918,7 @@ class SessionRunner:
         max_count: int,
         max_bytes: int,
         supported: tuple[str, ...],
+        image_model: str | None = None,
     ) -> list[ContextPart]:
         """Build parts for a vision-capable model."""
         parts: list[ContextPart] = []
@@ -1624,6 +1930,7 @@ class SessionRunner:
             image_attachments = image_attachments[:max_count]
 
         supported_set = set(supported)
+        eligible: list[InboundAttachment] = []
         for attachment in image_attachments:
             if (
                 attachment.mime_type
@@ -1637,8 +1944,16 @@ class SessionRunner:
                     mime_type=attachment.mime_type,
                 )
                 continue
+            eligible.append(attachment)
 
-            resolved = await self._resolve_attachment(attachment)
+        # The resolver bounds concurrency and coalesces duplicate fetches.
+        resolved_all = await asyncio.gather(
+            *(
+                self._resolve_attachment(attachment, image_model=image_model)
+                for attachment in eligible
+            )
+        )
+        for attachment, resolved in zip(eligible, resolved_all, strict=True):
             if max_bytes > 0 and resolved.file_size > max_bytes:
                 logger.debug(
                     "session_runner.image_skipped",
@@ -1672,6 +1987,8 @@ class SessionRunner:
                         data=resolved.base64_data,
                         mime_type=resolved.mime_type,
                         media_id=resolved.media_id,
+                        width=resolved.width,
+                        height=resolved.height,
                     )
                 )
             elif resolved.local_path and attachment.url:
@@ -1689,6 +2006,8 @@ class SessionRunner:
                         url=attachment.url,
                         media_id=resolved.media_id,
                         mime_type=resolved.mime_type,
+                        width=resolved.width,
+                        height=resolved.height,
                     )
                 )
             elif attachment.url:
@@ -1706,6 +2025,8 @@ class SessionRunner:
                         url=attachment.url,
                         media_id=attachment.platform_id,
                         mime_type=attachment.mime_type,
+                        width=attachment.width,
+                        height=attachment.height,
                     )
                 )
             elif attachment.alt_text:
@@ -1813,7 +2134,10 @@ class SessionRunner:
             return attachment.alt_text or f"[Image: {attachment.platform_id}]"
         slot, fallback_model, route_reason = routed
 
-        resolved = await self._resolve_attachment(attachment)
+        resolved = await self._resolve_attachment(
+            attachment,
+            image_model=slot.resolve_capabilities(fallback_model).image_token_model,
+        )
 
         content_parts: list[ContextPart] = [
             ContextPart(type="text", text=_FALLBACK_VISION_PROMPT),
@@ -1865,7 +2189,11 @@ class SessionRunner:
                 route_reason=route_reason,
                 image_part_type=content_parts[-1].type,
             )
-            response = await slot.provider.chat(messages=[vision_msg], **chat_kwargs)
+            response = await rate_limited_call(
+                slot.provider,
+                lambda: slot.provider.chat(messages=[vision_msg], **chat_kwargs),
+                estimated_tokens=estimate_request_tokens([vision_msg]),
+            )
             if response.content:
                 logger.debug(
                     "session_runner.fallback_vision_success",
@@ -1884,8 +2212,14 @@ class SessionRunner:
 
         return attachment.alt_text or f"[Image: {attachment.platform_id}]"
 
-    async def _resolve_attachment(self, attachment: InboundAttachment) -> Any:
-        """Resolve an attachment via MediaResolver if available."""
+    async def _resolve_attachment(
+        self, attachment: InboundAttachment, *, image_model: str | None = None
+    ) -> Any:
+        """Resolve an attachment via MediaResolver if available.
+
+        ``image_model`` asks for the copy preprocessed for that model's
+        image token formula (see :class:`ImagePreprocessor`).
+        """
         attachment = await self._download_platform_attachment_if_needed(attachment)
         if self._media_resolver is None:
             from nahida_bot.agent.media.resolver import ResolvedMedia
@@ -1899,7 +2233,7 @@ class SessionRunner:
                 height=attachment.height,
                 description=attachment.alt_text,
             )
-        return await self._media_resolver.resolve(attachment)
+        return await self._media_resolver.resolve(attachment, image_model=image_model)
 
     async def _download_platform_attachment_if_needed(
         self, attachment: InboundAttachment
@@ -2109,6 +2443,34 @@ class SessionRunner:
             ),
         )
 
+    async def persist_coalesced_message(
+        self,
+        *,
+        inbound: InboundMessage,
+        session_id: str,
+        workspace_id: str | None = None,
+    ) -> None:
+        """Persist a queued message that the next run answers with its burst."""
+        if self._memory is None:
+            return
+        await self._memory.ensure_session(session_id, workspace_id=workspace_id)
+        metadata = await self._build_user_turn_metadata(
+            attachments=inbound.attachments,
+            message_context=context_from_inbound(inbound),
+        )
+        if metadata is None:
+            metadata = {}
+        metadata["coalesced"] = True
+        await self._memory.append_turn(
+            session_id,
+            ConversationTurn(
+                role="user",
+                content=inbound.text,
+                source="user_input",
+                metadata=metadata,
+            ),
+        )
+
     async def _persist_turns(
         self,
         session_id: str,
@@ -2214,55 +2576,94 @@ class SessionRunner:
         workspace_id: str | None,
         workspace_root: Any,
     ) -> None:
-        """Run non-blocking-looking memory consolidation on the completed turn."""
-        if self._memory_consolidator is None:
+        """Queue the completed turn for background memory consolidation."""
+        if (
+            self._memory_consolidator is None
+            or not self._memory_consolidation_rule_based_enabled
+        ):
             return
-        resolved_root = workspace_root
-        if resolved_root is None and workspace_id is not None:
-            resolved_root = self._resolve_workspace_root(workspace_id)
+        await self._consolidation_worker.submit(
+            session_id=session_id,
+            user_message=user_message,
+            assistant_message=assistant_message,
+            workspace_id=workspace_id,
+            workspace_root=workspace_root,
+        )
+
+    async def _run_consolidation_job(self, job: ConsolidationJob) -> None:
+        """Consolidate a session's queued turns (runs on the worker task)."""
+        consolidator = self._memory_consolidator
+        if consolidator is None:
+            return
+        resolved_root = job.workspace_root
+        if resolved_root is None and job.workspace_id is not None:
+            resolved_root = self._resolve_workspace_root(job.workspace_id)
         try:
-            applied = await self._memory_consolidator.consolidate_turn(
-                session_id=session_id,
-                user_message=user_message,
-                assistant_message=assistant_message,
-                workspace_id=workspace_id,
+            applied = await consolidator.consolidate_turns(
+                session_id=job.session_id,
+                turns=job.turns,
+                workspace_id=job.workspace_id,
                 workspace_root=resolved_root,
-                run_rules=self._memory_consolidation_rule_based_enabled,
             )
             if applied:
                 logger.debug(
                     "session_runner.memory_consolidated",
-                    session_id=session_id,
-                    workspace_id=workspace_id or "",
+                    session_id=job.session_id,
+                    workspace_id=job.workspace_id or "",
                     applied=applied,
+                    turns=len(job.turns),
                 )
-                await self._embed_memory_items_after_consolidation()
+                self._embed_memory_items_after_consolidation()
         except Exception as exc:
             logger.warning(
                 "session_runner.memory_consolidation_failed",
-                session_id=session_id,
+                session_id=job.session_id,
                 error=str(exc),
             )
 
-    async def _embed_memory_items_after_consolidation(self) -> None:
+    async def flush_memory_consolidation(self, timeout: float | None = None) -> bool:
+        """Wait for queued consolidation jobs; return false on timeout."""
+        return await self._consolidation_worker.drain(timeout)
+
+    def consolidation_stats(self) -> dict[str, float]:
+        """Return queue depth, coalescing and backpressure counters."""
+        return self._consolidation_worker.stats()
+
+    def _embed_memory_items_after_consolidation(self) -> None:
         """Refresh embeddings after durable memory changes when configured."""
-        if (
-            not self._memory_embed_after_consolidation
-            or self._memory is None
-            or self._memory_embedding_provider is None
-        ):
+        if self._memory_embed_after_consolidation:
+            self.request_memory_embedding_refresh()
+
+    def request_memory_embedding_refresh(self) -> None:
+        """Schedule a debounced, incremental refresh of memory embeddings."""
+        if self._memory is None or self._memory_embedding_provider is None:
             return
-        embed_items = getattr(self._memory, "embed_items", None)
-        if not callable(embed_items):
+        if not callable(getattr(self._memory, "embed_items", None)):
             return
-        try:
+        self._embedding_refresher.request()
+
+    async def flush_memory_embeddings(self) -> None:
+        """Run a pending embedding refresh now instead of after the debounce."""
+        await self._embedding_refresher.flush()
+
+    async def _refresh_memory_embeddings_now(self) -> int:
+        """Embed changed memory items in passes of at most ``max_items``."""
+        memory = self._memory
+        provider = self._memory_embedding_provider
+        embed_items = getattr(memory, "embed_items", None)
+        if provider is None or not callable(embed_items):
+            return 0
+        limit = self._memory_embedding_refresh_max_items
+        total = 0
+        while True:
             count = await cast(Any, embed_items)(
-                self._memory_embedding_provider,
+                provider,
+                limit=limit,
                 vector_index=self._memory_vector_index,
             )
-            logger.debug("session_runner.memory_embeddings_refreshed", count=count)
-        except Exception as exc:
-            logger.warning("session_runner.memory_embedding_failed", error=str(exc))
+            total += count
+            if count < limit:
+                return total
 
 
 def _safe_int(value: object, default: int = 0) -> int:
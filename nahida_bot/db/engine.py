@@ -3,6 +3,9 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from contextvars import ContextVar, Token
 from pathlib import Path
 from typing import Any
 
@@ -10,7 +13,7 @@ import aiosqlite
 
 
 _SCHEMA_MIGRATIONS = [
-    # Migration 001: sessions, memory_turns, memory_keywords
+    # Migration 001: sessions, memory_turns, memory_keywords (dropped in 012)
     """
     CREATE TABLE IF NOT EXISTS sessions (
         session_id TEXT PRIMARY KEY,
@@ -184,31 +187,182 @@ _SCHEMA_MIGRATIONS = [
     CREATE INDEX IF NOT EXISTS idx_memory_embeddings_item
         ON memory_embeddings(item_id);
     """,
+    # Migration 010: float32 BLOB storage for memory embeddings. Rows written
+    # before this keep their JSON vector; new rows leave embedding_json empty.
+    """
+    ALTER TABLE memory_embeddings ADD COLUMN embedding_blob BLOB;
+    """,
+    # Migration 011: index keyword rows by turn so retention deletes do not
+    # scan the whole keyword table per deleted chunk.
+    """
+    CREATE INDEX IF NOT EXISTS idx_memory_keywords_turn
+        ON memory_keywords(turn_id);
+    """,
+    # Migration 012: replace memory_keywords with an external-content FTS5
+    # index over memory_turns. The index text is jieba-tokenized in Python,
+    # so existing turns are indexed afterwards in chunks: ids up to
+    # max_unindexed_id still need indexing (see backfill_turn_index).
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS memory_turn_fts USING fts5(
+        content_index,
+        content='memory_turns',
+        content_rowid='id'
+    );
+
+    CREATE TABLE IF NOT EXISTS memory_turn_fts_backfill (
+        max_unindexed_id INTEGER NOT NULL
+    );
+
+    INSERT INTO memory_turn_fts_backfill (max_unindexed_id)
+        SELECT MAX(id) FROM memory_turns HAVING MAX(id) IS NOT NULL;
+
+    DROP INDEX IF EXISTS idx_memory_keywords_turn;
+    DROP INDEX IF EXISTS idx_keywords_keyword;
+    DROP TABLE IF EXISTS memory_keywords;
+    """,
+    # Migration 013: per-session activity counters kept current by triggers
+    # in the same transaction as each turn insert/delete, so session
+    # listings and dreaming never aggregate memory_turns. The dreaming
+    # watermark is seeded from the legacy session metadata key.
+    """
+    CREATE TABLE IF NOT EXISTS session_stats (
+        session_id TEXT PRIMARY KEY,
+        turn_count INTEGER NOT NULL DEFAULT 0,
+        last_turn_id INTEGER NOT NULL DEFAULT 0,
+        last_turn_at TEXT NOT NULL DEFAULT '',
+        last_dream_turn_id INTEGER NOT NULL DEFAULT 0,
+        pending_dream_turns INTEGER NOT NULL DEFAULT 0
+    );
+
+    INSERT OR IGNORE INTO session_stats (
+        session_id, turn_count, last_turn_id, last_turn_at,
+        last_dream_turn_id, pending_dream_turns
+    )
+    SELECT t.session_id, COUNT(*), MAX(t.id), MAX(t.created_at), d.dream_id,
+        SUM(t.id > d.dream_id)
+    FROM memory_turns t
+    JOIN (
+        SELECT session_id, COALESCE(CAST(json_extract(
+            metadata_json, '$.memory_dream_last_turn_id') AS INTEGER), 0) AS dream_id
+        FROM sessions
+    ) d ON d.session_id = t.session_id
+    GROUP BY t.session_id;
+
+    CREATE INDEX IF NOT EXISTS idx_session_stats_dream_pending
+        ON session_stats(last_turn_at) WHERE pending_dream_turns > 0;
+
+    CREATE INDEX IF NOT EXISTS idx_sessions_last_active
+        ON sessions(last_active_at);
+
+    CREATE TRIGGER IF NOT EXISTS trg_memory_turns_stats_insert
+    AFTER INSERT ON memory_turns
+    BEGIN
+        INSERT INTO session_stats (
+            session_id, turn_count, last_turn_id, last_turn_at, pending_dream_turns
+        )
+        VALUES (NEW.session_id, 1, NEW.id, NEW.created_at, 1)
+        ON CONFLICT(session_id) DO UPDATE SET
+            turn_count = turn_count + 1,
+            last_turn_id = MAX(last_turn_id, excluded.last_turn_id),
+            last_turn_at = MAX(last_turn_at, excluded.last_turn_at),
+            pending_dream_turns = pending_dream_turns + 1;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_memory_turns_stats_delete
+    AFTER DELETE ON memory_turns
+    BEGIN
+        UPDATE session_stats SET
+            turn_count = MAX(turn_count - 1, 0),
+            pending_dream_turns = MAX(
+                pending_dream_turns - (OLD.id > last_dream_turn_id), 0
+            )
+        WHERE session_id = OLD.session_id;
+    END;
+    """,
 ]
 
 
+DEFAULT_READ_POOL_SIZE = 4
+DEFAULT_VACUUM_PAGES_PER_STEP = 256
+
+# Engine whose write lock the current task holds; reads issued from that
+# context must see the writer's uncommitted changes. Tasks spawned while the
+# lock is held inherit the value and also read from the writer.
+_write_owner: ContextVar[DatabaseEngine | None] = ContextVar(
+    "nahida_db_write_owner", default=None
+)
+
+
+class _WriteLock:
+    """``asyncio.Lock`` that marks its holder as inside a write transaction."""
+
+    __slots__ = ("_engine", "_lock", "_token")
+
+    def __init__(self, engine: DatabaseEngine) -> None:
+        self._engine = engine
+        self._lock = asyncio.Lock()
+        self._token: Token[DatabaseEngine | None] | None = None
+
+    def locked(self) -> bool:
+        return self._lock.locked()
+
+    async def __aenter__(self) -> None:
+        await self._lock.acquire()
+        self._token = _write_owner.set(self._engine)
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        token, self._token = self._token, None
+        if token is not None:
+            _write_owner.reset(token)
+        self._lock.release()
+
+
 class DatabaseEngine:
     """Async SQLite engine with schema migration support.
 
+    One writer connection executes every statement passed to
+    :meth:`execute` and owns all transactions; callers serialize writes with
+    :attr:`write_lock`. :meth:`fetch_one` and :meth:`fetch_all` are served by
+    a small pool of query-only reader connections, which WAL mode lets run
+    concurrently with the writer and with each other. Reads made while the
+    current task holds :attr:`write_lock` go to the writer instead, so a
+    transaction always sees its own uncommitted rows. In-memory databases
+    cannot be shared between connections and always read from the writer.
+
     TODO: Add ``__aenter__`` / ``__aexit__`` so callers can use
     ``async with DatabaseEngine(...) as db:`` for guaranteed connection
     cleanup on exception paths. Currently callers must remember to call
     ``close()`` manually.
     """
 
-    def __init__(self, db_path: str | Path) -> None:
+    def __init__(
+        self,
+        db_path: str | Path,
+        *,
+        read_pool_size: int = DEFAULT_READ_POOL_SIZE,
+    ) -> None:
         """Create engine for given database path.
 
         Args:
             db_path: File path or ``":memory:"`` for transient databases.
+            read_pool_size: Number of reader connections; ``0`` sends every
+                read through the writer connection.
         """
         self._db_path = str(db_path)
         self._db: aiosqlite.Connection | None = None
-        self._write_lock: asyncio.Lock = asyncio.Lock()
+        self._write_lock = _WriteLock(self)
+        self._read_pool_size = (
+            0 if self._db_path in ("", ":memory:") else max(0, read_pool_size)
+        )
+        self._readers: list[aiosqlite.Connection] = []
+        self._idle_readers: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        self.reads = 0
+        self.writer_reads = 0
+        self.read_waits = 0
 
     @property
     def db(self) -> aiosqlite.Connection:
-        """Return the active database connection.
+        """Return the writer database connection.
 
         Raises:
             RuntimeError: If called before ``initialize()``.
@@ -218,43 +372,152 @@ class DatabaseEngine:
         return self._db
 
     @property
-    def write_lock(self) -> asyncio.Lock:
-        """Lock for serializing write operations."""
+    def write_lock(self) -> _WriteLock:
+        """Lock for serializing write operations on the writer connection."""
         return self._write_lock
 
     async def initialize(self) -> None:
-        """Open the database connection and run pending migrations."""
+        """Open the database connections and run pending migrations."""
         self._db = await aiosqlite.connect(self._db_path)
         self._db.row_factory = aiosqlite.Row
+        # Only takes effect for a new database file; existing files keep their
+        # mode until a full VACUUM.
+        await self._db.execute("PRAGMA auto_vacuum=INCREMENTAL")
         await self._db.execute("PRAGMA journal_mode=WAL")
         await self._db.execute("PRAGMA foreign_keys=ON")
         await self._run_migrations()
+        for _ in range(self._read_pool_size):
+            reader = await aiosqlite.connect(self._db_path)
+            reader.row_factory = aiosqlite.Row
+            await reader.execute("PRAGMA query_only=ON")
+            self._readers.append(reader)
+            self._idle_readers.put_nowait(reader)
 
     async def close(self) -> None:
-        """Close the database connection."""
+        """Close the reader pool and the writer connection."""
+        readers, self._readers = self._readers, []
+        self._idle_readers = asyncio.Queue()
+        for reader in readers:
+            await reader.close()
         if self._db is not None:
             await self._db.close()
             self._db = None
 
+    async def configure_connections(
+        self, configure: Callable[[aiosqlite.Connection], Awaitable[None]]
+    ) -> None:
+        """Run ``configure`` on the writer and every reader connection.
+
+        Use this for per-connection state such as loadable extensions that
+        queries on any connection depend on.
+        """
+        await configure(self.db)
+        for reader in self._readers:
+            await configure(reader)
+
     async def execute(
         self, sql: str, parameters: tuple[Any, ...] | None = None
     ) -> aiosqlite.Cursor:
-        """Execute a single SQL statement."""
+        """Execute a single SQL statement on the writer connection."""
         return await self.db.execute(sql, parameters or ())
 
     async def fetch_one(
         self, sql: str, parameters: tuple[Any, ...] | None = None
     ) -> aiosqlite.Row | None:
         """Execute a query and return the first row, or None."""
-        cursor = await self.db.execute(sql, parameters or ())
-        return await cursor.fetchone()
+        if self._reads_use_writer():
+            cursor = await self.db.execute(sql, parameters or ())
+            return await cursor.fetchone()
+        async with (
+            self._reader() as reader,
+            reader.execute(sql, parameters or ()) as cursor,
+        ):
+            return await cursor.fetchone()
 
     async def fetch_all(
         self, sql: str, parameters: tuple[Any, ...] | None = None
     ) -> list[aiosqlite.Row]:
         """Execute a query and return all matching rows."""
-        cursor = await self.db.execute(sql, parameters or ())
-        return list(await cursor.fetchall())
+        if self._reads_use_writer():
+            cursor = await self.db.execute(sql, parameters or ())
+            return list(await cursor.fetchall())
+        async with (
+            self._reader() as reader,
+            reader.execute(sql, parameters or ()) as cursor,
+        ):
+            return list(await cursor.fetchall())
+
+    async def compact(
+        self, *, pages_per_step: int = DEFAULT_VACUUM_PAGES_PER_STEP
+    ) -> dict[str, int]:
+        """Return free pages to the filesystem and refresh planner statistics.
+
+        Runs ``PRAGMA incremental_vacuum`` in steps of ``pages_per_step`` pages,
+        releasing the write lock between steps, then ``PRAGMA optimize``.
+        Databases created before incremental auto-vacuum was enabled keep
+        their free pages for reuse and report nothing reclaimed.
+        """
+        pages_per_step = max(1, pages_per_step)
+        before = await self._page_stats()
+        freelist = before["freelist_count"]
+        while freelist > 0:
+            async with self.write_lock:
+                cursor = await self.db.execute(
+                    f"PRAGMA incremental_vacuum({pages_per_step})"
+                )
+                await cursor.fetchall()
+                await self.db.commit()
+            remaining = (await self._page_stats())["freelist_count"]
+            if remaining >= freelist:
+                break
+            freelist = remaining
+        async with self.write_lock:
+            await self.db.execute("PRAGMA optimize")
+            await self.db.commit()
+        after = await self._page_stats()
+        return {
+            "page_size": after["page_size"],
+            "pages_before": before["page_count"],
+            "pages_after": after["page_count"],
+            "freelist_pages": after["freelist_count"],
+            "reclaimed_bytes": max(0, before["page_count"] - after["page_count"])
+            * after["page_size"],
+        }
+
+    def pool_stats(self) -> dict[str, int]:
+        """Return reader-pool size and routing counters."""
+        return {
+            "readers": len(self._readers),
+            "idle_readers": self._idle_readers.qsize(),
+            "reads": self.reads,
+            "writer_reads": self.writer_reads,
+            "read_waits": self.read_waits,
+        }
+
+    def _reads_use_writer(self) -> bool:
+        self.reads += 1
+        if self._readers and _write_owner.get() is not self:
+            return False
+        self.writer_reads += 1
+        return True
+
+    @asynccontextmanager
+    async def _reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        if self._idle_readers.empty():
+            self.read_waits += 1
+        reader = await self._idle_readers.get()
+        try:
+            yield reader
+        finally:
+            self._idle_readers.put_nowait(reader)
+
+    async def _page_stats(self) -> dict[str, int]:
+        stats: dict[str, int] = {}
+        for pragma in ("page_size", "page_count", "freelist_count"):
+            cursor = await self.db.execute(f"PRAGMA {pragma}")
+            row = await cursor.fetchone()
+            stats[pragma] = int(row[0]) if row else 0
+        return stats
 
     async def _run_migrations(self) -> None:
         """Apply pending schema migrations with version tracking."""
@@ -2,13 +2,32 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
+import sys
+from array import array
+from collections.abc import Callable, Sequence
 from datetime import UTC, datetime
 from typing import Any
 
 import aiosqlite
 
 from nahida_bot.db.engine import DatabaseEngine
+from nahida_bot.db.write_batcher import (
+    DEFAULT_WRITE_BATCH_MAX_DELAY_SECONDS,
+    DEFAULT_WRITE_BATCH_MAX_SIZE,
+    WriteBatcher,
+)
+
+# Stay well below SQLite's default bound-parameter limit for IN (...) lists.
+_SQL_VARIABLE_CHUNK = 500
+
+# Passively observed group messages: stored with the ``group_observation``
+# source and ``observed_only`` metadata flag.
+_OBSERVED_TURN_CONDITION = (
+    "(source = 'group_observation' OR "
+    "COALESCE(json_extract(metadata_json, '$.observed_only'), 0) = 1)"
+)
 
 
 def _utc_now_iso() -> str:
@@ -16,25 +35,72 @@ def _utc_now_iso() -> str:
     return datetime.now(UTC).isoformat()
 
 
+def _pack_float32(values: Sequence[float]) -> bytes:
+    """Serialize a vector as little-endian float32 bytes for BLOB storage."""
+    packed = array("f", values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _unpack_float32(blob: bytes) -> array[float]:
+    """Decode a BLOB written by :func:`_pack_float32`."""
+    values = array("f")
+    values.frombytes(blob)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
 class SQLiteMemoryRepository:
     """Typed SQLite data access for session and conversation turn storage."""
 
-    def __init__(self, engine: DatabaseEngine) -> None:
+    def __init__(
+        self,
+        engine: DatabaseEngine,
+        *,
+        write_batch_max_delay: float = DEFAULT_WRITE_BATCH_MAX_DELAY_SECONDS,
+        write_batch_max_size: int = DEFAULT_WRITE_BATCH_MAX_SIZE,
+        fts_tokenizer: Callable[[str], str] = str,
+    ) -> None:
+        """Create the repository.
+
+        ``fts_tokenizer`` turns turn content into the space-separated index
+        text stored in ``memory_turn_fts``. Deleting a turn must replay the
+        exact text it was indexed with, so the same function is used for
+        both and must stay deterministic for the lifetime of the index (run
+        :meth:`rebuild_turn_index` after changing it).
+        """
         self._engine = engine
+        self._fts_tokenizer = fts_tokenizer
+        self._backfill_lock = asyncio.Lock()
+        # Session touches and turn inserts from concurrent callers share one
+        # transaction per batch instead of one commit each.
+        self._write_batcher = WriteBatcher(
+            engine,
+            max_delay_seconds=write_batch_max_delay,
+            max_batch_size=write_batch_max_size,
+        )
+
+    def write_batch_stats(self) -> dict[str, float]:
+        """Return group-commit counters for turn and session writes."""
+        return self._write_batcher.stats()
+
+    async def close(self) -> None:
+        """Commit writes still queued for group commit."""
+        await self._write_batcher.close()
 
     async def ensure_session(
         self, session_id: str, workspace_id: str | None = None
     ) -> None:
         """Insert a session row if it does not exist, refresh last_active_at."""
         now_iso = _utc_now_iso()
-        async with self._engine.write_lock:
-            await self._engine.execute(
-                "INSERT INTO sessions (session_id, workspace_id, created_at, last_active_at) "
-                "VALUES (?, ?, ?, ?) "
-                "ON CONFLICT(session_id) DO UPDATE SET last_active_at = excluded.last_active_at",
-                (session_id, workspace_id, now_iso, now_iso),
-            )
-            await self._engine.db.commit()
+        await self._write_batcher.submit(
+            "INSERT INTO sessions (session_id, workspace_id, created_at, last_active_at) "
+            "VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(session_id) DO UPDATE SET last_active_at = excluded.last_active_at",
+            (session_id, workspace_id, now_iso, now_iso),
+        )
 
     async def append_turn(
         self,
@@ -44,26 +110,24 @@ class SQLiteMemoryRepository:
         content: str,
         source: str = "",
         metadata: dict[str, Any] | None = None,
-        keywords: list[str] | None = None,
     ) -> int:
-        """Store a conversation turn and return its auto-generated id."""
+        """Store a conversation turn and return its auto-generated id.
+
+        The insert and its FTS index row are group-committed with other
+        concurrent writes; the call returns once the batch is durable.
+        """
         now_iso = _utc_now_iso()
         metadata_json = json.dumps(metadata, ensure_ascii=False) if metadata else None
-
-        async with self._engine.write_lock:
-            cursor = await self._engine.execute(
-                "INSERT INTO memory_turns "
-                "(session_id, role, content, source, metadata_json, created_at) "
-                "VALUES (?, ?, ?, ?, ?, ?)",
-                (session_id, role, content, source, metadata_json, now_iso),
-            )
-            turn_id: int = cursor.lastrowid  # type: ignore[assignment]
-
-            if keywords:
-                await self._insert_keywords(turn_id, keywords)
-
-            await self._engine.db.commit()
-        return turn_id
+        return await self._write_batcher.submit(
+            "INSERT INTO memory_turns "
+            "(session_id, role, content, source, metadata_json, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (session_id, role, content, source, metadata_json, now_iso),
+            dependent_sql=(
+                "INSERT INTO memory_turn_fts (rowid, content_index) VALUES (?, ?)"
+            ),
+            dependent_rows=[(self._fts_tokenizer(content),)],
+        )
 
     async def get_recent_turns(
         self, session_id: str, *, limit: int = 50
@@ -78,65 +142,22 @@ class SQLiteMemoryRepository:
         )
         return [self._row_to_dict(row) for row in reversed(rows)]
 
-    async def search_by_keyword(
-        self, session_id: str, keyword: str, *, limit: int = 10
-    ) -> list[dict[str, Any]]:
-        """Search turns by keyword match within a session."""
-        rows = await self._engine.fetch_all(
-            "SELECT DISTINCT t.id, t.session_id, t.role, t.content, "
-            "t.source, t.metadata_json, t.created_at "
-            "FROM memory_turns t "
-            "JOIN memory_keywords mk ON mk.turn_id = t.id "
-            "WHERE t.session_id = ? AND mk.keyword = ? "
-            "ORDER BY t.created_at DESC LIMIT ?",
-            (session_id, keyword.lower(), limit),
-        )
-        return [self._row_to_dict(row) for row in rows]
-
-    async def search_by_keywords(
-        self, session_id: str, keywords: list[str], *, limit: int = 10
+    async def search_turns(
+        self, session_id: str, fts_query: str, *, limit: int = 10
     ) -> list[dict[str, Any]]:
-        """Search turns matching *any* of the given keywords (OR), ranked by match count."""
-        if not keywords:
-            return []
-        placeholders = ",".join("?" for _ in keywords)
-        params: list[Any] = [session_id] + [kw.lower() for kw in keywords] + [limit]
+        """Search a session's turns via FTS5, best BM25 score first."""
         rows = await self._engine.fetch_all(
             "SELECT t.id, t.session_id, t.role, t.content, "
             "t.source, t.metadata_json, t.created_at, "
-            "COUNT(DISTINCT mk.keyword) AS match_count "
-            "FROM memory_turns t "
-            "JOIN memory_keywords mk ON mk.turn_id = t.id "
-            "WHERE t.session_id = ? AND mk.keyword IN (" + placeholders + ") "
-            "GROUP BY t.id "
-            "ORDER BY match_count DESC, t.created_at DESC LIMIT ?",
-            tuple(params),
+            "bm25(memory_turn_fts) AS score "
+            "FROM memory_turn_fts "
+            "JOIN memory_turns t ON t.id = memory_turn_fts.rowid "
+            "WHERE memory_turn_fts MATCH ? AND t.session_id = ? "
+            "ORDER BY score, t.created_at DESC LIMIT ?",
+            (fts_query, session_id, limit),
         )
         return [self._row_to_dict(row) for row in rows]
 
-    async def get_keywords_for_turn(self, turn_id: int) -> list[str]:
-        """Return all indexed keywords for a given turn."""
-        rows = await self._engine.fetch_all(
-            "SELECT keyword FROM memory_keywords WHERE turn_id = ?",
-            (turn_id,),
-        )
-        return [row["keyword"] for row in rows]
-
-    async def get_keywords_for_turns(self, turn_ids: list[int]) -> dict[int, list[str]]:
-        """Bulk-fetch keywords for multiple turns."""
-        if not turn_ids:
-            return {}
-        placeholders = ",".join("?" for _ in turn_ids)
-        rows = await self._engine.fetch_all(
-            "SELECT turn_id, keyword FROM memory_keywords "
-            "WHERE turn_id IN (" + placeholders + ")",
-            tuple(turn_ids),
-        )
-        result: dict[int, list[str]] = {tid: [] for tid in turn_ids}
-        for row in rows:
-            result[row["turn_id"]].append(row["keyword"])
-        return result
-
     async def search_by_time_window(
         self,
         session_id: str,
@@ -167,47 +188,196 @@ class SQLiteMemoryRepository:
         rows = await self._engine.fetch_all(sql, tuple(params))
         return [self._row_to_dict(row) for row in reversed(rows)]
 
-    async def delete_turns_before(self, cutoff: datetime) -> int:
-        """Delete turns older than cutoff. Returns count of deleted rows."""
-        cutoff_iso = cutoff.isoformat()
-        async with self._engine.write_lock:
-            # Delete keywords first (no ON DELETE CASCADE on the FK).
+    async def delete_turns_before(
+        self,
+        cutoff: datetime,
+        *,
+        source: str | None = None,
+        exclude_sources: Sequence[str] = (),
+        observed_only: bool | None = None,
+        chunk_size: int = _SQL_VARIABLE_CHUNK,
+    ) -> int:
+        """Delete turns older than cutoff. Returns count of deleted rows.
+
+        ``source`` restricts the delete to one turn source and
+        ``exclude_sources`` skips the listed ones. ``observed_only`` selects
+        passively observed group messages (``True``) or everything else
+        (``False``). Rows are deleted in chunks of ``chunk_size``, each in its
+        own short transaction, so other writers are never blocked for long.
+        """
+        conditions = ["created_at < ?"]
+        params: list[Any] = [cutoff.isoformat()]
+        if source is not None:
+            conditions.append("source = ?")
+            params.append(source)
+        if exclude_sources:
+            placeholders = ",".join("?" for _ in exclude_sources)
+            conditions.append(f"source NOT IN ({placeholders})")
+            params.extend(exclude_sources)
+        if observed_only is not None:
+            conditions.append(
+                _OBSERVED_TURN_CONDITION
+                if observed_only
+                else f"NOT {_OBSERVED_TURN_CONDITION}"
+            )
+        sql = (
+            f"SELECT id FROM memory_turns WHERE {' AND '.join(conditions)} "
+            "ORDER BY id LIMIT ?"
+        )
+        chunk_size = max(1, min(chunk_size, _SQL_VARIABLE_CHUNK))
+        deleted = 0
+        while True:
+            rows = await self._engine.fetch_all(sql, (*params, chunk_size))
+            if not rows:
+                return deleted
+            deleted += await self._delete_turn_ids([int(row["id"]) for row in rows])
+
+    async def list_sessions_over_turn_limit(
+        self, max_turns: int
+    ) -> list[tuple[str, int]]:
+        """Return ``(session_id, turn_count)`` for sessions above ``max_turns``."""
+        rows = await self._engine.fetch_all(
+            "SELECT session_id, turn_count FROM session_stats WHERE turn_count > ?",
+            (max_turns,),
+        )
+        return [(row["session_id"], int(row["turn_count"])) for row in rows]
+
+    async def trim_session_turns(
+        self, session_id: str, keep: int, *, chunk_size: int = _SQL_VARIABLE_CHUNK
+    ) -> int:
+        """Delete all but the newest ``keep`` turns of a session, in chunks."""
+        chunk_size = max(1, min(chunk_size, _SQL_VARIABLE_CHUNK))
+        deleted = 0
+        while True:
+            rows = await self._engine.fetch_all(
+                "SELECT id FROM memory_turns WHERE session_id = ? "
+                "ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?",
+                (session_id, chunk_size, max(0, keep)),
+            )
+            if not rows:
+                return deleted
+            deleted += await self._delete_turn_ids([int(row["id"]) for row in rows])
+
+    async def clear_session_turns(self, session_id: str) -> int:
+        """Delete all turns of a session in chunks. Returns deleted turn count."""
+        deleted = 0
+        while True:
+            rows = await self._engine.fetch_all(
+                "SELECT id FROM memory_turns WHERE session_id = ? ORDER BY id LIMIT ?",
+                (session_id, _SQL_VARIABLE_CHUNK),
+            )
+            if not rows:
+                return deleted
+            deleted += await self._delete_turn_ids([int(row["id"]) for row in rows])
+
+    async def backfill_turn_index(
+        self, *, chunk_size: int = _SQL_VARIABLE_CHUNK
+    ) -> int:
+        """Index one chunk of turns written before the FTS index existed.
+
+        Works newest-first so recent history becomes searchable first.
+        Returns the number of turns processed; ``0`` once nothing is left.
+        Tokenization runs before the write lock is taken.
+        """
+        chunk_size = max(1, min(chunk_size, _SQL_VARIABLE_CHUNK))
+        async with self._backfill_lock:
+            watermark = await self._turn_index_watermark()
+            if watermark is None:
+                return 0
+            rows = await self._engine.fetch_all(
+                "SELECT id, content FROM memory_turns WHERE id <= ? "
+                "ORDER BY id DESC LIMIT ?",
+                (watermark, chunk_size),
+            )
+            index_rows = [
+                (int(row["id"]), self._fts_tokenizer(row["content"])) for row in rows
+            ]
+            async with self._engine.write_lock:
+                # Turns deleted meanwhile were never indexed; skip them.
+                existing = await self._existing_turn_ids([i for i, _ in index_rows])
+                await self._engine.db.executemany(
+                    "INSERT INTO memory_turn_fts (rowid, content_index) VALUES (?, ?)",
+                    [row for row in index_rows if row[0] in existing],
+                )
+                if len(index_rows) < chunk_size:
+                    await self._engine.execute("DELETE FROM memory_turn_fts_backfill")
+                else:
+                    await self._engine.execute(
+                        "UPDATE memory_turn_fts_backfill SET max_unindexed_id = ?",
+                        (index_rows[-1][0] - 1,),
+                    )
+                await self._engine.db.commit()
+            return len(index_rows)
+
+    async def rebuild_turn_index(self) -> None:
+        """Drop the turn FTS index and mark every turn for backfill."""
+        async with self._backfill_lock, self._engine.write_lock:
             await self._engine.execute(
-                "DELETE FROM memory_keywords WHERE turn_id IN ("
-                "SELECT id FROM memory_turns WHERE created_at < ?"
-                ")",
-                (cutoff_iso,),
+                "INSERT INTO memory_turn_fts (memory_turn_fts) VALUES ('delete-all')"
             )
-            cursor = await self._engine.execute(
-                "DELETE FROM memory_turns WHERE created_at < ?",
-                (cutoff_iso,),
+            await self._engine.execute("DELETE FROM memory_turn_fts_backfill")
+            await self._engine.execute(
+                "INSERT INTO memory_turn_fts_backfill (max_unindexed_id) "
+                "SELECT MAX(id) FROM memory_turns HAVING MAX(id) IS NOT NULL"
             )
             await self._engine.db.commit()
-        return cursor.rowcount
 
-    async def clear_session_turns(self, session_id: str) -> int:
-        """Delete all turns and keywords for a session. Returns deleted turn count."""
+    async def _turn_index_watermark(self) -> int | None:
+        row = await self._engine.fetch_one(
+            "SELECT max_unindexed_id FROM memory_turn_fts_backfill"
+        )
+        return int(row["max_unindexed_id"]) if row else None
+
+    async def _existing_turn_ids(self, turn_ids: list[int]) -> set[int]:
+        if not turn_ids:
+            return set()
+        placeholders = ",".join("?" for _ in turn_ids)
+        rows = await self._engine.fetch_all(
+            f"SELECT id FROM memory_turns WHERE id IN ({placeholders})",
+            tuple(turn_ids),
+        )
+        return {int(row["id"]) for row in rows}
+
+    async def _delete_turn_ids(self, turn_ids: list[int]) -> int:
+        placeholders = ",".join("?" for _ in turn_ids)
+        # External-content FTS5 deletes need the indexed text; re-tokenize
+        # before taking the write lock.
+        rows = await self._engine.fetch_all(
+            f"SELECT id, content FROM memory_turns WHERE id IN ({placeholders})",
+            tuple(turn_ids),
+        )
+        index_rows = {
+            int(row["id"]): self._fts_tokenizer(row["content"]) for row in rows
+        }
         async with self._engine.write_lock:
-            await self._engine.execute(
-                "DELETE FROM memory_keywords WHERE turn_id IN ("
-                "SELECT id FROM memory_turns WHERE session_id = ?"
-                ")",
-                (session_id,),
+            watermark = await self._turn_index_watermark()
+            existing = await self._existing_turn_ids(list(index_rows))
+            await self._engine.db.executemany(
+                "INSERT INTO memory_turn_fts (memory_turn_fts, rowid, content_index) "
+                "VALUES ('delete', ?, ?)",
+                [
+                    (turn_id, text)
+                    for turn_id, text in index_rows.items()
+                    if turn_id in existing
+                    and (watermark is None or turn_id > watermark)
+                ],
             )
             cursor = await self._engine.execute(
-                "DELETE FROM memory_turns WHERE session_id = ?",
-                (session_id,),
+                f"DELETE FROM memory_turns WHERE id IN ({placeholders})",
+                tuple(turn_ids),
             )
             await self._engine.db.commit()
         return cursor.rowcount
 
     async def list_sessions(self, *, limit: int = 50) -> list[dict[str, Any]]:
-        """List sessions with turn counts."""
+        """List the most recently active sessions with turn counts."""
         rows = await self._engine.fetch_all(
             "SELECT s.session_id, s.workspace_id, s.created_at, "
             "s.last_active_at, s.metadata_json, "
-            "(SELECT COUNT(*) FROM memory_turns t WHERE t.session_id = s.session_id) AS turn_count "
-            "FROM sessions s ORDER BY s.last_active_at DESC LIMIT ?",
+            "COALESCE(st.turn_count, 0) AS turn_count "
+            "FROM sessions s "
+            "LEFT JOIN session_stats st ON st.session_id = s.session_id "
+            "ORDER BY s.last_active_at DESC LIMIT ?",
             (limit,),
         )
         results: list[dict[str, Any]] = []
@@ -224,6 +394,35 @@ class SQLiteMemoryRepository:
             results.append(d)
         return results
 
+    async def list_sessions_for_dreaming(
+        self, *, min_new_turns: int = 1, limit: int = 20
+    ) -> list[dict[str, Any]]:
+        """Return recently active sessions with undreamed turns, newest first."""
+        rows = await self._engine.fetch_all(
+            "SELECT st.session_id, s.workspace_id, st.turn_count, st.last_turn_id, "
+            "st.last_turn_at, st.last_dream_turn_id, st.pending_dream_turns "
+            "FROM session_stats st "
+            "JOIN sessions s ON s.session_id = st.session_id "
+            "WHERE st.pending_dream_turns > 0 AND st.pending_dream_turns >= ? "
+            "ORDER BY st.last_turn_at DESC LIMIT ?",
+            (min_new_turns, limit),
+        )
+        return [dict(row) for row in rows]
+
+    async def mark_session_dreamed(self, session_id: str, turn_id: int) -> None:
+        """Advance the dreaming watermark and recount turns stored after it."""
+        async with self._engine.write_lock:
+            await self._engine.execute(
+                "UPDATE session_stats SET "
+                "last_dream_turn_id = MAX(last_dream_turn_id, ?), "
+                "pending_dream_turns = ("
+                "SELECT COUNT(*) FROM memory_turns "
+                "WHERE session_id = ? AND id > MAX(session_stats.last_dream_turn_id, ?)"
+                ") WHERE session_id = ?",
+                (turn_id, session_id, turn_id, session_id),
+            )
+            await self._engine.db.commit()
+
     async def get_session_metadata(self, session_id: str) -> dict[str, Any]:
         """Get session metadata_json as a dict."""
         row = await self._engine.fetch_one(
@@ -242,17 +441,22 @@ class SQLiteMemoryRepository:
 
     async def update_session_metadata(
         self, session_id: str, updates: dict[str, Any]
-    ) -> None:
-        """Merge updates into session metadata_json (upsert)."""
-        existing = await self.get_session_metadata(session_id)
-        merged = {**existing, **updates}
-        merged_json = json.dumps(merged, ensure_ascii=False)
+    ) -> dict[str, Any] | None:
+        """Merge updates into session metadata_json (upsert).
+
+        The read-modify-write runs under the write lock so concurrent
+        updates cannot drop each other's keys. Returns the merged metadata,
+        or ``None`` when the session does not exist.
+        """
         async with self._engine.write_lock:
-            await self._engine.execute(
+            existing = await self.get_session_metadata(session_id)
+            merged = {**existing, **updates}
+            cursor = await self._engine.execute(
                 "UPDATE sessions SET metadata_json = ? WHERE session_id = ?",
-                (merged_json, session_id),
+                (json.dumps(merged, ensure_ascii=False), session_id),
             )
             await self._engine.db.commit()
+        return merged if cursor.rowcount else None
 
     # -- Active session overrides --
 
@@ -431,33 +635,85 @@ class SQLiteMemoryRepository:
         content_hash: str,
         embedding: list[float],
     ) -> str:
-        """Insert or update a persisted memory embedding."""
+        """Insert or update a persisted memory embedding as a float32 BLOB."""
+        await self.upsert_memory_embeddings(
+            [
+                {
+                    "embedding_id": embedding_id,
+                    "item_id": item_id,
+                    "provider_id": provider_id,
+                    "model": model,
+                    "dimensions": dimensions,
+                    "content_hash": content_hash,
+                    "embedding": embedding,
+                }
+            ]
+        )
+        return embedding_id
+
+    async def upsert_memory_embeddings(self, rows: list[dict[str, Any]]) -> int:
+        """Insert or update several memory embeddings in one transaction.
+
+        Each row carries the keyword arguments of :meth:`upsert_memory_embedding`.
+        """
+        if not rows:
+            return 0
         now_iso = _utc_now_iso()
-        embedding_json = json.dumps(embedding, ensure_ascii=False)
+        params = [
+            (
+                row["embedding_id"],
+                row["item_id"],
+                row["provider_id"],
+                row["model"],
+                row["dimensions"],
+                row["content_hash"],
+                _pack_float32(row["embedding"]),
+                now_iso,
+            )
+            for row in rows
+        ]
         async with self._engine.write_lock:
-            await self._engine.execute(
+            await self._engine.db.executemany(
                 "INSERT INTO memory_embeddings "
                 "(embedding_id, item_id, provider_id, model, dimensions, "
-                "content_hash, embedding_json, created_at) "
-                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "content_hash, embedding_json, embedding_blob, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, '', ?, ?) "
                 "ON CONFLICT(item_id, provider_id, model, content_hash) "
                 "DO UPDATE SET embedding_id = excluded.embedding_id, "
                 "embedding_json = excluded.embedding_json, "
+                "embedding_blob = excluded.embedding_blob, "
                 "dimensions = excluded.dimensions, "
                 "created_at = excluded.created_at",
-                (
-                    embedding_id,
-                    item_id,
-                    provider_id,
-                    model,
-                    dimensions,
-                    content_hash,
-                    embedding_json,
-                    now_iso,
-                ),
+                params,
             )
             await self._engine.db.commit()
-        return embedding_id
+        return len(params)
+
+    async def list_memory_embedding_state(
+        self,
+        *,
+        scope_type: str,
+        scope_id: str,
+        provider_id: str,
+        model: str,
+    ) -> list[dict[str, Any]]:
+        """List active items in a scope with their stored hashes for one model.
+
+        Returns one row per (item, stored embedding); items without an
+        embedding for ``provider_id``/``model`` appear once with a ``None``
+        ``embedding_id``. Rows are ordered like :meth:`list_memory_items`.
+        """
+        rows = await self._engine.fetch_all(
+            "SELECT mi.item_id, mi.title, mi.content, "
+            "me.embedding_id, me.content_hash "
+            "FROM memory_items mi "
+            "LEFT JOIN memory_embeddings me ON me.item_id = mi.item_id "
+            "AND me.provider_id = ? AND me.model = ? "
+            "WHERE mi.status = 'active' AND mi.scope_type = ? AND mi.scope_id = ? "
+            "ORDER BY mi.importance DESC, mi.updated_at DESC",
+            (provider_id, model, scope_type, scope_id),
+        )
+        return [dict(row) for row in rows]
 
     async def list_memory_embeddings(
         self,
@@ -472,7 +728,8 @@ class SQLiteMemoryRepository:
         """List embeddings for active memory items in a scope."""
         rows = await self._engine.fetch_all(
             "SELECT me.embedding_id, me.item_id, me.provider_id, me.model, "
-            "me.dimensions, me.content_hash, me.embedding_json, me.created_at "
+            "me.dimensions, me.content_hash, me.embedding_json, me.embedding_blob, "
+            "me.created_at "
             "FROM memory_embeddings me "
             "JOIN memory_items mi ON mi.item_id = me.item_id "
             "WHERE mi.status = 'active' "
@@ -483,6 +740,49 @@ class SQLiteMemoryRepository:
         )
         return [self._memory_embedding_row_to_dict(row) for row in rows]
 
+    async def list_memory_embedding_vectors(
+        self,
+        *,
+        provider_id: str,
+        model: str,
+        dimensions: int,
+        scope_type: str,
+        scope_id: str,
+    ) -> list[dict[str, Any]]:
+        """List ``embedding_id``/``item_id``/``embedding`` for active items.
+
+        Used to load an in-process vector index for one embedding space and
+        memory scope.
+        """
+        rows = await self._engine.fetch_all(
+            "SELECT me.embedding_id, me.item_id, me.embedding_json, "
+            "me.embedding_blob "
+            "FROM memory_embeddings me "
+            "JOIN memory_items mi ON mi.item_id = me.item_id "
+            "WHERE mi.status = 'active' "
+            "AND mi.scope_type = ? AND mi.scope_id = ? "
+            "AND me.provider_id = ? AND me.model = ? AND me.dimensions = ?",
+            (scope_type, scope_id, provider_id, model, dimensions),
+        )
+        return [self._memory_embedding_row_to_dict(row) for row in rows]
+
+    async def list_memory_embedding_ids_for_item(self, item_id: str) -> list[str]:
+        """List persisted embedding ids for one memory item."""
+        rows = await self._engine.fetch_all(
+            "SELECT embedding_id FROM memory_embeddings WHERE item_id = ?",
+            (item_id,),
+        )
+        return [str(row["embedding_id"]) for row in rows]
+
+    async def list_inactive_memory_embedding_ids(self) -> list[str]:
+        """List embeddings whose memory item is archived or gone."""
+        rows = await self._engine.fetch_all(
+            "SELECT me.embedding_id FROM memory_embeddings me "
+            "LEFT JOIN memory_items mi ON mi.item_id = me.item_id "
+            "WHERE mi.item_id IS NULL OR mi.status != 'active'"
+        )
+        return [str(row["embedding_id"]) for row in rows]
+
     async def delete_memory_embeddings_for_item(self, item_id: str) -> int:
         """Delete persisted embeddings for one memory item."""
         async with self._engine.write_lock:
@@ -493,6 +793,24 @@ class SQLiteMemoryRepository:
             await self._engine.db.commit()
         return cursor.rowcount
 
+    async def delete_memory_embeddings(self, embedding_ids: list[str]) -> int:
+        """Delete persisted embeddings by id."""
+        if not embedding_ids:
+            return 0
+        deleted = 0
+        async with self._engine.write_lock:
+            for offset in range(0, len(embedding_ids), _SQL_VARIABLE_CHUNK):
+                chunk = embedding_ids[offset : offset + _SQL_VARIABLE_CHUNK]
+                placeholders = ",".join("?" for _ in chunk)
+                cursor = await self._engine.execute(
+                    "DELETE FROM memory_embeddings "
+                    f"WHERE embedding_id IN ({placeholders})",
+                    tuple(chunk),
+                )
+                deleted += cursor.rowcount
+            await self._engine.db.commit()
+        return deleted
+
     # -- Memory consolidation candidates --
 
     async def append_memory_candidate(
@@ -579,19 +897,6 @@ class SQLiteMemoryRepository:
             await self._engine.db.commit()
         return cursor.rowcount > 0
 
-    async def _insert_keywords(self, turn_id: int, keywords: list[str]) -> None:
-        """Insert keyword associations for a turn.
-
-        TODO: This issues N individual INSERT statements. For CJK text jieba
-        can produce 20-50+ keywords per turn. Replace with ``executemany`` or
-        a single multi-value INSERT to reduce round-trips.
-        """
-        for keyword in keywords:
-            await self._engine.execute(
-                "INSERT INTO memory_keywords (turn_id, keyword) VALUES (?, ?)",
-                (turn_id, keyword.lower()),
-            )
-
     @staticmethod
     def _row_to_dict(row: aiosqlite.Row) -> dict[str, Any]:  # type: ignore[name-defined]
         """Convert a database row to a plain dict with parsed metadata."""
@@ -632,10 +937,18 @@ class SQLiteMemoryRepository:
 
     @staticmethod
     def _memory_embedding_row_to_dict(row: aiosqlite.Row) -> dict[str, Any]:
-        """Convert a memory embedding row into a dict with parsed vector JSON."""
+        """Convert a memory embedding row into a dict with a decoded vector.
+
+        ``embedding`` is a float32 ``array`` for BLOB rows and a list of floats
+        for legacy JSON rows.
+        """
         data: dict[str, Any] = dict(row)
         embedding_raw = data.pop("embedding_json", None)
-        if isinstance(embedding_raw, str):
+        embedding_blob = data.pop("embedding_blob", None)
+        if isinstance(embedding_blob, bytes):
+            data["embedding"] = _unpack_float32(embedding_blob)
+            return data
+        if isinstance(embedding_raw, str) and embedding_raw:
             try:
                 parsed = json.loads(embedding_raw)
             except (json.JSONDecodeError, ValueError):
@@ -0,0 +1,198 @@
+"""Group commit for small, independent SQLite writes."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+import structlog
+
+if TYPE_CHECKING:
+    from nahida_bot.db.engine import DatabaseEngine
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_WRITE_BATCH_MAX_DELAY_SECONDS = 0.005
+DEFAULT_WRITE_BATCH_MAX_SIZE = 64
+
+
+@dataclass(slots=True)
+class _QueuedWrite:
+    sql: str
+    params: tuple[Any, ...]
+    dependent_sql: str | None
+    dependent_rows: list[tuple[Any, ...]]
+    future: asyncio.Future[int] = field(repr=False)
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class WriteBatcher:
+    """Coalesce concurrent INSERT/UPSERT statements into one transaction.
+
+    :meth:`submit` queues a statement and waits for its row id. The first
+    queued write starts a timer; when it fires after ``max_delay_seconds``
+    (or as soon as ``max_batch_size`` writes are waiting) the whole batch is
+    executed under the engine's write lock and committed once, so N
+    concurrent callers pay for one fsync instead of N. Each statement may
+    carry dependent rows (for example keyword associations) that are
+    inserted with ``executemany`` after the new row id is known; the id is
+    prepended to every dependent row.
+
+    If the batch fails it is rolled back and replayed one write per
+    transaction, so a bad row only fails its own caller. A
+    ``max_delay_seconds`` of ``0`` disables queueing and writes inline.
+    :meth:`close` flushes whatever is still queued; later writes go inline.
+    """
+
+    def __init__(
+        self,
+        engine: DatabaseEngine,
+        *,
+        max_delay_seconds: float = DEFAULT_WRITE_BATCH_MAX_DELAY_SECONDS,
+        max_batch_size: int = DEFAULT_WRITE_BATCH_MAX_SIZE,
+    ) -> None:
+        self._engine = engine
+        self.max_delay_seconds = max(0.0, max_delay_seconds)
+        self.max_batch_size = max(1, max_batch_size)
+        self._pending: list[_QueuedWrite] = []
+        self._full = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._closed = False
+        self.batches = 0
+        self.writes = 0
+        self.largest_batch = 0
+        self.fallbacks = 0
+
+    async def submit(
+        self,
+        sql: str,
+        params: tuple[Any, ...],
+        *,
+        dependent_sql: str | None = None,
+        dependent_rows: list[tuple[Any, ...]] | None = None,
+    ) -> int:
+        """Queue one write and return its ``lastrowid`` once committed."""
+        write = _QueuedWrite(
+            sql=sql,
+            params=params,
+            dependent_sql=dependent_sql,
+            dependent_rows=dependent_rows or [],
+            future=asyncio.get_running_loop().create_future(),
+        )
+        if self.max_delay_seconds <= 0 or self._closed:
+            await self._flush([write])
+            return write.future.result()
+        self._pending.append(write)
+        if len(self._pending) >= self.max_batch_size:
+            self._full.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="db-write-batcher")
+        return await asyncio.shield(write.future)
+
+    async def close(self) -> None:
+        """Commit every queued write and wait for the batch task to finish.
+
+        Must be awaited before the engine is closed; otherwise queued writes
+        are lost with the connection.
+        """
+        self._closed = True
+        self._full.set()
+        task = self._task
+        if task is not None:
+            await asyncio.gather(task, return_exceptions=True)
+            self._task = None
+        # Writes queued after the task finished its last loop check.
+        while self._pending:
+            batch = self._pending[: self.max_batch_size]
+            del self._pending[: self.max_batch_size]
+            await self._flush(batch)
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "batches": self.batches,
+            "writes": self.writes,
+            "avg_batch_size": round(self.writes / self.batches, 2)
+            if self.batches
+            else 0.0,
+            "largest_batch": self.largest_batch,
+            "fallbacks": self.fallbacks,
+            "pending": len(self._pending),
+        }
+
+    # -- internal helpers ------------------------------------------------
+
+    async def _run(self) -> None:
+        while self._pending:
+            # Writes queued while the previous batch committed have already
+            # waited; the delay counts from the oldest queued write.
+            remaining = (
+                self._pending[0].enqueued_at + self.max_delay_seconds - time.monotonic()
+            )
+            if (
+                remaining > 0
+                and not self._closed
+                and len(self._pending) < self.max_batch_size
+            ):
+                try:
+                    await asyncio.wait_for(self._full.wait(), timeout=remaining)
+                except TimeoutError:
+                    pass
+            self._full.clear()
+            batch = self._pending[: self.max_batch_size]
+            del self._pending[: self.max_batch_size]
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[_QueuedWrite]) -> None:
+        started = time.perf_counter()
+        failure: Exception | None = None
+        async with self._engine.write_lock:
+            try:
+                row_ids = [await self._execute(write) for write in batch]
+                await self._engine.db.commit()
+            except Exception as exc:  # noqa: BLE001
+                # Forwarded to the waiting callers, one write at a time.
+                await self._engine.db.rollback()
+                failure = exc
+        if failure is not None:
+            if len(batch) == 1:
+                _resolve(batch[0], exc=failure)
+                return
+            self.fallbacks += 1
+            logger.warning("db.write_batch_failed", size=len(batch), error=str(failure))
+            for write in batch:
+                await self._flush([write])
+            return
+        self.batches += 1
+        self.writes += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        for write, row_id in zip(batch, row_ids, strict=True):
+            _resolve(write, row_id=row_id)
+        if len(batch) > 1:
+            logger.debug(
+                "db.write_batch_committed",
+                size=len(batch),
+                elapsed_ms=round((time.perf_counter() - started) * 1000, 2),
+            )
+
+    async def _execute(self, write: _QueuedWrite) -> int:
+        cursor = await self._engine.execute(write.sql, write.params)
+        row_id = int(cursor.lastrowid or 0)
+        if write.dependent_sql and write.dependent_rows:
+            await self._engine.db.executemany(
+                write.dependent_sql,
+                [(row_id, *row) for row in write.dependent_rows],
+            )
+        return row_id
+
+
+def _resolve(
+    write: _QueuedWrite, *, row_id: int = 0, exc: BaseException | None = None
+) -> None:
+    if write.future.done():
+        return
+    if exc is not None:
+        write.future.set_exception(exc)
+    else:
+        write.future.set_result(row_id)
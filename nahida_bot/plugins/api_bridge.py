@@ -171,6 +171,8 @@ class RealBotAPI:
         description: str,
         parameters: dict[str, Any],
         handler: Callable[..., Awaitable[str]],
+        *,
+        serial: bool = False,
     ) -> None:
         self._tool_registry.register(
             ToolEntry(
@@ -179,6 +181,7 @@ class RealBotAPI:
                 parameters=parameters,
                 handler=handler,
                 plugin_id=self._plugin_id,
+                serial=serial,
             )
         )
         self._logger.debug("tool_registered", tool_name=name)
@@ -509,6 +512,11 @@ class RealBotAPI:
         """Access the MessageRouter for /stop command support."""
         return self._event_bus.context.app.message_router
 
+    @property
+    def http_transports(self) -> Any | None:
+        """Access the application's shared HTTP connection pools."""
+        return getattr(self._event_bus.context.app, "http_transports", None)
+
     # ── Cleanup ────────────────────────────────────────
 
     def clear_subscriptions(self) -> None:
@@ -186,8 +186,10 @@ class ChannelService(Protocol):
 
     Channel services are ordinary plugins that explicitly register themselves
     with ``BotAPI.register_channel()``. Optional helpers such as
-    ``get_user_info()`` or ``download_media()`` are intentionally not part of
-    the required runtime protocol.
+    ``get_user_info()``, ``download_media()`` or
+    ``edit_message(target, message_id, message)`` (used for progressive
+    streaming replies) are intentionally not part of the required runtime
+    protocol.
     """
 
     @property
@@ -244,8 +246,15 @@ class BotAPI(Protocol):
         description: str,
         parameters: dict[str, Any],  # JSON Schema
         handler: Callable[..., Awaitable[str]],
+        *,
+        serial: bool = False,
     ) -> None:
-        """Register a tool that the LLM can call during conversations."""
+        """Register a tool that the LLM can call during conversations.
+
+        Tools with side effects that must not overlap other tool calls from
+        the same step (shell execution, file writes) should pass
+        ``serial=True``.
+        """
         ...
 
     # ── Service Registration ──────────────────────────
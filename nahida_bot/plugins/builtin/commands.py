@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import ipaddress
 import json
 import mimetypes
@@ -163,6 +164,7 @@ class BuiltinCommandsPlugin(Plugin):
                 "additionalProperties": False,
             },
             self._tool_workspace_write,
+            serial=True,
         )
 
     def _register_attachment_tools(self) -> None:
@@ -202,6 +204,7 @@ class BuiltinCommandsPlugin(Plugin):
                 "additionalProperties": False,
             },
             self._tool_send_local_attachment,
+            serial=True,
         )
 
     def _register_memory_tools(self) -> None:
@@ -255,6 +258,7 @@ class BuiltinCommandsPlugin(Plugin):
                 "additionalProperties": False,
             },
             self._tool_memory_write,
+            serial=True,
         )
 
     # ── exec Tool ──────────────────────────────────────────
@@ -283,6 +287,7 @@ class BuiltinCommandsPlugin(Plugin):
                 "additionalProperties": False,
             },
             self._tool_exec,
+            serial=True,
         )
 
     async def _tool_exec(
@@ -409,14 +414,11 @@ class BuiltinCommandsPlugin(Plugin):
             )
 
         try:
-            async with httpx.AsyncClient(
-                follow_redirects=True,
-                max_redirects=5,
-                timeout=httpx.Timeout(_WEB_FETCH_TIMEOUT),
-            ) as client:
+            async with self._web_fetch_client() as client:
                 response = await client.get(
                     url,
                     headers={"User-Agent": "NahidaBot/0.1 (web_fetch tool)"},
+                    timeout=httpx.Timeout(_WEB_FETCH_TIMEOUT),
                 )
                 response.raise_for_status()
 
@@ -446,6 +448,26 @@ class BuiltinCommandsPlugin(Plugin):
             _logger.exception("tool.web_fetch.error", url=url)
             return f"Failed to fetch URL: {e}"
 
+    def _web_fetch_client(
+        self,
+    ) -> contextlib.AbstractAsyncContextManager[httpx.AsyncClient]:
+        """Pooled client from the application, or a one-off client."""
+        transports = getattr(self.api, "http_transports", None)
+        if transports is not None:
+            return contextlib.nullcontext(
+                transports.client(
+                    "web_fetch",
+                    follow_redirects=True,
+                    max_redirects=5,
+                    accept_cookies=False,
+                )
+            )
+        return httpx.AsyncClient(
+            follow_redirects=True,
+            max_redirects=5,
+            timeout=httpx.Timeout(_WEB_FETCH_TIMEOUT),
+        )
+
     # ── plan Tool ──────────────────────────────────────────
 
     def _register_plan_tool(self) -> None:
@@ -494,6 +516,7 @@ class BuiltinCommandsPlugin(Plugin):
                 "additionalProperties": False,
             },
             self._tool_plan,
+            serial=True,
         )
 
     async def _load_plan_data(self) -> dict[str, Any] | None:
@@ -745,6 +768,7 @@ class BuiltinCommandsPlugin(Plugin):
                 "additionalProperties": False,
             },
             self._tool_cron_create,
+            serial=True,
         )
         self.api.register_tool(
             "cron_list",
@@ -772,6 +796,7 @@ class BuiltinCommandsPlugin(Plugin):
                 "additionalProperties": False,
             },
             self._tool_cron_cancel,
+            serial=True,
         )
         self.api.register_tool(
             "cron_update",
@@ -813,6 +838,7 @@ class BuiltinCommandsPlugin(Plugin):
                 "additionalProperties": False,
             },
             self._tool_cron_update,
+            serial=True,
         )
         self.api.register_tool(
             "cron_delete",
@@ -829,6 +855,7 @@ class BuiltinCommandsPlugin(Plugin):
                 "additionalProperties": False,
             },
             self._tool_cron_delete,
+            serial=True,
         )
 
     def _get_scheduler(self) -> Any:
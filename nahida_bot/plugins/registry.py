@@ -15,6 +15,7 @@ class ToolEntry:
     parameters: dict[str, Any]  # JSON Schema
     handler: Callable[..., Awaitable[str]]
     plugin_id: str
+    serial: bool = False
 
 
 @dataclass(slots=True, frozen=True)
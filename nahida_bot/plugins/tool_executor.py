@@ -13,6 +13,7 @@ def tool_entry_to_definition(entry: ToolEntry) -> ToolDefinition:
         name=entry.name,
         description=entry.description,
         parameters=entry.parameters,
+        serial=entry.serial,
     )
 
 
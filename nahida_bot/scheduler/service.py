@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import asyncio
 from datetime import UTC, datetime, timedelta
-from typing import TYPE_CHECKING, Any, Literal, cast
+from typing import TYPE_CHECKING, Any, Literal
 
 from croniter import croniter
 from uuid import uuid4
@@ -24,6 +24,9 @@ if TYPE_CHECKING:
 
 logger = structlog.get_logger(__name__)
 
+# Dreaming needs at least one exchange beyond what was already dreamed over.
+_MIN_DREAM_NEW_TURNS = 2
+
 _CRON_TOOL_NAMES = frozenset(
     {"cron_create", "cron_update", "cron_list", "cron_cancel", "cron_delete"}
 )
@@ -402,9 +405,16 @@ class SchedulerService:
         if provider_manager is None:
             return 0
 
-        sessions = await memory.list_sessions(
-            limit=self._config.memory_dreaming_session_limit
-        )
+        list_for_dreaming = getattr(memory, "list_sessions_for_dreaming", None)
+        if callable(list_for_dreaming):
+            sessions = await list_for_dreaming(
+                min_new_turns=_MIN_DREAM_NEW_TURNS,
+                limit=self._config.memory_dreaming_session_limit,
+            )
+        else:
+            sessions = await memory.list_sessions(
+                limit=self._config.memory_dreaming_session_limit
+            )
         logger.debug(
             "scheduler.memory_dreaming_run_start",
             session_count=len(sessions),
@@ -417,6 +427,7 @@ class SchedulerService:
                 applied = await self._dream_session(
                     session.session_id,
                     workspace_id=session.workspace_id,
+                    last_turn_id=getattr(session, "last_dream_turn_id", None),
                 )
                 if applied:
                     processed_sessions += 1
@@ -436,20 +447,29 @@ class SchedulerService:
         return applied_total
 
     async def _dream_session(
-        self, session_id: str, *, workspace_id: str | None = None
+        self,
+        session_id: str,
+        *,
+        workspace_id: str | None = None,
+        last_turn_id: int | None = None,
     ) -> int:
         assert self._runner is not None
         memory = self._runner.memory
         if memory is None:
             return 0
 
-        meta = await memory.get_session_meta(session_id)
-        last_turn_id = _safe_int(meta.get("memory_dream_last_turn_id"), default=0)
+        if last_turn_id is None or workspace_id is None:
+            meta = await memory.get_session_meta(session_id)
+            workspace_id = workspace_id or str(meta.get("workspace_id") or "") or None
+            if last_turn_id is None:
+                last_turn_id = _safe_int(
+                    meta.get("memory_dream_last_turn_id"), default=0
+                )
         records = await memory.get_recent(
             session_id, limit=self._config.memory_dreaming_recent_turn_limit
         )
         new_records = [record for record in records if record.turn_id > last_turn_id]
-        if len(new_records) < 2:
+        if len(new_records) < _MIN_DREAM_NEW_TURNS:
             logger.debug(
                 "scheduler.memory_dreaming_session_skipped",
                 session_id=session_id,
@@ -479,7 +499,6 @@ class SchedulerService:
             provider_reason=provider_reason,
         )
 
-        workspace_id = workspace_id or str(meta.get("workspace_id") or "") or None
         workspace_root = self._runner.workspace_root_for(workspace_id)
         conversation = "\n".join(
             f"{record.turn.role}: {record.turn.content}"
@@ -506,8 +525,11 @@ class SchedulerService:
             run_rules=False,
         )
         if applied:
-            await self._refresh_memory_embeddings()
+            self._refresh_memory_embeddings()
         max_turn_id = max(record.turn_id for record in new_records)
+        mark_dreamed = getattr(memory, "mark_session_dreamed", None)
+        if callable(mark_dreamed):
+            await mark_dreamed(session_id, max_turn_id)
         await memory.update_session_meta(
             session_id,
             {
@@ -523,25 +545,11 @@ class SchedulerService:
         )
         return applied
 
-    async def _refresh_memory_embeddings(self) -> None:
+    def _refresh_memory_embeddings(self) -> None:
         """Refresh durable memory embeddings after background dreaming changes."""
         if self._runner is None:
             return
-        memory = self._runner.memory
-        provider = self._runner.memory_embedding_provider
-        if memory is None or provider is None:
-            return
-        embed_items = getattr(memory, "embed_items", None)
-        if not callable(embed_items):
-            return
-        try:
-            count = await cast(Any, embed_items)(
-                provider,
-                vector_index=self._runner.memory_vector_index,
-            )
-            logger.debug("scheduler.memory_embeddings_refreshed", count=count)
-        except Exception as exc:
-            logger.warning("scheduler.memory_embedding_failed", error=str(exc))
+        self._runner.request_memory_embedding_refresh()
 
     async def _resolve_memory_dream_provider(
         self, session_id: str
@@ -30,6 +30,8 @@ class MockBotAPI:
         description: str,
         parameters: dict[str, Any],
         handler: Callable[..., Awaitable[str]],
+        *,
+        serial: bool = False,
     ) -> None:
         pass
 
@@ -128,11 +130,14 @@ class RecordingMockBotAPI(MockBotAPI):
         description: str,
         parameters: dict[str, Any],
         handler: Any,
+        *,
+        serial: bool = False,
     ) -> None:
         self.registered_tools[name] = {
             "description": description,
             "parameters": parameters,
             "handler": handler,
+            "serial": serial,
         }
 
     def register_channel(self, channel: Any) -> None:
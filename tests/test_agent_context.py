@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import gc
+import weakref
+from dataclasses import replace
 from pathlib import Path
 
 import pytest
@@ -12,8 +15,15 @@ from nahida_bot.agent.context import (
     ContextMessage,
     ContextPart,
 )
-from nahida_bot.agent.providers import ChatProvider, ProviderResponse
-from nahida_bot.agent.tokenization import CharacterEstimateTokenizer
+from nahida_bot.agent.providers import (
+    ChatProvider,
+    ModelCapabilities,
+    ProviderResponse,
+)
+from nahida_bot.agent.tokenization import (
+    CharacterEstimateTokenizer,
+    estimate_image_tokens,
+)
 
 
 class _AlwaysOneTokenizer:
@@ -21,6 +31,17 @@ class _AlwaysOneTokenizer:
         return 1
 
 
+class _CountingTokenizer:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.texts: list[str] = []
+
+    def count_tokens(self, text: str) -> int:
+        self.calls += 1
+        self.texts.append(text)
+        return len(text)
+
+
 class _FailingTokenizer:
     def count_tokens(self, text: str) -> int:
         raise RuntimeError("boom")
@@ -257,6 +278,87 @@ class TestContextBuilder:
             [plain]
         )
 
+    def test_token_estimates_are_memoized_across_rebuilt_messages(self) -> None:
+        """Equal messages rebuilt from storage should reuse cached token counts."""
+        counting = _CountingTokenizer()
+        builder = ContextBuilder(tokenizer=counting)
+        history = [
+            ContextMessage(role="user", source="history", content=f"turn {i}")
+            for i in range(20)
+        ]
+
+        first = builder._estimate_tokens(history)
+        calls_after_first = counting.calls
+        assert builder._estimate_tokens(history) == first
+        rebuilt = [
+            ContextMessage(role=m.role, source=m.source, content=m.content)
+            for m in history
+        ]
+        assert builder._estimate_tokens(rebuilt) == first
+
+        assert calls_after_first == 20
+        assert counting.calls == 20
+        assert builder.token_cache_stats()["hits"] == 40
+
+    def test_token_cache_is_bounded(self) -> None:
+        """The memo should evict least recently used entries past its size."""
+        builder = ContextBuilder(
+            tokenizer=CharacterEstimateTokenizer(chars_per_token=1),
+            token_cache_size=8,
+        )
+        history = [
+            ContextMessage(role="user", source="history", content=f"turn {i}")
+            for i in range(30)
+        ]
+
+        builder._estimate_tokens(history)
+
+        stats = builder.token_cache_stats()
+        assert stats["identity_entries"] == 8
+        assert stats["digest_entries"] == 8
+
+    def test_token_cache_does_not_keep_messages_alive(self) -> None:
+        """Identity entries should go away with their (possibly huge) message."""
+        builder = ContextBuilder(tokenizer=CharacterEstimateTokenizer())
+        message = ContextMessage(
+            role="user",
+            source="history",
+            content="look",
+            parts=[ContextPart(type="image_base64", data="A" * 100_000)],
+        )
+        builder._estimate_tokens([message])
+        ref = weakref.ref(message)
+        assert builder.token_cache_stats()["identity_entries"] == 1
+
+        del message
+        gc.collect()
+
+        assert ref() is None
+        stats = builder.token_cache_stats()
+        assert stats["identity_entries"] == 0
+        assert stats["digest_entries"] == 1
+
+    def test_truncation_tokenizes_only_content_after_overhead(self) -> None:
+        """Truncation probes should not re-serialize metadata on every step."""
+        counting = _CountingTokenizer()
+        builder = ContextBuilder(tokenizer=counting)
+        metadata = {"tool_call_id": "call_1", "blob": "m" * 2000}
+        message = ContextMessage(
+            role="tool",
+            source="tool_result:search",
+            content="x" * 4000,
+            metadata=metadata,
+        )
+
+        truncated = builder._truncate_message_to_budget(message, 3000)
+
+        assert truncated is not None
+        assert truncated.metadata == metadata
+        assert builder._estimate_tokens([truncated]) <= 3000
+        assert len(truncated.content) > 900
+        # Only the overhead and the final verification see the metadata blob.
+        assert sum(1 for text in counting.texts if "m" * 2000 in text) == 2
+
     def test_budget_adds_summary_when_messages_are_dropped(self) -> None:
         """Dropped context should be represented by a summary message when possible."""
         # Arrange
@@ -435,6 +537,49 @@ Use workspace_read before workspace_write.
 
         assert "workspace_memory:markdown" not in [item.source for item in result]
 
+    def test_workspace_prefix_is_cached_until_files_change(
+        self, temp_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Repeated builds should reuse workspace messages until a file changes."""
+        workspace_dir = temp_dir / "ws"
+        skill_dir = workspace_dir / "skills" / "search"
+        skill_dir.mkdir(parents=True)
+        (workspace_dir / "AGENTS.md").write_text("agents v1", encoding="utf-8")
+        (skill_dir / "SKILL.md").write_text("use search", encoding="utf-8")
+        (workspace_dir / "MEMORY.md").write_text(
+            "# Memory\n\n- User likes tea.", encoding="utf-8"
+        )
+        builder = ContextBuilder()
+        reads: list[Path] = []
+        original_read_text = Path.read_text
+
+        def _counting_read_text(self: Path, *args: object, **kwargs: object) -> str:
+            reads.append(self)
+            return original_read_text(self, *args, **kwargs)  # type: ignore[arg-type]
+
+        monkeypatch.setattr(Path, "read_text", _counting_read_text)
+
+        first = builder.build_context(system_prompt="s", workspace_root=workspace_dir)
+        reads_after_first = len(reads)
+        second = builder.build_context(system_prompt="s", workspace_root=workspace_dir)
+
+        assert reads_after_first == 3
+        assert len(reads) == reads_after_first
+        assert all(a is b for a, b in zip(first[1:], second[1:], strict=True))
+
+        (workspace_dir / "AGENTS.md").write_text("agents v2 edited", encoding="utf-8")
+        third = builder.build_context(system_prompt="s", workspace_root=workspace_dir)
+        assert third[1].content == "agents v2 edited"
+
+        new_skill = workspace_dir / "skills" / "fetch"
+        new_skill.mkdir()
+        (new_skill / "SKILL.md").write_text("use fetch", encoding="utf-8")
+        fourth = builder.build_context(system_prompt="s", workspace_root=workspace_dir)
+        assert [m.source for m in fourth if m.source.startswith("workspace_skill")] == [
+            "workspace_skill:fetch",
+            "workspace_skill:search",
+        ]
+
     def test_provider_tokenizer_is_used_when_available(self) -> None:
         """Context builder should use provider tokenizer when provider exposes one."""
         # Arrange
@@ -575,3 +720,104 @@ class TestContextMessageParts:
         assert builder._estimate_tokens([with_parts]) > builder._estimate_tokens(
             [without_parts]
         )
+
+    def test_token_budget_never_tokenizes_image_payload(self) -> None:
+        counting = _CountingTokenizer()
+        builder = ContextBuilder(tokenizer=counting)
+        payload = "A" * 500_000
+        message = ContextMessage(
+            role="user",
+            source="user_input",
+            content="look",
+            parts=[
+                ContextPart(
+                    type="image_base64",
+                    data=payload,
+                    mime_type="image/png",
+                    width=1024,
+                    height=1024,
+                )
+            ],
+        )
+
+        tokens = builder._estimate_tokens([message])
+
+        assert not any(payload in text for text in counting.texts)
+        text_only = builder._estimate_tokens([replace(message, parts=[])])
+        assert tokens < text_only + 1000
+
+
+class TestImageTokenBudget:
+    def test_openai_tile_formula(self) -> None:
+        assert estimate_image_tokens(512, 512, model="openai_tiles") == 255
+        assert estimate_image_tokens(1024, 1024, model="openai_tiles") == 765
+        # 2048x4096 -> 1024x2048 -> 768x1536 -> 2x3 tiles
+        assert estimate_image_tokens(2048, 4096, model="openai_tiles") == 1105
+
+    def test_anthropic_pixel_formula(self) -> None:
+        assert estimate_image_tokens(1000, 750, model="anthropic_pixels") == 1000
+        # Large images are downscaled before charging, capping the cost.
+        assert estimate_image_tokens(8000, 6000, model="anthropic_pixels") <= 1600
+
+    def test_unknown_dimensions_use_default_size(self) -> None:
+        assert estimate_image_tokens(0, 0) == estimate_image_tokens(1024, 1024)
+
+    def test_builder_uses_provider_image_model_and_capability_override(
+        self,
+    ) -> None:
+        builder = ContextBuilder(
+            budget=ContextBudget(max_tokens=100_000, reserved_tokens=0),
+            tokenizer=_AlwaysOneTokenizer(),
+            image_token_model="anthropic_pixels",
+        )
+        image = ContextMessage(
+            role="user",
+            source="user_input",
+            content="",
+            parts=[ContextPart(type="image_url", url="u", width=1000, height=750)],
+        )
+        assert builder._estimate_tokens([image]) == 1 + 1000
+
+        builder.build_context(
+            system_prompt="s",
+            protected_messages=[image],
+            capabilities=ModelCapabilities(image_token_model="openai_tiles"),
+        )
+        # 1000x750 needs no scaling: 2x2 tiles of 512px
+        assert builder._estimate_tokens([image]) == 1 + 85 + 170 * 4
+
+    def test_large_image_turn_keeps_history_within_budget(self) -> None:
+        builder = ContextBuilder(
+            budget=ContextBudget(max_tokens=4000, reserved_tokens=0),
+            tokenizer=CharacterEstimateTokenizer(chars_per_token=4),
+        )
+        history = [
+            ContextMessage(role="user", source="history", content="earlier question"),
+            ContextMessage(role="assistant", source="history", content="answer"),
+        ]
+        active = ContextMessage(
+            role="user",
+            source="user_input",
+            content="what is this?",
+            parts=[
+                ContextPart(
+                    type="image_base64",
+                    data="B" * 5_000_000,
+                    width=1920,
+                    height=1080,
+                )
+            ],
+        )
+
+        result = builder.build_context(
+            system_prompt="baseline",
+            history_messages=history,
+            protected_messages=[active],
+        )
+
+        assert [m.source for m in result] == [
+            "system_baseline",
+            "history",
+            "history",
+            "user_input",
+        ]
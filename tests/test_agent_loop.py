@@ -26,6 +26,7 @@ from nahida_bot.agent.providers import (
     ProviderAuthError,
     ProviderRateLimitError,
     ProviderResponse,
+    ProviderStreamDelta,
     ToolCall,
     ToolDefinition,
 )
@@ -44,7 +45,7 @@ class _QueuedProvider(ChatProvider):
     def tokenizer(self):
         return None
 
-    async def chat(self, *, messages, tools=None, timeout_seconds=None, model=None):  # noqa: ANN001
+    async def chat(self, *, messages, tools=None, timeout_seconds=None, model=None):
         self.calls += 1
         self.observed_messages.append(list(messages))
         if self.failures:
@@ -114,8 +115,9 @@ async def test_agent_loop_passes_user_parts_to_provider() -> None:
     provider = _QueuedProvider(
         responses=[ProviderResponse(content="looks good", tool_calls=[])]
     )
+    # Images are charged by pixel size (~765 tokens for an unknown size).
     builder = ContextBuilder(
-        budget=ContextBudget(max_tokens=300, reserved_tokens=0),
+        budget=ContextBudget(max_tokens=2000, reserved_tokens=0),
         fallback_tokenizer=CharacterEstimateTokenizer(chars_per_token=20),
     )
     loop = AgentLoop(provider=provider, context_builder=builder)
@@ -667,6 +669,97 @@ async def test_agent_loop_retries_retryable_provider_errors() -> None:
     assert provider.calls == 2
 
 
+@pytest.mark.asyncio
+async def test_agent_loop_does_not_wait_out_long_retry_after() -> None:
+    """A Retry-After beyond the backoff cap fails instead of stalling the run."""
+    provider = _QueuedProvider(
+        responses=[ProviderResponse(content="ok", tool_calls=[])],
+        failures=[ProviderRateLimitError(retry_after=120)],
+    )
+    builder = ContextBuilder(
+        budget=ContextBudget(max_tokens=200, reserved_tokens=0),
+        fallback_tokenizer=CharacterEstimateTokenizer(chars_per_token=20),
+    )
+    loop = AgentLoop(
+        provider=provider,
+        context_builder=builder,
+        config=AgentLoopConfig(
+            retry_attempts=2, retry_backoff_seconds=0.0, retry_backoff_max_seconds=5
+        ),
+    )
+
+    result = await loop.run(user_message="retry", system_prompt="sys")
+
+    assert result.error is not None
+    assert provider.calls == 1
+
+
+@dataclass
+class _StreamingProvider(_QueuedProvider):
+    """Streams each queued response's content one character at a time."""
+
+    partial_failures: list[Exception] = field(default_factory=list)
+
+    async def chat_stream(
+        self, *, messages, tools=None, timeout_seconds=None, model=None
+    ):
+        self.calls += 1
+        if self.partial_failures:
+            yield ProviderStreamDelta(type="text", text="partial")
+            raise self.partial_failures.pop(0)
+        response = self.responses.pop(0)
+        for char in response.content or "":
+            yield ProviderStreamDelta(type="text", text=char)
+        yield ProviderStreamDelta(type="response", response=response)
+
+
+@pytest.mark.asyncio
+async def test_agent_loop_forwards_provider_deltas_before_text_event() -> None:
+    provider = _StreamingProvider(responses=[ProviderResponse(content="hey")])
+    loop = AgentLoop(provider=provider, context_builder=ContextBuilder())
+
+    events = [
+        event async for event in loop.run_stream(user_message="hi", system_prompt="")
+    ]
+
+    assert [(event.type, event.text) for event in events[:4]] == [
+        ("text_delta", "h"),
+        ("text_delta", "e"),
+        ("text_delta", "y"),
+        ("text", "hey"),
+    ]
+    assert events[-1].type == "done"
+    assert events[-1].final_response == "hey"
+
+
+@pytest.mark.asyncio
+async def test_agent_loop_resets_deltas_when_stream_is_retried() -> None:
+    provider = _StreamingProvider(
+        responses=[ProviderResponse(content="ok")],
+        partial_failures=[ProviderRateLimitError()],
+    )
+    loop = AgentLoop(
+        provider=provider,
+        context_builder=ContextBuilder(),
+        config=AgentLoopConfig(retry_attempts=1, retry_backoff_seconds=0),
+    )
+
+    events = [
+        event.type
+        async for event in loop.run_stream(user_message="hi", system_prompt="")
+    ]
+
+    assert events == [
+        "text_delta",
+        "delta_reset",
+        "text_delta",
+        "text_delta",
+        "text",
+        "done",
+    ]
+    assert provider.calls == 2
+
+
 @pytest.mark.asyncio
 async def test_agent_loop_raises_when_tool_requested_without_executor() -> None:
     """Loop should fail fast when provider requests tools but executor is missing."""
@@ -763,7 +856,7 @@ async def test_agent_loop_fallback_preserves_prior_assistant_messages() -> None:
         def tokenizer(self):
             return None
 
-        async def chat(self, *, messages, tools=None, timeout_seconds=None, model=None):  # noqa: ANN001
+        async def chat(self, *, messages, tools=None, timeout_seconds=None, model=None):
             nonlocal call_count
             call_count += 1
             if call_count == 1:
@@ -883,6 +976,111 @@ async def test_agent_loop_records_tool_metrics() -> None:
     assert metrics.provider_latency_stats()["count"] == 2.0  # Two provider calls.
 
 
+@dataclass
+class _ConcurrencyProbeExecutor(ToolExecutor):
+    delays: dict[str, float] = field(default_factory=dict)
+    in_flight: int = 0
+    max_in_flight: int = 0
+    started: list[str] = field(default_factory=list)
+
+    async def execute(self, tool_call: ToolCall) -> ToolExecutionResult:
+        self.started.append(tool_call.call_id)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(tool_call.call_id, 0.01))
+        finally:
+            self.in_flight -= 1
+        return ToolExecutionResult.success(output=f"out-{tool_call.call_id}")
+
+
+def _probe_loop(
+    executor: ToolExecutor,
+    calls: list[ToolCall],
+    *,
+    max_parallel_tools: int = 4,
+    metrics: MetricsCollector | None = None,
+) -> AgentLoop:
+    provider = _QueuedProvider(
+        responses=[
+            ProviderResponse(content="", tool_calls=calls),
+            ProviderResponse(content="done", tool_calls=[]),
+        ]
+    )
+    return AgentLoop(
+        provider=provider,
+        context_builder=ContextBuilder(),
+        tool_executor=executor,
+        metrics=metrics,
+        config=AgentLoopConfig(max_parallel_tools=max_parallel_tools),
+    )
+
+
+_PROBE_SCHEMA: dict[str, object] = {"type": "object", "properties": {}}
+_PROBE_TOOLS = [
+    ToolDefinition(name="fetch", description="fetch", parameters=_PROBE_SCHEMA),
+    ToolDefinition(
+        name="write", description="write", parameters=_PROBE_SCHEMA, serial=True
+    ),
+]
+
+
+@pytest.mark.asyncio
+async def test_agent_loop_runs_independent_tools_in_parallel_preserving_order() -> None:
+    executor = _ConcurrencyProbeExecutor(delays={"a": 0.05, "b": 0.01, "c": 0.03})
+    metrics = MetricsCollector()
+    calls = [ToolCall(call_id=call_id, name="fetch") for call_id in ("a", "b", "c")]
+    loop = _probe_loop(executor, calls, metrics=metrics)
+
+    result = await loop.run(user_message="go", system_prompt="", tools=_PROBE_TOOLS)
+
+    assert executor.max_in_flight == 3
+    assert [m.metadata["tool_call_id"] for m in result.tool_messages] == [
+        "a",
+        "b",
+        "c",
+    ]
+    stats = metrics.tool_parallelism_stats()
+    assert stats["batches"] == 1.0
+    assert stats["tool_calls"] == 3.0
+    assert stats["saved_seconds"] > 0
+
+
+@pytest.mark.asyncio
+async def test_agent_loop_parallel_tools_respect_concurrency_limit() -> None:
+    executor = _ConcurrencyProbeExecutor()
+    calls = [ToolCall(call_id=str(i), name="fetch") for i in range(5)]
+    loop = _probe_loop(executor, calls, max_parallel_tools=2)
+
+    result = await loop.run(user_message="go", system_prompt="", tools=_PROBE_TOOLS)
+
+    assert executor.max_in_flight == 2
+    assert len(result.tool_messages) == 5
+
+
+@pytest.mark.asyncio
+async def test_agent_loop_serial_tools_run_alone_in_call_order() -> None:
+    executor = _ConcurrencyProbeExecutor()
+    calls = [
+        ToolCall(call_id="a", name="fetch"),
+        ToolCall(call_id="w", name="write"),
+        ToolCall(call_id="b", name="fetch"),
+        ToolCall(call_id="c", name="fetch"),
+    ]
+    loop = _probe_loop(executor, calls)
+
+    result = await loop.run(user_message="go", system_prompt="", tools=_PROBE_TOOLS)
+
+    assert executor.started.index("w") == 1
+    assert set(executor.started[2:]) == {"b", "c"}
+    assert [m.metadata["tool_call_id"] for m in result.tool_messages] == [
+        "a",
+        "w",
+        "b",
+        "c",
+    ]
+
+
 @pytest.mark.asyncio
 async def test_agent_loop_records_provider_error_metrics() -> None:
     """Loop should record provider errors in the metrics collector."""
@@ -5,9 +5,11 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Any
 
+import httpx
 import pytest
 
 from nahida_bot.core.context import SessionContext, current_session
+from nahida_bot.core.http_transport import HttpTransportRegistry
 from nahida_bot.core.runtime_settings import merge_runtime_meta
 from nahida_bot.plugins.base import InboundMessage, MemoryRef, OutboundMessage
 from nahida_bot.plugins.builtin.commands import BuiltinCommandsPlugin
@@ -71,12 +73,19 @@ class _FakeAPI:
         return None
 
     def register_tool(
-        self, name: str, description: str, parameters: dict[str, Any], handler: Any
+        self,
+        name: str,
+        description: str,
+        parameters: dict[str, Any],
+        handler: Any,
+        *,
+        serial: bool = False,
     ) -> None:
         self.tools[name] = {
             "description": description,
             "parameters": parameters,
             "handler": handler,
+            "serial": serial,
         }
 
     def register_channel(self, channel: Any) -> None:
@@ -222,6 +231,33 @@ async def test_workspace_tools_delegate_to_bot_api() -> None:
     assert await plugin._tool_workspace_read("notes/a.txt") == "hello"
 
 
+@pytest.mark.asyncio
+async def test_web_fetch_does_not_replay_cookies_between_fetches(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    api = _FakeAPI()
+    api.http_transports = HttpTransportRegistry()  # type: ignore[attr-defined]
+    plugin = BuiltinCommandsPlugin(api=api, manifest=_manifest())
+    sent_cookies: list[str | None] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent_cookies.append(request.headers.get("cookie"))
+        return httpx.Response(
+            200,
+            headers={"content-type": "text/plain", "set-cookie": "sid=alice"},
+            text="ok",
+        )
+
+    monkeypatch.setattr(plugin, "_resolve_host", lambda _host: "93.184.216.34")
+    async with plugin._web_fetch_client() as client:
+        monkeypatch.setattr(client, "_transport", httpx.MockTransport(handler))
+
+    assert await plugin._tool_web_fetch("https://example.com/a") == "ok"
+    assert await plugin._tool_web_fetch("https://example.com/b") == "ok"
+    assert sent_cookies == [None, None]
+    await api.http_transports.aclose()  # type: ignore[attr-defined]
+
+
 @pytest.mark.asyncio
 async def test_send_local_attachment_sends_in_current_session(tmp_path: Path) -> None:
     api = _FakeAPI()
@@ -0,0 +1,177 @@
+"""Tests for the DatabaseEngine reader pool, write routing and group commit."""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from nahida_bot.db.engine import DatabaseEngine
+from nahida_bot.db.write_batcher import WriteBatcher
+
+
+@pytest.fixture
+async def engine(tmp_path: Path):
+    engine = DatabaseEngine(tmp_path / "pool.sqlite3", read_pool_size=2)
+    await engine.initialize()
+    yield engine
+    await engine.close()
+
+
+async def _insert_session(engine: DatabaseEngine, session_id: str) -> None:
+    await engine.execute(
+        "INSERT INTO sessions (session_id, created_at, last_active_at) "
+        "VALUES (?, 'now', 'now')",
+        (session_id,),
+    )
+
+
+async def test_reads_inside_write_lock_see_uncommitted_rows(
+    engine: DatabaseEngine,
+) -> None:
+    inserted = asyncio.Event()
+
+    async def read_from_other_task() -> object:
+        await inserted.wait()
+        return await engine.fetch_one(
+            "SELECT session_id FROM sessions WHERE session_id = 's1'"
+        )
+
+    # Other tasks read committed state from the pool.
+    other = asyncio.create_task(read_from_other_task())
+    async with engine.write_lock:
+        await _insert_session(engine, "s1")
+        inside = await engine.fetch_one(
+            "SELECT session_id FROM sessions WHERE session_id = 's1'"
+        )
+        inserted.set()
+        outside = await other
+        await engine.db.commit()
+    after_commit = await engine.fetch_all("SELECT session_id FROM sessions")
+
+    assert inside is not None
+    assert outside is None
+    assert [row["session_id"] for row in after_commit] == ["s1"]
+    stats = engine.pool_stats()
+    assert stats["readers"] == 2
+    assert stats["writer_reads"] == 1
+
+
+async def test_reader_pool_serves_concurrent_queries(engine: DatabaseEngine) -> None:
+    async with engine.write_lock:
+        for index in range(5):
+            await _insert_session(engine, f"s{index}")
+        await engine.db.commit()
+
+    results = await asyncio.gather(
+        *(engine.fetch_all("SELECT session_id FROM sessions") for _ in range(6))
+    )
+
+    assert all(len(rows) == 5 for rows in results)
+    assert engine.pool_stats()["idle_readers"] == 2
+    with pytest.raises(Exception, match="readonly"):
+        async with engine._reader() as reader:
+            await reader.execute("DELETE FROM sessions")
+
+
+async def test_in_memory_engine_reads_through_writer() -> None:
+    engine = DatabaseEngine(":memory:", read_pool_size=4)
+    await engine.initialize()
+    try:
+        await _insert_session(engine, "s1")
+        row = await engine.fetch_one("SELECT session_id FROM sessions")
+    finally:
+        await engine.close()
+
+    assert row is not None
+    assert engine.pool_stats()["readers"] == 0
+
+
+_TURN_SQL = (
+    "INSERT INTO memory_turns (session_id, role, content, created_at) "
+    "VALUES (?, 'user', ?, 'now')"
+)
+_FTS_SQL = "INSERT INTO memory_turn_fts (rowid, content_index) VALUES (?, ?)"
+
+
+async def test_write_batcher_group_commits_concurrent_writes(
+    engine: DatabaseEngine,
+) -> None:
+    batcher = WriteBatcher(engine, max_delay_seconds=0.05)
+    await batcher.submit(
+        "INSERT INTO sessions (session_id, created_at, last_active_at) "
+        "VALUES ('s1', 'now', 'now')",
+        (),
+    )
+
+    turn_ids = await asyncio.gather(
+        *(
+            batcher.submit(
+                _TURN_SQL,
+                ("s1", f"turn {index}"),
+                dependent_sql=_FTS_SQL,
+                dependent_rows=[(f"kw{index} shared",)],
+            )
+            for index in range(10)
+        )
+    )
+
+    rows = await engine.fetch_all("SELECT id, content FROM memory_turns ORDER BY id")
+    assert turn_ids == [row["id"] for row in rows]
+    assert [row["content"] for row in rows] == [f"turn {i}" for i in range(10)]
+    match = await engine.fetch_one(
+        "SELECT rowid FROM memory_turn_fts WHERE memory_turn_fts MATCH 'kw3'"
+    )
+    assert match is not None and match["rowid"] == turn_ids[3]
+    stats = batcher.stats()
+    assert stats["batches"] == 2
+    assert stats["largest_batch"] == 10
+
+
+async def test_write_batcher_isolates_failing_write(engine: DatabaseEngine) -> None:
+    batcher = WriteBatcher(engine, max_delay_seconds=0.05)
+    await _insert_session(engine, "s1")
+    await engine.db.commit()
+
+    results = await asyncio.gather(
+        batcher.submit(_TURN_SQL, ("s1", "ok")),
+        batcher.submit(_TURN_SQL, ("missing-session", "violates fk")),
+        batcher.submit(_TURN_SQL, ("s1", "also ok")),
+        return_exceptions=True,
+    )
+
+    assert isinstance(results[0], int)
+    assert isinstance(results[1], sqlite3.IntegrityError)
+    assert isinstance(results[2], int)
+    rows = await engine.fetch_all("SELECT content FROM memory_turns ORDER BY id")
+    assert [row["content"] for row in rows] == ["ok", "also ok"]
+    assert batcher.stats()["fallbacks"] == 1
+
+
+async def test_write_batcher_close_commits_queued_writes(tmp_path: Path) -> None:
+    engine = DatabaseEngine(tmp_path / "close.sqlite3", read_pool_size=1)
+    await engine.initialize()
+    await _insert_session(engine, "s1")
+    await engine.db.commit()
+    batcher = WriteBatcher(engine, max_delay_seconds=30)
+
+    pending = [
+        asyncio.create_task(batcher.submit(_TURN_SQL, ("s1", f"turn {index}")))
+        for index in range(3)
+    ]
+    await asyncio.sleep(0)
+    assert batcher.stats()["pending"] == 3
+
+    await asyncio.wait_for(batcher.close(), timeout=2)
+    assert all(task.done() for task in pending)
+    # Writes after close go straight to the database.
+    await batcher.submit(_TURN_SQL, ("s1", "late"))
+    await engine.close()
+
+    reopened = DatabaseEngine(tmp_path / "close.sqlite3", read_pool_size=1)
+    await reopened.initialize()
+    rows = await reopened.fetch_all("SELECT content FROM memory_turns ORDER BY id")
+    await reopened.close()
+    assert [row["content"] for row in rows] == ["turn 0", "turn 1", "turn 2", "late"]
@@ -0,0 +1,152 @@
+"""Tests for the application-owned HTTP transport registry."""
+
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from nahida_bot.agent.providers import OpenAICompatibleProvider
+from nahida_bot.core.http_transport import HttpTransportRegistry, origin_of
+
+
+def _pool_limits(client: httpx.AsyncClient) -> tuple[int | None, int | None]:
+    pool = client._transport._pool  # type: ignore[attr-defined]
+    return pool._max_connections, pool._max_keepalive_connections
+
+
+def test_origin_of_normalizes_urls() -> None:
+    assert origin_of("https://API.example.com/v1/chat") == "https://api.example.com"
+    assert origin_of("http://127.0.0.1:3000/api") == "http://127.0.0.1:3000"
+    assert origin_of("not a url") == ""
+
+
+async def test_clients_are_shared_per_key_and_origin() -> None:
+    registry = HttpTransportRegistry()
+
+    first = registry.client_for("https://api.example.com/v1")
+    second = registry.client_for("https://api.example.com/v2/models")
+    other = registry.client_for("https://other.example.com")
+
+    assert first is second
+    assert first is not other
+    assert registry.client("media") is registry.client("media")
+    assert set(registry.stats()) == {
+        "https://api.example.com",
+        "https://other.example.com",
+        "media",
+    }
+    with pytest.raises(ValueError):
+        registry.client_for("/relative/path")
+    await registry.aclose()
+
+
+async def test_host_limits_override_the_default_pool_size() -> None:
+    registry = HttpTransportRegistry(
+        max_connections_per_host=8,
+        max_keepalive_connections=4,
+        host_limits={"api.example.com": 2},
+    )
+
+    limited = registry.client_for("https://api.example.com/v1")
+    default = registry.client_for("https://other.example.com")
+
+    assert _pool_limits(limited) == (2, 2)
+    assert _pool_limits(default) == (8, 4)
+    await registry.aclose()
+
+
+async def test_stats_count_requests_through_the_client(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    registry = HttpTransportRegistry()
+    client = registry.client_for("https://api.example.com")
+    monkeypatch.setattr(
+        client, "_transport", httpx.MockTransport(lambda _: httpx.Response(200))
+    )
+
+    for _ in range(3):
+        response = await client.get("https://api.example.com/ping")
+        assert response.status_code == 200
+
+    stats = registry.stats()["https://api.example.com"]
+    assert stats["requests"] == 3
+    assert stats["connect_failures"] == 0
+    assert {"reuse_ratio", "wait_p50_ms", "wait_p95_ms", "wait_max_ms"} <= set(stats)
+    await registry.aclose()
+
+
+async def test_cookie_free_client_does_not_replay_set_cookie(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    registry = HttpTransportRegistry()
+    sent_cookies: list[str | None] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent_cookies.append(request.headers.get("cookie"))
+        return httpx.Response(200, headers={"set-cookie": "sid=alice; Path=/"})
+
+    for key, accept_cookies in (("web_fetch", False), ("media", True)):
+        client = registry.client(key, accept_cookies=accept_cookies)
+        monkeypatch.setattr(client, "_transport", httpx.MockTransport(handler))
+        await client.get("https://example.com/first")
+        await client.get("https://example.com/second")
+
+    assert sent_cookies == [None, None, None, "sid=alice"]
+    assert not registry.client("web_fetch").cookies
+    await registry.aclose()
+
+
+async def test_prewarm_tolerates_unreachable_origins(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    registry = HttpTransportRegistry()
+    calls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        if request.url.host == "down.example.com":
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(404)
+
+    for url in ("https://up.example.com", "https://down.example.com"):
+        client = registry.client_for(url)
+        monkeypatch.setattr(client, "_transport", httpx.MockTransport(handler))
+    registry.client("media")  # keyed clients without an origin are skipped
+
+    await registry.prewarm(timeout_seconds=1)
+
+    assert calls == ["HEAD", "HEAD"]
+    await registry.aclose()
+
+
+async def test_aclose_is_idempotent_and_closes_clients() -> None:
+    registry = HttpTransportRegistry()
+    client = registry.client("media")
+
+    await registry.aclose()
+    await registry.aclose()
+
+    assert client.is_closed
+    assert registry.closed
+    with pytest.raises(RuntimeError):
+        registry.client("media")
+
+
+async def test_provider_does_not_close_a_bound_shared_client() -> None:
+    registry = HttpTransportRegistry()
+    shared = registry.client_for("https://api.example.com/v1")
+    provider = OpenAICompatibleProvider(
+        base_url="https://api.example.com/v1", api_key="x", model="m"
+    )
+    provider.bind_http_client(shared)
+
+    await provider.close()
+    assert not shared.is_closed
+
+    standalone = OpenAICompatibleProvider(
+        base_url="https://api.example.com/v1", api_key="x", model="m"
+    )
+    own = standalone._ensure_client()
+    await standalone.close()
+    assert own.is_closed
+    await registry.aclose()
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import asyncio
+import time
 from pathlib import Path
 
 import pytest
@@ -64,22 +66,81 @@ class TestMediaCache:
         assert result is not None
         assert Path(result).read_bytes() == b"v2"
 
-    async def test_get_missing_metadata_invalidates_entry(
+    async def test_entries_are_sharded_and_indexed(self, cache_dir: Path) -> None:
+        cache = MediaCache(cache_dir, ttl_seconds=3600)
+        path = Path(await cache.put("key", b"data", suffix=".jpg"))
+
+        assert path.parent.parent == cache_dir
+        assert path.parent.name == path.name[:2]
+        assert await cache.get("key") == str(path)
+        assert cache.stats()["entries"] == 1
+        assert cache.stats()["bytes"] == 4
+
+    async def test_index_survives_restart_via_manifest(self, cache_dir: Path) -> None:
+        cache = MediaCache(cache_dir, ttl_seconds=3600)
+        await cache.put("kept", b"kept", suffix=".jpg")
+        await cache.put("dropped", b"dropped", suffix=".png")
+        await cache.invalidate("dropped")
+
+        reopened = MediaCache(cache_dir, ttl_seconds=3600)
+
+        assert await reopened.get("kept") is not None
+        assert await reopened.get("dropped") is None
+        assert reopened.stats()["bytes"] == 4
+
+    async def test_ttl_uses_wall_clock_across_restarts(
+        self, cache_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        await MediaCache(cache_dir, ttl_seconds=60).put("key", b"data", suffix=".jpg")
+        later = time.time() + 120
+        monkeypatch.setattr(time, "time", lambda: later)
+
+        reopened = MediaCache(cache_dir, ttl_seconds=60)
+
+        assert await reopened.get("key") is None
+        assert reopened.stats()["expired"] == 1
+
+    async def test_byte_budget_evicts_least_recently_used(
+        self, cache_dir: Path
+    ) -> None:
+        cache = MediaCache(cache_dir, ttl_seconds=3600, max_bytes=10)
+        first = await cache.put("a", b"aaaa", suffix=".jpg")
+        await cache.put("b", b"bbbb", suffix=".jpg")
+        assert await cache.get("a") is not None
+        await cache.put("c", b"cccc", suffix=".jpg")
+
+        assert await cache.get("b") is None
+        assert await cache.get("a") == first
+        assert await cache.get("c") is not None
+        assert cache.stats()["bytes"] == 8
+        assert cache.stats()["evictions"] == 1
+
+    async def test_concurrent_puts_leave_one_complete_file(
         self, cache_dir: Path
     ) -> None:
         cache = MediaCache(cache_dir, ttl_seconds=3600)
-        path = await cache.put("key", b"data", suffix=".jpg")
-        cache._meta_path("key").unlink()
+        payloads = [bytes([index]) * 4096 for index in range(8)]
+
+        paths = await asyncio.gather(
+            *(cache.put("key", data, suffix=".jpg") for data in payloads)
+        )
 
-        assert await cache.get("key") is None
-        assert not Path(path).exists()
+        path = Path(paths[0])
+        assert len(set(paths)) == 1
+        assert path.read_bytes() in payloads
+        assert [p.name for p in path.parent.iterdir()] == [path.name]
+        assert cache.stats()["bytes"] == 4096
 
-    async def test_cleanup_removes_orphan_entry(self, cache_dir: Path) -> None:
+    async def test_rebuild_migrates_legacy_layout(self, cache_dir: Path) -> None:
+        (cache_dir / "abc123.jpg").write_bytes(b"legacy")
+        (cache_dir / ".abc123_meta.json").write_text("{}")
         cache = MediaCache(cache_dir, ttl_seconds=3600)
-        path = await cache.put("key", b"data", suffix=".jpg")
-        cache._meta_path("key").unlink()
+        path = Path(await cache.put("key", b"data", suffix=".jpg"))
+        (cache_dir / "manifest.jsonl").unlink()
 
-        removed = await cache.cleanup_expired()
+        reopened = MediaCache(cache_dir, ttl_seconds=3600)
 
-        assert removed == 1
-        assert not Path(path).exists()
+        assert await reopened.get("key") == str(path)
+        assert sorted(p.name for p in cache_dir.iterdir()) == sorted(
+            [path.parent.name, "manifest.jsonl"]
+        )
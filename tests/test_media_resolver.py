@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
+import io
 import ipaddress
+import os
 from pathlib import Path
 from typing import Any
 
@@ -10,7 +13,14 @@ import httpx
 import pytest
 
 from nahida_bot.agent.media.cache import MediaCache
+from nahida_bot.agent.media.preprocess import (
+    ImagePreprocessor,
+    ImagePreprocessPolicy,
+    PreprocessedImage,
+    target_image_size,
+)
 from nahida_bot.agent.media.resolver import MediaPolicy, MediaResolver
+from nahida_bot.agent.metrics import MetricsCollector
 from nahida_bot.plugins.base import InboundAttachment
 
 
@@ -278,3 +288,146 @@ class TestMediaResolver:
 
         assert result.source == "description_only"
         assert await cache.get(key) is None
+
+    async def test_concurrent_resolves_share_one_download(
+        self, cache_dir: Path, policy: MediaPolicy, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        requests: list[str] = []
+        active = 0
+        peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal active, peak
+            requests.append(str(request.url))
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.02)
+            active -= 1
+            return httpx.Response(
+                200, headers={"content-type": "image/png"}, content=b"\x89PNG-data"
+            )
+
+        metrics = MetricsCollector()
+        resolver = MediaResolver(
+            cache=MediaCache(cache_dir, ttl_seconds=3600),
+            policy=policy,
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            max_concurrency=2,
+            metrics=metrics,
+        )
+
+        async def resolve_public(host: str) -> list[Any]:
+            return [ipaddress.ip_address("93.184.216.34")]
+
+        monkeypatch.setattr(resolver, "_resolve_host_addresses", resolve_public)
+        attachments = [
+            InboundAttachment(
+                kind="image",
+                platform_id=f"fwd-{index}",
+                url="https://example.com/shared.png",
+            )
+            for index in range(3)
+        ] + [
+            InboundAttachment(
+                kind="image",
+                platform_id=f"own-{index}",
+                url=f"https://example.com/{index}.png",
+            )
+            for index in range(4)
+        ]
+
+        results = await asyncio.gather(*(resolver.resolve(a) for a in attachments))
+
+        assert requests.count("https://example.com/shared.png") == 1
+        assert len(requests) == 5
+        assert peak <= 2
+        assert [r.media_id for r in results] == [a.platform_id for a in attachments]
+        assert {r.source for r in results} == {"url"}
+        assert resolver.inflight_stats() == {"inflight": 0, "coalesced": 2}
+        assert metrics.media_resolve_stats()["count"] == 5.0
+
+
+class _ShrinkingPreprocessor(ImagePreprocessor):
+    """Preprocessor that "re-encodes" by truncating, without Pillow."""
+
+    def __init__(self) -> None:
+        super().__init__(ImagePreprocessPolicy(enabled=True, min_bytes=4))
+        self.calls = 0
+
+    @property
+    def available(self) -> bool:
+        return True
+
+    async def process(self, data: bytes, *, model: str) -> PreprocessedImage | None:
+        self.calls += 1
+        return PreprocessedImage(
+            data=b"\xff\xd8small", mime_type="image/jpeg", width=8, height=6
+        )
+
+
+def test_target_image_size_follows_model_formula() -> None:
+    assert target_image_size(4000, 3000, model="", max_edge=2048) == (2048, 1536)
+    assert target_image_size(4000, 3000, model="openai_tiles", max_edge=0) == (
+        1024,
+        768,
+    )
+    assert target_image_size(800, 600, model="anthropic_pixels", max_edge=0) == (
+        800,
+        600,
+    )
+
+
+async def test_preprocessed_variant_is_cached_next_to_original(
+    tmp_path: Path,
+) -> None:
+    image_path = tmp_path / "big.jpg"
+    image_path.write_bytes(b"\xff\xd8" + b"x" * 64)
+    cache = MediaCache(tmp_path / "cache")
+    preprocessor = _ShrinkingPreprocessor()
+    attachment = InboundAttachment(
+        kind="image", platform_id="img", path=str(image_path), mime_type="image/jpeg"
+    )
+
+    original = await MediaResolver(cache=cache, policy=MediaPolicy()).resolve(
+        attachment, image_model="openai_tiles"
+    )
+    first = await MediaResolver(
+        cache=cache, policy=MediaPolicy(), preprocessor=preprocessor
+    ).resolve(attachment, image_model="openai_tiles")
+    # A fresh resolver (empty memo) reads the variant back from MediaCache.
+    second = await MediaResolver(
+        cache=cache, policy=MediaPolicy(), preprocessor=preprocessor
+    ).resolve(attachment, image_model="openai_tiles")
+
+    assert original.file_size == 66
+    assert (first.file_size, first.width, first.height) == (7, 8, 6)
+    assert first.local_path == str(image_path)
+    assert second.base64_data == first.base64_data
+    assert preprocessor.calls == 1
+    variants = [p for p in (tmp_path / "cache").rglob("*-openai_tiles-*")]
+    assert len(variants) == 1
+
+    # Rewriting the file with the same size must not reuse the old variant.
+    image_path.write_bytes(b"\xff\xd8" + b"y" * 64)
+    stat = image_path.stat()
+    os.utime(image_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    await MediaResolver(
+        cache=cache, policy=MediaPolicy(), preprocessor=preprocessor
+    ).resolve(attachment, image_model="openai_tiles")
+    assert preprocessor.calls == 2
+
+
+async def test_preprocessor_downsizes_with_pillow() -> None:
+    image_module = pytest.importorskip("PIL.Image")
+    buffer = io.BytesIO()
+    image_module.new("RGBA", (3000, 1000), (200, 10, 10, 128)).save(
+        buffer, format="PNG"
+    )
+    preprocessor = ImagePreprocessor(ImagePreprocessPolicy(enabled=True))
+
+    result = await preprocessor.process(buffer.getvalue(), model="anthropic_pixels")
+
+    assert result is not None
+    assert result.mime_type == "image/jpeg"
+    assert (result.width, result.height) == (1568, 523)
+    assert image_module.open(io.BytesIO(result.data)).size == (1568, 523)
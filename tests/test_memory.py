@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from collections.abc import AsyncGenerator
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
@@ -9,14 +10,21 @@ from pathlib import Path
 import pytest
 
 from nahida_bot.agent.memory import (
+    ConsolidationJob,
+    ConsolidationWorker,
     ConversationTurn,
+    EmbeddingRefresher,
     EmbeddingResult,
     HashEmbeddingProvider,
     MemoryConsolidator,
     MemoryItem,
     MemoryRecord,
+    MemoryRetention,
+    RetentionPolicy,
     RuleBasedMemoryExtractor,
     RoutedEmbeddingProvider,
+    SessionHistoryCache,
+    SessionMetaCache,
     SQLiteMemoryStore,
     extract_keywords,
     parse_memory_dream,
@@ -26,6 +34,7 @@ from nahida_bot.agent.memory.consolidation import build_dream_system_prompt
 from nahida_bot.agent.memory.markdown import MEMORY_SUMMARY_FILE
 from nahida_bot.agent.memory.sqlite import build_fts_query, tokenize_for_fts
 from nahida_bot.agent.memory.vector import (
+    InMemoryVectorIndex,
     VectorHit,
     VectorRecord,
     reciprocal_rank_fusion,
@@ -364,6 +373,238 @@ async def test_evict_preserves_recent(memory_store: SQLiteMemoryStore) -> None:
     assert len(recent) == 1
 
 
+async def test_retention_applies_policies_and_compacts(tmp_path: Path) -> None:
+    engine = DatabaseEngine(tmp_path / "retention.sqlite3")
+    await engine.initialize()
+    store = SQLiteMemoryStore(engine)
+    try:
+        await store.ensure_session("group")
+        await store.ensure_session("busy")
+        for index in range(3):
+            await store.append_turn(
+                "group",
+                ConversationTurn(
+                    role="user",
+                    content=f"observed chatter {index} " + "x" * 20000,
+                    source="group_observation",
+                    metadata={"observed_only": True},
+                ),
+            )
+        await store.append_turn(
+            "group", ConversationTurn(role="user", content="dialogue keeps")
+        )
+        await store.append_turn(
+            "group",
+            ConversationTurn(role="user", content="cron prompt", source="cron"),
+        )
+        for index in range(6):
+            await store.append_turn(
+                "busy", ConversationTurn(role="user", content=f"busy turn {index}")
+            )
+        retention = MemoryRetention(
+            store,
+            engine,
+            RetentionPolicy(
+                observed_max_age_days=1,
+                dialogue_max_age_days=90,
+                source_max_age_days={"cron": 1},
+                max_turns_per_session=4,
+                chunk_size=2,
+                vacuum_pages_per_step=1,
+            ),
+        )
+
+        report = await retention.run_once(now=datetime.now(UTC) + timedelta(days=2))
+
+        group = await store.get_recent("group")
+        busy = await store.get_recent("busy")
+        indexed = await engine.fetch_one(
+            "SELECT COUNT(*) AS n FROM memory_turn_fts_docsize"
+        )
+        auto_vacuum = await engine.fetch_one("PRAGMA auto_vacuum")
+    finally:
+        await engine.close()
+
+    assert report.deleted_observed == 3
+    assert report.deleted_by_source == {"cron": 1}
+    assert report.deleted_dialogue == 0
+    assert report.trimmed == 2
+    assert [record.turn.content for record in group] == ["dialogue keeps"]
+    assert [record.turn.content for record in busy] == [
+        f"busy turn {index}" for index in range(2, 6)
+    ]
+    assert indexed is not None and indexed["n"] == 5
+    assert auto_vacuum is not None and auto_vacuum[0] == 2
+    assert report.reclaimed_bytes > 0
+    assert retention.stats()["deleted_turns"] == 6
+
+
+async def test_turn_index_backfills_existing_rows_in_chunks(
+    memory_store: SQLiteMemoryStore,
+) -> None:
+    engine = memory_store._repo._engine
+    # Turns written before migration 012 have no FTS row yet.
+    for index in range(5):
+        await engine.execute(
+            "INSERT INTO memory_turns (session_id, role, content, created_at) "
+            "VALUES ('test-session', 'user', ?, ?)",
+            (f"legacy 天气 note {index}", f"2025-01-0{index + 1}T00:00:00+00:00"),
+        )
+    await engine.execute(
+        "INSERT INTO memory_turn_fts_backfill (max_unindexed_id) "
+        "SELECT MAX(id) FROM memory_turns"
+    )
+    await engine.db.commit()
+    await memory_store.append_turn(
+        "test-session", ConversationTurn(role="user", content="fresh 天气 report")
+    )
+
+    before = await memory_store.search("test-session", "天气")
+    # Deleting an unindexed turn must not touch the FTS index.
+    evicted = await memory_store.evict_before(
+        datetime(2025, 1, 2, tzinfo=UTC), chunk_size=1
+    )
+    processed = await memory_store.backfill_turn_index(chunk_size=2)
+    after = await memory_store.search("test-session", "天气", limit=10)
+    indexed = await engine.fetch_one(
+        "SELECT COUNT(*) AS n FROM memory_turn_fts_docsize"
+    )
+    pending = await engine.fetch_one("SELECT * FROM memory_turn_fts_backfill")
+
+    assert [record.turn.content for record in before] == ["fresh 天气 report"]
+    assert evicted == 1
+    assert processed == 4
+    assert len(after) == 5
+    assert indexed is not None and indexed["n"] == 5
+    assert pending is None
+    assert "天气" in after[0].keywords
+
+
+async def test_session_stats_track_turn_writes_and_dreaming(
+    memory_store: SQLiteMemoryStore,
+) -> None:
+    await memory_store.ensure_session("quiet")
+    turn_ids = [
+        await memory_store.append_turn(
+            "test-session", ConversationTurn(role="user", content=f"turn {index}")
+        )
+        for index in range(4)
+    ]
+    await memory_store.append_turn(
+        "quiet", ConversationTurn(role="user", content="only one")
+    )
+
+    sessions = {s.session_id: s for s in await memory_store.list_sessions()}
+    due = await memory_store.list_sessions_for_dreaming(min_new_turns=2)
+    await memory_store.mark_session_dreamed("test-session", turn_ids[2])
+    after_mark = await memory_store.list_sessions_for_dreaming(min_new_turns=1)
+    await memory_store.evict_before(datetime.now(UTC) + timedelta(days=1))
+    after_evict = await memory_store.list_sessions()
+
+    assert sessions["test-session"].turn_count == 4
+    assert sessions["quiet"].turn_count == 1
+    assert [(s.session_id, s.pending_dream_turns) for s in due] == [("test-session", 4)]
+    assert due[0].last_turn_id == turn_ids[-1]
+    assert {s.session_id: s.pending_dream_turns for s in after_mark} == {
+        "quiet": 1,
+        "test-session": 1,
+    }
+    assert all(s.turn_count == 0 for s in after_evict)
+    assert await memory_store.list_sessions_for_dreaming(min_new_turns=1) == []
+
+
+@pytest.mark.asyncio
+async def test_session_meta_cache_writes_through_immutable_snapshots(
+    memory_store: SQLiteMemoryStore,
+) -> None:
+    await memory_store.update_session_meta(
+        "test-session", {"model": "a", "runtime": {"reasoning": {"effort": "low"}}}
+    )
+    first = await memory_store.get_session_meta("test-session")
+    again = await memory_store.get_session_meta("test-session")
+    await memory_store.update_session_meta("test-session", {"model": "b"})
+    updated = await memory_store.get_session_meta("test-session")
+
+    assert again is first
+    assert first["model"] == "a"
+    assert updated["model"] == "b"
+    assert updated["runtime"] == {"reasoning": {"effort": "low"}}
+    with pytest.raises(TypeError):
+        first["model"] = "c"
+    with pytest.raises(TypeError):
+        first["runtime"]["reasoning"].update(effort="high")
+    mutable = dict(updated)
+    mutable["model"] = "c"
+    # Every read after a write is served from the write-through cache.
+    stats = memory_store.session_meta_cache_stats()
+    assert (stats["hits"], stats["misses"]) == (3, 0)
+
+    # Unknown sessions are not created and leave nothing stale behind.
+    await memory_store.update_session_meta("missing", {"model": "x"})
+    assert await memory_store.get_session_meta("missing") == {}
+
+
+@pytest.mark.asyncio
+async def test_session_meta_cache_fill_does_not_overwrite_concurrent_update(
+    memory_store: SQLiteMemoryStore, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    await memory_store.update_session_meta("test-session", {"model": "old"})
+    memory_store._session_meta_cache.invalidate()
+    repo = memory_store._repo
+    read = repo.get_session_metadata
+    read_done = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_read(session_id: str) -> dict[str, object]:
+        metadata = await read(session_id)
+        if not read_done.is_set():  # only the cache miss; updates read too
+            read_done.set()
+            await release.wait()
+        return metadata
+
+    monkeypatch.setattr(repo, "get_session_metadata", slow_read)
+    reader = asyncio.create_task(memory_store.get_session_meta("test-session"))
+    await read_done.wait()
+    # The update commits and writes through while the miss is still in flight.
+    await memory_store.update_session_meta("test-session", {"model": "new"})
+    release.set()
+    await reader
+
+    assert (await memory_store.get_session_meta("test-session"))["model"] == "new"
+    assert memory_store.session_meta_cache_stats()["stale_fills"] == 1
+
+
+def test_session_meta_cache_evicts_least_recently_used() -> None:
+    cache = SessionMetaCache(max_sessions=2)
+    cache.put("a", {"model": "a"})
+    cache.put("b", {"model": "b"})
+    assert cache.get("a") == {"model": "a"}
+    cache.put("c", {"model": "c"})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats()["evictions"] == 1
+    assert SessionMetaCache(max_sessions=0).put("a", {}) == {}
+
+    # A fill whose read started before a write is dropped.
+    generation = cache.generation("a")
+    cache.invalidate("a")
+    assert cache.fill("a", {"model": "stale"}, generation) == {"model": "stale"}
+    assert cache.get("a") is None
+    generation = cache.generation("a")
+    cache.invalidate()
+    cache.fill("a", {"model": "stale"}, generation)
+    assert cache.get("a") is None
+
+    # ...even when the write's counter has since been evicted.
+    generation = cache.generation("x")
+    cache.put("x", {"model": "fresh"})
+    cache.put("y", {"model": "y"})
+    cache.put("z", {"model": "z"})
+    cache.fill("x", {"model": "stale"}, generation)
+    assert cache.get("x") is None
+
+
 @pytest.mark.asyncio
 async def test_multiple_sessions_are_isolated() -> None:
     engine = DatabaseEngine(":memory:")
@@ -512,6 +753,203 @@ async def test_memory_item_embeddings_support_vector_search(
     assert isinstance(results[0], MemoryItem)
 
 
+@pytest.mark.asyncio
+async def test_vector_search_stays_in_sync_with_upserts_and_archives(
+    memory_store: SQLiteMemoryStore,
+) -> None:
+    provider = HashEmbeddingProvider(dimensions=32)
+    first_id = await memory_store.append_item(
+        title="python", content="Python packaging notes."
+    )
+    await memory_store.embed_items(provider)
+    assert [
+        item.item_id
+        for item in await memory_store.search_items_vector("Python", provider)
+    ] == [first_id]
+
+    second_id = await memory_store.append_item(
+        title="rust", content="Rust borrow checker notes."
+    )
+    await memory_store.embed_items(provider)
+    await memory_store.archive_item(first_id)
+    results = await memory_store.search_items_vector("Python", provider)
+
+    assert [item.item_id for item in results] == [second_id]
+    row = await memory_store._repo._engine.fetch_one(
+        "SELECT embedding_json, embedding_blob FROM memory_embeddings LIMIT 1"
+    )
+    assert row is not None
+    assert row["embedding_json"] == ""
+    assert len(row["embedding_blob"]) == 32 * 4
+
+
+@pytest.mark.asyncio
+async def test_vector_search_is_not_crowded_out_by_other_scopes(
+    memory_store: SQLiteMemoryStore,
+) -> None:
+    provider = HashEmbeddingProvider(dimensions=32)
+    for index in range(10):
+        await memory_store.append_item(
+            title="python",
+            content="Python packaging notes.",
+            scope_type="chat",
+            scope_id=f"other-{index}",
+        )
+        await memory_store.embed_items(
+            provider, scope_type="chat", scope_id=f"other-{index}"
+        )
+    wanted_id = await memory_store.append_item(
+        title="rust",
+        content="Rust notes that mention Python once.",
+        scope_type="chat",
+        scope_id="mine",
+    )
+    await memory_store.embed_items(provider, scope_type="chat", scope_id="mine")
+
+    results = await memory_store.search_items_vector(
+        "Python packaging notes.",
+        provider,
+        scope_type="chat",
+        scope_id="mine",
+        limit=1,
+    )
+    assert [item.item_id for item in results] == [wanted_id]
+
+    # Items embedded after the scoped index is loaded are routed into it.
+    later_id = await memory_store.append_item(
+        title="python",
+        content="Python packaging notes.",
+        scope_type="chat",
+        scope_id="mine",
+    )
+    await memory_store.embed_items(provider, scope_type="chat", scope_id="mine")
+    results = await memory_store.search_items_vector(
+        "Python packaging notes.",
+        provider,
+        scope_type="chat",
+        scope_id="mine",
+        limit=1,
+    )
+    assert [item.item_id for item in results] == [later_id]
+
+
+class CountingEmbeddingProvider(HashEmbeddingProvider):
+    """Hash embeddings that record every text sent for embedding."""
+
+    def __init__(self) -> None:
+        super().__init__(dimensions=16)
+        self.calls: list[list[str]] = []
+
+    async def embed_texts(self, texts: list[str]) -> list[EmbeddingResult]:
+        self.calls.append(list(texts))
+        return await super().embed_texts(texts)
+
+
+@pytest.mark.asyncio
+async def test_embed_items_only_embeds_new_or_changed_items(
+    memory_store: SQLiteMemoryStore,
+) -> None:
+    provider = CountingEmbeddingProvider()
+    vector_index = FakeVectorIndex()
+    kept_id = await memory_store.append_item(title="tea", content="Likes green tea.")
+    archived_id = await memory_store.append_item(
+        title="coffee", content="Dislikes coffee."
+    )
+    engine = memory_store._repo._engine
+
+    assert await memory_store.embed_items(provider, vector_index=vector_index) == 2
+    assert await memory_store.embed_items(provider, vector_index=vector_index) == 0
+    assert len(provider.calls) == 1
+
+    await engine.execute(
+        "UPDATE memory_items SET content = ? WHERE item_id = ?",
+        ("Likes oolong tea.", kept_id),
+    )
+    await engine.db.commit()
+    await memory_store.archive_item(archived_id)
+    assert (
+        await engine.fetch_one(
+            "SELECT 1 FROM memory_embeddings WHERE item_id = ?", (archived_id,)
+        )
+        is None
+    )
+
+    assert await memory_store.embed_items(provider, vector_index=vector_index) == 1
+    assert provider.calls[-1] == ["tea\nLikes oolong tea."]
+    assert [record.item_id for record in vector_index.records.values()] == [kept_id]
+    rows = await engine.fetch_all("SELECT item_id FROM memory_embeddings")
+    assert [row["item_id"] for row in rows] == [kept_id]
+
+
+@pytest.mark.asyncio
+async def test_embedding_refresher_coalesces_bursts_into_one_pass() -> None:
+    started = asyncio.Event()
+    release = asyncio.Event()
+    passes = 0
+
+    async def refresh() -> int:
+        nonlocal passes
+        passes += 1
+        started.set()
+        await release.wait()
+        return 1
+
+    refresher = EmbeddingRefresher(
+        refresh, debounce_seconds=0.05, max_delay_seconds=1.0
+    )
+    for _ in range(5):
+        refresher.request()
+    await asyncio.wait_for(started.wait(), timeout=2)
+    assert passes == 1
+
+    # Requests during a running pass schedule exactly one follow-up.
+    refresher.request()
+    refresher.request()
+    release.set()
+    await refresher.close()
+    refresher.request()
+
+    assert passes == 2
+    assert refresher.stats() == {
+        "requests": 7,
+        "passes": 2,
+        "embedded": 2,
+        "failures": 0,
+        "pending": False,
+    }
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+@pytest.mark.asyncio
+async def test_in_memory_vector_index_ranks_by_cosine(use_numpy: bool) -> None:
+    if use_numpy:
+        pytest.importorskip("numpy")
+    loads = 0
+
+    async def loader() -> list[VectorRecord]:
+        nonlocal loads
+        loads += 1
+        return [
+            VectorRecord("e1", "a", [1.0, 0.0, 0.0]),
+            VectorRecord("e2", "b", [10.0, 10.0, 0.0]),
+            VectorRecord("e3", "c", [0.0, 0.0, 2.0]),
+        ]
+
+    index = InMemoryVectorIndex(loader=loader, use_numpy=use_numpy)
+    hits = await index.search([1.0, 0.1, 0.0], limit=2)
+    assert [hit.item_id for hit in hits] == ["a", "b"]
+    assert hits[0].score == pytest.approx(0.995, abs=1e-3)
+
+    await index.delete(["e1"])
+    await index.upsert([VectorRecord("e4", "d", [0.0, 0.0, -1.0])])
+    hits = await index.search([0.0, 0.0, 1.0], limit=5)
+
+    assert loads == 1
+    assert len(index) == 3
+    assert [hit.item_id for hit in hits] == ["c", "b", "d"]
+    assert hits[-1].score == pytest.approx(-1.0)
+
+
 @pytest.mark.asyncio
 async def test_memory_item_embeddings_can_use_optional_vector_index(
     memory_store: SQLiteMemoryStore,
@@ -533,7 +971,7 @@ async def test_memory_item_embeddings_can_use_optional_vector_index(
     )
 
     assert first_count == 1
-    assert second_count == 1
+    assert second_count == 0
     assert set(vector_index.records) == first_embedding_ids
     assert results
     assert results[0].item_id == item_id
@@ -695,6 +1133,141 @@ async def test_session_runner_can_disable_rule_based_consolidation(
     assert not (tmp_path / MEMORY_SUMMARY_FILE).exists()
 
 
+@pytest.mark.asyncio
+async def test_session_runner_consolidates_queued_turns_in_background(
+    memory_store: SQLiteMemoryStore,
+    tmp_path: Path,
+) -> None:
+    runner = SessionRunner(memory_store=memory_store)
+
+    for message in (
+        "请记住：我喜欢你默认用中文回答，并且说明关键取舍。",
+        "请记住：我的项目代号是 irminsul。",
+    ):
+        await runner._consolidate_memory_after_turn(
+            session_id="test-session",
+            user_message=message,
+            assistant_message="好的，我会记住。",
+            workspace_id="default",
+            workspace_root=tmp_path,
+        )
+    assert await memory_store.search_items("中文回答") == []
+
+    assert await runner.flush_memory_consolidation(timeout=5)
+    stats = runner.consolidation_stats()
+
+    assert await memory_store.search_items("中文回答")
+    assert await memory_store.search_items("irminsul")
+    assert (tmp_path / MEMORY_SUMMARY_FILE).exists()
+    assert stats["processed_jobs"] == 1
+    assert stats["processed_turns"] == 2
+    assert stats["coalesced"] == 1
+    assert stats["pending_jobs"] == 0
+
+
+@pytest.mark.asyncio
+async def test_consolidation_worker_coalesces_and_applies_backpressure() -> None:
+    release = asyncio.Event()
+    processed: list[tuple[str, list[str]]] = []
+
+    async def process(job: ConsolidationJob) -> None:
+        await release.wait()
+        processed.append((job.session_id, [user for user, _ in job.turns]))
+
+    worker = ConsolidationWorker(process, max_pending_jobs=1)
+
+    async def submit(session_id: str, message: str) -> None:
+        await worker.submit(
+            session_id=session_id,
+            user_message=message,
+            assistant_message="",
+            workspace_id=None,
+            workspace_root=None,
+        )
+
+    await submit("a", "a1")
+    await asyncio.sleep(0)  # the worker picks up a1 and blocks
+    await submit("a", "a2")
+    await submit("a", "a3")
+    blocked = asyncio.create_task(submit("b", "b1"))
+    await asyncio.sleep(0)
+    assert not blocked.done()
+
+    release.set()
+    await asyncio.wait_for(blocked, timeout=2)
+    await worker.close(timeout=2)
+
+    assert processed == [("a", ["a1"]), ("a", ["a2", "a3"]), ("b", ["b1"])]
+    stats = worker.stats()
+    assert stats["coalesced"] == 1
+    assert stats["backpressure_waits"] == 1
+    assert stats["processed_turns"] == 4
+
+
+@pytest.mark.asyncio
+async def test_session_runner_history_cache_skips_store_for_hot_sessions(
+    memory_store: SQLiteMemoryStore,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    runner = SessionRunner(memory_store=memory_store, max_history_turns=3)
+    await memory_store.append_turn(
+        "test-session", ConversationTurn(role="user", content="first")
+    )
+    loads = 0
+    original_get_recent = memory_store.get_recent
+
+    async def counting_get_recent(*args: object, **kwargs: object) -> list:
+        nonlocal loads
+        loads += 1
+        return await original_get_recent(*args, **kwargs)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(memory_store, "get_recent", counting_get_recent)
+
+    history = await runner._load_history("test-session")
+    assert [m.content for m in history] == ["first"]
+    for content in ("second", "third", "fourth"):
+        await memory_store.append_turn(
+            "test-session", ConversationTurn(role="assistant", content=content)
+        )
+    history_again = await runner._load_history("test-session")
+
+    assert loads == 1
+    assert [m.content for m in history_again] == ["second", "third", "fourth"]
+    stats = runner.history_cache_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["records"] == 3
+    assert stats["approx_bytes"] > 0
+
+    await memory_store.clear_session("test-session")
+    assert await runner._load_history("test-session") == []
+    assert loads == 2
+
+
+def test_history_cache_evicts_lru_sessions_and_drops_stale_loads() -> None:
+    def record(turn_id: int, session_id: str) -> MemoryRecord:
+        return MemoryRecord(
+            turn_id=turn_id,
+            session_id=session_id,
+            turn=ConversationTurn(role="user", content=f"turn {turn_id}"),
+        )
+
+    cache = SessionHistoryCache(max_sessions=2)
+    cache.put("a", [record(1, "a")], limit=10, version=cache.version)
+    cache.put("b", [record(2, "b")], limit=10, version=cache.version)
+    assert cache.get("a", 10) is not None
+    cache.put("c", [record(3, "c")], limit=10, version=cache.version)
+
+    assert cache.get("b", 10) is None
+    assert cache.get("a", 10) is not None
+    assert cache.stats()["evictions"] == 1
+
+    version = cache.version
+    cache.append("d", record(4, "d"))
+    cache.put("d", [], limit=10, version=version)
+    assert cache.get("d", 10) is None
+
+
 @pytest.mark.asyncio
 async def test_memory_consolidator_applies_llm_dream_add_and_archive(
     memory_store: SQLiteMemoryStore,
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+from dataclasses import replace
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
@@ -73,6 +74,18 @@ class _StubChannel(Plugin):
         return "msg_1"
 
 
+class _EditableChannel(_StubChannel):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.edits: list[tuple[str, str, str]] = []
+
+    async def edit_message(
+        self, target: str, message_id: str, message: OutboundMessage
+    ) -> str:
+        self.edits.append((target, message_id, message.text))
+        return message_id
+
+
 class _MockMemoryStore(MemoryStore):
     """Minimal MemoryStore mock."""
 
@@ -536,6 +549,74 @@ class TestMessageRouterAgentDispatch:
         assert isinstance(channel, _StubChannel)
         assert channel.sent[0][1].reasoning == "hidden steps"
 
+    async def test_text_deltas_are_coalesced_into_message_edits(self) -> None:
+        class _StreamingAgent(_MockAgentLoop):
+            async def run_stream(self, **kwargs: Any) -> Any:
+                self.calls.append(kwargs)
+                yield LoopEvent(type="text_delta", text="Hel")
+                yield LoopEvent(type="text_delta", text="lo")
+                yield LoopEvent(type="delta_reset")
+                yield LoopEvent(type="text_delta", text="Hello")
+                yield LoopEvent(type="text_delta", text=" world")
+                yield LoopEvent(type="text", text="Hello world!")
+                yield LoopEvent(type="done", final_response="Hello world!")
+
+        router, event_bus, channel_registry, _ = _make_router(
+            agent=_StreamingAgent(),
+            config=RouterConfig(stream_edit_interval_seconds=0),
+        )
+        manifest = PluginManifest(
+            id="edit", name="Edit", version="1.0", entrypoint="t:T"
+        )
+        channel = _EditableChannel(api=MagicMock(), manifest=manifest)
+        channel_registry.register(channel)
+
+        await router.start()
+        await event_bus.publish(
+            MessageReceived(
+                payload=MessagePayload(
+                    message=_inbound("stream please", platform="edit"),
+                    session_id="",
+                ),
+                source="test",
+            )
+        )
+        await router.stop()
+
+        assert [message.text for _target, message in channel.sent] == ["Hel"]
+        assert [text for _target, _msg_id, text in channel.edits] == [
+            "Hello",
+            "Hello world",
+            "Hello world!",
+        ]
+        assert all(msg_id == "msg_1" for _target, msg_id, _text in channel.edits)
+
+    async def test_text_deltas_ignored_without_edit_support(self) -> None:
+        class _StreamingAgent(_MockAgentLoop):
+            async def run_stream(self, **kwargs: Any) -> Any:
+                self.calls.append(kwargs)
+                yield LoopEvent(type="text_delta", text="partial")
+                yield LoopEvent(type="text", text="complete")
+                yield LoopEvent(type="done", final_response="complete")
+
+        router, event_bus, channel_registry, _ = _make_router(
+            agent=_StreamingAgent(),
+            config=RouterConfig(stream_edit_interval_seconds=0),
+        )
+
+        await router.start()
+        await event_bus.publish(
+            MessageReceived(
+                payload=MessagePayload(message=_inbound("hi"), session_id=""),
+                source="test",
+            )
+        )
+        await router.stop()
+
+        channel = channel_registry.get("test")
+        assert isinstance(channel, _StubChannel)
+        assert [message.text for _target, message in channel.sent] == ["complete"]
+
     async def test_registered_tools_are_passed_to_agent(self) -> None:
         async def _tool_handler(query: str) -> str:
             return f"result: {query}"
@@ -596,6 +677,160 @@ class TestMessageRouterAgentDispatch:
         assert agent.calls[0]["workspace_root"] == manager.workspace_path("default")
 
 
+class _GatedAgentLoop(_MockAgentLoop):
+    """Agent whose first run blocks until ``release`` is set."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.release = asyncio.Event()
+
+    async def run_stream(self, **kwargs: Any) -> Any:
+        self.calls.append(kwargs)
+        if len(self.calls) == 1:
+            await self.release.wait()
+        yield LoopEvent(type="done", final_response=f"reply {len(self.calls)}")
+
+
+async def _publish(event_bus: EventBus, text: str, *, user_id: str = "u1") -> None:
+    inbound = replace(_inbound(text), user_id=user_id)
+    await event_bus.publish(
+        MessageReceived(
+            payload=MessagePayload(message=inbound, session_id=""),
+            source="test",
+        )
+    )
+
+
+async def _wait_for_calls(agent: _MockAgentLoop, count: int) -> None:
+    for _ in range(200):
+        if len(agent.calls) >= count:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"expected {count} agent calls, got {len(agent.calls)}")
+
+
+class TestMessageRouterPendingQueue:
+    async def test_burst_during_run_is_answered_in_one_follow_up(self) -> None:
+        memory = _MockMemoryStore()
+        agent = _GatedAgentLoop()
+        router, event_bus, _, _ = _make_router(agent=agent, memory=memory)
+
+        await router.start()
+        await _publish(event_bus, "first")
+        await _wait_for_calls(agent, 1)
+        for index, user in enumerate(("u2", "u3", "u4")):
+            await _publish(event_bus, f"ping {index}", user_id=user)
+        assert router.pending_stats()["queued"] == 3
+
+        agent.release.set()
+        await _wait_for_calls(agent, 2)
+        await asyncio.sleep(0.05)
+        await router.stop()
+
+        assert len(agent.calls) == 2
+        follow_up = agent.calls[1]
+        assert follow_up["user_message"].endswith("\nping 2")
+        history = [message.content for message in follow_up["history_messages"]]
+        assert any("u2" in text and text.endswith("ping 0") for text in history)
+        assert any("u3" in text and text.endswith("ping 1") for text in history)
+        coalesced = [
+            turn
+            for turn in memory.sessions["test:c1"]
+            if (turn.metadata or {}).get("coalesced")
+        ]
+        assert [turn.content for turn in coalesced] == ["ping 0", "ping 1"]
+        assert router.pending_stats()["coalesced"] == 2
+
+    async def test_pending_queue_drops_oldest_on_overflow(self) -> None:
+        memory = _MockMemoryStore()
+        agent = _GatedAgentLoop()
+        router, event_bus, _, _ = _make_router(
+            agent=agent,
+            memory=memory,
+            config=RouterConfig(pending_max_messages=2),
+        )
+
+        await router.start()
+        await _publish(event_bus, "first")
+        await _wait_for_calls(agent, 1)
+        for text in ("a", "b", "c"):
+            await _publish(event_bus, text)
+        assert router.pending_stats() == {
+            "sessions": 1,
+            "queued": 2,
+            "dropped": 1,
+            "coalesced": 0,
+        }
+
+        agent.release.set()
+        await _wait_for_calls(agent, 2)
+        await asyncio.sleep(0.05)
+        await router.stop()
+
+        assert agent.calls[1]["user_message"].endswith("\nc")
+        contents = [turn.content for turn in memory.sessions["test:c1"]]
+        assert "a" not in contents
+        assert "b" in contents
+
+    async def test_arrival_while_burst_is_persisted_waits_for_the_burst(
+        self,
+    ) -> None:
+        class _SlowCoalesceMemory(_MockMemoryStore):
+            def __init__(self) -> None:
+                super().__init__()
+                self.persisting = asyncio.Event()
+                self.release = asyncio.Event()
+
+            async def append_turn(self, session_id: str, turn: ConversationTurn) -> int:
+                if (turn.metadata or {}).get("coalesced"):
+                    self.persisting.set()
+                    await self.release.wait()
+                return await super().append_turn(session_id, turn)
+
+        memory = _SlowCoalesceMemory()
+        agent = _GatedAgentLoop()
+        router, event_bus, _, _ = _make_router(agent=agent, memory=memory)
+
+        await router.start()
+        await _publish(event_bus, "first")
+        await _wait_for_calls(agent, 1)
+        await _publish(event_bus, "a")
+        await _publish(event_bus, "b")
+
+        agent.release.set()
+        await asyncio.wait_for(memory.persisting.wait(), timeout=2)
+        await _publish(event_bus, "late")
+        # The session stays busy while the burst is being persisted.
+        assert len(agent.calls) == 1
+        assert router.pending_stats()["queued"] == 1
+
+        memory.release.set()
+        await _wait_for_calls(agent, 3)
+        await asyncio.sleep(0.05)
+        await router.stop()
+
+        assert agent.calls[1]["user_message"].endswith("\nb")
+        assert agent.calls[2]["user_message"].endswith("\nlate")
+
+    async def test_debounce_window_merges_rapid_messages(self) -> None:
+        agent = _MockAgentLoop()
+        router, event_bus, _, _ = _make_router(
+            agent=agent,
+            memory=_MockMemoryStore(),
+            config=RouterConfig(burst_debounce_seconds=0.05),
+        )
+
+        await router.start()
+        for text in ("one", "two", "three"):
+            await _publish(event_bus, text)
+        await _wait_for_calls(agent, 1)
+        await asyncio.sleep(0.05)
+        await router.stop()
+
+        assert len(agent.calls) == 1
+        assert agent.calls[0]["user_message"].endswith("\nthree")
+
+
 class TestMessageRouterMemory:
     async def test_history_loaded_from_memory(self) -> None:
         memory = _MockMemoryStore()
@@ -193,6 +193,24 @@ class TestMetricsCollectorAggregates:
         assert collector.tool_success_rate() == pytest.approx(0.5)
         assert collector.trace_count == 2
 
+    def test_tool_parallelism_stats_empty(self) -> None:
+        collector = MetricsCollector()
+        assert collector.tool_parallelism_stats()["saved_seconds"] == 0.0
+
+    def test_tool_parallelism_stats_reports_saved_wall_time(self) -> None:
+        collector = MetricsCollector()
+        trace = collector.new_trace()
+        collector.record_tool_batch(
+            trace, step=1, tool_count=3, wall_seconds=1.0, sequential_seconds=2.5
+        )
+        collector.record_tool_batch(
+            trace, step=2, tool_count=2, wall_seconds=0.5, sequential_seconds=0.4
+        )
+        stats = collector.tool_parallelism_stats()
+        assert stats["batches"] == 2.0
+        assert stats["tool_calls"] == 5.0
+        assert stats["saved_seconds"] == pytest.approx(1.5)
+
 
 # ---------------------------------------------------------------------------
 # MetricsCollector — max_traces ring buffer
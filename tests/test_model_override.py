@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from collections.abc import AsyncIterator
 from dataclasses import dataclass, field
 from typing import Any, cast
@@ -428,6 +429,75 @@ class TestSessionRunnerEndToEnd:
         assert spy_loop.captured_user_parts is None
 
 
+class _RendezvousMemoryStore(_FakeMemoryStore):
+    """Memory store whose search and history reads only finish together."""
+
+    def __init__(self, meta: dict[str, Any] | None = None) -> None:
+        super().__init__(meta)
+        self.meta_reads = 0
+        self._search_started = asyncio.Event()
+        self._history_started = asyncio.Event()
+
+    async def get_session_meta(self, session_id: str) -> dict[str, Any]:
+        self.meta_reads += 1
+        return await super().get_session_meta(session_id)
+
+    async def get_recent(self, *a: Any, **kw: Any) -> list[Any]:
+        self._history_started.set()
+        await self._search_started.wait()
+        return []
+
+    async def search_items(self, query: str, *, limit: int = 5) -> list[MemoryItem]:
+        self._search_started.set()
+        await self._history_started.wait()
+        return []
+
+
+class TestSessionRunnerPreflight:
+    @pytest.mark.asyncio
+    async def test_memory_search_overlaps_history_load(self) -> None:
+        slot = _slot("ds", models=["deepseek-chat"])
+        pm = ProviderManager([slot], default_id="ds")
+        memory = _RendezvousMemoryStore(meta={"model": "deepseek-chat"})
+        spy_loop = _SpyAgentLoop()
+
+        runner = SessionRunner(
+            agent_loop=cast(Any, spy_loop),
+            memory_store=cast(Any, memory),
+            provider_manager=pm,
+        )
+        # A serial pre-flight would deadlock: each read waits for the other.
+        await asyncio.wait_for(
+            runner.run(
+                user_message="hello memory",
+                session_id="s1",
+                system_prompt="sys",
+            ),
+            timeout=5,
+        )
+
+        assert spy_loop.captured_model == "deepseek-chat"
+        assert memory.meta_reads == 1
+
+    @pytest.mark.asyncio
+    async def test_preflight_failure_surfaces_original_exception(self) -> None:
+        class _BrokenHistoryStore(_FakeMemoryStore):
+            async def get_recent(self, *a: Any, **kw: Any) -> list[Any]:
+                raise RuntimeError("history unavailable")
+
+        slot = _slot("ds", models=["deepseek-chat"])
+        pm = ProviderManager([slot], default_id="ds")
+        runner = SessionRunner(
+            agent_loop=cast(Any, _SpyAgentLoop()),
+            memory_store=cast(Any, _BrokenHistoryStore()),
+            provider_manager=pm,
+        )
+
+        with pytest.raises(RuntimeError, match="history unavailable"):
+            await runner.run(user_message="hello", session_id="s1", system_prompt="sys")
+        assert current_runtime_settings.get().reasoning.effort is None
+
+
 class TestBuildUserPartsEdgeCases:
     """Unit tests for SessionRunner._build_user_parts edge cases."""
 
@@ -348,6 +348,80 @@ class TestHistoryMediaResolve:
         assert messages[0].parts[1].type == "image_base64"
         assert messages[0].parts[1].media_id == "img"
 
+    async def test_load_history_skips_images_the_policy_degrades(
+        self, tmp_path: Path
+    ) -> None:
+        from nahida_bot.agent.memory.models import ConversationTurn
+        from nahida_bot.core.config import MultimodalConfig
+
+        png = (
+            b"\x89PNG\r\n\x1a\n"
+            b"\x00\x00\x00\rIHDR"
+            b"\x00\x00\x00\x01\x00\x00\x00\x01\x08\x02\x00\x00\x00\x90wS\xde"
+        )
+        records = []
+        for index in range(3):
+            image_path = tmp_path / f"img{index}.png"
+            image_path.write_bytes(png)
+            records.append(
+                _FakeMemoryRecord(
+                    ConversationTurn(
+                        role="user",
+                        content=f"look {index}",
+                        source="user_input",
+                        metadata={
+                            "attachments": [
+                                {
+                                    "kind": "image",
+                                    "platform_id": f"img{index}",
+                                    "path": str(image_path),
+                                    "mime_type": "image/png",
+                                }
+                            ]
+                        },
+                    )
+                )
+            )
+
+        class _FakeMemory:
+            async def ensure_session(self, *a: Any, **kw: Any) -> None:
+                pass
+
+            async def get_recent(self, *a: Any, **kw: Any) -> list:
+                return records
+
+        resolver = MediaResolver(
+            cache=MediaCache(tmp_path / "media_cache"), policy=MediaPolicy()
+        )
+        reads: list[str] = []
+        read_file = resolver._read_file
+
+        async def counting_read(path: Path) -> bytes:
+            reads.append(path.name)
+            return await read_file(path)
+
+        resolver._read_file = counting_read  # type: ignore[method-assign]
+        runner = SessionRunner(
+            memory_store=cast(MemoryStore, _FakeMemory()),
+            media_resolver=resolver,
+            multimodal_config=MultimodalConfig(media_context_policy="cache_aware"),
+        )
+        capabilities = ModelCapabilities(image_input=True)
+
+        first = await runner._load_history("s1", capabilities=capabilities)
+        second = await runner._load_history("s1", capabilities=capabilities)
+
+        assert [[p.type for p in m.parts[1:]] for m in first] == [
+            ["image_description"],
+            ["image_base64"],
+            ["image_base64"],
+        ]
+        assert first[0].parts[1].text == "[Image: img0]"
+        assert [m.parts for m in second] == [m.parts for m in first]
+        # Degraded images are never read; native ones are read once.
+        assert sorted(reads) == ["img1.png", "img2.png"]
+        assert resolver.memo_stats()["hits"] == 2
+
 
 # -- _persist_turns metadata tests -----------------------------------------
 
@@ -324,6 +324,60 @@ async def test_anthropic_streaming_collects_content_blocks(
     assert result.tool_calls[0].arguments == {"q": "nahida"}
 
 
+@pytest.mark.asyncio
+async def test_anthropic_chat_stream_yields_deltas(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """chat_stream should surface thinking/text deltas as they arrive."""
+    events = [
+        (
+            'data: {"type":"message_start","message":{"id":"msg_1",'
+            '"role":"assistant","usage":{"input_tokens":3}}}'
+        ),
+        (
+            'data: {"type":"content_block_start","index":0,'
+            '"content_block":{"type":"thinking","thinking":""}}'
+        ),
+        (
+            'data: {"type":"content_block_delta","index":0,'
+            '"delta":{"type":"thinking_delta","thinking":"Hmm"}}'
+        ),
+        (
+            'data: {"type":"content_block_start","index":1,'
+            '"content_block":{"type":"text","text":""}}'
+        ),
+        (
+            'data: {"type":"content_block_delta","index":1,'
+            '"delta":{"type":"text_delta","text":"Hi"}}'
+        ),
+        (
+            'data: {"type":"message_delta","delta":{"stop_reason":"end_turn"},'
+            '"usage":{"output_tokens":2}}'
+        ),
+    ]
+    stream_body = "\n".join(events)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, text=stream_body)
+
+    provider = _mock_anthropic_provider(monkeypatch, handler)
+    provider.stream_responses = True
+    deltas = [
+        delta
+        async for delta in provider.chat_stream(
+            messages=[ContextMessage(role="user", source="u", content="hi")]
+        )
+    ]
+
+    assert [(d.type, d.text) for d in deltas[:-1]] == [
+        ("reasoning", "Hmm"),
+        ("text", "Hi"),
+    ]
+    assert deltas[-1].response is not None
+    assert deltas[-1].response.content == "Hi"
+    assert deltas[-1].response.finish_reason == "stop"
+
+
 # ── Interleaved Thinking ──
 
 
@@ -0,0 +1,210 @@
+"""Tests for provider failover chains, circuit breaking and hedging."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from unittest.mock import MagicMock
+
+import pytest
+
+from nahida_bot.agent.context import ContextMessage
+from nahida_bot.agent.providers import (
+    ChatProvider,
+    FailoverPolicy,
+    FailoverProvider,
+    ModelCapabilities,
+    ProviderAuthError,
+    ProviderRateLimiter,
+    ProviderRateLimitError,
+    ProviderResponse,
+    ProviderStreamDelta,
+    ProviderTransportError,
+)
+from nahida_bot.agent.providers.manager import ProviderManager, ProviderSlot
+from nahida_bot.agent.providers.router import ModelRouter
+
+_MESSAGES = [ContextMessage(role="user", source="u", content="hi")]
+
+
+@dataclass
+class _Provider(ChatProvider):
+    name: str = "fake"
+    reply: str = "ok"
+    failures: list[Exception] = field(default_factory=list)
+    first_byte_delay: float = 0.0
+    calls: list[str | None] = field(default_factory=list)
+    cancelled: int = 0
+
+    @property
+    def tokenizer(self):
+        return None
+
+    async def chat(self, *, messages, tools=None, timeout_seconds=None, model=None):
+        return await self._collect_stream_response(
+            self.chat_stream(messages=messages, model=model)
+        )
+
+    async def chat_stream(
+        self, *, messages, tools=None, timeout_seconds=None, model=None
+    ):
+        self.calls.append(model)
+        if self.failures:
+            raise self.failures.pop(0)
+        try:
+            await asyncio.sleep(self.first_byte_delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        yield ProviderStreamDelta(type="text", text=self.reply)
+        yield ProviderStreamDelta(
+            type="response", response=ProviderResponse(content=self.reply)
+        )
+
+
+def _slot(slot_id: str, provider: _Provider, models: list[str]) -> ProviderSlot:
+    return ProviderSlot(
+        id=slot_id,
+        provider=provider,
+        context_builder=MagicMock(),
+        default_model=models[0],
+        available_models=models,
+        tags_by_model={models[-1]: ["cheap"]} if len(models) > 1 else {},
+    )
+
+
+def _router(
+    primary: _Provider,
+    backup: _Provider,
+    policy: FailoverPolicy | None = None,
+) -> tuple[ModelRouter, ProviderSlot]:
+    main = _slot("main", primary, ["big", "small"])
+    manager = ProviderManager([main, _slot("backup", backup, ["big"])])
+    router = ModelRouter(
+        manager,
+        fallback_chains={"main/big": ["backup/big", "cheap", "missing/model"]},
+        failover_policy=policy,
+    )
+    return router, main
+
+
+async def test_chain_resolves_specs_in_order_and_skips_unknown() -> None:
+    router, main = _router(_Provider(), _Provider())
+
+    chain = router.resolve_chain(main)
+
+    assert [(c.slot.id, c.model) for c in chain] == [
+        ("main", None),
+        ("backup", "big"),
+        ("main", "small"),
+    ]
+    assert router.provider_for(main, "small") is main.provider
+    assert isinstance(router.provider_for(main), FailoverProvider)
+
+
+async def test_retryable_error_fails_over_to_next_entry() -> None:
+    primary = _Provider(failures=[ProviderTransportError()])
+    backup = _Provider(reply="from backup")
+    router, main = _router(primary, backup)
+
+    response = await router.provider_for(main).chat(messages=_MESSAGES)
+
+    assert response.content == "from backup"
+    assert backup.calls == ["big"]
+    stats = router.failover_stats()
+    assert stats["failovers"] == 1
+    assert stats["slots"]["main"]["failures"] == 1
+    assert stats["slots"]["backup"]["successes"] == 1
+
+
+async def test_non_retryable_error_is_raised_without_failover() -> None:
+    primary = _Provider(failures=[ProviderAuthError()])
+    backup = _Provider()
+    router, main = _router(primary, backup)
+
+    with pytest.raises(ProviderAuthError):
+        await router.provider_for(main).chat(messages=_MESSAGES)
+    assert backup.calls == []
+
+
+async def test_consecutive_failures_open_the_circuit() -> None:
+    primary = _Provider(failures=[ProviderTransportError() for _ in range(2)])
+    backup = _Provider()
+    router, main = _router(
+        primary, backup, FailoverPolicy(failure_threshold=2, circuit_open_seconds=60)
+    )
+
+    for _ in range(3):
+        await router.provider_for(main).chat(messages=_MESSAGES)
+
+    # The third round skips the open circuit entirely.
+    assert len(primary.calls) == 2
+    assert router.failover_stats()["slots"]["main"]["circuit_open"] is True
+
+
+async def test_first_byte_deadline_abandons_a_stalled_entry() -> None:
+    primary = _Provider(first_byte_delay=5)
+    backup = _Provider(reply="fast")
+    router, main = _router(
+        primary, backup, FailoverPolicy(first_byte_timeout_seconds=0.02)
+    )
+
+    response = await asyncio.wait_for(
+        router.provider_for(main).chat(messages=_MESSAGES), timeout=2
+    )
+
+    assert response.content == "fast"
+    assert primary.cancelled == 1
+
+
+async def test_hedged_request_wins_and_cancels_the_slow_primary() -> None:
+    primary = _Provider(reply="slow", first_byte_delay=5)
+    backup = _Provider(reply="hedge")
+    router, main = _router(
+        primary,
+        backup,
+        FailoverPolicy(hedge=True, hedge_min_samples=1, hedge_min_delay_seconds=0),
+    )
+    router._health.record_first_byte("main", 0.02)
+
+    deltas = [
+        delta
+        async for delta in router.provider_for(main).chat_stream(messages=_MESSAGES)
+    ]
+
+    assert [d.text for d in deltas if d.type == "text"] == ["hedge"]
+    assert primary.cancelled == 1
+    stats = router.failover_stats()
+    assert stats["hedges"] == 1
+    assert stats["hedge_wins"] == 1
+
+
+async def test_chain_skips_fallbacks_lacking_primary_capabilities() -> None:
+    router, main = _router(_Provider(), _Provider())
+    vision = ModelCapabilities(image_input=True)
+    main.capabilities_by_model = {"big": vision, "small": vision}
+
+    chain = router.resolve_chain(main)
+
+    # backup/big is text-only, so an image request could not fail over to it.
+    assert [(c.slot.id, c.model) for c in chain] == [("main", None), ("main", "small")]
+
+
+async def test_rate_limit_cooldown_does_not_count_as_first_byte_stall() -> None:
+    primary = _Provider(reply="primary")
+    primary.rate_limiter = ProviderRateLimiter("main")
+    with pytest.raises(ProviderRateLimitError):
+        async with primary.rate_limiter.permit():
+            raise ProviderRateLimitError(retry_after=0.1)
+    backup = _Provider(reply="backup")
+    router, main = _router(
+        primary, backup, FailoverPolicy(first_byte_timeout_seconds=0.03)
+    )
+
+    response = await asyncio.wait_for(
+        router.provider_for(main).chat(messages=_MESSAGES), timeout=2
+    )
+
+    assert response.content == "primary"
+    assert backup.calls == []
+    assert router.failover_stats()["slots"]["main"]["failures"] == 0
@@ -4,6 +4,7 @@ from unittest.mock import MagicMock
 
 from nahida_bot.agent.providers.base import ModelCapabilities
 from nahida_bot.agent.providers.manager import ProviderManager, ProviderSlot
+from nahida_bot.agent.providers.ratelimit import ProviderRateLimiter
 
 
 def _slot(
@@ -36,6 +37,17 @@ class TestProviderManagerDefault:
         assert pm.default is None
 
 
+class TestProviderManagerRateLimit:
+    def test_binds_slot_limiter_to_provider(self) -> None:
+        limiter = ProviderRateLimiter("a", max_concurrency=4)
+        s1 = _slot("a")
+        s1.rate_limiter = limiter
+        pm = ProviderManager([s1, _slot("b")])
+        assert s1.provider.rate_limiter is limiter
+        assert list(pm.rate_limit_stats()) == ["a"]
+        assert pm.rate_limit_stats()["a"]["concurrency_limit"] == 4
+
+
 class TestProviderManagerGet:
     def test_get_found(self) -> None:
         s = _slot("deepseek")
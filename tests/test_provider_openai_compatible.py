@@ -13,6 +13,7 @@ from nahida_bot.agent.providers import (
     OpenAICompatibleProvider,
     ProviderAuthError,
     ProviderBadResponseError,
+    ProviderRateLimiter,
     ProviderRateLimitError,
 )
 
@@ -253,6 +254,56 @@ async def test_openai_provider_streaming_collects_content_and_tool_calls(
     assert result.tool_calls[0].arguments == {"q": "nahida"}
 
 
+@pytest.mark.asyncio
+async def test_openai_provider_chat_stream_yields_deltas(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """chat_stream should surface SSE deltas before the final response."""
+    events = [
+        'data: {"choices":[{"delta":{"reasoning_content":"hmm"}}]}',
+        'data: {"choices":[{"delta":{"content":"Hel"}}]}',
+        'data: {"choices":[{"delta":{"content":"lo"},"finish_reason":"stop"}]}',
+        "data: [DONE]",
+    ]
+    stream_body = "\n".join(events)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, text=stream_body)
+
+    transport = _build_transport(handler)
+
+    class _MockClient(httpx.AsyncClient):
+        def __init__(self, *args: Any, **kwargs: Any):
+            super().__init__(*args, transport=transport, **kwargs)
+
+    monkeypatch.setattr(
+        "nahida_bot.agent.providers.openai_compatible.httpx.AsyncClient", _MockClient
+    )
+
+    provider = OpenAICompatibleProvider(
+        base_url="https://example.com/v1",
+        api_key="x",
+        model="gpt-test",
+        stream_responses=True,
+    )
+    deltas = [
+        delta
+        async for delta in provider.chat_stream(
+            messages=[ContextMessage(role="user", source="u", content="hi")]
+        )
+    ]
+
+    assert [(d.type, d.text) for d in deltas[:-1]] == [
+        ("reasoning", "hmm"),
+        ("text", "Hel"),
+        ("text", "lo"),
+    ]
+    assert deltas[-1].type == "response"
+    assert deltas[-1].response is not None
+    assert deltas[-1].response.content == "Hello"
+    assert deltas[-1].response.reasoning_content == "hmm"
+
+
 @pytest.mark.asyncio
 async def test_openai_provider_maps_auth_error(monkeypatch: pytest.MonkeyPatch) -> None:
     """Provider should map 401/403 to normalized auth error."""
@@ -287,7 +338,11 @@ async def test_openai_provider_maps_rate_limit(monkeypatch: pytest.MonkeyPatch)
     """Provider should map 429 to normalized rate-limit error."""
 
     async def handler(request: httpx.Request) -> httpx.Response:
-        return httpx.Response(429, json={"error": "too many requests"})
+        return httpx.Response(
+            429,
+            json={"error": "too many requests"},
+            headers={"Retry-After": "7", "x-ratelimit-limit-requests": "60"},
+        )
 
     transport = _build_transport(handler)
 
@@ -304,11 +359,15 @@ async def test_openai_provider_maps_rate_limit(monkeypatch: pytest.MonkeyPatch)
         api_key="x",
         model="gpt-test",
     )
+    provider.rate_limiter = ProviderRateLimiter("test")
 
-    with pytest.raises(ProviderRateLimitError):
+    with pytest.raises(ProviderRateLimitError) as exc_info:
         await provider.chat(
             messages=[ContextMessage(role="user", source="u", content="hi")]
         )
+    assert exc_info.value.retry_after == 7.0
+    # Rate-limit headers are observed even on error responses.
+    assert provider.rate_limiter.requests.capacity == 60
 
 
 @pytest.mark.asyncio
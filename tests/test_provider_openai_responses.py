@@ -21,6 +21,7 @@ class _FakeResponse:
     def __init__(self, body: dict[str, object], text: str = "") -> None:
         self._body = body
         self.text = text
+        self.headers: dict[str, str] = {}
 
     def json(self) -> dict[str, object]:
         return self._body
@@ -427,6 +428,42 @@ async def test_chat_streaming_responses_collects_output_text() -> None:
     assert fake_client.headers["Accept"] == "text/event-stream"
 
 
+@pytest.mark.asyncio
+async def test_chat_stream_responses_yields_text_and_tool_call_deltas() -> None:
+    events = [
+        'data: {"type":"response.output_text.delta","delta":"Hi"}',
+        (
+            'data: {"type":"response.output_item.added","output_index":1,'
+            '"item":{"type":"function_call","call_id":"call_1","name":"search"}}'
+        ),
+        (
+            'data: {"type":"response.function_call_arguments.delta",'
+            '"output_index":1,"delta":"{}"}'
+        ),
+        (
+            'data: {"type":"response.completed","response":'
+            '{"id":"resp_stream","status":"completed","output":[]}}'
+        ),
+    ]
+    stream_body = "\n".join(events)
+    provider = _provider(stream_responses=True)
+    provider._client = cast(Any, _FakeClient({}, stream_body))
+
+    deltas = [
+        delta
+        async for delta in provider.chat_stream(
+            messages=[ContextMessage(role="user", source="user_input", content="hi")]
+        )
+    ]
+
+    assert [d.type for d in deltas] == ["text", "tool_call", "tool_call", "response"]
+    assert deltas[1].tool_name == "search"
+    assert deltas[2].tool_call_id == "call_1"
+    assert deltas[2].text == "{}"
+    assert deltas[-1].response is not None
+    assert deltas[-1].response.content == "Hi"
+
+
 def test_agent_loop_keeps_response_metadata_and_image_only_content() -> None:
     loop = AgentLoop(provider=_provider(), context_builder=ContextBuilder())
     response = ProviderResponse(
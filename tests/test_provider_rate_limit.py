@@ -0,0 +1,162 @@
+"""Tests for the shared per-provider rate limiter."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+
+import pytest
+
+from nahida_bot.agent.providers import (
+    ProviderAuthError,
+    ProviderRateLimiter,
+    ProviderRateLimitError,
+    ProviderTransportError,
+)
+from nahida_bot.agent.providers.ratelimit import (
+    TokenBucket,
+    backoff_delay,
+    parse_retry_after,
+    rate_limited_call,
+)
+
+
+@dataclass
+class _Usage:
+    total: int
+
+
+@dataclass
+class _Response:
+    usage: _Usage
+
+
+def test_parse_retry_after_formats() -> None:
+    assert parse_retry_after({"retry-after": "3"}) == 3.0
+    assert parse_retry_after({"Retry-After": "1.5"}) == 1.5
+    assert parse_retry_after({"retry-after-ms": "250", "retry-after": "9"}) == 0.25
+    assert parse_retry_after({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0.0
+    assert parse_retry_after({"retry-after": "soon"}) is None
+    assert parse_retry_after({}) is None
+
+
+def test_backoff_delay_is_jittered_and_capped() -> None:
+    delays = [backoff_delay(10, base=1.0, cap=4.0) for _ in range(50)]
+    assert all(0 <= delay <= 4.0 for delay in delays)
+    assert len(set(delays)) > 1
+    # Retry-After is a floor, with only a small jitter on top.
+    assert 6.0 <= backoff_delay(1, base=1.0, cap=4.0, retry_after=6.0) <= 6.1
+
+
+async def test_error_halves_concurrency_and_success_regrows_it() -> None:
+    limiter = ProviderRateLimiter("p", max_concurrency=8)
+
+    with pytest.raises(ProviderTransportError):
+        async with limiter.permit():
+            raise ProviderTransportError()
+    assert limiter.concurrency_limit == 4
+
+    # Errors inside the decrease cooldown count as the same congestion event.
+    with pytest.raises(ProviderTransportError):
+        async with limiter.permit():
+            raise ProviderTransportError()
+    assert limiter.concurrency_limit == 4
+
+    for _ in range(5):
+        async with limiter.permit():
+            pass
+    assert limiter.concurrency_limit == 5
+
+    with pytest.raises(ProviderAuthError):
+        async with limiter.permit():
+            raise ProviderAuthError()
+    assert limiter.concurrency_limit == 5
+    stats = limiter.stats()
+    assert stats["server_errors"] == 2
+    assert stats["concurrency_decreases"] == 1
+    assert stats["inflight"] == 0
+
+
+async def test_concurrency_limit_queues_extra_callers() -> None:
+    limiter = ProviderRateLimiter("p", max_concurrency=1)
+    release = asyncio.Event()
+    order: list[str] = []
+
+    async def call(name: str) -> None:
+        async with limiter.permit():
+            order.append(name)
+            await release.wait()
+
+    first = asyncio.create_task(call("a"))
+    second = asyncio.create_task(call("b"))
+    await asyncio.sleep(0)
+    assert order == ["a"]
+    assert limiter.stats()["waiting"] == 1
+
+    release.set()
+    await asyncio.gather(first, second)
+    assert order == ["a", "b"]
+    assert limiter.stats()["throttled"] == 1
+
+
+async def test_rate_limit_pauses_every_caller_until_retry_after() -> None:
+    limiter = ProviderRateLimiter("p")
+
+    with pytest.raises(ProviderRateLimitError):
+        async with limiter.permit():
+            raise ProviderRateLimitError(retry_after=0.05)
+    assert limiter.stats()["cooldown_seconds"] > 0
+
+    started = time.monotonic()
+    async with limiter.permit():
+        pass
+    assert time.monotonic() - started >= 0.04
+    assert limiter.stats()["rate_limited"] == 1
+
+
+def test_headers_seed_and_correct_token_buckets() -> None:
+    limiter = ProviderRateLimiter("p", requests_per_minute=100)
+    assert not limiter.tokens.enabled
+
+    limiter.update_from_headers(
+        {
+            "anthropic-ratelimit-tokens-limit": "40000",
+            "anthropic-ratelimit-tokens-remaining": "1000",
+            "x-ratelimit-remaining-requests": "10",
+        }
+    )
+
+    assert limiter.tokens.capacity == 40000
+    assert limiter.tokens.available() == pytest.approx(1000, abs=5)
+    assert limiter.requests.capacity == 100
+    assert limiter.requests.available() == pytest.approx(10, abs=1)
+
+
+def test_token_bucket_debt_becomes_wait_time() -> None:
+    bucket = TokenBucket(per_minute=60)
+
+    assert bucket.reserve(60) == 0.0
+    assert bucket.reserve(3) == pytest.approx(3.0, abs=0.05)
+    assert TokenBucket(per_minute=0).reserve(10) == 0.0
+
+
+async def test_rate_limited_call_reconciles_token_usage() -> None:
+    class _Provider:
+        rate_limiter = ProviderRateLimiter("p", tokens_per_minute=1000)
+
+    async def call() -> _Response:
+        return _Response(usage=_Usage(total=50))
+
+    result = await rate_limited_call(_Provider(), call, estimated_tokens=400)
+
+    assert result.usage.total == 50
+    assert _Provider.rate_limiter.tokens.available() == pytest.approx(950, abs=5)
+    assert _Provider.rate_limiter.calls == 1
+
+
+async def test_rate_limited_call_without_limiter_calls_through() -> None:
+    async def call() -> str:
+        return "ok"
+
+    assert await rate_limited_call(object(), call) == "ok"
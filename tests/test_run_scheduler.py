@@ -0,0 +1,162 @@
+"""Tests for agent run admission control and fair queueing."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from nahida_bot.core.run_scheduler import (
+    AgentRunScheduler,
+    RunLease,
+    RunRequest,
+    run_priority_for,
+)
+
+
+async def _acquire_detached(
+    scheduler: AgentRunScheduler, request: RunRequest
+) -> RunLease:
+    # Acquire in a separate task so the lease is not bound to the test's
+    # context; tasks created afterwards would otherwise be nested runs.
+    return await asyncio.create_task(scheduler.acquire(request))
+
+
+async def _run(
+    scheduler: AgentRunScheduler, request: RunRequest, log: list[str]
+) -> None:
+    lease = await scheduler.acquire(request)
+    log.append(request.session_id)
+    await asyncio.sleep(0)
+    lease.release()
+
+
+async def test_global_cap_queues_runs_and_admits_flows_round_robin() -> None:
+    scheduler = AgentRunScheduler(max_concurrent=1, max_per_provider=0)
+    first = await _acquire_detached(
+        scheduler, RunRequest(flow=("qq", "busy"), session_id="b0")
+    )
+    admitted: list[str] = []
+    tasks = [
+        asyncio.create_task(
+            _run(
+                scheduler,
+                RunRequest(flow=("qq", "busy"), priority="group", session_id=f"b{i}"),
+                admitted,
+            )
+        )
+        for i in range(1, 4)
+    ]
+    tasks.append(
+        asyncio.create_task(
+            _run(
+                scheduler,
+                RunRequest(flow=("qq", "quiet"), priority="group", session_id="q1"),
+                admitted,
+            )
+        )
+    )
+    await asyncio.sleep(0)
+    assert scheduler.stats()["queue_depth"] == 4
+
+    first.release()
+    await asyncio.gather(*tasks)
+
+    # The quiet chat is served after one run of the busy chat, not after all.
+    assert admitted == ["b1", "q1", "b2", "b3"]
+    stats = scheduler.stats()
+    assert stats["running"] == 0
+    assert stats["queued"] == 4
+    assert stats["admitted"] == 5
+
+
+async def test_weights_favour_private_chats_over_cron() -> None:
+    scheduler = AgentRunScheduler(
+        max_concurrent=1, max_per_provider=0, weights={"private": 3, "cron": 1}
+    )
+    blocker = await _acquire_detached(scheduler, RunRequest(flow=("x", "0")))
+    admitted: list[str] = []
+    tasks = [
+        asyncio.create_task(
+            _run(
+                scheduler,
+                RunRequest(flow=("cron", str(i)), priority="cron", session_id="cron"),
+                admitted,
+            )
+        )
+        for i in range(2)
+    ] + [
+        asyncio.create_task(
+            _run(
+                scheduler,
+                RunRequest(flow=("tg", str(i)), priority="private", session_id="dm"),
+                admitted,
+            )
+        )
+        for i in range(6)
+    ]
+    await asyncio.sleep(0)
+    blocker.release()
+    await asyncio.gather(*tasks)
+
+    assert admitted == ["dm", "dm", "cron", "dm", "dm", "dm", "cron", "dm"]
+
+
+async def test_full_provider_does_not_block_other_providers() -> None:
+    scheduler = AgentRunScheduler(max_concurrent=0, provider_limits={"slow": 1})
+    held = await _acquire_detached(
+        scheduler, RunRequest(flow=("a", "1"), provider_id="slow")
+    )
+    waiting = asyncio.create_task(
+        scheduler.acquire(RunRequest(flow=("a", "2"), provider_id="slow"))
+    )
+    await asyncio.sleep(0)
+    other = await asyncio.wait_for(
+        scheduler.acquire(RunRequest(flow=("a", "3"), provider_id="fast")),
+        timeout=1,
+    )
+    assert not waiting.done()
+    assert scheduler.stats()["running_by_provider"] == {"slow": 1, "fast": 1}
+
+    held.release()
+    (await waiting).release()
+    other.release()
+    assert scheduler.running == 0
+
+
+async def test_cancelled_waiter_leaves_the_queue() -> None:
+    scheduler = AgentRunScheduler(max_concurrent=1)
+    held = await _acquire_detached(scheduler, RunRequest(flow=("a", "1")))
+    waiting = asyncio.create_task(scheduler.acquire(RunRequest(flow=("a", "2"))))
+    await asyncio.sleep(0)
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    assert scheduler.queue_depth == 0
+
+    held.release()
+    assert scheduler.running == 0
+    assert scheduler.stats()["cancelled"] == 1
+
+
+async def test_nested_run_bypasses_the_cap_held_by_its_parent() -> None:
+    scheduler = AgentRunScheduler(max_concurrent=1)
+    parent = await scheduler.acquire(RunRequest(flow=("a", "1")))
+
+    child = await asyncio.wait_for(
+        scheduler.acquire(RunRequest(flow=("agent", "t"), priority="subagent")),
+        timeout=1,
+    )
+    assert child.nested
+    assert scheduler.running == 2
+    child.release()
+    parent.release()
+    assert scheduler.running == 0
+    assert scheduler.stats()["nested"] == 1
+
+
+def test_run_priority_for_source_tags() -> None:
+    assert run_priority_for("user_input", "group") == "group"
+    assert run_priority_for("user_input", "private") == "private"
+    assert run_priority_for("cron_trigger", "group") == "cron"
+    assert run_priority_for("subagent_task") == "subagent"
@@ -182,6 +182,48 @@ class TestTelegramPluginMessaging:
         assert mock_bot.send_message.await_count == 2
         sleep_mock.assert_awaited_once_with(0.0)
 
+    async def test_edit_message_sends_overflow_chunks_only_once(self) -> None:
+        api = RecordingMockBotAPI()
+        plugin = TelegramPlugin(api=api, manifest=_make_manifest())
+
+        mock_bot = AsyncMock()
+        next_id = iter(range(100, 200))
+
+        def _sent(**_kwargs: object) -> MagicMock:
+            sent = MagicMock()
+            sent.message_id = next(next_id)
+            return sent
+
+        mock_bot.send_message.side_effect = _sent
+        plugin._bot = mock_bot
+
+        from nahida_bot.plugins.base import OutboundMessage
+
+        first = "a" * 3000
+        second = "b" * 3000
+        third = "c" * 3000
+        texts = [
+            first,
+            f"{first}\n\n{second}",
+            f"{first}\n\n{second}",
+            f"{first}\n\n{second}\n\n{third}",
+            f"{first}\n\n{second}\n\n{third}!",
+        ]
+        results = [
+            await plugin.edit_message("123", "10", OutboundMessage(text=text))
+            for text in texts
+        ]
+
+        sent_texts = [c.kwargs["text"] for c in mock_bot.send_message.call_args_list]
+        assert sent_texts == [second, third]
+        assert results == ["10", "100", "100", "101", "101"]
+        edits = [
+            (c.kwargs["message_id"], c.kwargs["text"])
+            for c in mock_bot.edit_message_text.call_args_list
+        ]
+        # Only changed chunks are edited: the head once, the tail once.
+        assert edits == [(10, first), (101, f"{third}!")]
+
 
 class TestTelegramInboundMedia:
     async def test_handle_inbound_publishes_event(self) -> None: